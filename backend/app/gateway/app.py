@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import os
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
@@ -27,6 +28,7 @@ from app.gateway.routers import (
     input_polish,
     mcp,
     memory,
+    metrics,
     models,
     runs,
     scheduled_tasks,
@@ -38,6 +40,7 @@ from app.gateway.routers import (
 )
 from app.gateway.trace_middleware import TraceMiddleware, resolve_trace_enabled
 from deerflow.config import app_config as deerflow_app_config
+from deerflow.config.config_watcher import DEFAULT_POLL_INTERVAL_SECONDS
 from deerflow.logging_config import DEFAULT_LOG_DATE_FORMAT, DEFAULT_LOG_FORMAT, configure_logging
 from deerflow.tracing.monocle import setup_monocle_tracing_if_enabled
 from deerflow.uploads.manager import cleanup_stale_upload_staging_files
@@ -60,6 +63,30 @@ logger = logging.getLogger(__name__)
 _SHUTDOWN_HOOK_TIMEOUT_SECONDS = 5.0
 
 
+def _start_config_watcher() -> bool:
+    """Start the ``config.yaml`` / extensions config watcher unless disabled.
+
+    ``DEER_FLOW_CONFIG_WATCH`` picks the backend: ``auto`` (default; native
+    notifications when ``watchfiles`` is installed, else polling), ``native``,
+    ``poll`` (use on NFS/SMB mounts that do not deliver notifications) or
+    ``off`` to keep the per-call file check in ``get_app_config()``.
+    ``DEER_FLOW_CONFIG_WATCH_INTERVAL`` sets the poll interval in seconds.
+    A watcher that fails to start is logged and the per-call check stays on.
+    """
+    backend = os.getenv("DEER_FLOW_CONFIG_WATCH", "auto").strip().lower()
+    if backend in ("off", "false", "0", "none"):
+        logger.info("Config watcher disabled; get_app_config() checks config.yaml on every call")
+        return False
+    try:
+        interval = float(os.getenv("DEER_FLOW_CONFIG_WATCH_INTERVAL", str(DEFAULT_POLL_INTERVAL_SECONDS)))
+        watcher = deerflow_app_config.start_app_config_watcher(backend=backend, poll_interval=interval)
+    except Exception:
+        logger.exception("Failed to start the config watcher; falling back to per-call config checks")
+        return False
+    logger.info("Config watcher started (%s backend) for %s", watcher.backend, ", ".join(sorted(str(path) for path in watcher.paths)))
+    return True
+
+
 async def _ensure_admin_user(app: FastAPI) -> None:
     """Startup hook: handle first boot and migrate orphan threads otherwise.
 
@@ -193,6 +220,8 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     config = get_gateway_config()
     logger.info(f"Starting API Gateway on {config.host}:{config.port}")
 
+    config_watcher_started = _start_config_watcher()
+
     # Agent observability (Monocle). Off by default; enabled with
     # MONOCLE_TRACING. Initialized here at startup — not at import time — so a
     # plain `import deerflow.agents` never installs a process-global tracer.
@@ -321,6 +350,30 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         except Exception:
             logger.exception("Failed to close browser sessions")
 
+        try:
+            from deerflow.community.http_pool import aclose_http_clients
+
+            await aclose_http_clients()
+        except Exception:
+            logger.exception("Failed to close pooled web-tool HTTP clients")
+
+        try:
+            from deerflow.skills.skillscan.cache import shutdown_scan_pool
+
+            shutdown_scan_pool()
+        except Exception:
+            logger.exception("Failed to shut down the SkillScan worker pool")
+
+        try:
+            from app.gateway.auth.session_cache import get_session_cache, reset_session_cache
+
+            session_cache = get_session_cache()
+            if session_cache is not None:
+                await session_cache.close()
+            reset_session_cache()
+        except Exception:
+            logger.exception("Failed to close the session cache")
+
         # Drain the memory backend's pending-update buffer before the worker
         # exits (best-effort, bounded). IM channels and the scheduler are
         # already stopped above, so no new IM/scheduler updates arrive during
@@ -359,6 +412,9 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         except Exception:
             logger.exception("Failed to flush memory queue on shutdown")
 
+        if config_watcher_started:
+            deerflow_app_config.stop_app_config_watcher()
+
     logger.info("Shutting down API Gateway")
 
 
@@ -568,6 +624,9 @@ This gateway provides runtime endpoints for agent runs plus custom endpoints for
     else:
         logger.warning("GitHub webhooks route NOT mounted: GITHUB_WEBHOOK_SECRET unset and DEER_FLOW_ALLOW_UNVERIFIED_GITHUB_WEBHOOKS not set. /api/webhooks/github will respond 404. Configure either env var to enable the route.")
 
+    # Prometheus scrape endpoint (public like /health; see metrics.auth_token)
+    app.include_router(metrics.router)
+
     @app.get("/health", tags=["health"])
     async def health_check() -> dict[str, str]:
         """Health check endpoint.
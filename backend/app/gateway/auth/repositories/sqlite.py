@@ -21,6 +21,7 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.gateway.auth.models import User
 from app.gateway.auth.repositories.base import UserNotFoundError, UserRepository
+from app.gateway.auth.session_cache import invalidate_user_sessions
 from deerflow.persistence.user.model import UserRow
 
 
@@ -98,6 +99,7 @@ class SQLiteUserRepository(UserRepository):
                 # row here means the row vanished underneath us. Silent
                 # success would let the caller log "password reset" for
                 # a row that no longer exists.
+                await invalidate_user_sessions(str(user.id))
                 raise UserNotFoundError(f"User {user.id} no longer exists")
             row.email = user.email
             row.password_hash = user.password_hash
@@ -107,6 +109,9 @@ class SQLiteUserRepository(UserRepository):
             row.needs_setup = user.needs_setup
             row.token_version = user.token_version
             await session.commit()
+        # Password, role and token_version all live on this row: drop every
+        # cached session so the change takes effect on the next request.
+        await invalidate_user_sessions(str(user.id))
         return user
 
     async def count_users(self) -> int:
@@ -21,6 +21,7 @@ from sqlalchemy import select
 from app.gateway.auth.credential_file import write_initial_credentials
 from app.gateway.auth.password import hash_password
 from app.gateway.auth.repositories.sqlite import SQLiteUserRepository
+from app.gateway.auth.session_cache import get_session_cache
 from deerflow.persistence.user.model import UserRow
 
 
@@ -75,6 +76,11 @@ async def _run(email: str | None) -> int:
         print("Next login will require setup (new email + password).")
         return 0
     finally:
+        # update_user() invalidated the user's cached sessions; with the redis
+        # backend that reached the running gateway workers too.
+        session_cache = get_session_cache()
+        if session_cache is not None:
+            await session_cache.close()
         await close_engine()
 
 
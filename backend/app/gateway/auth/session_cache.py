@@ -0,0 +1,242 @@
+"""Cache of verified session cookies.
+
+Authenticating a request means decoding the JWT, loading the user row and
+comparing its ``token_version`` with the token's ``ver`` claim. The answer only
+changes when the user row does, so :class:`SessionCache` remembers it per token
+(keyed by the token's SHA-256, never the token itself) for a short TTL, and
+:func:`invalidate_user_sessions` drops every entry of a user the moment the
+row is updated — a password change, role change, admin reset or deletion.
+
+Invalidation races a concurrent lookup that read the row *before* the update
+and caches it *after* the invalidation. Each user therefore has a generation
+counter that invalidation bumps: a lookup records the generation before it
+reads the row and :meth:`SessionCache.put` refuses to store the result if the
+generation moved in the meantime.
+
+The memory backend is per process. In a multi-worker gateway use the redis
+backend (``auth.session_cache.type: redis``, inferred when the stream bridge
+runs on redis) so an invalidation on one worker reaches all of them; a
+process that cannot reach the cache (e.g. ``reset_admin`` against a memory
+backend) is only seen once ``ttl_seconds`` elapse.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import UTC, datetime
+from typing import NamedTuple
+
+from app.gateway.auth.models import User
+from deerflow.config.auth_config import SessionCacheConfig
+from deerflow.config.stream_bridge_config import StreamBridgeConfig
+
+logger = logging.getLogger(__name__)
+
+_ENV_STREAM_BRIDGE_REDIS_URL = "DEER_FLOW_STREAM_BRIDGE_REDIS_URL"
+
+
+def token_key(token: str) -> str:
+    """Cache key for a raw session token."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def entry_ttl(ttl_seconds: float, token_expires_at: datetime) -> float:
+    """Seconds an entry may live: the configured TTL, capped at the token's expiry."""
+    if token_expires_at.tzinfo is None:
+        token_expires_at = token_expires_at.replace(tzinfo=UTC)
+    return min(ttl_seconds, (token_expires_at - datetime.now(UTC)).total_seconds())
+
+
+class SessionCache(ABC):
+    """Verified ``token -> User`` entries with per-user invalidation.
+
+    Implementations never raise: a cache failure degrades to a miss (or, for
+    :meth:`generation`, to ``None``, which makes :meth:`put` a no-op) so
+    authentication falls back to the database.
+    """
+
+    @abstractmethod
+    async def get(self, token: str) -> User | None:
+        """Return a copy of the cached user for *token*, or ``None``."""
+
+    @abstractmethod
+    async def generation(self, user_id: str) -> int | None:
+        """Current invalidation generation of *user_id* (read before the user lookup)."""
+
+    @abstractmethod
+    async def put(self, token: str, user: User, *, expires_at: datetime, generation: int | None) -> None:
+        """Cache *user* for *token* unless *user_id* was invalidated since *generation*."""
+
+    @abstractmethod
+    async def invalidate_user(self, user_id: str) -> None:
+        """Drop every cached session of *user_id*."""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Drop every cached session."""
+
+    async def close(self) -> None:  # noqa: B027 - optional hook
+        """Release backend resources."""
+
+
+class _Entry(NamedTuple):
+    user: User
+    user_id: str
+    expires_at: float
+
+
+class MemorySessionCache(SessionCache):
+    """Per-process LRU bounded by ``max_entries``."""
+
+    def __init__(self, *, ttl_seconds: float = 30.0, max_entries: int = 10_000) -> None:
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._by_user: dict[str, set[str]] = {}
+        self._generations: dict[str, int] = {}
+        # One cache serves every event loop in the process (the gateway loop,
+        # TestClient portals, threads running their own loop), so mutations
+        # are serialised even though each call is synchronous within a loop.
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._by_user.get(entry.user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[entry.user_id]
+
+    async def get(self, token: str) -> User | None:
+        key = token_key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+        # Callers mutate the user they get back (change-password), which must
+        # not leak into the cached copy.
+        return entry.user.model_copy()
+
+    async def generation(self, user_id: str) -> int | None:
+        return self._generations.get(user_id, 0)
+
+    async def put(self, token: str, user: User, *, expires_at: datetime, generation: int | None) -> None:
+        if generation is None:
+            return
+        ttl = entry_ttl(self._ttl, expires_at)
+        if ttl <= 0:
+            return
+        user_id = str(user.id)
+        key = token_key(token)
+        with self._lock:
+            if self._generations.get(user_id, 0) != generation:
+                return
+            self._drop(key)
+            self._entries[key] = _Entry(user.model_copy(), user_id, time.monotonic() + ttl)
+            self._by_user.setdefault(user_id, set()).add(key)
+            while len(self._entries) > self._max_entries:
+                self._drop(next(iter(self._entries)))
+
+    async def invalidate_user(self, user_id: str) -> None:
+        with self._lock:
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+            for key in list(self._by_user.get(user_id, ())):
+                self._drop(key)
+
+    async def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+
+def resolve_session_cache_config(config: SessionCacheConfig, *, stream_bridge: StreamBridgeConfig | None = None) -> SessionCacheConfig:
+    """Fill in an omitted ``type``: redis for multi-worker deployments, else memory.
+
+    Mirrors the sandbox ownership inference: a stream bridge on Redis (from
+    config.yaml or ``DEER_FLOW_STREAM_BRIDGE_REDIS_URL``) means several
+    workers, and a per-process cache there would let a revoked session live on
+    in the workers that did not handle the password change.
+    """
+    if config.type is not None:
+        return config
+    if stream_bridge is not None and stream_bridge.type == "redis":
+        return config.model_copy(update={"type": "redis", "redis_url": config.redis_url or stream_bridge.redis_url})
+    if os.getenv(_ENV_STREAM_BRIDGE_REDIS_URL):
+        return config.model_copy(update={"type": "redis"})
+    return config.model_copy(update={"type": "memory"})
+
+
+def _resolve_redis_url(config: SessionCacheConfig) -> str:
+    return config.redis_url or os.getenv(_ENV_STREAM_BRIDGE_REDIS_URL) or os.getenv("REDIS_URL") or "redis://localhost:6379/0"
+
+
+def make_session_cache(config: SessionCacheConfig, *, stream_bridge: StreamBridgeConfig | None = None) -> SessionCache | None:
+    """Build the configured cache; ``None`` when caching is disabled."""
+    if not config.enabled:
+        return None
+    config = resolve_session_cache_config(config, stream_bridge=stream_bridge)
+    if config.type == "redis":
+        from app.gateway.auth.session_cache_redis import RedisSessionCache
+
+        return RedisSessionCache(redis_url=_resolve_redis_url(config), ttl_seconds=config.ttl_seconds, key_prefix=config.key_prefix)
+    return MemorySessionCache(ttl_seconds=config.ttl_seconds, max_entries=config.max_entries)
+
+
+_session_cache: SessionCache | None = None
+_session_cache_loaded = False
+
+
+def get_session_cache() -> SessionCache | None:
+    """Return the process-wide session cache (``None`` when disabled).
+
+    ``config.yaml`` is absent in bare-app contexts (tests build the gateway
+    without one); those get the default config, which leaves caching off.
+    """
+    global _session_cache, _session_cache_loaded
+    if not _session_cache_loaded:
+        from deerflow.config.app_config import get_app_config
+
+        try:
+            app_config = get_app_config()
+            config, stream_bridge = app_config.auth.session_cache, app_config.stream_bridge
+        except FileNotFoundError:
+            config, stream_bridge = SessionCacheConfig(), None
+        _session_cache = make_session_cache(config, stream_bridge=stream_bridge)
+        _session_cache_loaded = True
+    return _session_cache
+
+
+def set_session_cache(cache: SessionCache | None) -> None:
+    """Install *cache* as the process-wide session cache (tests, benchmarks)."""
+    global _session_cache, _session_cache_loaded
+    _session_cache = cache
+    _session_cache_loaded = True
+
+
+def reset_session_cache() -> None:
+    """Forget the process-wide cache; the next :func:`get_session_cache` rebuilds it."""
+    global _session_cache, _session_cache_loaded
+    _session_cache = None
+    _session_cache_loaded = False
+
+
+async def invalidate_user_sessions(user_id: str) -> None:
+    """Drop *user_id*'s cached sessions after its row changed or was deleted."""
+    cache = get_session_cache()
+    if cache is not None:
+        await cache.invalidate_user(user_id)
@@ -0,0 +1,151 @@
+"""Redis-backed verified-session cache shared by every gateway worker.
+
+Keys (under ``key_prefix``):
+
+- ``<prefix>:tok:<sha256>`` — the cached user as JSON, with the entry TTL.
+- ``<prefix>:user:<user_id>`` — set of the user's token keys, so invalidation
+  can find them; its TTL is pushed out to the newest entry's.
+- ``<prefix>:gen:<user_id>`` — the user's invalidation generation.
+
+Both mutations are Lua scripts: the generation check and the write of a
+``put`` must not interleave with an invalidation, and an invalidation has to
+bump the generation and drop the entries as one step. A hit is a single GET.
+"""
+
+from __future__ import annotations
+
+import inspect
+import logging
+from datetime import datetime
+
+try:
+    from redis.asyncio import Redis
+    from redis.exceptions import RedisError
+except ImportError:  # pragma: no cover - only hit when the optional extra is missing
+    # ``redis`` is an optional extra (mirrors the stream_bridge redis path). This
+    # module is imported lazily from ``make_session_cache`` only when the redis
+    # backend is selected, so the hint surfaces exactly then.
+    raise ImportError(
+        "auth.session_cache.type is 'redis' (set, or inferred from stream_bridge.type) but the redis package is not installed.\n"
+        "Install it with:\n"
+        "    cd backend && uv sync --all-packages --extra redis\n"
+        "On the next `make dev` the redis extra is auto-detected from config.yaml\n"
+        "(auth.session_cache.type: redis) and reinstalled, so it will not be wiped again.\n"
+        "Or switch to auth.session_cache.type: memory in config.yaml for single-process deployment."
+    ) from None
+
+from app.gateway.auth.models import User
+from app.gateway.auth.session_cache import SessionCache, entry_ttl, token_key
+
+logger = logging.getLogger(__name__)
+
+# Authentication sits on every request; a stalled Redis must degrade to the
+# database lookup rather than hang it.
+_SOCKET_TIMEOUT_SECONDS = 1.0
+
+# KEYS: gen, tok, user-index. ARGV: expected generation, user JSON, ttl ms, token key.
+_PUT_SCRIPT = """
+local gen = redis.call('GET', KEYS[1]) or '0'
+if gen ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[2], ARGV[2], 'PX', ARGV[3])
+redis.call('SADD', KEYS[3], ARGV[4])
+if redis.call('PTTL', KEYS[3]) < tonumber(ARGV[3]) then
+    redis.call('PEXPIRE', KEYS[3], ARGV[3])
+end
+return 1
+"""
+
+# KEYS: gen, user-index. ARGV: token key prefix.
+_INVALIDATE_SCRIPT = """
+redis.call('INCR', KEYS[1])
+local members = redis.call('SMEMBERS', KEYS[2])
+for _, key in ipairs(members) do
+    redis.call('DEL', ARGV[1] .. key)
+end
+redis.call('DEL', KEYS[2])
+return #members
+"""
+
+
+class RedisSessionCache(SessionCache):
+    def __init__(self, *, redis_url: str, ttl_seconds: float = 30.0, key_prefix: str = "deerflow:auth:session", client: Redis | None = None) -> None:
+        self._ttl = ttl_seconds
+        self._prefix = key_prefix
+        self._owns_client = client is None
+        self._redis = client if client is not None else Redis.from_url(redis_url, decode_responses=True, socket_timeout=_SOCKET_TIMEOUT_SECONDS, socket_connect_timeout=_SOCKET_TIMEOUT_SECONDS)
+
+    def _tok_prefix(self) -> str:
+        return f"{self._prefix}:tok:"
+
+    def _gen_key(self, user_id: str) -> str:
+        return f"{self._prefix}:gen:{user_id}"
+
+    def _user_key(self, user_id: str) -> str:
+        return f"{self._prefix}:user:{user_id}"
+
+    async def get(self, token: str) -> User | None:
+        try:
+            raw = await self._redis.get(self._tok_prefix() + token_key(token))
+        except RedisError:
+            logger.debug("Session cache read failed; falling back to the database", exc_info=True)
+            return None
+        return User.model_validate_json(raw) if raw else None
+
+    async def generation(self, user_id: str) -> int | None:
+        try:
+            raw = await self._redis.get(self._gen_key(user_id))
+        except RedisError:
+            logger.debug("Session cache generation read failed; not caching", exc_info=True)
+            return None
+        return int(raw) if raw else 0
+
+    async def put(self, token: str, user: User, *, expires_at: datetime, generation: int | None) -> None:
+        if generation is None:
+            return
+        ttl_ms = int(entry_ttl(self._ttl, expires_at) * 1000)
+        if ttl_ms <= 0:
+            return
+        user_id = str(user.id)
+        key = token_key(token)
+        try:
+            await self._redis.eval(
+                _PUT_SCRIPT,
+                3,
+                self._gen_key(user_id),
+                self._tok_prefix() + key,
+                self._user_key(user_id),
+                str(generation),
+                user.model_dump_json(),
+                ttl_ms,
+                key,
+            )
+        except RedisError:
+            logger.debug("Session cache write failed", exc_info=True)
+
+    async def invalidate_user(self, user_id: str) -> None:
+        try:
+            await self._redis.eval(_INVALIDATE_SCRIPT, 2, self._gen_key(user_id), self._user_key(user_id), self._tok_prefix())
+        except RedisError:
+            # Entries expire on their own within ttl_seconds; say so loudly,
+            # since until then the old session keeps working on every worker.
+            logger.warning("Failed to invalidate cached sessions for user %s; they expire within %ss", user_id, self._ttl, exc_info=True)
+
+    async def clear(self) -> None:
+        try:
+            keys = [key async for key in self._redis.scan_iter(match=f"{self._prefix}:*")]
+            if keys:
+                await self._redis.delete(*keys)
+        except RedisError:
+            logger.warning("Failed to clear the session cache", exc_info=True)
+
+    async def close(self) -> None:
+        if not self._owns_client:
+            return
+        close = getattr(self._redis, "aclose", None) or getattr(self._redis, "close", None)
+        if close is None:
+            return
+        result = close()
+        if inspect.isawaitable(result):
+            await result
@@ -41,7 +41,7 @@ _PUBLIC_PATH_PREFIXES: tuple[str, ...] = (
     "/api/webhooks/",
 )
 
-# Exact auth paths that are public (login/register/status check).
+# Exact paths that are public (auth login/register/status check, metrics scrape).
 # /api/v1/auth/me, /api/v1/auth/change-password etc. are NOT public.
 _PUBLIC_EXACT_PATHS: frozenset[str] = frozenset(
     {
@@ -51,6 +51,8 @@ _PUBLIC_EXACT_PATHS: frozenset[str] = frozenset(
         "/api/v1/auth/setup-status",
         "/api/v1/auth/initialize",
         "/api/v1/auth/providers",
+        # Aggregate latency histograms; ``metrics.auth_token`` adds a bearer check.
+        "/metrics",
     }
 )
 
@@ -60,9 +60,11 @@ def _enforce_postgres_for_multi_worker(config: AppConfig) -> None:
 
     Three checks (all must pass for multi-worker):
 
-    1. Process-local browser sessions must be disabled. Browser tools keep
-       Chromium and Playwright objects in one worker's memory, while ordinary
-       uvicorn dispatch provides no thread-id affinity.
+    1. Browser sessions must be shareable across workers. Browser tools keep
+       Chromium and Playwright objects in one process's memory and uvicorn
+       dispatch provides no thread-id affinity, so multi-worker gateways route
+       every session through the Unix-socket browser host; platforms without
+       Unix sockets must keep browser tools disabled.
     2. The DB backend must be Postgres — SQLite write-locks cannot support
        concurrent multi-process access.
     3. ``run_ownership.heartbeat_enabled`` must be True — without heartbeat,
@@ -82,8 +84,8 @@ def _enforce_postgres_for_multi_worker(config: AppConfig) -> None:
     if workers <= 1:
         return
 
-    if _browser_tools_enabled_in_config(config):
-        raise SystemExit(browser_multi_worker_error(workers))
+    if _browser_tools_enabled_in_config(config) and (browser_error := browser_multi_worker_error(workers)):
+        raise SystemExit(browser_error)
 
     backend = getattr(config.database, "backend", None)
     if backend != "postgres":
@@ -203,7 +205,8 @@ def get_config() -> AppConfig:
 
     Routes through :func:`deerflow.config.app_config.get_app_config`, which
     honours runtime ``ContextVar`` overrides and reloads ``config.yaml`` from
-    disk when its mtime changes. ``AppConfig`` is not cached on ``app.state``
+    disk when it changes — detected by the config watcher started in
+    ``lifespan()``, or by a per-call check when the watcher is off. ``AppConfig`` is not cached on ``app.state``
     at all — the only startup-time snapshot lives as a local
     ``startup_config`` variable inside ``lifespan()`` and is passed
     explicitly into :func:`langgraph_runtime` for the engines that are
@@ -263,6 +266,7 @@ async def langgraph_runtime(app: FastAPI, startup_config: AppConfig) -> AsyncGen
     from deerflow.runtime import make_store, make_stream_bridge
     from deerflow.runtime.checkpointer.async_provider import make_checkpointer
     from deerflow.runtime.events.store import make_run_event_store
+    from deerflow.runtime.metrics import CHECKPOINT_SECONDS, RUN_EVENT_STORE_SECONDS, STREAM_BRIDGE_SECONDS, configure_metrics, instrument_methods
 
     # ------------------------------------------------------------------
     # Multi-worker safety gate: reject SQLite when GATEWAY_WORKERS > 1.
@@ -273,13 +277,14 @@ async def langgraph_runtime(app: FastAPI, startup_config: AppConfig) -> AsyncGen
     async with AsyncExitStack() as stack:
         config = startup_config
 
-        app.state.stream_bridge = await stack.enter_async_context(make_stream_bridge(config))
+        configure_metrics(getattr(config, "metrics", None))
+        app.state.stream_bridge = instrument_methods(await stack.enter_async_context(make_stream_bridge(config)), STREAM_BRIDGE_SECONDS, ("publish", "publish_end"))
 
         # Initialize persistence engine BEFORE checkpointer so that
         # auto-create-database logic runs first (postgres backend).
         await init_engine_from_config(config.database)
 
-        app.state.checkpointer = await stack.enter_async_context(make_checkpointer(config))
+        app.state.checkpointer = instrument_methods(await stack.enter_async_context(make_checkpointer(config)), CHECKPOINT_SECONDS, ("aput", "aput_writes"))
         app.state.store = await stack.enter_async_context(make_store(config))
 
         # Initialize repositories — one get_session_factory() call for all.
@@ -317,7 +322,7 @@ async def langgraph_runtime(app: FastAPI, startup_config: AppConfig) -> AsyncGen
         # the previous backend.
         run_events_config = getattr(config, "run_events", None)
         app.state.run_events_config = run_events_config
-        app.state.run_event_store = make_run_event_store(run_events_config)
+        app.state.run_event_store = instrument_methods(make_run_event_store(run_events_config), RUN_EVENT_STORE_SECONDS, ("put", "put_batch"))
 
         # RunManager with store backing for persistence
         run_ownership_config = getattr(config, "run_ownership", None)
@@ -496,6 +501,17 @@ async def get_current_user_from_request(request: Request):
             detail=AuthErrorResponse(code=AuthErrorCode.NOT_AUTHENTICATED, message="Not authenticated").model_dump(),
         )
 
+    from app.gateway.auth.session_cache import get_session_cache
+
+    # A cached entry was verified (signature, expiry, token_version) at most
+    # ``auth.session_cache.ttl_seconds`` ago and is dropped as soon as the
+    # user row changes, so a hit skips both the JWT decode and the DB lookup.
+    session_cache = get_session_cache()
+    if session_cache is not None:
+        cached = await session_cache.get(access_token)
+        if cached is not None:
+            return cached
+
     payload = decode_token(access_token)
     if isinstance(payload, TokenError):
         raise HTTPException(
@@ -503,6 +519,7 @@ async def get_current_user_from_request(request: Request):
             detail=AuthErrorResponse(code=token_error_to_code(payload), message=f"Token error: {payload.value}").model_dump(),
         )
 
+    generation = await session_cache.generation(payload.sub) if session_cache is not None else None
     provider = get_local_provider()
     user = await provider.get_user(payload.sub)
     if user is None:
@@ -518,6 +535,8 @@ async def get_current_user_from_request(request: Request):
             detail=AuthErrorResponse(code=AuthErrorCode.TOKEN_INVALID, message="Token revoked (password changed)").model_dump(),
         )
 
+    if session_cache is not None:
+        await session_cache.put(access_token, user, expires_at=payload.exp, generation=generation)
     return user
 
 
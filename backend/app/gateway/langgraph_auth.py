@@ -20,6 +20,7 @@ from langgraph_sdk import Auth
 
 from app.gateway.auth.errors import TokenError
 from app.gateway.auth.jwt import decode_token
+from app.gateway.auth.session_cache import get_session_cache
 from app.gateway.auth_disabled import AUTH_DISABLED_USER_ID, is_auth_disabled
 from app.gateway.deps import get_local_provider
 
@@ -80,6 +81,12 @@ async def authenticate(request):
             detail="Not authenticated",
         )
 
+    session_cache = get_session_cache()
+    if session_cache is not None:
+        cached = await session_cache.get(token)
+        if cached is not None:
+            return str(cached.id)
+
     payload = decode_token(token)
     if isinstance(payload, TokenError):
         raise Auth.exceptions.HTTPException(
@@ -87,6 +94,7 @@ async def authenticate(request):
             detail="Invalid token",
         )
 
+    generation = await session_cache.generation(payload.sub) if session_cache is not None else None
     user = await get_local_provider().get_user(payload.sub)
     if user is None:
         raise Auth.exceptions.HTTPException(
@@ -99,6 +107,8 @@ async def authenticate(request):
             detail="Token revoked (password changed)",
         )
 
+    if session_cache is not None:
+        await session_cache.put(token, user, expires_at=payload.exp, generation=generation)
     return payload.sub
 
 
@@ -121,16 +121,24 @@ async def _authenticate_ws(websocket: WebSocket):
     """
     from app.gateway.auth import decode_token
     from app.gateway.auth.errors import TokenError
+    from app.gateway.auth.session_cache import get_session_cache
     from app.gateway.auth_disabled import get_auth_disabled_user, is_auth_disabled
     from app.gateway.deps import get_local_provider
 
     access_token = websocket.cookies.get("access_token")
     if access_token:
+        session_cache = get_session_cache()
+        cached = await session_cache.get(access_token) if session_cache is not None else None
+        if cached is not None:
+            return cached
         payload = decode_token(access_token)
         if not isinstance(payload, TokenError):
+            generation = await session_cache.generation(payload.sub) if session_cache is not None else None
             provider = get_local_provider()
             user = await provider.get_user(payload.sub)
             if user is not None and user.token_version == payload.ver:
+                if session_cache is not None:
+                    await session_cache.put(access_token, user, expires_at=payload.exp, generation=generation)
                 return user
     if is_auth_disabled():
         return get_auth_disabled_user()
@@ -216,8 +224,8 @@ async def browser_stream(websocket: WebSocket, thread_id: str) -> None:
         from deerflow.community.browser_automation import (
             BrowserLiveViewerError,
             BrowserSessionCapacityError,
+            avalidate_browser_url,
             get_browser_session_manager,
-            validate_browser_url,
         )
     except ImportError:
         await websocket.close(code=4501)
@@ -272,16 +280,16 @@ async def browser_stream(websocket: WebSocket, thread_id: str) -> None:
 
     manager = get_browser_session_manager()
     try:
-        session_lease = manager.acquire_session(
+        session_lease = manager.aacquire_session(
             thread_id,
             headless=_cfg_bool("headless", True),
             timeout_ms=_cfg_int("timeout_ms", 30000),
             viewport={"width": _cfg_int("viewport_width", 1280), "height": _cfg_int("viewport_height", 720)},
             cdp_url=_cfg_str("cdp_url"),
             allow_unguarded_cdp=_cfg_bool("allow_unguarded_cdp", False),
-            url_guard=validate_browser_url,
+            url_guard=avalidate_browser_url,
         )
-        session = session_lease.__enter__()
+        session = await session_lease.__aenter__()
     except BrowserSessionCapacityError:
         await websocket.close(code=4429)
         reset_current_user(token)
@@ -409,7 +417,7 @@ async def browser_stream(websocket: WebSocket, thread_id: str) -> None:
                     # SSRF-screen client-driven navigations with the same policy
                     # the agent tools enforce; reject rather than dispatch.
                     url = event.get("url")
-                    reason = validate_browser_url(url) if isinstance(url, str) else "Error: invalid navigation URL"
+                    reason = await avalidate_browser_url(url) if isinstance(url, str) else "Error: invalid navigation URL"
                     if reason is not None:
                         await _send_payload({"type": "nav_rejected", "url": url, "message": reason})
                         continue
@@ -433,7 +441,7 @@ async def browser_stream(websocket: WebSocket, thread_id: str) -> None:
         # page differs from the latest visible browser artifact, align Live with
         # what the user expects instead of requiring an off/on reconnect.
         seed = websocket.query_params.get("seed")
-        if seed and validate_browser_url(seed) is None:
+        if seed and await avalidate_browser_url(seed) is None:
             with contextlib.suppress(Exception):
                 current = await session.current_url()
                 if _should_apply_browser_seed(current, seed):
@@ -463,5 +471,5 @@ async def browser_stream(websocket: WebSocket, thread_id: str) -> None:
             poll_task.cancel()
         with contextlib.suppress(Exception):
             await session.stop_screencast(_on_frame)
-        session_lease.__exit__(None, None, None)
+        await session_lease.__aexit__(None, None, None)
         reset_current_user(token)
@@ -9,16 +9,22 @@ queries against the harness-owned ``runs`` / ``threads_meta`` tables instead of
 widening the runtime ``RunStore`` surface. Requires a SQL database backend
 (``database.backend: sqlite | postgres``); returns 503 on the memory backend,
 which persists no run history to report on.
+
+Stats and usage read finished runs from the hourly ``run_usage_hourly``
+rollup (kept current by ``RunRepository``) and only scan ``runs`` for the
+few rows still pending/running, so their cost no longer grows with history.
+While the rollup is being rebuilt after a pricing change they aggregate
+``runs`` directly, as they did before the rollup existed.
 """
 
 import asyncio
 import logging
 from datetime import UTC, datetime, time, timedelta
-from typing import NamedTuple
+from typing import Any
 
 from fastapi import APIRouter, HTTPException, Query, Request
 from pydantic import BaseModel, Field
-from sqlalchemy import func, select
+from sqlalchemy import and_, func, or_, select
 
 from app.gateway.authz import require_permission
 from app.gateway.deps import get_current_user
@@ -26,6 +32,8 @@ from deerflow.config import get_app_config
 from deerflow.config.agents_config import list_custom_agents
 from deerflow.persistence.engine import get_session_factory
 from deerflow.persistence.run.model import RunRow
+from deerflow.persistence.run_usage import RunUsageHourlyRow, RunUsageRepository
+from deerflow.persistence.run_usage.pricing import ModelPricing, build_pricing_map, lookup_pricing, pricing_currency, run_cost, token_cost
 from deerflow.persistence.thread_meta.model import ThreadMetaRow
 
 logger = logging.getLogger(__name__)
@@ -140,120 +148,117 @@ def _as_utc(dt: datetime | None) -> datetime | None:
 # ---------------------------------------------------------------------------
 
 
-class _ModelPricing(NamedTuple):
-    input_per_million: float
-    output_per_million: float
-    currency: str
-    # Price for prompt-cache-hit input tokens. None → hits are billed at the
-    # full input price (conservative upper bound for providers that don't
-    # discount, or when the operator hasn't configured the hit price).
-    input_cache_hit_per_million: float | None = None
-
+# The pricing helpers live with the usage rollup so rolled-up and live costs
+# are computed identically; the aliases keep this module's call sites short.
+_pricing_currency = pricing_currency
+_lookup_pricing = lookup_pricing
+_token_cost = token_cost
+_run_cost = run_cost
 
-def _build_pricing_map() -> dict[str, _ModelPricing]:
-    """Collect per-model prices from ``models[*].pricing`` in config.yaml.
 
-    ``ModelConfig`` allows extra fields, so operators can annotate each model
-    with e.g. ``pricing: {currency: CNY, input_per_million: 8,
-    output_per_million: 32, input_cache_hit_per_million: 0.8}`` without any
-    schema change. Entries are keyed by both the config ``name`` and the
-    provider ``model`` id (plus lowercase variants), because
-    ``token_usage_by_model`` buckets carry the provider-reported model name.
-    """
+def _build_pricing_map() -> dict[str, ModelPricing]:
+    """Collect per-model prices from ``models[*].pricing`` in config.yaml."""
     try:
         models = get_app_config().models
     except Exception:  # pragma: no cover - defensive: cost display must not break the console
         logger.warning("console: failed to load model pricing from config", exc_info=True)
         return {}
+    return build_pricing_map(models)
 
-    pricing: dict[str, _ModelPricing] = {}
-    for model_cfg in models or []:
-        raw = getattr(model_cfg, "pricing", None)
-        if not isinstance(raw, dict):
-            continue
-        try:
-            input_price = float(raw.get("input_per_million") or 0)
-            output_price = float(raw.get("output_per_million") or 0)
-            raw_hit_price = raw.get("input_cache_hit_per_million")
-            cache_hit_price = float(raw_hit_price) if raw_hit_price is not None else None
-        except (TypeError, ValueError):
-            logger.warning("console: ignoring malformed pricing on model %s", model_cfg.name)
-            continue
-        if input_price <= 0 and output_price <= 0:
-            continue
-        currency = str(raw.get("currency") or "USD").upper()
-        entry = _ModelPricing(input_price, output_price, currency, cache_hit_price)
-        for key in (model_cfg.name, getattr(model_cfg, "model", None)):
-            if key:
-                pricing.setdefault(key, entry)
-                pricing.setdefault(key.lower(), entry)
-    return pricing
 
+# ---------------------------------------------------------------------------
+# Usage accumulation
+# ---------------------------------------------------------------------------
 
-def _pricing_currency(pricing: dict[str, _ModelPricing]) -> str | None:
-    """Display currency: the first configured entry's (one currency per deployment)."""
-    return next(iter(pricing.values())).currency if pricing else None
 
+_USAGE_SUM_COLUMNS = (
+    "total_tokens",
+    "input_tokens",
+    "output_tokens",
+    "run_count",
+    "cost",
+    "model_run_count",
+    "model_tokens",
+    "model_input_tokens",
+    "model_cache_read_tokens",
+)
 
-def _lookup_pricing(pricing: dict[str, _ModelPricing], model: str | None) -> _ModelPricing | None:
-    if not model:
-        return None
-    return pricing.get(model) or pricing.get(model.lower())
 
+def _floor_hour(dt: datetime) -> datetime:
+    return dt.replace(minute=0, second=0, microsecond=0)
 
-def _token_cost(input_tokens: int, output_tokens: int, price: _ModelPricing, cache_read_tokens: int = 0) -> float:
-    """Cache-aware spend: cache-hit input tokens are billed at the hit price.
 
-    ``cache_read_tokens`` is clamped into ``[0, input_tokens]``; the remainder
-    is billed at the full (cache-miss) input price. Without a configured hit
-    price all input is billed at the miss price.
-    """
-    cache_read = min(max(int(cache_read_tokens or 0), 0), max(int(input_tokens or 0), 0))
-    uncached = max(int(input_tokens or 0), 0) - cache_read
-    hit_price = price.input_cache_hit_per_million if price.input_cache_hit_per_million is not None else price.input_per_million
-    return (uncached / 1_000_000) * price.input_per_million + (cache_read / 1_000_000) * hit_price + (output_tokens / 1_000_000) * price.output_per_million
-
-
-def _run_cost(
-    pricing: dict[str, _ModelPricing],
-    *,
-    model_name: str | None,
-    total_input_tokens: int | None,
-    total_output_tokens: int | None,
-    token_usage_by_model: dict | None,
-) -> float | None:
-    """Estimate one run's spend, or None when none of its models are priced.
-
-    Prefers the per-model breakdown (accurate for multi-model runs, e.g.
-    subagents on a different model); falls back to run-level totals priced at
-    ``model_name`` for legacy rows. Buckets without an input/output split are
-    skipped rather than guessed.
+# Usage is accumulated in plain dicts shaped like ConsoleUsageDay /
+# ConsoleUsageModelBreakdown; validated models are built once at the end.
+def _new_day() -> dict[str, Any]:
+    return {"total_tokens": 0, "input_tokens": 0, "output_tokens": 0, "runs": 0, "cost": 0.0}
+
+
+def _new_model_entry() -> dict[str, Any]:
+    return {"tokens": 0, "runs": 0, "cost": None, "input_tokens": 0, "cache_read_tokens": 0}
+
+
+def _add_rollup_row(model_name: str, sums: tuple, day: dict[str, Any], by_model: dict[str, dict[str, Any]]) -> None:
+    """Fold one (hour, model) rollup aggregate into its day bucket and the per-model breakdown.
+
+    *sums* follows ``_USAGE_SUM_COLUMNS`` then ``model_cost``; rows are
+    unpacked positionally because this runs once per rollup group.
     """
-    cost = 0.0
-    priced = False
-    if isinstance(token_usage_by_model, dict):
-        for model, usage in token_usage_by_model.items():
+    total_tokens, input_tokens, output_tokens, run_count, cost, model_runs, model_tokens, model_input, model_cache_read, model_cost = sums
+    day["total_tokens"] += total_tokens
+    day["input_tokens"] += input_tokens
+    day["output_tokens"] += output_tokens
+    day["runs"] += run_count
+    day["cost"] += cost
+    if model_runs:
+        entry = by_model.setdefault(model_name, _new_model_entry())
+        entry["runs"] += model_runs
+        entry["tokens"] += model_tokens
+        entry["input_tokens"] += model_input
+        entry["cache_read_tokens"] += model_cache_read
+        if model_cost is not None:
+            entry["cost"] = (entry["cost"] or 0.0) + model_cost
+
+
+def _add_run_row(row: RunRow, pricing: dict[str, ModelPricing], day: dict[str, Any], by_model: dict[str, dict[str, Any]]) -> None:
+    """Fold one raw run (active, in a split hour, or read while the rollup is rebuilt) the way the rollup would."""
+    run_tokens = row.total_tokens or 0
+    day["total_tokens"] += run_tokens
+    day["input_tokens"] += row.total_input_tokens or 0
+    day["output_tokens"] += row.total_output_tokens or 0
+    day["runs"] += 1
+
+    cost = _run_cost(
+        pricing,
+        model_name=row.model_name,
+        total_input_tokens=row.total_input_tokens,
+        total_output_tokens=row.total_output_tokens,
+        token_usage_by_model=row.token_usage_by_model,
+    )
+    if cost is not None:
+        day["cost"] += cost
+
+    usage_map = row.token_usage_by_model or {}
+    if isinstance(usage_map, dict) and usage_map:
+        for model, usage in usage_map.items():
+            entry = by_model.setdefault(model, _new_model_entry())
+            entry["runs"] += 1
             if not isinstance(usage, dict):
                 continue
+            entry["tokens"] += int(usage.get("total_tokens", 0) or 0)
+            entry["input_tokens"] += int(usage.get("input_tokens") or 0)
+            entry["cache_read_tokens"] += int(usage.get("cache_read_tokens") or 0)
             price = _lookup_pricing(pricing, model)
-            if price is None:
-                continue
-            input_tokens = int(usage.get("input_tokens") or 0)
-            output_tokens = int(usage.get("output_tokens") or 0)
-            if input_tokens == 0 and output_tokens == 0:
-                continue
-            cost += _token_cost(input_tokens, output_tokens, price, int(usage.get("cache_read_tokens") or 0))
-            priced = True
-    if priced:
-        return cost
-    price = _lookup_pricing(pricing, model_name)
-    if price is None:
-        return None
-    input_tokens = int(total_input_tokens or 0)
-    output_tokens = int(total_output_tokens or 0)
-    if input_tokens == 0 and output_tokens == 0:
-        return None
-    return _token_cost(input_tokens, output_tokens, price)
+            if price is not None:
+                model_cost = _token_cost(int(usage.get("input_tokens") or 0), int(usage.get("output_tokens") or 0), price, int(usage.get("cache_read_tokens") or 0))
+                entry["cost"] = (entry["cost"] or 0.0) + model_cost
+    elif row.model_name and run_tokens > 0:
+        # Legacy rows predating token_usage_by_model: fall back to the run's model.
+        entry = by_model.setdefault(row.model_name, _new_model_entry())
+        entry["tokens"] += run_tokens
+        entry["runs"] += 1
+        if cost is not None:
+            entry["cost"] = (entry["cost"] or 0.0) + cost
 
 
 # ---------------------------------------------------------------------------
@@ -275,39 +280,60 @@ async def console_stats(request: Request) -> ConsoleStatsResponse:
     run_where = (RunRow.user_id == user_id,) if user_id else ()
     thread_where = (ThreadMetaRow.user_id == user_id,) if user_id else ()
 
+    rollup_where = (RunUsageHourlyRow.user_id == user_id,) if user_id else ()
+
     pricing = _build_pricing_map()
+    rollup_current = await RunUsageRepository(sf).ensure_current(pricing, user_id=user_id)
 
     async with sf() as session:
-        total_runs = await session.scalar(select(func.count()).select_from(RunRow).where(*run_where)) or 0
-        active_runs = await session.scalar(select(func.count()).select_from(RunRow).where(RunRow.status.in_(_ACTIVE_STATUSES), *run_where)) or 0
-        failed_runs = await session.scalar(select(func.count()).select_from(RunRow).where(RunRow.status.in_(_FAILED_STATUSES), *run_where)) or 0
-        total_tokens = await session.scalar(select(func.coalesce(func.sum(RunRow.total_tokens), 0)).where(*run_where)) or 0
-        total_threads = await session.scalar(select(func.count()).select_from(ThreadMetaRow).where(*thread_where)) or 0
-
-        total_cost: float | None = None
-        if pricing:
-            cost_rows = (
+        finished_runs, finished_tokens, finished_cost, failed_runs = 0, 0, 0.0, 0
+        if rollup_current:
+            finished_runs, finished_tokens, finished_cost = (
                 await session.execute(
                     select(
-                        RunRow.model_name,
-                        RunRow.total_input_tokens,
-                        RunRow.total_output_tokens,
-                        RunRow.token_usage_by_model,
-                    ).where(*run_where)
-                )
-            ).all()
-            cost_sum = 0.0
-            for model_name, input_tokens, output_tokens, usage_map in cost_rows:
-                cost = _run_cost(
-                    pricing,
-                    model_name=model_name,
-                    total_input_tokens=input_tokens,
-                    total_output_tokens=output_tokens,
-                    token_usage_by_model=usage_map,
+                        func.coalesce(func.sum(RunUsageHourlyRow.run_count), 0),
+                        func.coalesce(func.sum(RunUsageHourlyRow.total_tokens), 0),
+                        func.coalesce(func.sum(RunUsageHourlyRow.cost), 0.0),
+                    ).where(*rollup_where)
                 )
-                if cost is not None:
-                    cost_sum += cost
-            total_cost = round(cost_sum, 6)
+            ).one()
+            failed_runs = await session.scalar(select(func.coalesce(func.sum(RunUsageHourlyRow.run_count), 0)).where(RunUsageHourlyRow.status.in_(_FAILED_STATUSES), *rollup_where)) or 0
+        # Active runs are not rolled up yet; read them live (and every run
+        # while the rollup is being rebuilt).
+        live_where = (RunRow.status.in_(_ACTIVE_STATUSES),) if rollup_current else ()
+        live_rows = (
+            await session.execute(
+                select(
+                    RunRow.status,
+                    RunRow.model_name,
+                    RunRow.total_tokens,
+                    RunRow.total_input_tokens,
+                    RunRow.total_output_tokens,
+                    RunRow.token_usage_by_model,
+                ).where(*live_where, *run_where)
+            )
+        ).all()
+        total_threads = await session.scalar(select(func.count()).select_from(ThreadMetaRow).where(*thread_where)) or 0
+
+    active_runs = sum(1 for row in live_rows if row.status in _ACTIVE_STATUSES)
+    if not rollup_current:
+        failed_runs = sum(1 for row in live_rows if row.status in _FAILED_STATUSES)
+    total_runs = int(finished_runs) + len(live_rows)
+    total_tokens = int(finished_tokens) + sum(row.total_tokens or 0 for row in live_rows)
+    total_cost: float | None = None
+    if pricing:
+        cost_sum = float(finished_cost)
+        for row in live_rows:
+            cost = _run_cost(
+                pricing,
+                model_name=row.model_name,
+                total_input_tokens=row.total_input_tokens,
+                total_output_tokens=row.total_output_tokens,
+                token_usage_by_model=row.token_usage_by_model,
+            )
+            if cost is not None:
+                cost_sum += cost
+        total_cost = round(cost_sum, 6)
 
     try:
         # Filesystem scan; resolves the effective user internally (AuthMiddleware
@@ -415,78 +441,75 @@ async def console_usage(
     start_local = today_local - timedelta(days=days - 1)
     window_start_utc = datetime.combine(start_local, time.min, tzinfo=UTC) - tz_delta
 
-    stmt = select(RunRow).where(RunRow.created_at >= window_start_utc)
+    # Hours that straddle a local midnight (every hour, for offsets that are
+    # not whole hours, contains at most one) cannot be split from the rollup;
+    # their finished runs are read raw instead.
+    split_hours: set[datetime] = set()
+    if tz_offset_minutes % 60:
+        split_hours = {_floor_hour(datetime.combine(start_local + timedelta(days=i), time.min, tzinfo=UTC) - tz_delta) for i in range(days + 1)}
+
+    # Status/agent dimensions are not needed here; collapse them in SQL.
+    rollup_stmt = (
+        select(
+            RunUsageHourlyRow.bucket_start,
+            RunUsageHourlyRow.model_name,
+            *(func.sum(getattr(RunUsageHourlyRow, column)).label(column) for column in _USAGE_SUM_COLUMNS),
+            # SUM ignores NULLs, so an all-unpriced model keeps a null cost.
+            func.sum(RunUsageHourlyRow.model_cost).label("model_cost"),
+        )
+        .where(RunUsageHourlyRow.bucket_start >= _floor_hour(window_start_utc))
+        .group_by(RunUsageHourlyRow.bucket_start, RunUsageHourlyRow.model_name)
+    )
+    raw_stmt = select(RunRow).where(RunRow.created_at >= window_start_utc)
     if user_id:
-        stmt = stmt.where(RunRow.user_id == user_id)
-
-    async with sf() as session:
-        rows = (await session.execute(stmt)).scalars().all()
-
-    day_buckets: dict[str, ConsoleUsageDay] = {}
-    for i in range(days):
-        d = (start_local + timedelta(days=i)).isoformat()
-        day_buckets[d] = ConsoleUsageDay(date=d)
+        rollup_stmt = rollup_stmt.where(RunUsageHourlyRow.user_id == user_id)
+        raw_stmt = raw_stmt.where(RunRow.user_id == user_id)
 
     pricing = _build_pricing_map()
-    by_model: dict[str, ConsoleUsageModelBreakdown] = {}
-    total_tokens = 0
-    total_runs = 0
-    total_cost = 0.0 if pricing else None
-    for row in rows:
+    rollup_current = await RunUsageRepository(sf).ensure_current(pricing, user_id=user_id)
+    if rollup_current:
+        raw_stmt = raw_stmt.where(
+            or_(
+                RunRow.status.in_(_ACTIVE_STATUSES),
+                *(and_(RunRow.created_at >= hour, RunRow.created_at < hour + timedelta(hours=1)) for hour in split_hours),
+            )
+        )
+
+    async with sf() as session:
+        # While the rollup is rebuilt every run in the window is read raw.
+        rollup_rows = (await session.execute(rollup_stmt)).tuples().all() if rollup_current else []
+        raw_rows = (await session.execute(raw_stmt)).scalars().all()
+
+    day_buckets = {(start_local + timedelta(days=i)).isoformat(): _new_day() for i in range(days)}
+    by_model: dict[str, dict[str, Any]] = {}
+    day_of_hour: dict[datetime, str] = {}
+    for bucket_start, model_name, *sums in rollup_rows:
+        local_date = day_of_hour.get(bucket_start)
+        if local_date is None:
+            utc_start = _as_utc(bucket_start)
+            local_date = day_of_hour[bucket_start] = "" if utc_start in split_hours else (utc_start + tz_delta).date().isoformat()
+        bucket = day_buckets.get(local_date)
+        if bucket is not None:
+            _add_rollup_row(model_name, sums, bucket, by_model)
+    for row in raw_rows:
         created = _as_utc(row.created_at)
         if created is None:
             continue
-        local_date = ((created + tz_delta).date()).isoformat()
-        bucket = day_buckets.get(local_date)
+        bucket = day_buckets.get((created + tz_delta).date().isoformat())
         if bucket is None:
             # Row sits just outside the local window (UTC-window over-fetch); skip.
             continue
-        run_tokens = row.total_tokens or 0
-        bucket.total_tokens += run_tokens
-        bucket.input_tokens += row.total_input_tokens or 0
-        bucket.output_tokens += row.total_output_tokens or 0
-        bucket.runs += 1
-        total_tokens += run_tokens
-        total_runs += 1
-
-        run_cost = _run_cost(
-            pricing,
-            model_name=row.model_name,
-            total_input_tokens=row.total_input_tokens,
-            total_output_tokens=row.total_output_tokens,
-            token_usage_by_model=row.token_usage_by_model,
-        )
-        if run_cost is not None and total_cost is not None:
-            bucket.cost = round(bucket.cost + run_cost, 6)
-            total_cost = round(total_cost + run_cost, 6)
-
-        usage_map = row.token_usage_by_model or {}
-        if isinstance(usage_map, dict) and usage_map:
-            for model, usage in usage_map.items():
-                entry = by_model.setdefault(model, ConsoleUsageModelBreakdown())
-                entry.runs += 1
-                if not isinstance(usage, dict):
-                    continue
-                entry.tokens += int(usage.get("total_tokens", 0) or 0)
-                entry.input_tokens += int(usage.get("input_tokens") or 0)
-                entry.cache_read_tokens += int(usage.get("cache_read_tokens") or 0)
-                price = _lookup_pricing(pricing, model)
-                if price is not None:
-                    model_cost = _token_cost(int(usage.get("input_tokens") or 0), int(usage.get("output_tokens") or 0), price, int(usage.get("cache_read_tokens") or 0))
-                    entry.cost = round((entry.cost or 0.0) + model_cost, 6)
-        elif row.model_name and run_tokens > 0:
-            # Legacy rows predating token_usage_by_model: fall back to the run's model.
-            entry = by_model.setdefault(row.model_name, ConsoleUsageModelBreakdown())
-            entry.tokens += run_tokens
-            entry.runs += 1
-            if run_cost is not None:
-                entry.cost = round((entry.cost or 0.0) + run_cost, 6)
+        _add_run_row(row, pricing, bucket, by_model)
+
+    for entry in by_model.values():
+        if entry["cost"] is not None:
+            entry["cost"] = round(entry["cost"], 6)
 
     return ConsoleUsageResponse(
-        days=list(day_buckets.values()),
-        by_model=by_model,
-        total_tokens=total_tokens,
-        total_runs=total_runs,
-        total_cost=total_cost,
+        days=[ConsoleUsageDay(date=d, **{**bucket, "cost": round(bucket["cost"], 6)}) for d, bucket in day_buckets.items()],
+        by_model={model: ConsoleUsageModelBreakdown(**entry) for model, entry in by_model.items()},
+        total_tokens=sum(d["total_tokens"] for d in day_buckets.values()),
+        total_runs=sum(d["runs"] for d in day_buckets.values()),
+        total_cost=round(sum(d["cost"] for d in day_buckets.values()), 6) if pricing else None,
         currency=_pricing_currency(pricing),
     )
@@ -13,6 +13,10 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api", tags=["input-polish"])
 
+# Bump when the system instruction or ``_clean_rewritten_text`` changes, so
+# cached rewrites produced under the old prompt are never served.
+_PROMPT_VERSION = "1"
+
 
 class InputPolishRequest(BaseModel):
     text: str = Field(..., description="Draft text currently shown in the composer")
@@ -92,6 +96,8 @@ async def polish_input(
             app_config=config,
             model_name=model_name,
             thread_id=body.thread_id,
+            cache_version=_PROMPT_VERSION,
+            cache_validator=lambda raw_text: bool(_clean_rewritten_text(raw_text)),
         )
         rewritten = _clean_rewritten_text(raw)
     except Exception as exc:
@@ -0,0 +1,31 @@
+"""Prometheus-format latency metrics (``metrics`` in ``config.yaml``)."""
+
+import secrets
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+
+from app.gateway.deps import get_config
+from deerflow.config.app_config import AppConfig
+from deerflow.runtime.metrics import metrics_enabled, render_prometheus
+
+router = APIRouter(tags=["health"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics(request: Request, config: AppConfig = Depends(get_config)) -> Response:
+    """Latency histograms for middleware hooks, tools, model calls and persistence.
+
+    Public like ``/health`` so Prometheus can scrape it without a session;
+    set ``metrics.auth_token`` to require ``Authorization: Bearer <token>``.
+    Responds 404 while ``metrics.enabled`` is off.
+    """
+    if not metrics_enabled():
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    token = getattr(getattr(config, "metrics", None), "auth_token", None)
+    if token:
+        supplied = request.headers.get("authorization", "")
+        if not secrets.compare_digest(supplied.encode(), f"Bearer {token}".encode()):
+            raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return Response(render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
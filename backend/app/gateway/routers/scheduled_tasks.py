@@ -35,6 +35,22 @@ def _ensure_task_mutable(task: dict[str, Any]) -> None:
         )
 
 
+def _local_scheduler(request: Request):
+    """This worker's scheduler, or ``None`` when it is disabled or unavailable."""
+    state = getattr(getattr(request, "app", None), "state", None)
+    return getattr(state, "scheduled_task_service", None)
+
+
+def _notify_scheduler(request: Request, task: dict[str, Any]) -> None:
+    """Re-plan *task* on this worker's scheduler so edits take effect immediately.
+
+    Other workers pick the change up on their reconciliation poll.
+    """
+    service = _local_scheduler(request)
+    if service is not None:
+        service.task_changed(task)
+
+
 class ScheduledTaskCreateRequest(BaseModel):
     thread_id: str | None = None
     context_mode: str = "fresh_thread_per_run"
@@ -108,7 +124,7 @@ async def create_scheduled_task(request: Request, body: ScheduledTaskCreateReque
             detail=(f"once schedule must be at least {config.scheduler.min_once_delay_seconds} seconds in the future"),
         )
 
-    return await repo.create(
+    created = await repo.create(
         task_id=f"task-{uuid.uuid4().hex}",
         user_id=str(user.id),
         thread_id=body.thread_id,
@@ -121,6 +137,8 @@ async def create_scheduled_task(request: Request, body: ScheduledTaskCreateReque
         timezone=body.timezone,
         next_run_at=next_run_at,
     )
+    _notify_scheduler(request, created)
+    return created
 
 
 @router.get("/scheduled-tasks/{task_id}")
@@ -212,6 +230,8 @@ async def update_scheduled_task(task_id: str, request: Request, body: ScheduledT
         user_id=str(user.id),
         updates=updates,
     )
+    if updated is not None:
+        _notify_scheduler(request, updated)
     return updated
 
 
@@ -229,6 +249,7 @@ async def pause_scheduled_task(task_id: str, request: Request):
     updated = await repo.update(task_id, user_id=str(user.id), updates={"status": "paused"})
     if updated is None:
         raise HTTPException(status_code=404, detail="Scheduled task not found")
+    _notify_scheduler(request, updated)
     return updated
 
 
@@ -246,6 +267,7 @@ async def resume_scheduled_task(task_id: str, request: Request):
     updated = await repo.update(task_id, user_id=str(user.id), updates={"status": "enabled"})
     if updated is None:
         raise HTTPException(status_code=404, detail="Scheduled task not found")
+    _notify_scheduler(request, updated)
     return updated
 
 
@@ -278,6 +300,9 @@ async def delete_scheduled_task(task_id: str, request: Request):
     deleted = await repo.delete(task_id, user_id=str(user.id))
     if not deleted:
         raise HTTPException(status_code=404, detail="Scheduled task not found")
+    service = _local_scheduler(request)
+    if service is not None:
+        service.task_removed(task_id)
     return {"id": task_id, "deleted": deleted}
 
 
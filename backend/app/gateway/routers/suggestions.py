@@ -14,6 +14,10 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api", tags=["suggestions"])
 
+# Bump when the prompt below or the parsing of the raw response changes, so
+# cached answers produced under the old prompt are never served.
+_PROMPT_VERSION = "1"
+
 
 class SuggestionMessage(BaseModel):
     role: str = Field(..., description="Message role: user|assistant")
@@ -131,6 +135,8 @@ async def generate_suggestions(
             app_config=config,
             model_name=body.model_name,
             thread_id=thread_id,
+            cache_version=_PROMPT_VERSION,
+            cache_validator=lambda text: bool(_parse_json_string_list(text)),
         )
         suggestions = _parse_json_string_list(raw) or []
         cleaned = [s.replace("\n", " ").strip() for s in suggestions if s.strip()]
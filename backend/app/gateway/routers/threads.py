@@ -14,7 +14,6 @@ from __future__ import annotations
 
 import copy
 import logging
-import shutil
 import uuid
 from pathlib import Path
 from typing import Any
@@ -47,6 +46,8 @@ from deerflow.runtime.goal import (
 )
 from deerflow.runtime.runs.worker import valid_duration_entry
 from deerflow.runtime.user_context import get_effective_user_id
+from deerflow.uploads.blob_store import UploadBlobStore
+from deerflow.utils.file_clone import clone_tree
 from deerflow.utils.file_io import run_file_io
 from deerflow.utils.time import coerce_iso, now_iso
 
@@ -185,13 +186,25 @@ def _ignore_branch_user_data(directory: str, names: list[str]) -> set[str]:
     return ignored
 
 
-def _copy_branch_user_data_sync(paths: Paths, source_thread_id: str, target_thread_id: str, *, user_id: str) -> str:
+def _branch_hardlinks_enabled() -> bool:
+    from deerflow.config.app_config import get_app_config
+
+    try:
+        return bool(get_app_config().sandbox.branch_hardlinks)
+    except FileNotFoundError:
+        return False
+
+
+def _copy_branch_user_data_sync(paths: Paths, source_thread_id: str, target_thread_id: str, *, user_id: str, allow_hardlinks: bool = False) -> str:
     source = paths.sandbox_user_data_dir(source_thread_id, user_id=user_id)
     target = paths.sandbox_user_data_dir(target_thread_id, user_id=user_id)
     if not source.exists():
         return "not_found"
 
-    shutil.copytree(source, target, ignore=_ignore_branch_user_data, dirs_exist_ok=True)
+    # Files are reflinked where the filesystem supports it, so a branch
+    # shares the parent's data blocks until either side writes.
+    methods = clone_tree(source, target, ignore=_ignore_branch_user_data, allow_hardlinks=allow_hardlinks)
+    logger.debug("Cloned user-data for branch %s -> %s: %s", sanitize_log_param(source_thread_id), sanitize_log_param(target_thread_id), dict(methods))
     return "current_thread_best_effort"
 
 
@@ -199,7 +212,8 @@ async def _copy_branch_user_data(source_thread_id: str, target_thread_id: str) -
     paths = get_paths()
     user_id = get_effective_user_id()
     try:
-        return await run_file_io(_copy_branch_user_data_sync, paths, source_thread_id, target_thread_id, user_id=user_id)
+        allow_hardlinks = _branch_hardlinks_enabled()
+        return await run_file_io(_copy_branch_user_data_sync, paths, source_thread_id, target_thread_id, user_id=user_id, allow_hardlinks=allow_hardlinks)
     except Exception:
         logger.warning(
             "Failed to copy user-data for branch %s -> %s",
@@ -397,11 +411,23 @@ class ThreadBranchResponse(BaseModel):
 # ---------------------------------------------------------------------------
 
 
+def _release_thread_upload_blobs(path_manager: Paths, thread_id: str, user_id: str) -> None:
+    """Drop the thread's references in the user's ``uploads.dedup`` blob store (best-effort)."""
+    try:
+        root = path_manager.user_upload_blobs_dir(user_id)
+        if root.exists():
+            UploadBlobStore(root).release_thread(thread_id)
+    except Exception:
+        logger.warning("Failed to release upload blobs for thread %s", sanitize_log_param(thread_id), exc_info=True)
+
+
 def _delete_thread_data(thread_id: str, paths: Paths | None = None, *, user_id: str | None = None) -> ThreadDeleteResponse:
     """Delete local persisted filesystem data for a thread."""
     path_manager = paths or get_paths()
     try:
         path_manager.delete_thread_dir(thread_id, user_id=user_id)
+        if user_id is not None:
+            _release_thread_upload_blobs(path_manager, thread_id, user_id)
     except ValueError as exc:
         raise HTTPException(status_code=422, detail=str(exc)) from exc
     except FileNotFoundError:
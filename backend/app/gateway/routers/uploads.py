@@ -1,12 +1,13 @@
 """Upload router for handling file uploads."""
 
+import hashlib
 import logging
 import os
 import stat
 import tempfile
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import BinaryIO
+from typing import Any, BinaryIO
 
 from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile
 from pydantic import BaseModel, Field
@@ -16,7 +17,9 @@ from app.gateway.deps import get_config
 from deerflow.config.app_config import AppConfig
 from deerflow.config.paths import get_paths
 from deerflow.runtime.user_context import get_effective_user_id
+from deerflow.sandbox.bulk_sync import BULK_SYNC_MIN_FILES, push_tree
 from deerflow.sandbox.sandbox_provider import SandboxProvider, get_sandbox_provider
+from deerflow.uploads.blob_store import UploadBlobStore, get_upload_blob_store
 from deerflow.uploads.manager import (
     UPLOAD_STAGING_PREFIX,
     UPLOAD_STAGING_SUFFIX,
@@ -33,7 +36,7 @@ from deerflow.uploads.manager import (
     upload_virtual_path,
     validate_upload_destination,
 )
-from deerflow.utils.file_conversion import CONVERTIBLE_EXTENSIONS, convert_file_to_markdown
+from deerflow.utils.file_conversion import CONVERTIBLE_EXTENSIONS, convert_file_to_markdown, markdown_cache_key
 from deerflow.utils.file_io import run_file_io
 
 logger = logging.getLogger(__name__)
@@ -51,6 +54,8 @@ class _UploadTempFile:
     file_path: Path
     temp_path: Path
     handle: BinaryIO
+    # SHA-256 of the bytes written so far; keys the ``uploads.dedup`` blob store.
+    hasher: Any = field(default_factory=hashlib.sha256)
 
 
 class UploadedFileInfo(BaseModel):
@@ -199,6 +204,7 @@ def _prepare_upload_destination(uploads_dir: os.PathLike[str] | str, display_fil
 
 def _write_upload_chunk(upload_temp: _UploadTempFile, chunk: bytes) -> None:
     upload_temp.handle.write(chunk)
+    upload_temp.hasher.update(chunk)
 
 
 def _abort_upload_temp(upload_temp: _UploadTempFile) -> None:
@@ -223,6 +229,31 @@ def _commit_upload_temp(upload_temp: _UploadTempFile) -> None:
         raise
 
 
+def _commit_upload_blob(upload_temp: _UploadTempFile, blob_store: UploadBlobStore, thread_id: str) -> str:
+    upload_temp.handle.close()
+    digest = upload_temp.hasher.hexdigest()
+    try:
+        method = blob_store.add(thread_id, upload_temp.file_path.name, upload_temp.temp_path, digest, upload_temp.file_path)
+    except Exception:
+        try:
+            os.unlink(upload_temp.temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    logger.debug("Stored upload %s as blob %s (%s)", upload_temp.file_path.name, digest, method)
+    return digest
+
+
+def _release_upload_blobs(blob_store: UploadBlobStore | None, thread_id: str, filenames: list[str]) -> None:
+    if blob_store is None:
+        return
+    for filename in filenames:
+        try:
+            blob_store.release(thread_id, filename)
+        except Exception:
+            logger.warning("Failed to release upload blob for %s after rejected request", filename, exc_info=True)
+
+
 def _make_uploaded_paths_sandbox_readable(paths: list[os.PathLike[str] | str]) -> None:
     for file_path in paths:
         _make_file_sandbox_readable(file_path)
@@ -233,6 +264,12 @@ def _sync_upload_to_sandbox(sandbox, file_path: os.PathLike[str] | str, virtual_
     sandbox.update_file(virtual_path, Path(file_path).read_bytes())
 
 
+def _bulk_sync_uploads_to_sandbox(sandbox, uploads_dir: os.PathLike[str] | str, file_paths: list[os.PathLike[str] | str]) -> None:
+    for file_path in file_paths:
+        _make_file_sandbox_writable(file_path)
+    push_tree(sandbox, Path(uploads_dir), upload_virtual_path("").rstrip("/"), only=[Path(file_path).name for file_path in file_paths])
+
+
 def _list_uploaded_files_for_thread(thread_id: str, user_id: str) -> dict:
     uploads_dir = get_uploads_dir(thread_id, user_id=user_id)
     result = list_files_in_dir(uploads_dir)
@@ -246,7 +283,13 @@ def _list_uploaded_files_for_thread(thread_id: str, user_id: str) -> dict:
 
 def _delete_uploaded_file_for_thread(thread_id: str, filename: str, user_id: str) -> dict:
     uploads_dir = get_uploads_dir(thread_id, user_id=user_id)
-    return delete_file_safe(uploads_dir, filename, convertible_extensions=CONVERTIBLE_EXTENSIONS)
+    result = delete_file_safe(uploads_dir, filename, convertible_extensions=CONVERTIBLE_EXTENSIONS)
+    # Runs whether or not dedup is enabled now: the file may have been stored
+    # while it was. Unknown names are a no-op.
+    blob_store = get_upload_blob_store(user_id)
+    if blob_store.root.exists():
+        blob_store.release(thread_id, Path(filename).name)
+    return result
 
 
 async def _write_upload_file_with_limits(
@@ -257,8 +300,11 @@ async def _write_upload_file_with_limits(
     max_single_file_size: int,
     max_total_size: int,
     total_size: int,
-) -> tuple[os.PathLike[str] | str, int, int]:
+    blob_store: UploadBlobStore | None = None,
+    thread_id: str | None = None,
+) -> tuple[os.PathLike[str] | str, int, int, str | None]:
     file_size = 0
+    digest = None
     upload_temp: _UploadTempFile | None = None
     try:
         upload_temp = await run_file_io(_prepare_upload_destination, uploads_dir, display_filename)
@@ -271,24 +317,22 @@ async def _write_upload_file_with_limits(
                 raise HTTPException(status_code=413, detail="Total upload size too large")
             await run_file_io(_write_upload_chunk, upload_temp, chunk)
 
-        await run_file_io(_commit_upload_temp, upload_temp)
+        if blob_store is not None and thread_id is not None:
+            digest = await run_file_io(_commit_upload_blob, upload_temp, blob_store, thread_id)
+        else:
+            await run_file_io(_commit_upload_temp, upload_temp)
         file_path = upload_temp.file_path
         upload_temp = None
     except Exception:
         if upload_temp is not None:
             await run_file_io(_abort_upload_temp, upload_temp)
         raise
-    return file_path, file_size, total_size
-
+    return file_path, file_size, total_size, digest
 
-def _auto_convert_documents_enabled(app_config: AppConfig) -> bool:
-    """Return whether automatic host-side document conversion is enabled.
 
-    The secure default is disabled unless an operator explicitly opts in via
-    uploads.auto_convert_documents in config.yaml.
-    """
+def _uploads_flag_enabled(app_config: AppConfig, key: str) -> bool:
     try:
-        raw = _get_uploads_config_value(app_config, "auto_convert_documents", False)
+        raw = _get_uploads_config_value(app_config, key, False)
         if isinstance(raw, str):
             return raw.strip().lower() in {"1", "true", "yes", "on"}
         return bool(raw)
@@ -296,6 +340,42 @@ def _auto_convert_documents_enabled(app_config: AppConfig) -> bool:
         return False
 
 
+def _auto_convert_documents_enabled(app_config: AppConfig) -> bool:
+    """Return whether automatic host-side document conversion is enabled.
+
+    The secure default is disabled unless an operator explicitly opts in via
+    uploads.auto_convert_documents in config.yaml.
+    """
+    return _uploads_flag_enabled(app_config, "auto_convert_documents")
+
+
+def _get_upload_blob_store(app_config: AppConfig, user_id: str) -> UploadBlobStore | None:
+    """Return the user's dedup blob store when uploads.dedup is enabled.
+
+    Hardlinked thread files share their inode with the blob, so they are used
+    only with uploads.dedup_hardlinks; otherwise files are reflinked or copied.
+    """
+    if not _uploads_flag_enabled(app_config, "dedup"):
+        return None
+    return get_upload_blob_store(user_id, allow_hardlinks=_uploads_flag_enabled(app_config, "dedup_hardlinks"))
+
+
+async def _convert_upload_to_markdown(file_path: Path, md_output: Path, blob_store: UploadBlobStore | None, digest: str | None) -> Path | None:
+    """Convert an upload, reusing the blob store's cached conversion of the same bytes."""
+    if blob_store is None or digest is None:
+        return await convert_file_to_markdown(file_path, output_path=md_output)
+    key = markdown_cache_key(file_path)
+    if await run_file_io(blob_store.materialize_markdown, digest, key, md_output):
+        return md_output
+    md_path = await convert_file_to_markdown(file_path, output_path=md_output)
+    if md_path:
+        try:
+            await run_file_io(blob_store.store_markdown, digest, key, md_path)
+        except Exception:
+            logger.warning("Failed to cache converted markdown for %s", file_path.name, exc_info=True)
+    return md_path
+
+
 @router.post("", response_model=UploadResponse)
 @require_permission("threads", "write", owner_check=True, require_existing=False)
 async def upload_files(
@@ -320,6 +400,7 @@ async def upload_files(
     sandbox_uploads = uploads_dir
     uploaded_files = []
     written_paths = []
+    stored_filenames = []
     sandbox_sync_targets = []
     skipped_files = []
     total_size = 0
@@ -337,6 +418,7 @@ async def upload_files(
         if sandbox is None:
             raise HTTPException(status_code=500, detail="Failed to acquire sandbox")
     auto_convert_documents = _auto_convert_documents_enabled(config)
+    blob_store = _get_upload_blob_store(config, effective_user_id)
 
     for file in files:
         if not file.filename:
@@ -350,15 +432,19 @@ async def upload_files(
             continue
 
         try:
-            file_path, file_size, total_size = await _write_upload_file_with_limits(
+            file_path, file_size, total_size, digest = await _write_upload_file_with_limits(
                 file,
                 uploads_dir=uploads_dir,
                 display_filename=safe_filename,
                 max_single_file_size=limits.max_file_size,
                 max_total_size=limits.max_total_size,
                 total_size=total_size,
+                blob_store=blob_store,
+                thread_id=thread_id,
             )
             written_paths.append(file_path)
+            if digest is not None:
+                stored_filenames.append(file_path.name)
 
             virtual_path = upload_virtual_path(safe_filename)
 
@@ -385,7 +471,7 @@ async def upload_files(
                 provisional_md_name = Path(safe_filename).with_suffix(".md").name
                 unique_md_name = claim_unique_filename(provisional_md_name, seen_filenames)
                 md_output = file_path.with_name(unique_md_name)
-                md_path = await convert_file_to_markdown(file_path, output_path=md_output)
+                md_path = await _convert_upload_to_markdown(file_path, md_output, blob_store, digest)
                 if md_path:
                     written_paths.append(md_path)
                     md_virtual_path = upload_virtual_path(md_path.name)
@@ -407,6 +493,7 @@ async def upload_files(
 
         except HTTPException as e:
             await run_file_io(_cleanup_uploaded_paths, written_paths)
+            await run_file_io(_release_upload_blobs, blob_store, thread_id, stored_filenames)
             raise e
         except UnsafeUploadPathError as e:
             logger.warning("Skipping upload with unsafe destination %s: %s", file.filename, e)
@@ -415,6 +502,7 @@ async def upload_files(
         except Exception as e:
             logger.error(f"Failed to upload {file.filename}: {e}")
             await run_file_io(_cleanup_uploaded_paths, written_paths)
+            await run_file_io(_release_upload_blobs, blob_store, thread_id, stored_filenames)
             raise HTTPException(status_code=500, detail=f"Failed to upload {file.filename}: {str(e)}")
 
     # Uploaded files are created with 0o600 permissions (owner read/write only).
@@ -427,8 +515,11 @@ async def upload_files(
     await run_file_io(_make_uploaded_paths_sandbox_readable, written_paths)
 
     if sync_to_sandbox:
-        for file_path, virtual_path in sandbox_sync_targets:
-            await run_file_io(_sync_upload_to_sandbox, sandbox, file_path, virtual_path)
+        if len(sandbox_sync_targets) >= BULK_SYNC_MIN_FILES:
+            await run_file_io(_bulk_sync_uploads_to_sandbox, sandbox, uploads_dir, [file_path for file_path, _ in sandbox_sync_targets])
+        else:
+            for file_path, virtual_path in sandbox_sync_targets:
+                await run_file_io(_sync_upload_to_sandbox, sandbox, file_path, virtual_path)
 
     message = f"Successfully uploaded {len(uploaded_files)} file(s)"
     if skipped_files:
@@ -1,10 +1,28 @@
+"""Background scheduler for one-time and recurring (cron) agent runs.
+
+The service keeps a min-heap of upcoming ``next_run_at`` times and sleeps
+exactly until the earliest one, so cron occurrences fire on time without
+polling the database at a short interval. The heap is only a wake-up hint:
+every firing still goes through ``claim_due_tasks`` (``FOR UPDATE SKIP
+LOCKED`` on Postgres), which keeps claims exactly-once across workers.
+
+The heap is fed from three places: tasks this worker dispatches (their next
+occurrence), router notifications when a task is created, edited, paused or
+removed (:meth:`ScheduledTaskService.task_changed` /
+:meth:`ScheduledTaskService.task_removed`), and a slow reconciliation poll
+every ``poll_interval_seconds`` that reloads it from the database — the safety
+net for changes made by other workers and for reclaiming expired leases.
+"""
+
 from __future__ import annotations
 
 import asyncio
+import heapq
 import logging
 import socket
 import uuid
-from datetime import UTC, datetime
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
 from typing import Any, Literal
 
 from fastapi import HTTPException
@@ -25,6 +43,8 @@ class ScheduledTaskService:
         poll_interval_seconds: int,
         lease_seconds: int,
         max_concurrent_runs: int,
+        clock: Callable[[], datetime] | None = None,
+        due_window: int = 1024,
     ) -> None:
         self._task_repo = task_repo
         self._task_run_repo = task_run_repo
@@ -35,6 +55,80 @@ class ScheduledTaskService:
         self._lease_owner = f"{socket.gethostname()}:{uuid.uuid4().hex}"
         self._task: asyncio.Task | None = None
         self._stop = asyncio.Event()
+        self._clock = clock or (lambda: datetime.now(UTC))
+        # Min-heap of (due_at, task_id) with lazy deletion: an entry is live
+        # only while ``_due[task_id]`` still holds the same time.
+        self._heap: list[tuple[datetime, str]] = []
+        self._due: dict[str, datetime] = {}
+        self._due_window = due_window
+        self._wake = asyncio.Event()
+        # Set when the last claim was capped by ``max_concurrent_runs``: due
+        # tasks may remain unclaimed, so the next wake-up (a run finishing)
+        # must claim again even if nothing new is in the heap.
+        self._backlog = False
+
+    # ------------------------------------------------------------------
+    # Next-due tracking
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _parse_due(value: datetime | str | None) -> datetime | None:
+        if value is None:
+            return None
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        return value.replace(tzinfo=UTC) if value.tzinfo is None else value.astimezone(UTC)
+
+    def _track(self, task_id: str, due_at: datetime | str | None) -> None:
+        due = self._parse_due(due_at)
+        if due is None:
+            self._due.pop(task_id, None)
+            return
+        if self._due.get(task_id) == due:
+            return
+        self._due[task_id] = due
+        heapq.heappush(self._heap, (due, task_id))
+
+    def _next_due(self) -> datetime | None:
+        while self._heap:
+            due, task_id = self._heap[0]
+            if self._due.get(task_id) == due:
+                return due
+            heapq.heappop(self._heap)
+        return None
+
+    def _pop_due(self, now: datetime) -> int:
+        popped = 0
+        while (due := self._next_due()) is not None and due <= now:
+            _, task_id = heapq.heappop(self._heap)
+            del self._due[task_id]
+            popped += 1
+        return popped
+
+    def task_changed(self, task: dict[str, Any]) -> None:
+        """Re-plan *task* after the router created or edited it.
+
+        Only ``enabled`` tasks are armed; anything else (paused, terminal,
+        running) is dropped from the plan. Wakes the loop so a new earliest
+        time takes effect immediately.
+        """
+        if task.get("status") == "enabled":
+            self._track(task["id"], task.get("next_run_at"))
+        else:
+            self._track(task["id"], None)
+        self._wake.set()
+
+    def task_removed(self, task_id: str) -> None:
+        """Drop a deleted task from the plan."""
+        self._track(task_id, None)
+        self._wake.set()
+
+    async def reconcile(self) -> None:
+        """Reload the plan from the database (other workers' edits, lease expiry)."""
+        due_times = await self._task_repo.list_due_times(limit=self._due_window)
+        self._heap = [(self._parse_due(due), task_id) for task_id, due in due_times]
+        heapq.heapify(self._heap)
+        self._due = {task_id: due for due, task_id in self._heap}
 
     async def run_once(self, *, now: datetime) -> None:
         # ``max_concurrent_runs`` is a global cap on active scheduled runs, not
@@ -43,6 +137,7 @@ class ScheduledTaskService:
         active = await self._task_run_repo.count_active_runs()
         budget = self._max_concurrent_runs - active
         if budget <= 0:
+            self._backlog = True
             return
         claimed = await self._task_repo.claim_due_tasks(
             now=now,
@@ -50,6 +145,7 @@ class ScheduledTaskService:
             lease_seconds=self._lease_seconds,
             limit=budget,
         )
+        self._backlog = len(claimed) >= budget
         for task in claimed:
             await self.dispatch_task(task, now=now, trigger="scheduled")
 
@@ -166,6 +262,7 @@ class ScheduledTaskService:
                 # completion hook may have already finalized a `once` task.
                 protect_terminal=True,
             )
+            self._track(task["id"], next_at if task_status == "enabled" else None)
             return {
                 "outcome": "launched",
                 "task_run_id": task_run_id,
@@ -201,6 +298,7 @@ class ScheduledTaskService:
                 last_error=str(exc),
                 increment_run_count=False,
             )
+            self._track(task["id"], next_at if task_status == "enabled" else None)
             return {
                 "outcome": "conflict" if self._is_overlap_conflict(exc) else "failed",
                 "task_run_id": task_run_id,
@@ -231,9 +329,10 @@ class ScheduledTaskService:
             started_at=now,
             finished_at=now,
         )
+        status = self._task_status_for_skip(task)
         await self._task_repo.update_after_launch(
             task["id"],
-            status=self._task_status_for_skip(task),
+            status=status,
             next_run_at=next_at,
             last_run_at=task.get("last_run_at"),
             last_run_id=task.get("last_run_id"),
@@ -241,6 +340,7 @@ class ScheduledTaskService:
             last_error=error if task["schedule_type"] == "once" else None,
             increment_run_count=False,
         )
+        self._track(task["id"], next_at if status == "enabled" else None)
         return {
             "outcome": "skipped",
             "task_run_id": task_run_id,
@@ -274,6 +374,9 @@ class ScheduledTaskService:
             error = record.error
         if terminal_status is None:
             return
+        # A finished run frees a slot under max_concurrent_runs.
+        if self._backlog:
+            self._wake.set()
 
         await self._task_run_repo.update_status(
             task_run_id,
@@ -330,17 +433,41 @@ class ScheduledTaskService:
         self._task = None
 
     async def _run_loop(self) -> None:
+        next_reconcile = self._clock()
         while not self._stop.is_set():
+            # Cleared before the work below so a notification that arrives
+            # while we claim is not lost: it makes the sleep return at once.
+            self._wake.clear()
+            now = self._clock()
             try:
-                await self.run_once(now=datetime.now(UTC))
+                if now >= next_reconcile:
+                    next_reconcile = now + timedelta(seconds=self._poll_interval_seconds)
+                    await self.reconcile()
+                    if len(self._due) >= self._due_window:
+                        # The plan only holds the earliest ``due_window``
+                        # tasks; reload once its horizon is reached.
+                        next_reconcile = min(next_reconcile, max(self._due.values()))
+                    self._pop_due(now)
+                    await self.run_once(now=now)
+                elif self._pop_due(now) or self._backlog:
+                    await self.run_once(now=now)
             except Exception:
                 # A transient DB error (e.g. SQLite "database is locked") must
-                # not kill the poller task for the rest of the process life.
-                logger.exception("Scheduled task poll failed; retrying next interval")
-            try:
-                await asyncio.wait_for(
-                    self._stop.wait(),
-                    timeout=self._poll_interval_seconds,
-                )
-            except TimeoutError:
-                continue
+                # not kill the scheduler task for the rest of the process life.
+                logger.exception("Scheduled task poll failed; retrying at the next due time")
+
+            wake_at = next_reconcile
+            due = self._next_due()
+            if due is not None and due < wake_at:
+                wake_at = due
+            await self._sleep_until(wake_at)
+
+    async def _sleep_until(self, wake_at: datetime) -> None:
+        """Sleep until *wake_at*, a router notification, or stop()."""
+        timeout = max((wake_at - self._clock()).total_seconds(), 0.0)
+        waiters = {asyncio.ensure_future(self._stop.wait()), asyncio.ensure_future(self._wake.wait())}
+        try:
+            await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
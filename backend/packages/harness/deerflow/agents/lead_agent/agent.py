@@ -51,6 +51,7 @@ from deerflow.config.app_config import AppConfig, get_app_config
 from deerflow.config.memory_config import should_use_memory_tools
 from deerflow.config.subagents_config import DEFAULT_MAX_TOTAL_SUBAGENTS_PER_RUN
 from deerflow.models import create_chat_model
+from deerflow.runtime.metrics import instrument_middlewares
 from deerflow.skills.types import Skill
 from deerflow.tracing import build_tracing_callbacks
 
@@ -424,7 +425,8 @@ def build_middlewares(
 
     # ClarificationMiddleware should always be last
     middlewares.append(ClarificationMiddleware())
-    return middlewares
+    # Per-hook latency histograms (metrics.enabled); a no-op otherwise.
+    return instrument_middlewares(middlewares)
 
 
 def _available_skill_names(agent_config, is_bootstrap: bool) -> set[str] | None:
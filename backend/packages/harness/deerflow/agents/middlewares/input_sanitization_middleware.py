@@ -1,6 +1,6 @@
 """Input guardrail middleware for prompt-injection defense (issue #3630).
 
-Escapes blocked XML-like tags in the last genuine user message (e.g.
+Escapes blocked XML-like tags in genuine user messages (e.g.
 ``<system>`` → ``&lt;system&gt;``) so they render as literal text instead
 of structured-context markers.  This preserves the user's intent ("how do
 I use DeerFlow's <think> tag?") while neutralizing injection attempts —
@@ -267,16 +267,71 @@ class InputSanitizationMiddleware(AgentMiddleware[AgentState]):
         result.extend(original_content[last + 1 :])
         return result
 
+    def _sanitize_message(self, msg: HumanMessage) -> HumanMessage | None:
+        """Return the sanitized copy of one genuine user message, or None if unchanged."""
+        content = msg.content
+        text_content, text_blocks = self._extract_text_from_content(content)
+
+        # No text at all (e.g. image-only message) — pass through
+        if not text_content and not isinstance(content, str):
+            logger.debug("_process_request: no text content in message — passing through")
+            return None
+
+        processed = _check_user_content(text_content)
+
+        if processed == text_content:
+            # Already wrapped — no override needed
+            return None
+
+        if text_blocks:
+            new_content = self._rebuild_content(content, processed, text_blocks)
+        else:
+            new_content = processed
+
+        # Preserve the pre-sanitization user text so downstream consumers that
+        # must see the genuine input (slash skill activation, regenerate) can
+        # recover it after the BEGIN/END wrapping. Keep a valid value set by
+        # UploadsMiddleware or an IM channel, but repair malformed metadata so
+        # persistence never falls back to the wrapped model-facing content.
+        preserved_kwargs = dict(msg.additional_kwargs or {})
+        original_user_content = preserved_kwargs.get(ORIGINAL_USER_CONTENT_KEY)
+        if not isinstance(original_user_content, str):
+            if ORIGINAL_USER_CONTENT_KEY in preserved_kwargs:
+                logger.warning(
+                    "InputSanitizationMiddleware replaced non-string %s metadata: type=%s",
+                    ORIGINAL_USER_CONTENT_KEY,
+                    type(original_user_content).__name__,
+                )
+            preserved_kwargs[ORIGINAL_USER_CONTENT_KEY] = message_content_to_text(content)
+        logger.debug(
+            "InputSanitizationMiddleware: original=%r -> processed=%r",
+            content if isinstance(content, str) else "[content-blocks]",
+            processed,
+        )
+        return HumanMessage(
+            content=new_content,
+            id=msg.id,
+            name=msg.name,
+            additional_kwargs=preserved_kwargs,
+        )
+
     def _process_request(self, request: ModelRequest) -> ModelRequest:
-        """Return a request with the last genuine user message sanitized.
+        """Return a request with every genuine user message sanitized.
 
         Blocked tags are HTML-escaped (not rejected) so the user's intent is
         preserved while the tags lose their semantic significance. Transformation
         is temporary — the original request is never mutated.
+
+        Earlier user turns are sanitized too, not just the latest one: the
+        transformation is deterministic, so each user message reaches the
+        model with the same bytes on every call. Wrapping only the latest
+        message would rewrite the previous turn back to its raw form as soon
+        as a new user message arrived, invalidating the provider's prefix
+        cache from that turn onward.
         """
         messages = list(request.messages)
-        for i in range(len(messages) - 1, -1, -1):
-            msg = messages[i]
+        changed = False
+        for i, msg in enumerate(messages):
             if not _is_genuine_user_message(msg):
                 if isinstance(msg, HumanMessage):
                     logger.debug(
@@ -287,53 +342,11 @@ class InputSanitizationMiddleware(AgentMiddleware[AgentState]):
                         msg.content,
                     )
                 continue
-            content = msg.content
-            logger.debug("_process_request: found genuine user message at pos=%d content=%.120r", i, content)
-
-            text_content, text_blocks = self._extract_text_from_content(content)
-
-            # No text at all (e.g. image-only message) — pass through
-            if not text_content and not isinstance(content, str):
-                logger.debug("_process_request: no text content in message — passing through")
-                return request
-
-            processed = _check_user_content(text_content)
-
-            if processed == text_content:
-                # Already wrapped — no override needed
-                return request
-
-            if text_blocks:
-                new_content = self._rebuild_content(content, processed, text_blocks)
-            else:
-                new_content = processed
-
-            # Preserve the pre-sanitization user text so downstream consumers that
-            # must see the genuine input (slash skill activation, regenerate) can
-            # recover it after the BEGIN/END wrapping. Keep a valid value set by
-            # UploadsMiddleware or an IM channel, but repair malformed metadata so
-            # persistence never falls back to the wrapped model-facing content.
-            preserved_kwargs = dict(msg.additional_kwargs or {})
-            original_user_content = preserved_kwargs.get(ORIGINAL_USER_CONTENT_KEY)
-            if not isinstance(original_user_content, str):
-                if ORIGINAL_USER_CONTENT_KEY in preserved_kwargs:
-                    logger.warning(
-                        "InputSanitizationMiddleware replaced non-string %s metadata: type=%s",
-                        ORIGINAL_USER_CONTENT_KEY,
-                        type(original_user_content).__name__,
-                    )
-                preserved_kwargs[ORIGINAL_USER_CONTENT_KEY] = message_content_to_text(content)
-            messages[i] = HumanMessage(
-                content=new_content,
-                id=msg.id,
-                name=msg.name,
-                additional_kwargs=preserved_kwargs,
-            )
-            logger.debug(
-                "InputSanitizationMiddleware: original=%r -> processed=%r",
-                content if isinstance(content, str) else "[content-blocks]",
-                processed,
-            )
+            sanitized = self._sanitize_message(msg)
+            if sanitized is not None:
+                messages[i] = sanitized
+                changed = True
+        if changed:
             return request.override(messages=messages)
         return request
 
@@ -47,11 +47,20 @@ Stop-reason surfacing (#3875 Phase 2):
   the token-budget guard's so a loop-capped run surfaces as
   ``completed + loop_capped`` and the lead/ledger can tell it was capped
   without parsing result text.
+
+Persistence:
+  The per-thread windows (call hashes, warned hashes, recent tool names and
+  frequency-warned names) are written to the ``loop_detection`` state key
+  by every ``after_model`` that tracks tool calls, so they are checkpointed
+  with the thread. When the incoming state carries that snapshot it is the
+  source of truth and the in-process copy is rebuilt from it; a restarted
+  worker, a worker that took over the run's lease, or an instance that
+  evicted the thread therefore keeps counting where the run left off. The
+  in-process copy remains the fallback for graphs without the key.
 """
 
 from __future__ import annotations
 
-import hashlib
 import json
 import logging
 import threading
@@ -60,6 +69,7 @@ from collections.abc import Awaitable, Callable
 from copy import deepcopy
 from typing import TYPE_CHECKING, override
 
+import xxhash
 from langchain.agents import AgentState
 from langchain.agents.middleware import AgentMiddleware
 from langchain.agents.middleware.types import ModelCallResult, ModelRequest, ModelResponse
@@ -67,6 +77,7 @@ from langchain_core.messages import HumanMessage
 from langgraph.runtime import Runtime
 
 from deerflow.agents.middlewares._bounded_dict import BoundedDict
+from deerflow.agents.thread_state import LoopDetectionState, LoopDetectionStateField
 
 if TYPE_CHECKING:
     from deerflow.config.loop_detection_config import LoopDetectionConfig
@@ -109,8 +120,48 @@ def _normalize_tool_call_args(raw_args: object) -> tuple[dict, str | None]:
     return {}, json.dumps(raw_args, sort_keys=True, default=str)
 
 
-def _stable_tool_key(name: str, args: dict, fallback_key: str | None) -> str:
-    """Derive a stable key from salient args without overfitting to noise."""
+def _feed_canonical(hasher: xxhash.xxh3_64, value: object) -> None:
+    """Feed *value* into *hasher* as a canonical, type-tagged byte stream.
+
+    Equivalent values encode identically regardless of dict insertion order,
+    and every string carries its length so adjacent fields cannot run into
+    each other. Large strings (``write_file`` bodies) go straight to the
+    hasher instead of being JSON-escaped into an intermediate document.
+    Unknown types fall back to ``str()``, as ``json.dumps(default=str)`` did.
+    """
+    if value is None:
+        hasher.update(b"N")
+    elif value is True:
+        hasher.update(b"T")
+    elif value is False:
+        hasher.update(b"F")
+    elif isinstance(value, str):
+        data = value.encode("utf-8", "surrogatepass")
+        hasher.update(b"S%d:" % len(data))
+        hasher.update(data)
+    elif isinstance(value, int):
+        hasher.update(b"I%d;" % value)
+    elif isinstance(value, float):
+        hasher.update(b"D" + repr(value).encode() + b";")
+    elif isinstance(value, dict):
+        hasher.update(b"M%d:" % len(value))
+        for key in sorted(value, key=str):
+            _feed_canonical(hasher, str(key))
+            _feed_canonical(hasher, value[key])
+    elif isinstance(value, (list, tuple)):
+        hasher.update(b"L%d:" % len(value))
+        for item in value:
+            _feed_canonical(hasher, item)
+    else:
+        _feed_canonical(hasher, str(value))
+
+
+def _stable_tool_key(name: str, args: dict, fallback_key: str | None) -> object:
+    """Derive a stable key from salient args without overfitting to noise.
+
+    The key is fed to :func:`_feed_canonical`, so it only needs to be a
+    plain value, not a serialized string.
+    """
     if name == "read_file" and fallback_key is None:
         path = args.get("path") or ""
         start_line = args.get("start_line")
@@ -131,7 +182,7 @@ def _stable_tool_key(name: str, args: dict, fallback_key: str | None) -> str:
         bucket_end = max(end_line, 1)
         bucket_start = (bucket_start - 1) // bucket_size
         bucket_end = (bucket_end - 1) // bucket_size
-        return f"{path}:{bucket_start}-{bucket_end}"
+        return (path, bucket_start, bucket_end)
 
     # write_file / str_replace are content-sensitive: same path may be updated
     # with different payloads during iteration. Using only salient fields (path)
@@ -139,17 +190,17 @@ def _stable_tool_key(name: str, args: dict, fallback_key: str | None) -> str:
     if name in {"write_file", "str_replace"}:
         if fallback_key is not None:
             return fallback_key
-        return json.dumps(args, sort_keys=True, default=str)
+        return args
 
     salient_fields = ("path", "url", "query", "command", "pattern", "glob", "cmd")
     stable_args = {field: args[field] for field in salient_fields if args.get(field) is not None}
     if stable_args:
-        return json.dumps(stable_args, sort_keys=True, default=str)
+        return stable_args
 
     if fallback_key is not None:
         return fallback_key
 
-    return json.dumps(args, sort_keys=True, default=str)
+    return args
 
 
 def _hash_tool_calls(tool_calls: list[dict]) -> str:
@@ -157,20 +208,22 @@ def _hash_tool_calls(tool_calls: list[dict]) -> str:
 
     This is intended to be order-independent: the same multiset of tool calls
     should always produce the same hash, regardless of their input order.
+    Each call is hashed on its own and the per-call digests are sorted before
+    being combined. The result must be identical across processes because it
+    is persisted with the thread state, so the built-in ``hash()`` is out.
     """
-    # Normalize each tool call to a stable (name, key) structure.
-    normalized: list[str] = []
+    digests: list[bytes] = []
     for tc in tool_calls:
         name = tc.get("name", "")
         args, fallback_key = _normalize_tool_call_args(tc.get("args", {}))
-        key = _stable_tool_key(name, args, fallback_key)
-
-        normalized.append(f"{name}:{key}")
+        hasher = xxhash.xxh3_64()
+        _feed_canonical(hasher, name)
+        _feed_canonical(hasher, _stable_tool_key(name, args, fallback_key))
+        digests.append(hasher.digest())
 
     # Sort so permutations of the same multiset of calls yield the same ordering.
-    normalized.sort()
-    blob = json.dumps(normalized, sort_keys=True, default=str)
-    return hashlib.md5(blob.encode()).hexdigest()[:12]
+    digests.sort()
+    return xxhash.xxh3_64_hexdigest(b"".join(digests))
 
 
 _WARNING_MSG = "[LOOP DETECTED] You are repeating the same tool calls. Stop calling tools and produce your final answer now. If you cannot complete the task, summarize what you accomplished so far."
@@ -184,7 +237,13 @@ _HARD_STOP_MSG = "[FORCED STOP] Repeated tool calls exceeded the safety limit. P
 _TOOL_FREQ_HARD_STOP_MSG = "[FORCED STOP] Tool {tool_name} called {count} times — exceeded the per-tool safety limit. Producing final answer with results collected so far."
 
 
-class LoopDetectionMiddleware(AgentMiddleware[AgentState]):
+class LoopDetectionMiddlewareState(AgentState):
+    """Compatible with the `ThreadState` schema."""
+
+    loop_detection: LoopDetectionStateField
+
+
+class LoopDetectionMiddleware(AgentMiddleware[LoopDetectionMiddlewareState]):
     """Detects and breaks repetitive tool call loops.
 
     Threshold parameters are validated upstream by :class:`LoopDetectionConfig`;
@@ -217,6 +276,8 @@ class LoopDetectionMiddleware(AgentMiddleware[AgentState]):
             (no overrides).
     """
 
+    state_schema = LoopDetectionMiddlewareState
+
     def __init__(
         self,
         warn_threshold: int = _DEFAULT_WARN_THRESHOLD,
@@ -405,6 +466,34 @@ class LoopDetectionMiddleware(AgentMiddleware[AgentState]):
             self._touch_pending_warning_key_locked(pending_key)
             self._prune_pending_warning_state_locked(protected_key=pending_key)
 
+    def _restore_locked(self, thread_id: str, snapshot: LoopDetectionState) -> None:
+        """Rebuild the in-process windows of *thread_id* from a checkpointed snapshot.
+
+        Must be called while holding self._lock.
+        """
+        self._history[thread_id] = list(snapshot.get("hashes") or [])
+        self._history.move_to_end(thread_id)
+        self._warned.pop(thread_id, None)
+        if warned := snapshot.get("warned"):
+            self._warned[thread_id] = set(warned)
+        names = deque(snapshot.get("tool_names") or [])
+        self._tool_name_history[thread_id] = names
+        self._tool_name_counter[thread_id] = Counter(names)
+        self._tool_freq_warned.pop(thread_id, None)
+        if freq_warned := snapshot.get("freq_warned"):
+            self._tool_freq_warned[thread_id] = set(freq_warned)
+        self._evict_if_needed()
+
+    def _snapshot(self, thread_id: str) -> LoopDetectionState:
+        """Return the windows of *thread_id* in their checkpointable form."""
+        with self._lock:
+            return {
+                "hashes": list(self._history.get(thread_id, ())),
+                "warned": sorted(self._warned.get(thread_id, ())),
+                "tool_names": list(self._tool_name_history.get(thread_id, ())),
+                "freq_warned": sorted(self._tool_freq_warned.get(thread_id, ())),
+            }
+
     def _track_and_check(self, state: AgentState, runtime: Runtime) -> tuple[str | None, bool]:
         """Track tool calls and check for loops.
 
@@ -433,6 +522,9 @@ class LoopDetectionMiddleware(AgentMiddleware[AgentState]):
         call_hash = _hash_tool_calls(tool_calls)
 
         with self._lock:
+            snapshot = state.get("loop_detection")
+            if snapshot:
+                self._restore_locked(thread_id, snapshot)
             # Touch / create entry (move to end for LRU)
             if thread_id in self._history:
                 self._history.move_to_end(thread_id)
@@ -651,13 +743,21 @@ class LoopDetectionMiddleware(AgentMiddleware[AgentState]):
         self._clear_other_run_pending_warnings(runtime)
         return None
 
+    def _apply_and_persist(self, state: AgentState, runtime: Runtime) -> dict | None:
+        """Run :meth:`_apply` and checkpoint the thread's windows alongside its update."""
+        update = self._apply(state, runtime)
+        messages = state.get("messages", [])
+        if not messages or getattr(messages[-1], "type", None) != "ai" or not getattr(messages[-1], "tool_calls", None):
+            return update
+        return {**(update or {}), "loop_detection": self._snapshot(self._get_thread_id(runtime))}
+
     @override
     def after_model(self, state: AgentState, runtime: Runtime) -> dict | None:
-        return self._apply(state, runtime)
+        return self._apply_and_persist(state, runtime)
 
     @override
     async def aafter_model(self, state: AgentState, runtime: Runtime) -> dict | None:
-        return self._apply(state, runtime)
+        return self._apply_and_persist(state, runtime)
 
     @override
     def after_agent(self, state: AgentState, runtime: Runtime) -> dict | None:
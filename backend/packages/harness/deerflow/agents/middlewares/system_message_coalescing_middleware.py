@@ -36,6 +36,7 @@ from langchain.agents.middleware.types import ModelCallResult, ModelRequest, Mod
 from langchain_core.messages import SystemMessage
 
 from deerflow.agents.middlewares.dynamic_context_middleware import is_dynamic_context_reminder
+from deerflow.utils.messages import STABLE_PREFIX_CHARS_KEY
 
 
 def _flatten_content(content) -> str:
@@ -106,6 +107,13 @@ def _coalesce_request(request: ModelRequest) -> ModelRequest | None:
     merged_kwargs: dict = {}
     for p in parts:
         merged_kwargs.update(p.additional_kwargs or {})
+    # The static prompt leads the merged text and is identical on every turn;
+    # record where it ends so Claude can put a cache breakpoint right there
+    # instead of losing the whole system block whenever a reminder changes.
+    if request.system_message is not None:
+        merged_kwargs[STABLE_PREFIX_CHARS_KEY] = len(_flatten_content(request.system_message.content))
+    else:
+        merged_kwargs.pop(STABLE_PREFIX_CHARS_KEY, None)
     merged = SystemMessage(
         content="\n\n".join(_flatten_content(p.content) for p in parts),
         id=first.id,
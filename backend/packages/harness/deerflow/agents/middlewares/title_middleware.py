@@ -1,7 +1,9 @@
 """Middleware for automatic thread title generation."""
 
+import asyncio
 import logging
 import re
+from collections.abc import Awaitable, Callable
 from typing import TYPE_CHECKING, Any, NotRequired, override
 
 from langchain.agents import AgentState
@@ -13,6 +15,7 @@ from langgraph.runtime import Runtime
 from deerflow.agents.middlewares.dynamic_context_middleware import is_dynamic_context_reminder
 from deerflow.config.title_config import get_title_config
 from deerflow.models import create_chat_model
+from deerflow.utils.llm_response_cache import build_cache_key, get_llm_response_cache, resolve_cache_model_name
 
 if TYPE_CHECKING:
     from deerflow.config.app_config import AppConfig
@@ -20,6 +23,81 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Bump when the title post-processing changes in a way that makes cached raw
+# responses unsuitable. The configurable prompt template itself is part of the
+# hashed prompt, so template edits never need a bump.
+_TITLE_CACHE_VERSION = "1"
+
+# ``runtime.context`` key under which the run worker exposes the run's
+# :class:`BackgroundTitle`. Runtimes without it (embedded client, tests)
+# await the title model inline as before.
+BACKGROUND_TITLE_CONTEXT_KEY = "__background_title"
+
+
+class BackgroundTitle:
+    """Run-scoped handle for an LLM title generated off the agent's critical path.
+
+    ``TitleMiddleware`` applies the local fallback title at once and starts
+    the title model call here. The finished title is announced through
+    *on_ready*, written into the graph state by the next ``after_model`` hook
+    of the same run, and otherwise persisted by the worker once the graph
+    has finished (see ``settle``). Only the first ``start`` of a run counts.
+    """
+
+    def __init__(self, on_ready: Callable[[str], Awaitable[Any]] | None = None) -> None:
+        self.fallback: str | None = None
+        self.title: str | None = None
+        self._on_ready = on_ready
+        self._applied = False
+        self._task: asyncio.Task | None = None
+
+    @property
+    def started(self) -> bool:
+        return self._task is not None
+
+    def start(self, result: Awaitable[dict | None], *, fallback: str) -> None:
+        """Run *result* (a title-generation coroutine) in a detached task."""
+        if self._task is not None:
+            return
+        self.fallback = fallback
+        self._task = asyncio.create_task(self._run(result))
+
+    async def _run(self, result: Awaitable[dict | None]) -> None:
+        outcome = await result
+        title = outcome.get("title") if isinstance(outcome, dict) else None
+        if not title or title == self.fallback:
+            return
+        self.title = title
+        if self._on_ready is not None:
+            try:
+                await self._on_ready(title)
+            except Exception:
+                logger.debug("Failed to announce background title", exc_info=True)
+
+    def take_title(self) -> str | None:
+        """Return the generated title the first time it is ready, then ``None``."""
+        if self.title is None or self._applied:
+            return None
+        self._applied = True
+        return self.title
+
+    async def settle(self, timeout: float) -> str | None:
+        """Wait up to *timeout* seconds for the title; cancel the call after that."""
+        if self._task is None:
+            return None
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout)
+        except TimeoutError:
+            logger.debug("Background title generation timed out after %.1fs", timeout)
+            self._task.cancel()
+        except Exception:
+            logger.debug("Background title generation failed", exc_info=True)
+        return self.title
+
+    def cancel(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
 
 class TitleMiddlewareState(AgentState):
     """Compatible with the `ThreadState` schema."""
@@ -210,6 +288,14 @@ class TitleMiddleware(AgentMiddleware[TitleMiddlewareState]):
 
         try:
             prompt, user_msg = self._build_title_prompt(state)
+            cache = get_llm_response_cache(self._app_config)
+            cache_key = build_cache_key(call_site="title_agent", model_name=resolve_cache_model_name(config.model_name, self._app_config), prompt_version=_TITLE_CACHE_VERSION, parts=(prompt,))
+            if cache is not None:
+                cached = await cache.aget("title_agent", cache_key)
+                if cached is not None:
+                    title = self._parse_title(cached)
+                    if title:
+                        return {"title": title}
             # attach_tracing=False because ``_get_runnable_config()`` inherits
             # the graph-level RunnableConfig (set in ``_make_lead_agent``) whose
             # callbacks already carry tracing handlers; binding them again at
@@ -221,6 +307,8 @@ class TitleMiddleware(AgentMiddleware[TitleMiddlewareState]):
             response = await model.ainvoke(prompt, config=self._get_runnable_config())
             title = self._parse_title(response.content)
             if title:
+                if cache is not None:
+                    await cache.aset("title_agent", cache_key, self._normalize_content(response.content))
                 return {"title": title}
         except Exception:
             logger.debug("Failed to generate async title; falling back to local title", exc_info=True)
@@ -232,4 +320,24 @@ class TitleMiddleware(AgentMiddleware[TitleMiddlewareState]):
 
     @override
     async def aafter_model(self, state: TitleMiddlewareState, runtime: Runtime) -> dict | None:
-        return await self._agenerate_title_result(state)
+        context = getattr(runtime, "context", None)
+        background = context.get(BACKGROUND_TITLE_CONTEXT_KEY) if isinstance(context, dict) else None
+        if not isinstance(background, BackgroundTitle):
+            return await self._agenerate_title_result(state)
+
+        # Swap in a title that finished while the run was still going, unless
+        # something else has retitled the thread since the fallback.
+        if background.started:
+            title = background.take_title()
+            if title and state.get("title") == background.fallback:
+                return {"title": title}
+            return None
+
+        if not self._should_generate_title(state):
+            return None
+        fallback = {"title": self._fallback_title(self._get_title_user_message(state))}
+        if self._get_title_config().model_name:
+            # Snapshot the messages: the task reads them after this hook returns.
+            snapshot = {**state, "messages": list(state.get("messages") or [])}
+            background.start(self._agenerate_title_result(snapshot), fallback=fallback["title"])
+        return fallback
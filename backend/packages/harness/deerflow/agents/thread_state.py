@@ -102,6 +102,29 @@ def merge_goal(existing: GoalState | None, new: GoalState | None) -> GoalState |
     return new
 
 
+class LoopDetectionState(TypedDict):
+    """Per-thread sliding windows of ``LoopDetectionMiddleware``.
+
+    Persisted with the checkpoint so loop detection survives a worker
+    restart, a lease takeover or LRU eviction of the in-process copy.
+    """
+
+    hashes: list[str]
+    warned: list[str]
+    tool_names: list[str]
+    freq_warned: list[str]
+
+
+def merge_loop_detection(existing: LoopDetectionState | None, new: LoopDetectionState | None) -> LoopDetectionState | None:
+    """Reducer for loop-detection state - the latest snapshot wins."""
+    if new is None:
+        return existing
+    return new
+
+
+LoopDetectionStateField = Annotated[NotRequired[LoopDetectionState | None], merge_loop_detection]
+
+
 class PromotedTools(TypedDict):
     catalog_hash: str
     names: list[str]
@@ -249,3 +272,4 @@ class ThreadState(AgentState):
     delegations: Annotated[list[DelegationEntry], merge_delegations]
     skill_context: Annotated[list[SkillEntry], merge_skill_context]
     summary_text: NotRequired[str | None]
+    loop_detection: LoopDetectionStateField
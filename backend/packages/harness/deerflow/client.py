@@ -13,21 +13,27 @@ Usage:
     # Streaming
     for event in client.stream("hello"):
         print(event)
+
+    # Async
+    async for event in client.astream("hello"):
+        print(event)
 """
 
 import asyncio
 import concurrent.futures
+import contextlib
 import json
 import logging
 import mimetypes
 import os
 import shutil
 import tempfile
+import threading
 import uuid
-from collections.abc import Generator, Sequence
+from collections.abc import AsyncGenerator, Coroutine, Generator, Iterator, Sequence
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Literal
+from typing import TYPE_CHECKING, Any, Literal, TypeVar
 
 from langchain.agents import create_agent
 from langchain.agents.middleware import AgentMiddleware
@@ -60,8 +66,16 @@ from deerflow.uploads.manager import (
     upload_virtual_path,
 )
 
+if TYPE_CHECKING:
+    from deerflow.persistence.thread_meta import ThreadMetaStore
+
 logger = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
+# Rows fetched per query when collecting every thread id in the thread store.
+_THREAD_STORE_PAGE_SIZE = 500
+
 
 def _run_async_from_sync(coro):
     """Run an async helper from this synchronous client API."""
@@ -76,9 +90,252 @@ def _run_async_from_sync(coro):
     return asyncio.run(coro)
 
 
+class _ClientLoop:
+    """One long-lived event loop on a daemon thread, owned by a client.
+
+    Async checkpointers and SQLAlchemy pools are bound to the loop that opened
+    them, so every piece of the client's async work runs here: the sync API
+    blocks on it and the async API awaits it from the caller's loop.
+    ``run_coroutine_threadsafe`` schedules in a copy of the caller's context,
+    so user and trace context vars carry over.
+    """
+
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.open_lock = asyncio.Lock()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="deerflow-client-loop", daemon=True)
+        self._thread.start()
+
+    def submit(self, coro: Coroutine[Any, Any, _T]) -> concurrent.futures.Future[_T]:
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine[Any, Any, _T]) -> _T:
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("DeerFlowClient sync methods cannot be called from its own event loop")
+        return self.submit(coro).result()
+
+    async def arun(self, coro: Coroutine[Any, Any, _T]) -> _T:
+        return await asyncio.wrap_future(self.submit(coro))
+
+    def close(self) -> None:
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
+        if not self._thread.is_alive():
+            self.loop.close()
+
+
+@dataclass
+class _AsyncResources:
+    """Checkpointer and thread-metadata store opened on the client loop."""
+
+    stack: contextlib.AsyncExitStack
+    checkpointer: Any = None
+    thread_store: "ThreadMetaStore | None" = None
+    checkpointer_opened: bool = False
+    thread_store_opened: bool = False
+    # Threads that only exist in the checkpointer (created before the thread
+    # store was in use), found by one scan per client and merged into listings.
+    checkpoint_only_threads: dict[str, dict] | None = None
+
+
 StreamEventType = Literal["values", "messages-tuple", "custom", "end"]
 
 
+class _StreamTranslator:
+    """Turn one run's LangGraph ``stream_mode=["values", "messages", "custom"]``
+    items into :class:`StreamEvent` objects.
+
+    Shared by :meth:`DeerFlowClient.stream` and :meth:`DeerFlowClient.astream`
+    so the sync and async paths deduplicate and account usage identically.
+    """
+
+    def __init__(self) -> None:
+        self.seen_ids: set[str] = set()
+        # Cross-mode handoff: ids already streamed via LangGraph ``messages``
+        # mode so the ``values`` path skips re-synthesis of the same message.
+        self.streamed_ids: set[str] = set()
+        # The same message id carries identical cumulative ``usage_metadata``
+        # in both the final ``messages`` chunk and the values snapshot —
+        # count it only on whichever arrives first.
+        self.counted_usage_ids: set[str] = set()
+        self.sent_additional_kwargs_by_id: dict[str, dict[str, Any]] = {}
+        self.cumulative_usage: dict[str, int] = {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0}
+        self.title: str | None = None
+
+    def _account_usage(self, msg_id: str | None, usage: Any) -> dict | None:
+        """Add *usage* to cumulative totals if this id has not been counted.
+
+        ``usage`` is a ``langchain_core.messages.UsageMetadata`` TypedDict
+        or ``None``; typed as ``Any`` because TypedDicts are not
+        structurally assignable to plain ``dict`` under strict type
+        checking.  Returns the normalized usage dict (for attaching
+        to an event) when we accepted it, otherwise ``None``.
+        """
+        if not usage:
+            return None
+        if msg_id and msg_id in self.counted_usage_ids:
+            return None
+        if msg_id:
+            self.counted_usage_ids.add(msg_id)
+        input_tokens = usage.get("input_tokens", 0) or 0
+        output_tokens = usage.get("output_tokens", 0) or 0
+        total_tokens = usage.get("total_tokens", 0) or 0
+        self.cumulative_usage["input_tokens"] += input_tokens
+        self.cumulative_usage["output_tokens"] += output_tokens
+        self.cumulative_usage["total_tokens"] += total_tokens
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": total_tokens,
+        }
+
+    def _unsent_additional_kwargs(self, msg_id: str | None, additional_kwargs: dict[str, Any] | None) -> dict[str, Any] | None:
+        if not additional_kwargs:
+            return None
+        if not msg_id:
+            return additional_kwargs
+
+        sent = self.sent_additional_kwargs_by_id.setdefault(msg_id, {})
+        delta = {key: value for key, value in additional_kwargs.items() if sent.get(key) != value}
+        if not delta:
+            return None
+
+        sent.update(delta)
+        return delta
+
+    def feed(self, item) -> Iterator["StreamEvent"]:
+        """Yield the events for one item of ``agent.stream`` / ``agent.astream``."""
+        client = DeerFlowClient
+        if isinstance(item, tuple) and len(item) == 2:
+            mode, chunk = item
+            mode = str(mode)
+        else:
+            mode, chunk = "values", item
+
+        if mode == "custom":
+            yield StreamEvent(type="custom", data=chunk)
+            return
+
+        if mode == "messages":
+            # LangGraph ``messages`` mode emits ``(message_chunk, metadata)``.
+            if isinstance(chunk, tuple) and len(chunk) == 2:
+                msg_chunk, _metadata = chunk
+            else:
+                msg_chunk = chunk
+
+            msg_id = getattr(msg_chunk, "id", None)
+
+            if isinstance(msg_chunk, AIMessage):
+                text = client._extract_text(msg_chunk.content)
+                additional_kwargs = client._serialize_additional_kwargs(msg_chunk)
+                counted_usage = self._account_usage(msg_id, msg_chunk.usage_metadata)
+                sent_additional_kwargs = False
+
+                if text:
+                    if msg_id:
+                        self.streamed_ids.add(msg_id)
+                    additional_kwargs_delta = self._unsent_additional_kwargs(msg_id, additional_kwargs)
+                    yield client._ai_text_event(
+                        msg_id,
+                        text,
+                        counted_usage,
+                        additional_kwargs_delta,
+                    )
+                    sent_additional_kwargs = bool(additional_kwargs_delta)
+
+                if msg_chunk.tool_calls:
+                    if msg_id:
+                        self.streamed_ids.add(msg_id)
+                    additional_kwargs_delta = None if sent_additional_kwargs else self._unsent_additional_kwargs(msg_id, additional_kwargs)
+                    yield client._ai_tool_calls_event(
+                        msg_id,
+                        msg_chunk.tool_calls,
+                        additional_kwargs_delta,
+                    )
+
+            elif isinstance(msg_chunk, ToolMessage):
+                if msg_id:
+                    self.streamed_ids.add(msg_id)
+                yield client._tool_message_event(msg_chunk)
+            return
+
+        # mode == "values"
+        messages = chunk.get("messages", [])
+
+        for msg in messages:
+            msg_id = getattr(msg, "id", None)
+            if msg_id and msg_id in self.seen_ids:
+                continue
+            if msg_id:
+                self.seen_ids.add(msg_id)
+
+            # Already streamed via ``messages`` mode; only (defensively)
+            # capture usage here and skip re-synthesizing the event.
+            if msg_id and msg_id in self.streamed_ids:
+                if isinstance(msg, AIMessage):
+                    self._account_usage(msg_id, getattr(msg, "usage_metadata", None))
+                    additional_kwargs = client._serialize_additional_kwargs(msg)
+                    additional_kwargs_delta = self._unsent_additional_kwargs(msg_id, additional_kwargs)
+                    if additional_kwargs_delta:
+                        # Metadata-only follow-up: ``messages-tuple`` has no
+                        # dedicated attribution event, so clients should
+                        # merge this empty-content AI event by message id
+                        # and ignore it for text rendering.
+                        yield client._ai_text_event(msg_id, "", None, additional_kwargs_delta)
+                continue
+
+            if isinstance(msg, AIMessage):
+                counted_usage = self._account_usage(msg_id, msg.usage_metadata)
+                additional_kwargs = client._serialize_additional_kwargs(msg)
+                sent_additional_kwargs = False
+
+                if msg.tool_calls:
+                    additional_kwargs_delta = self._unsent_additional_kwargs(msg_id, additional_kwargs)
+                    yield client._ai_tool_calls_event(
+                        msg_id,
+                        msg.tool_calls,
+                        additional_kwargs_delta,
+                    )
+                    sent_additional_kwargs = bool(additional_kwargs_delta)
+
+                text = client._extract_text(msg.content)
+                if text:
+                    additional_kwargs_delta = None if sent_additional_kwargs else self._unsent_additional_kwargs(msg_id, additional_kwargs)
+                    yield client._ai_text_event(
+                        msg_id,
+                        text,
+                        counted_usage,
+                        additional_kwargs_delta,
+                    )
+                elif msg_id:
+                    additional_kwargs_delta = None if sent_additional_kwargs else self._unsent_additional_kwargs(msg_id, additional_kwargs)
+                    if not additional_kwargs_delta:
+                        continue
+                    # See the metadata-only follow-up convention above.
+                    yield client._ai_text_event(msg_id, "", None, additional_kwargs_delta)
+
+            elif isinstance(msg, ToolMessage):
+                yield client._tool_message_event(msg)
+
+        title = chunk.get("title")
+        if title:
+            self.title = title
+
+        # Emit a values event for each state snapshot
+        yield StreamEvent(
+            type="values",
+            data={
+                "title": title,
+                "messages": [client._serialize_message(m) for m in messages],
+                "artifacts": chunk.get("artifacts", []),
+            },
+        )
+
+    def end(self) -> "StreamEvent":
+        return StreamEvent(type="end", data={"usage": self.cumulative_usage})
+
+
 @dataclass
 class StreamEvent:
     """A single event from the streaming agent response.
@@ -113,6 +370,13 @@ class DeerFlowClient:
         the configuration key changes. Call :meth:`reset_agent` to force
         a refresh in long-running processes.
 
+        The ``a``-prefixed methods (:meth:`astream`, :meth:`achat`,
+        :meth:`alist_threads`, :meth:`aget_thread`) run on one event loop
+        owned by the client, with an async checkpointer and thread-metadata
+        store opened once and reused across calls. Call :meth:`close` /
+        :meth:`aclose` (or use the client as a context manager) to release
+        them.
+
     Example::
 
         from deerflow.client import DeerFlowClient
@@ -126,6 +390,11 @@ class DeerFlowClient:
         for event in client.stream("hello"):
             print(event.type, event.data)
 
+        # Async
+        async with DeerFlowClient() as client:
+            async for event in client.astream("hello"):
+                print(event.type, event.data)
+
         # Configuration queries
         print(client.list_models())
         print(client.list_skills())
@@ -144,6 +413,7 @@ class DeerFlowClient:
         available_skills: set[str] | None = None,
         middlewares: Sequence[AgentMiddleware] | None = None,
         environment: str | None = None,
+        thread_store: "ThreadMetaStore | None" = None,
     ):
         """Initialize the client.
 
@@ -153,7 +423,11 @@ class DeerFlowClient:
             config_path: Path to config.yaml. Uses default resolution if None.
             checkpointer: LangGraph checkpointer instance for state persistence.
                 Required for multi-turn conversations on the same thread_id.
-                Without a checkpointer, each call is stateless.
+                Without a checkpointer, each call is stateless. The async
+                API needs one that implements the async interface
+                (``InMemorySaver``, ``AsyncSqliteSaver``, ``AsyncPostgresSaver``);
+                when None it opens the configured one through
+                :func:`~deerflow.runtime.checkpointer.async_provider.make_checkpointer`.
             model_name: Override the default model name from config.
             thinking_enabled: Enable model's extended thinking.
             subagent_enabled: Enable subagent delegation.
@@ -167,6 +441,12 @@ class DeerFlowClient:
                 ``DEER_FLOW_ENV`` or ``ENVIRONMENT`` env vars. Pass an
                 explicit value for programmatic callers that do not want
                 env-var coupling.
+            thread_store: Thread-metadata store used for listing threads
+                and recording the threads this client runs. Defaults to a
+                SQL store over the configured ``database`` (the table the
+                Gateway lists from); with the ``memory`` backend threads are
+                listed from the checkpointer instead. A store passed here
+                is used from the client's own event loop.
         """
         if config_path is not None:
             reload_app_config(config_path)
@@ -185,10 +465,19 @@ class DeerFlowClient:
         self._middlewares = list(middlewares) if middlewares else []
         self._environment = environment
 
+        self._thread_store = thread_store
+
         # Lazy agent — created on first call, recreated when config changes.
         self._agent = None
         self._agent_config_key: tuple | None = None
 
+        # Async API state, all bound to ``_loop`` (created on first use).
+        self._loop: _ClientLoop | None = None
+        self._loop_lock = threading.Lock()
+        self._async_resources: _AsyncResources | None = None
+        self._async_agent = None
+        self._async_agent_config_key: tuple | None = None
+
     def reset_agent(self) -> None:
         """Force the internal agent to be recreated on the next call.
 
@@ -198,6 +487,38 @@ class DeerFlowClient:
         """
         self._agent = None
         self._agent_config_key = None
+        self._async_agent = None
+        self._async_agent_config_key = None
+
+    def close(self) -> None:
+        """Close the async checkpointer and store, and stop the client loop."""
+        loop = self._loop
+        if loop is None:
+            return
+        loop.run(self._aclose_resources())
+        self._loop = None
+        loop.close()
+
+    async def aclose(self) -> None:
+        """Async variant of :meth:`close`."""
+        loop = self._loop
+        if loop is None:
+            return
+        await loop.arun(self._aclose_resources())
+        self._loop = None
+        await asyncio.to_thread(loop.close)
+
+    def __enter__(self) -> "DeerFlowClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "DeerFlowClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
 
     # ------------------------------------------------------------------
     # Internal helpers
@@ -235,10 +556,9 @@ class DeerFlowClient:
             recursion_limit=overrides.get("recursion_limit", 100),
         )
 
-    def _ensure_agent(self, config: RunnableConfig):
-        """Create (or recreate) the agent when config-dependent params change."""
+    def _agent_key(self, config: RunnableConfig) -> tuple:
         cfg = config.get("configurable", {})
-        key = (
+        return (
             cfg.get("model_name"),
             cfg.get("thinking_enabled"),
             cfg.get("is_plan_mode"),
@@ -249,9 +569,22 @@ class DeerFlowClient:
             frozenset(self._available_skills) if self._available_skills is not None else None,
         )
 
+    def _ensure_agent(self, config: RunnableConfig):
+        """Create (or recreate) the agent when config-dependent params change."""
+        key = self._agent_key(config)
         if self._agent is not None and self._agent_config_key == key:
             return
 
+        checkpointer = self._checkpointer
+        if checkpointer is None:
+            from deerflow.runtime.checkpointer import get_checkpointer
+
+            checkpointer = get_checkpointer()
+        self._agent = self._create_agent(config, checkpointer)
+        self._agent_config_key = key
+
+    def _create_agent(self, config: RunnableConfig, checkpointer):
+        cfg = config.get("configurable", {})
         thinking_enabled = cfg.get("thinking_enabled", True)
         model_name = cfg.get("model_name")
         subagent_enabled = cfg.get("subagent_enabled", False)
@@ -311,17 +644,125 @@ class DeerFlowClient:
             ),
             "state_schema": ThreadState,
         }
-        checkpointer = self._checkpointer
-        if checkpointer is None:
-            from deerflow.runtime.checkpointer import get_checkpointer
-
-            checkpointer = get_checkpointer()
         if checkpointer is not None:
             kwargs["checkpointer"] = checkpointer
 
-        self._agent = create_agent(**kwargs)
-        self._agent_config_key = key
+        agent = create_agent(**kwargs)
         logger.info("Agent created: agent_name=%s, model=%s, thinking=%s", self._agent_name, model_name, thinking_enabled)
+        return agent
+
+    # ------------------------------------------------------------------
+    # Internal helpers — async resources (run on the client loop)
+    # ------------------------------------------------------------------
+
+    def _client_loop(self) -> _ClientLoop:
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = _ClientLoop()
+            return self._loop
+
+    def _uses_thread_store(self) -> bool:
+        """Whether threads are listed from a thread-metadata store rather than the checkpointer."""
+        if self._thread_store is not None:
+            return True
+        database = getattr(self._app_config, "database", None)
+        return getattr(database, "backend", None) in ("sqlite", "postgres")
+
+    def _uses_memory_checkpointer(self) -> bool:
+        # Same precedence as ``make_checkpointer``: the legacy section wins.
+        legacy = getattr(self._app_config, "checkpointer", None)
+        if legacy is not None:
+            return legacy.type == "memory"
+        database = getattr(self._app_config, "database", None)
+        return database is None or database.backend == "memory"
+
+    def _resources(self) -> _AsyncResources:
+        if self._async_resources is None:
+            self._async_resources = _AsyncResources(stack=contextlib.AsyncExitStack())
+        return self._async_resources
+
+    async def _acheckpointer(self):
+        """The checkpointer for the async API, opened once per client."""
+        resources = self._resources()
+        async with self._client_loop().open_lock:
+            if not resources.checkpointer_opened:
+                checkpointer = self._checkpointer
+                if checkpointer is None and self._uses_memory_checkpointer():
+                    # Share the process-wide InMemorySaver with the sync API.
+                    from deerflow.runtime.checkpointer import get_checkpointer
+
+                    checkpointer = get_checkpointer()
+                elif checkpointer is None:
+                    from deerflow.runtime.checkpointer.async_provider import make_checkpointer
+
+                    checkpointer = await resources.stack.enter_async_context(make_checkpointer(self._app_config))
+                resources.checkpointer = checkpointer
+                resources.checkpointer_opened = True
+        return resources.checkpointer
+
+    async def _athread_store(self) -> "ThreadMetaStore | None":
+        """The thread-metadata store, or None when threads live only in the checkpointer."""
+        resources = self._resources()
+        async with self._client_loop().open_lock:
+            if not resources.thread_store_opened:
+                store = self._thread_store
+                if store is None and self._uses_thread_store():
+                    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+                    from deerflow.persistence.engine import create_engine_from_config
+                    from deerflow.persistence.thread_meta import make_thread_store
+
+                    # A private pool bound to the client loop; the process-wide
+                    # engine may belong to another loop (Gateway, TUI writer).
+                    engine = await create_engine_from_config(self._app_config.database)
+                    if engine is not None:
+                        resources.stack.push_async_callback(engine.dispose)
+                        store = make_thread_store(async_sessionmaker(engine, expire_on_commit=False))
+                resources.thread_store = store
+                resources.thread_store_opened = True
+        return resources.thread_store
+
+    async def _aclose_resources(self) -> None:
+        resources, self._async_resources = self._async_resources, None
+        self._async_agent = None
+        self._async_agent_config_key = None
+        if resources is not None:
+            await resources.stack.aclose()
+
+    async def _aensure_agent(self, config: RunnableConfig):
+        """Async-API counterpart of :meth:`_ensure_agent`, compiled with the async checkpointer."""
+        key = self._agent_key(config)
+        if self._async_agent is None or self._async_agent_config_key != key:
+            checkpointer = await self._acheckpointer()
+            # Building tools and the prompt does sync IO; keep it off the loop.
+            self._async_agent = await asyncio.to_thread(self._create_agent, config, checkpointer)
+            self._async_agent_config_key = key
+        return self._async_agent
+
+    async def _arecord_thread(self, thread_id: str, *, title: str | None = None) -> None:
+        """Register *thread_id* (or its title) in the thread store, best-effort.
+
+        Mirrors the Gateway worker so threads run through the embedded client
+        are listed by :meth:`list_threads` and in the Web UI.
+        """
+        try:
+            store = await self._athread_store()
+            if store is None:
+                return
+            user_id = get_effective_user_id()
+            if title is not None:
+                await store.update_display_name(thread_id, title, user_id=user_id)
+            elif await store.get(thread_id, user_id=user_id) is None:
+                await store.create(thread_id, assistant_id=self._agent_name or "lead-agent", user_id=user_id)
+            legacy = self._resources().checkpoint_only_threads
+            if legacy is not None:
+                legacy.pop(thread_id, None)
+        except Exception:
+            logger.warning("Failed to record thread %s in the thread store", thread_id, exc_info=True)
+
+    def _record_thread(self, thread_id: str, *, title: str | None = None) -> None:
+        if self._uses_thread_store():
+            self._client_loop().run(self._arecord_thread(thread_id, title=title))
 
     @staticmethod
     def _get_tools(*, model_name: str | None, subagent_enabled: bool):
@@ -502,94 +943,190 @@ class DeerFlowClient:
             pass
         return {"goal": None}
 
+    @staticmethod
+    def _accumulate_thread_info(thread_info_map: dict[str, dict], cp) -> None:
+        """Fold one checkpoint tuple into the per-thread summary map."""
+        cfg = cp.config.get("configurable", {})
+        thread_id = cfg.get("thread_id")
+        if not thread_id:
+            return
+
+        ts = cp.checkpoint.get("ts")
+        checkpoint_id = cfg.get("checkpoint_id")
+
+        if thread_id not in thread_info_map:
+            channel_values = cp.checkpoint.get("channel_values", {})
+            thread_info_map[thread_id] = {
+                "thread_id": thread_id,
+                "created_at": ts,
+                "updated_at": ts,
+                "latest_checkpoint_id": checkpoint_id,
+                "title": channel_values.get("title"),
+                "status": None,
+            }
+        else:
+            # Explicitly compare timestamps to ensure accuracy when iterating over unordered namespaces.
+            # Treat None as "missing" and only compare when existing values are non-None.
+            if ts is not None:
+                current_created = thread_info_map[thread_id]["created_at"]
+                if current_created is None or ts < current_created:
+                    thread_info_map[thread_id]["created_at"] = ts
+
+                current_updated = thread_info_map[thread_id]["updated_at"]
+                if current_updated is None or ts > current_updated:
+                    thread_info_map[thread_id]["updated_at"] = ts
+                    thread_info_map[thread_id]["latest_checkpoint_id"] = checkpoint_id
+                    channel_values = cp.checkpoint.get("channel_values", {})
+                    thread_info_map[thread_id]["title"] = channel_values.get("title")
+
+    @staticmethod
+    def _sorted_thread_list(thread_info_map: dict[str, dict], limit: int) -> list[dict]:
+        threads = list(thread_info_map.values())
+        threads.sort(key=lambda x: x.get("created_at") or "", reverse=True)
+        return threads[:limit]
+
+    @staticmethod
+    def _thread_info_from_record(record: dict, latest_checkpoint_id: str | None = None) -> dict:
+        """Reshape a thread-metadata store row into a ``thread_list`` entry."""
+        return {
+            "thread_id": record["thread_id"],
+            "created_at": record.get("created_at"),
+            "updated_at": record.get("updated_at"),
+            "latest_checkpoint_id": latest_checkpoint_id,
+            "title": record.get("display_name"),
+            "status": record.get("status"),
+        }
+
+    @staticmethod
+    def _checkpoint_record(cp) -> dict:
+        channel_values = dict(cp.checkpoint.get("channel_values", {}))
+        if "messages" in channel_values:
+            channel_values["messages"] = [DeerFlowClient._serialize_message(m) if hasattr(m, "content") else m for m in channel_values["messages"]]
+
+        cfg = cp.config.get("configurable", {})
+        parent_cfg = cp.parent_config.get("configurable", {}) if cp.parent_config else {}
+
+        return {
+            "checkpoint_id": cfg.get("checkpoint_id"),
+            "parent_checkpoint_id": parent_cfg.get("checkpoint_id"),
+            "ts": cp.checkpoint.get("ts"),
+            "metadata": cp.metadata,
+            "values": channel_values,
+            "pending_writes": [{"task_id": w[0], "channel": w[1], "value": w[2]} for w in getattr(cp, "pending_writes", [])],
+        }
+
     def list_threads(self, limit: int = 10) -> dict:
         """List the recent N threads.
 
+        With a SQL ``database`` backend (or an explicit ``thread_store``)
+        threads come from the thread-metadata store the Gateway lists from:
+        one indexed query, most recently updated first. Threads that exist
+        only in the checkpointer (run through the client before it used the
+        store) are found by one checkpoint scan per client and merged in by
+        their last checkpoint time. Without a store every checkpoint is
+        scanned and threads are sorted by creation time.
+
         Args:
             limit: Maximum number of threads to return. Default is 10.
 
         Returns:
-            Dict with "thread_list" key containing list of thread info dicts,
-            sorted by thread creation time descending.
+            Dict with "thread_list" key containing list of thread info dicts
+            with ``thread_id``, ``created_at``, ``updated_at``,
+            ``latest_checkpoint_id``, ``title`` and ``status`` (``None``
+            for threads the store does not know).
         """
-        checkpointer = self._get_thread_checkpointer()
-
-        thread_info_map = {}
-
-        for cp in checkpointer.list(config=None, limit=limit):
-            cfg = cp.config.get("configurable", {})
-            thread_id = cfg.get("thread_id")
-            if not thread_id:
-                continue
+        if self._uses_thread_store():
+            return self._client_loop().run(self._alist_threads(limit))
 
-            ts = cp.checkpoint.get("ts")
-            checkpoint_id = cfg.get("checkpoint_id")
-
-            if thread_id not in thread_info_map:
-                channel_values = cp.checkpoint.get("channel_values", {})
-                thread_info_map[thread_id] = {
-                    "thread_id": thread_id,
-                    "created_at": ts,
-                    "updated_at": ts,
-                    "latest_checkpoint_id": checkpoint_id,
-                    "title": channel_values.get("title"),
-                }
-            else:
-                # Explicitly compare timestamps to ensure accuracy when iterating over unordered namespaces.
-                # Treat None as "missing" and only compare when existing values are non-None.
-                if ts is not None:
-                    current_created = thread_info_map[thread_id]["created_at"]
-                    if current_created is None or ts < current_created:
-                        thread_info_map[thread_id]["created_at"] = ts
-
-                    current_updated = thread_info_map[thread_id]["updated_at"]
-                    if current_updated is None or ts > current_updated:
-                        thread_info_map[thread_id]["updated_at"] = ts
-                        thread_info_map[thread_id]["latest_checkpoint_id"] = checkpoint_id
-                        channel_values = cp.checkpoint.get("channel_values", {})
-                        thread_info_map[thread_id]["title"] = channel_values.get("title")
-
-        threads = list(thread_info_map.values())
-        threads.sort(key=lambda x: x.get("created_at") or "", reverse=True)
+        checkpointer = self._get_thread_checkpointer()
 
+        # ``limit`` counts threads, not checkpoints: a thread with many
+        # checkpoints would otherwise crowd the others out of the page.
+        thread_info_map: dict[str, dict] = {}
+        for cp in checkpointer.list(config=None):
+            self._accumulate_thread_info(thread_info_map, cp)
+
+        return {"thread_list": self._sorted_thread_list(thread_info_map, limit)}
+
+    async def alist_threads(self, limit: int = 10) -> dict:
+        """Async variant of :meth:`list_threads`."""
+        return await self._client_loop().arun(self._alist_threads(limit))
+
+    async def _alist_threads(self, limit: int) -> dict:
+        store = await self._athread_store()
+        checkpointer = await self._acheckpointer()
+        if store is None:
+            thread_info_map: dict[str, dict] = {}
+            async for cp in checkpointer.alist(None):
+                self._accumulate_thread_info(thread_info_map, cp)
+            return {"thread_list": self._sorted_thread_list(thread_info_map, limit)}
+
+        rows = await store.search(limit=limit, user_id=get_effective_user_id())
+        latest = await asyncio.gather(*(self._alatest_checkpoint_id(checkpointer, row["thread_id"]) for row in rows))
+        threads = [self._thread_info_from_record(row, checkpoint_id) for row, checkpoint_id in zip(rows, latest)]
+        legacy = await self._acheckpoint_only_threads(store, checkpointer)
+        if legacy:
+            listed = {thread["thread_id"] for thread in threads}
+            threads += [dict(thread) for thread_id, thread in legacy.items() if thread_id not in listed]
+            threads.sort(key=lambda x: x.get("updated_at") or "", reverse=True)
         return {"thread_list": threads[:limit]}
 
+    @staticmethod
+    async def _alatest_checkpoint_id(checkpointer, thread_id: str) -> str | None:
+        cp = await checkpointer.aget_tuple({"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}})
+        return cp.config.get("configurable", {}).get("checkpoint_id") if cp is not None else None
+
+    async def _acheckpoint_only_threads(self, store: "ThreadMetaStore", checkpointer) -> dict[str, dict]:
+        """Threads in the checkpointer without a thread-store row, scanned once per client."""
+        resources = self._resources()
+        if resources.checkpoint_only_threads is None:
+            thread_info_map: dict[str, dict] = {}
+            async for cp in checkpointer.alist(None):
+                self._accumulate_thread_info(thread_info_map, cp)
+            # Rows of every owner count: a thread another user registered is
+            # theirs, not a legacy thread of this client.
+            known: set[str] = set()
+            offset = 0
+            while rows := await store.search(limit=_THREAD_STORE_PAGE_SIZE, offset=offset, user_id=None):
+                known.update(row["thread_id"] for row in rows)
+                offset += len(rows)
+            resources.checkpoint_only_threads = {thread_id: info for thread_id, info in thread_info_map.items() if thread_id not in known}
+        return resources.checkpoint_only_threads
+
     def get_thread(self, thread_id: str) -> dict:
         """Get the complete thread record, including all node execution records.
 
+        With a SQL ``database`` backend the history is read through the
+        client's async checkpointer and connection pool, like the async API.
+
         Args:
             thread_id: Thread ID.
 
         Returns:
             Dict containing the thread's full checkpoint history.
         """
+        if self._checkpointer is None and self._uses_thread_store():
+            return self._client_loop().run(self._aget_thread(thread_id))
+
         checkpointer = self._get_thread_checkpointer()
 
         config = {"configurable": {"thread_id": thread_id}}
-        checkpoints = []
+        checkpoints = [self._checkpoint_record(cp) for cp in checkpointer.list(config)]
 
-        for cp in checkpointer.list(config):
-            channel_values = dict(cp.checkpoint.get("channel_values", {}))
-            if "messages" in channel_values:
-                channel_values["messages"] = [self._serialize_message(m) if hasattr(m, "content") else m for m in channel_values["messages"]]
+        # Sort globally by timestamp to prevent partial ordering issues caused by different namespaces (e.g., subgraphs)
+        checkpoints.sort(key=lambda x: x["ts"] if x["ts"] else "")
 
-            cfg = cp.config.get("configurable", {})
-            parent_cfg = cp.parent_config.get("configurable", {}) if cp.parent_config else {}
+        return {"thread_id": thread_id, "checkpoints": checkpoints}
 
-            checkpoints.append(
-                {
-                    "checkpoint_id": cfg.get("checkpoint_id"),
-                    "parent_checkpoint_id": parent_cfg.get("checkpoint_id"),
-                    "ts": cp.checkpoint.get("ts"),
-                    "metadata": cp.metadata,
-                    "values": channel_values,
-                    "pending_writes": [{"task_id": w[0], "channel": w[1], "value": w[2]} for w in getattr(cp, "pending_writes", [])],
-                }
-            )
+    async def aget_thread(self, thread_id: str) -> dict:
+        """Async variant of :meth:`get_thread`."""
+        return await self._client_loop().arun(self._aget_thread(thread_id))
 
-        # Sort globally by timestamp to prevent partial ordering issues caused by different namespaces (e.g., subgraphs)
+    async def _aget_thread(self, thread_id: str) -> dict:
+        checkpointer = await self._acheckpointer()
+        config = {"configurable": {"thread_id": thread_id}}
+        checkpoints = [self._checkpoint_record(cp) async for cp in checkpointer.alist(config)]
         checkpoints.sort(key=lambda x: x["ts"] if x["ts"] else "")
-
         return {"thread_id": thread_id, "checkpoints": checkpoints}
 
     # ------------------------------------------------------------------
@@ -651,6 +1188,46 @@ class DeerFlowClient:
         finally:
             inner.close()
 
+    def _prepare_turn(self, message: str, thread_id: str | None, kwargs: dict) -> tuple[str, RunnableConfig, dict[str, Any], dict[str, Any]]:
+        """Build ``(thread_id, config, state, context)`` for one conversation turn."""
+        if thread_id is None:
+            thread_id = str(uuid.uuid4())
+
+        config = self._get_runnable_config(thread_id, **kwargs)
+
+        # Inject tracing callbacks and Langfuse trace metadata at the graph
+        # invocation root so the embedded client matches the gateway worker's
+        # behaviour: a single ``stream()`` produces one trace with all node /
+        # LLM / tool calls nested under it, and the trace carries the reserved
+        # ``langfuse_session_id`` / ``langfuse_user_id`` keys that the Langfuse
+        # CallbackHandler lifts onto the root trace's ``sessionId`` / ``userId``.
+        tracing_callbacks = build_tracing_callbacks()
+        if tracing_callbacks:
+            existing_callbacks = list(config.get("callbacks") or [])
+            config["callbacks"] = [*existing_callbacks, *tracing_callbacks]
+
+        configurable = config.get("configurable") or {}
+        deerflow_trace_id = get_current_trace_id()
+        inject_langfuse_metadata(
+            config,
+            thread_id=thread_id,
+            user_id=get_effective_user_id(),
+            assistant_id=self._agent_name or "lead-agent",
+            model_name=configurable.get("model_name") or self._model_name,
+            environment=self._environment or os.environ.get("DEER_FLOW_ENV") or os.environ.get("ENVIRONMENT"),
+            deerflow_trace_id=deerflow_trace_id,
+        )
+
+        run_id = str(uuid.uuid4())
+        state: dict[str, Any] = {"messages": [HumanMessage(content=message, additional_kwargs={"run_id": run_id})]}
+        context = {"thread_id": thread_id, "run_id": run_id}
+        if deerflow_trace_id:
+            context[DEERFLOW_TRACE_METADATA_KEY] = deerflow_trace_id
+        if self._agent_name:
+            context["agent_name"] = self._agent_name
+
+        return thread_id, config, state, context
+
     def _stream_without_trace_context(
         self,
         message: str,
@@ -693,8 +1270,8 @@ class DeerFlowClient:
         * ``run_agent`` is ``async def`` and uses ``agent.astream()``;
           this method is a sync generator using ``agent.stream()`` so
           callers can write ``for event in client.stream(...)`` without
-          touching asyncio.  Bridging the two would require spinning up
-          an event loop + thread per call.
+          touching asyncio.  Async callers use :meth:`astream`, which
+          runs ``agent.astream()`` on the client's own event loop.
         * Gateway events are JSON-serialized by ``serialize()`` for SSE
           wire transmission.  This client yields in-process stream event
           payloads directly as Python data structures (``StreamEvent``
@@ -732,224 +1309,22 @@ class DeerFlowClient:
             - type="messages-tuple"  data={"type": "tool", "content": str, "name": str, "tool_call_id": str, "id": str}
             - type="end"             data={"usage": {"input_tokens": int, "output_tokens": int, "total_tokens": int}}
         """
-        if thread_id is None:
-            thread_id = str(uuid.uuid4())
-
-        config = self._get_runnable_config(thread_id, **kwargs)
-
-        # Inject tracing callbacks and Langfuse trace metadata at the graph
-        # invocation root so the embedded client matches the gateway worker's
-        # behaviour: a single ``stream()`` produces one trace with all node /
-        # LLM / tool calls nested under it, and the trace carries the reserved
-        # ``langfuse_session_id`` / ``langfuse_user_id`` keys that the Langfuse
-        # CallbackHandler lifts onto the root trace's ``sessionId`` / ``userId``.
-        tracing_callbacks = build_tracing_callbacks()
-        if tracing_callbacks:
-            existing_callbacks = list(config.get("callbacks") or [])
-            config["callbacks"] = [*existing_callbacks, *tracing_callbacks]
-
-        configurable = config.get("configurable") or {}
-        deerflow_trace_id = get_current_trace_id()
-        inject_langfuse_metadata(
-            config,
-            thread_id=thread_id,
-            user_id=get_effective_user_id(),
-            assistant_id=self._agent_name or "lead-agent",
-            model_name=configurable.get("model_name") or self._model_name,
-            environment=self._environment or os.environ.get("DEER_FLOW_ENV") or os.environ.get("ENVIRONMENT"),
-            deerflow_trace_id=deerflow_trace_id,
-        )
-
+        thread_id, config, state, context = self._prepare_turn(message, thread_id, kwargs)
         self._ensure_agent(config)
+        self._record_thread(thread_id)
 
-        run_id = str(uuid.uuid4())
-        state: dict[str, Any] = {"messages": [HumanMessage(content=message, additional_kwargs={"run_id": run_id})]}
-        context = {"thread_id": thread_id, "run_id": run_id}
-        if deerflow_trace_id:
-            context[DEERFLOW_TRACE_METADATA_KEY] = deerflow_trace_id
-        if self._agent_name:
-            context["agent_name"] = self._agent_name
-
-        seen_ids: set[str] = set()
-        # Cross-mode handoff: ids already streamed via LangGraph ``messages``
-        # mode so the ``values`` path skips re-synthesis of the same message.
-        streamed_ids: set[str] = set()
-        # The same message id carries identical cumulative ``usage_metadata``
-        # in both the final ``messages`` chunk and the values snapshot —
-        # count it only on whichever arrives first.
-        counted_usage_ids: set[str] = set()
-        sent_additional_kwargs_by_id: dict[str, dict[str, Any]] = {}
-        cumulative_usage: dict[str, int] = {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0}
-
-        def _account_usage(msg_id: str | None, usage: Any) -> dict | None:
-            """Add *usage* to cumulative totals if this id has not been counted.
-
-            ``usage`` is a ``langchain_core.messages.UsageMetadata`` TypedDict
-            or ``None``; typed as ``Any`` because TypedDicts are not
-            structurally assignable to plain ``dict`` under strict type
-            checking.  Returns the normalized usage dict (for attaching
-            to an event) when we accepted it, otherwise ``None``.
-            """
-            if not usage:
-                return None
-            if msg_id and msg_id in counted_usage_ids:
-                return None
-            if msg_id:
-                counted_usage_ids.add(msg_id)
-            input_tokens = usage.get("input_tokens", 0) or 0
-            output_tokens = usage.get("output_tokens", 0) or 0
-            total_tokens = usage.get("total_tokens", 0) or 0
-            cumulative_usage["input_tokens"] += input_tokens
-            cumulative_usage["output_tokens"] += output_tokens
-            cumulative_usage["total_tokens"] += total_tokens
-            return {
-                "input_tokens": input_tokens,
-                "output_tokens": output_tokens,
-                "total_tokens": total_tokens,
-            }
-
-        def _unsent_additional_kwargs(msg_id: str | None, additional_kwargs: dict[str, Any] | None) -> dict[str, Any] | None:
-            if not additional_kwargs:
-                return None
-            if not msg_id:
-                return additional_kwargs
-
-            sent = sent_additional_kwargs_by_id.setdefault(msg_id, {})
-            delta = {key: value for key, value in additional_kwargs.items() if sent.get(key) != value}
-            if not delta:
-                return None
-
-            sent.update(delta)
-            return delta
-
+        translator = _StreamTranslator()
         for item in self._agent.stream(
             state,
             config=config,
             context=context,
             stream_mode=["values", "messages", "custom"],
         ):
-            if isinstance(item, tuple) and len(item) == 2:
-                mode, chunk = item
-                mode = str(mode)
-            else:
-                mode, chunk = "values", item
+            yield from translator.feed(item)
 
-            if mode == "custom":
-                yield StreamEvent(type="custom", data=chunk)
-                continue
-
-            if mode == "messages":
-                # LangGraph ``messages`` mode emits ``(message_chunk, metadata)``.
-                if isinstance(chunk, tuple) and len(chunk) == 2:
-                    msg_chunk, _metadata = chunk
-                else:
-                    msg_chunk = chunk
-
-                msg_id = getattr(msg_chunk, "id", None)
-
-                if isinstance(msg_chunk, AIMessage):
-                    text = self._extract_text(msg_chunk.content)
-                    additional_kwargs = self._serialize_additional_kwargs(msg_chunk)
-                    counted_usage = _account_usage(msg_id, msg_chunk.usage_metadata)
-                    sent_additional_kwargs = False
-
-                    if text:
-                        if msg_id:
-                            streamed_ids.add(msg_id)
-                        additional_kwargs_delta = _unsent_additional_kwargs(msg_id, additional_kwargs)
-                        yield self._ai_text_event(
-                            msg_id,
-                            text,
-                            counted_usage,
-                            additional_kwargs_delta,
-                        )
-                        sent_additional_kwargs = bool(additional_kwargs_delta)
-
-                    if msg_chunk.tool_calls:
-                        if msg_id:
-                            streamed_ids.add(msg_id)
-                        additional_kwargs_delta = None if sent_additional_kwargs else _unsent_additional_kwargs(msg_id, additional_kwargs)
-                        yield self._ai_tool_calls_event(
-                            msg_id,
-                            msg_chunk.tool_calls,
-                            additional_kwargs_delta,
-                        )
-
-                elif isinstance(msg_chunk, ToolMessage):
-                    if msg_id:
-                        streamed_ids.add(msg_id)
-                    yield self._tool_message_event(msg_chunk)
-                continue
-
-            # mode == "values"
-            messages = chunk.get("messages", [])
-
-            for msg in messages:
-                msg_id = getattr(msg, "id", None)
-                if msg_id and msg_id in seen_ids:
-                    continue
-                if msg_id:
-                    seen_ids.add(msg_id)
-
-                # Already streamed via ``messages`` mode; only (defensively)
-                # capture usage here and skip re-synthesizing the event.
-                if msg_id and msg_id in streamed_ids:
-                    if isinstance(msg, AIMessage):
-                        _account_usage(msg_id, getattr(msg, "usage_metadata", None))
-                        additional_kwargs = self._serialize_additional_kwargs(msg)
-                        additional_kwargs_delta = _unsent_additional_kwargs(msg_id, additional_kwargs)
-                        if additional_kwargs_delta:
-                            # Metadata-only follow-up: ``messages-tuple`` has no
-                            # dedicated attribution event, so clients should
-                            # merge this empty-content AI event by message id
-                            # and ignore it for text rendering.
-                            yield self._ai_text_event(msg_id, "", None, additional_kwargs_delta)
-                    continue
-
-                if isinstance(msg, AIMessage):
-                    counted_usage = _account_usage(msg_id, msg.usage_metadata)
-                    additional_kwargs = self._serialize_additional_kwargs(msg)
-                    sent_additional_kwargs = False
-
-                    if msg.tool_calls:
-                        additional_kwargs_delta = _unsent_additional_kwargs(msg_id, additional_kwargs)
-                        yield self._ai_tool_calls_event(
-                            msg_id,
-                            msg.tool_calls,
-                            additional_kwargs_delta,
-                        )
-                        sent_additional_kwargs = bool(additional_kwargs_delta)
-
-                    text = self._extract_text(msg.content)
-                    if text:
-                        additional_kwargs_delta = None if sent_additional_kwargs else _unsent_additional_kwargs(msg_id, additional_kwargs)
-                        yield self._ai_text_event(
-                            msg_id,
-                            text,
-                            counted_usage,
-                            additional_kwargs_delta,
-                        )
-                    elif msg_id:
-                        additional_kwargs_delta = None if sent_additional_kwargs else _unsent_additional_kwargs(msg_id, additional_kwargs)
-                        if not additional_kwargs_delta:
-                            continue
-                        # See the metadata-only follow-up convention above.
-                        yield self._ai_text_event(msg_id, "", None, additional_kwargs_delta)
-
-                elif isinstance(msg, ToolMessage):
-                    yield self._tool_message_event(msg)
-
-            # Emit a values event for each state snapshot
-            yield StreamEvent(
-                type="values",
-                data={
-                    "title": chunk.get("title"),
-                    "messages": [self._serialize_message(m) for m in messages],
-                    "artifacts": chunk.get("artifacts", []),
-                },
-            )
-
-        yield StreamEvent(type="end", data={"usage": cumulative_usage})
+        if translator.title:
+            self._record_thread(thread_id, title=translator.title)
+        yield translator.end()
 
     def chat(self, message: str, *, thread_id: str | None = None, **kwargs) -> str:
         """Send a message and return the final text response.
@@ -983,6 +1358,93 @@ class DeerFlowClient:
                     last_id = msg_id
         return "".join(chunks.get(last_id, ()))
 
+    async def astream(
+        self,
+        message: str,
+        *,
+        thread_id: str | None = None,
+        **kwargs,
+    ) -> AsyncGenerator[StreamEvent, None]:
+        """Async variant of :meth:`stream`; yields the same events.
+
+        The run executes with ``agent.astream()`` on the client's event loop,
+        where the async checkpointer and its connection pool stay open across
+        calls, and events are handed to the caller's loop as they are
+        produced. Breaking out of the ``async for`` cancels the run.
+
+        Trace correlation follows :meth:`stream`. The run happens in a copy
+        of the caller's context, so the trace id bound for it never leaks
+        back to the caller.
+        """
+        trace_id = (get_current_trace_id() or generate_trace_id()) if is_trace_correlation_enabled(self._app_config) else None
+
+        caller_loop = asyncio.get_running_loop()
+        queue: asyncio.Queue[tuple[str, Any]] = asyncio.Queue()
+
+        def hand_over(kind: str, payload: Any = None) -> None:
+            try:
+                caller_loop.call_soon_threadsafe(queue.put_nowait, (kind, payload))
+            except RuntimeError:
+                # The caller's loop is closed; nobody is listening any more.
+                pass
+
+        async def produce() -> None:
+            if trace_id is not None:
+                set_current_trace_id(trace_id)
+            try:
+                async for event in self._astream_events(message, thread_id, kwargs):
+                    hand_over("event", event)
+            except Exception as exc:
+                hand_over("error", exc)
+            finally:
+                hand_over("done")
+
+        future = self._client_loop().submit(produce())
+        try:
+            while True:
+                kind, payload = await queue.get()
+                if kind == "event":
+                    yield payload
+                elif kind == "error":
+                    raise payload
+                else:
+                    return
+        finally:
+            future.cancel()
+
+    async def _astream_events(self, message: str, thread_id: str | None, kwargs: dict) -> AsyncGenerator[StreamEvent, None]:
+        """Body of :meth:`astream`; runs on the client loop."""
+        thread_id, config, state, context = self._prepare_turn(message, thread_id, kwargs)
+        agent = await self._aensure_agent(config)
+        await self._arecord_thread(thread_id)
+
+        translator = _StreamTranslator()
+        async for item in agent.astream(
+            state,
+            config=config,
+            context=context,
+            stream_mode=["values", "messages", "custom"],
+        ):
+            for event in translator.feed(item):
+                yield event
+
+        if translator.title:
+            await self._arecord_thread(thread_id, title=translator.title)
+        yield translator.end()
+
+    async def achat(self, message: str, *, thread_id: str | None = None, **kwargs) -> str:
+        """Async variant of :meth:`chat`, built on :meth:`astream`."""
+        chunks: dict[str, list[str]] = {}
+        last_id: str = ""
+        async for event in self.astream(message, thread_id=thread_id, **kwargs):
+            if event.type == "messages-tuple" and event.data.get("type") == "ai":
+                msg_id = event.data.get("id") or ""
+                delta = event.data.get("content", "")
+                if delta:
+                    chunks.setdefault(msg_id, []).append(delta)
+                    last_id = msg_id
+        return "".join(chunks.get(last_id, ()))
+
     # ------------------------------------------------------------------
     # Public API — configuration queries
     # ------------------------------------------------------------------
@@ -4,10 +4,13 @@ import logging
 import shlex
 import threading
 import uuid
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 
 from agent_sandbox import Sandbox as AioSandboxClient
 from agent_sandbox.core.api_error import ApiError
 
+from deerflow.community.aio_sandbox.remote_grep import build_grep_command, is_unsupported_output, parse_grep_output
 from deerflow.config.paths import VIRTUAL_PATH_PREFIX
 from deerflow.sandbox.sandbox import Sandbox, _validate_extra_env
 from deerflow.sandbox.search import GrepMatch, path_matches, should_ignore_path, truncate_line
@@ -57,6 +60,9 @@ class AioSandbox(Sandbox):
         # Set to True after bash.exec answers 404 (image predates /v1/bash/*),
         # so later env-bearing calls fail fast instead of re-hitting HTTP (#3921).
         self._bash_exec_unsupported = False
+        # Set to True once the image turns out unable to run the in-sandbox
+        # grep (no python3), so grep goes straight to the file API.
+        self._remote_grep_unsupported = False
 
     @property
     def base_url(self) -> str:
@@ -361,14 +367,34 @@ class AioSandbox(Sandbox):
         with self._lock:
             try:
                 if append:
-                    existing = self.read_file(path)
-                    if not existing.startswith("Error:"):
-                        content = existing + content
-                self._client.file.write_file(file=path, content=content)
+                    # The file API appends in place: only the new text travels.
+                    self._client.file.write_file(file=path, content=content, append=True)
+                else:
+                    self._client.file.write_file(file=path, content=content)
             except Exception as e:
                 logger.error(f"Failed to write file in sandbox: {e}")
                 raise
 
+    # Concurrent file-API writes in one write_files batch.
+    _WRITE_FILES_CONCURRENCY = 8
+
+    def write_files(self, files: Mapping[str, str]) -> None:
+        """Write several files with concurrent file-API requests.
+
+        The file API is stateless, so unlike shell commands these need not
+        be serialized behind the session lock.
+        """
+
+        def write(item: tuple[str, str]) -> None:
+            self._client.file.write_file(file=item[0], content=item[1])
+
+        with ThreadPoolExecutor(max_workers=self._WRITE_FILES_CONCURRENCY, thread_name_prefix="aio-write") as pool:
+            try:
+                list(pool.map(write, files.items()))
+            except Exception as e:
+                logger.error(f"Failed to write files in sandbox: {e}")
+                raise
+
     def glob(self, path: str, pattern: str, *, include_dirs: bool = False, max_results: int = 200) -> tuple[list[str], bool]:
         if not include_dirs:
             result = self._client.file.find_files(path=path, glob=pattern)
@@ -394,6 +420,9 @@ class AioSandbox(Sandbox):
                     return matches, True
         return matches, False
 
+    # Concurrent file-API searches when the image cannot run the in-sandbox grep.
+    _GREP_FALLBACK_CONCURRENCY = 8
+
     def grep(
         self,
         path: str,
@@ -411,8 +440,54 @@ class AioSandbox(Sandbox):
         # (caught by grep_tool's except re.error handler) rather than a
         # generic remote API error.
         _re.compile(regex_source, 0 if case_sensitive else _re.IGNORECASE)
+
+        if not self._remote_grep_unsupported:
+            result = self._grep_in_sandbox(path, pattern, regex_source, glob=glob, literal=literal, case_sensitive=case_sensitive, max_results=max_results)
+            if result is not None:
+                return result
         regex = regex_source if case_sensitive else f"(?i){regex_source}"
+        return self._grep_via_file_api(path, regex, glob=glob, max_results=max_results)
 
+    def _grep_in_sandbox(
+        self,
+        path: str,
+        pattern: str,
+        regex_source: str,
+        *,
+        glob: str | None,
+        literal: bool,
+        case_sensitive: bool,
+        max_results: int,
+    ) -> tuple[list[GrepMatch], bool] | None:
+        """Grep with one shell call (see ``remote_grep``); ``None`` to fall back to the file API."""
+        command = build_grep_command(path, pattern, regex_source, glob=glob, literal=literal, case_sensitive=case_sensitive, max_results=max_results)
+        with self._lock:
+            try:
+                result = self._client.shell.exec_command(command=command, no_change_timeout=self._DEFAULT_NO_CHANGE_TIMEOUT)
+                output = result.data.output if result.data else ""
+            except Exception as e:
+                logger.warning(f"In-sandbox grep failed, falling back to the file API: {e}")
+                return None
+
+        parsed = parse_grep_output(output)
+        if parsed is None:
+            if is_unsupported_output(output):
+                # No usable python3 in the image: stop trying for this sandbox.
+                self._remote_grep_unsupported = True
+                logger.warning("Sandbox %s cannot run the in-sandbox grep; using per-file searches", self.id)
+            else:
+                # Anything else (a transient shell error, cut-off output) only
+                # costs this call the fast path.
+                logger.warning("In-sandbox grep returned no result, falling back to the file API for this call")
+            return None
+        if parsed.get("engine") == "missing":
+            raise FileNotFoundError(path)
+        if parsed.get("engine") == "not_a_directory":
+            raise NotADirectoryError(path)
+        matches = [GrepMatch(path=file_path, line_number=line_number, line=truncate_line(line)) for file_path, line_number, line in parsed.get("matches", [])]
+        return matches, bool(parsed.get("truncated"))
+
+    def _grep_via_file_api(self, path: str, regex: str, *, glob: str | None, max_results: int) -> tuple[list[GrepMatch], bool]:
         if glob is not None:
             find_result = self._client.file.find_files(path=path, glob=glob)
             candidate_paths = find_result.data.files if find_result.data and find_result.data.files else []
@@ -420,34 +495,35 @@ class AioSandbox(Sandbox):
             list_result = self._client.file.list_path(path=path, recursive=True, show_hidden=False)
             entries = list_result.data.files if list_result.data and list_result.data.files else []
             candidate_paths = [entry.path for entry in entries if not entry.is_directory]
+        candidate_paths = [file_path for file_path in candidate_paths if not should_ignore_path(file_path)]
 
-        matches: list[GrepMatch] = []
-        truncated = False
-
-        for file_path in candidate_paths:
-            if should_ignore_path(file_path):
-                continue
+        def search(file_path: str):
+            return self._client.file.search_in_file(file=file_path, regex=regex).data
 
-            search_result = self._client.file.search_in_file(file=file_path, regex=regex)
-            data = search_result.data
-            if data is None:
-                continue
-
-            line_numbers = data.line_numbers or []
-            matched_lines = data.matches or []
-            for line_number, line in zip(line_numbers, matched_lines):
-                matches.append(
-                    GrepMatch(
-                        path=file_path,
-                        line_number=line_number if isinstance(line_number, int) else 0,
-                        line=truncate_line(line),
-                    )
-                )
-                if len(matches) >= max_results:
-                    truncated = True
-                    return matches, truncated
+        matches: list[GrepMatch] = []
+        batch_size = self._GREP_FALLBACK_CONCURRENCY
+        with ThreadPoolExecutor(max_workers=batch_size, thread_name_prefix="aio-grep") as pool:
+            # Searches run a batch at a time, in order, so hitting max_results
+            # wastes at most one batch of requests.
+            for start in range(0, len(candidate_paths), batch_size):
+                batch = candidate_paths[start : start + batch_size]
+                for file_path, data in zip(batch, pool.map(search, batch)):
+                    if data is None:
+                        continue
+                    line_numbers = data.line_numbers or []
+                    matched_lines = data.matches or []
+                    for line_number, line in zip(line_numbers, matched_lines):
+                        matches.append(
+                            GrepMatch(
+                                path=file_path,
+                                line_number=line_number if isinstance(line_number, int) else 0,
+                                line=truncate_line(line),
+                            )
+                        )
+                        if len(matches) >= max_results:
+                            return matches, True
 
-        return matches, truncated
+        return matches, False
 
     def update_file(self, path: str, content: bytes) -> None:
         """Update a file with binary content in the sandbox.
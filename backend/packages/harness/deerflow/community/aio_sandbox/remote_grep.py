@@ -0,0 +1,197 @@
+"""Run ``AioSandbox.grep`` inside the sandbox in a single shell call.
+
+The file API can only search one file per request, so a grep over a large
+workspace used to cost one HTTP round trip per file. ``build_grep_command``
+instead builds a ``python3`` one-shot that walks the tree next to the data
+and prints every match as one JSON line. It uses ripgrep when the image has
+it and its own walker otherwise (also when rg rejects a Python-only regex
+construct). Both apply the rules of ``find_grep_matches``: the shared
+``IGNORE_PATTERNS``, no symlinks, no files over 1 MB or that look binary,
+lines over ten times the summary length skipped, plus no hidden entries, as
+the file-API listing did. ``parse_grep_output`` returns ``None`` when the
+output carries no result line (no ``python3`` in the image, shell error),
+so the caller can fall back to the file API. Only
+``is_unsupported_output`` says the image can never run the script; any
+other failure is worth retrying on the next grep.
+"""
+
+import base64
+import json
+import re
+import shlex
+
+from deerflow.sandbox.search import DEFAULT_LINE_SUMMARY_LENGTH, DEFAULT_MAX_FILE_SIZE_BYTES, IGNORE_PATTERNS
+
+RESULT_MARKER = "__DEERFLOW_GREP_RESULT__"
+
+# What a shell prints when the image has no python3 (bash: "python3: command
+# not found", dash/busybox: "python3: not found"), and what a python3 too old
+# for the script prints.
+_UNSUPPORTED_OUTPUT = re.compile(r"python3: (?:command )?not found|^\s*SyntaxError:", re.MULTILINE)
+
+# Runs in the sandbox under any python3 >= 3.8; parameters arrive as one
+# base64 JSON argument so nothing needs shell quoting.
+_SCRIPT = r"""
+import base64, fnmatch, json, os, re, shutil, subprocess, sys
+from pathlib import PurePosixPath
+
+a = json.loads(base64.b64decode(sys.argv[1]))
+root = os.path.normpath(a["root"])
+regex = re.compile(a["regex"], 0 if a["case_sensitive"] else re.IGNORECASE)
+limit = a["max_results"]
+max_line = a["max_line_chars"]
+glob = a["glob"]
+exact = set(p for p in a["ignore"] if not any(c in p for c in "*?["))
+globs = [p for p in a["ignore"] if any(c in p for c in "*?[")]
+matches = []
+
+
+def ignored(name):
+    return name.startswith(".") or name in exact or any(fnmatch.fnmatchcase(name, p) for p in globs)
+
+
+def wanted(path):
+    rel = os.path.relpath(path, root)
+    if any(ignored(part) for part in rel.split(os.sep)):
+        return False
+    if glob is None:
+        return True
+    p = PurePosixPath(rel.replace(os.sep, "/"))
+    return p.match(glob) or (glob.startswith("**/") and p.match(glob[3:]))
+
+
+def binary(path, cache={}):
+    if path not in cache:
+        try:
+            with open(path, "rb") as f:
+                cache[path] = b"\0" in f.read(8192)
+        except OSError:
+            cache[path] = True
+    return cache[path]
+
+
+def add(path, number, line):
+    if len(line) > max_line or not regex.search(line):
+        return False
+    matches.append([path, number, line[:max_line]])
+    return len(matches) >= limit
+
+
+def with_rg(rg):
+    cmd = [rg, "--json", "--no-ignore", "--no-config", "--sort", "path", "--max-filesize", str(a["max_file_size"])]
+    cmd += ["--fixed-strings"] if a["literal"] else []
+    cmd += ["--case-sensitive"] if a["case_sensitive"] else ["--ignore-case"]
+    for p in a["ignore"]:
+        cmd += ["--glob", "!" + p]
+    cmd += ["-e", a["pattern"] if a["literal"] else a["regex"], "--", root]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    done = False
+    for raw in proc.stdout:
+        event = json.loads(raw)
+        if event.get("type") != "match":
+            continue
+        data = event["data"]
+        path = data["path"].get("text") or base64.b64decode(data["path"]["bytes"]).decode("utf-8", "replace")
+        line = data["lines"].get("text") or base64.b64decode(data["lines"]["bytes"]).decode("utf-8", "replace")
+        # rg only pre-selects lines; the Python regex has the final say.
+        if wanted(path) and not binary(path) and add(path, data["line_number"], line.rstrip("\r\n")):
+            done = True
+            break
+    if done:
+        proc.kill()
+    proc.wait()
+    # Exit 2 without any output: rg rejected the regex, so walk instead.
+    return done or proc.returncode in (0, 1) or bool(matches)
+
+
+def files_in(directory):
+    # Depth-first in name order, the order ``rg --sort path`` reports in.
+    try:
+        entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+    except OSError:
+        return
+    for entry in entries:
+        if ignored(entry.name) or entry.is_symlink():
+            continue
+        if entry.is_dir():
+            yield from files_in(entry.path)
+        elif entry.is_file():
+            yield entry.path
+
+
+def with_walk():
+    for path in files_in(root):
+        if not wanted(path):
+            continue
+        try:
+            if os.path.getsize(path) > a["max_file_size"] or binary(path):
+                continue
+            with open(path, encoding="utf-8", errors="replace") as f:
+                for number, line in enumerate(f, 1):
+                    if add(path, number, line.rstrip("\r\n")):
+                        return
+        except OSError:
+            continue
+
+
+if not os.path.exists(root):
+    engine = "missing"
+elif not os.path.isdir(root):
+    engine = "not_a_directory"
+else:
+    rg = shutil.which("rg")
+    engine = "rg" if rg and with_rg(rg) else "walk"
+    if engine == "walk":
+        del matches[:]
+        with_walk()
+print(a["marker"] + json.dumps({"engine": engine, "matches": matches, "truncated": len(matches) >= limit}))
+"""
+
+
+def build_grep_command(
+    root: str,
+    pattern: str,
+    regex_source: str,
+    *,
+    glob: str | None,
+    literal: bool,
+    case_sensitive: bool,
+    max_results: int,
+) -> str:
+    """Return the shell command that greps *root* inside the sandbox."""
+    args = {
+        "root": root,
+        "pattern": pattern,
+        "regex": regex_source,
+        "glob": glob,
+        "literal": literal,
+        "case_sensitive": case_sensitive,
+        "max_results": max_results,
+        "max_file_size": DEFAULT_MAX_FILE_SIZE_BYTES,
+        "max_line_chars": DEFAULT_LINE_SUMMARY_LENGTH * 10,
+        "ignore": IGNORE_PATTERNS,
+        "marker": RESULT_MARKER,
+    }
+    encoded = base64.b64encode(json.dumps(args).encode("utf-8")).decode("ascii")
+    return f"python3 -c {shlex.quote(_SCRIPT)} {encoded} 2>&1"
+
+
+def parse_grep_output(output: object) -> dict | None:
+    """Decode the script's result line from *output*; ``None`` if there is none."""
+    if not isinstance(output, str):
+        return None
+    for line in reversed(output.splitlines()):
+        index = line.find(RESULT_MARKER)
+        if index == -1:
+            continue
+        try:
+            result = json.loads(line[index + len(RESULT_MARKER) :])
+        except ValueError:
+            return None
+        return result if isinstance(result, dict) else None
+    return None
+
+
+def is_unsupported_output(output: object) -> bool:
+    """Whether *output* shows the sandbox image cannot run the grep script at all."""
+    return isinstance(output, str) and _UNSUPPORTED_OUTPUT.search(output) is not None
@@ -22,6 +22,7 @@ import posixpath
 import re
 import shlex
 import threading
+from collections.abc import Mapping
 from typing import TYPE_CHECKING, TypeVar
 
 from deerflow.config.paths import VIRTUAL_PATH_PREFIX
@@ -222,28 +223,52 @@ class BoxliteBox(Sandbox):
     def update_file(self, path: str, content: bytes) -> None:
         self._write_bytes(self._resolve_path(path), content, append=False)
 
-    def _write_bytes(self, resolved: str, data: bytes, *, append: bool) -> None:
+    def write_files(self, files: Mapping[str, str]) -> None:
+        # Small files share one ``sh -lc`` script (one exec round trip) as
+        # long as their base64 fits in a chunk; larger ones go on their own.
+        scripts: list[str] = []
+        parents: set[str] = set()
+        pending = 0
+        for path, content in files.items():
+            resolved = self._resolve_path(path)
+            b64 = base64.b64encode(content.encode("utf-8")).decode("ascii")
+            if len(b64) > _B64_CHUNK:
+                self._write_bytes(resolved, content.encode("utf-8"), append=False)
+                continue
+            if pending + len(b64) > _B64_CHUNK:
+                self._run_batch(scripts)
+                scripts, parents, pending = [], set(), 0
+            parent = posixpath.dirname(resolved)
+            scripts.append(self._write_script(resolved, b64, ">", mkdir=parent not in parents))
+            parents.add(parent)
+            pending += len(b64)
+        self._run_batch(scripts)
+
+    def _run_batch(self, scripts: list[str]) -> None:
+        if not scripts:
+            return
+        r = self._sh(" && ".join(scripts))
+        if r.exit_code not in (0, None):
+            raise OSError(f"batched write failed: {(r.stderr or '').strip()}")
+
+    @staticmethod
+    def _write_script(resolved: str, b64: str, redir: str, *, mkdir: bool) -> str:
+        target = shlex.quote(resolved)
+        script = f"printf %s {shlex.quote(b64)} | base64 -d {redir} {target}" if b64 else f": {redir} {target}"
         parent = posixpath.dirname(resolved)
-        if parent:
-            mk = self._sh(f"mkdir -p {shlex.quote(parent)}")
-            if mk.exit_code not in (0, None):
-                raise OSError(f"cannot create parent of '{resolved}': {(mk.stderr or '').strip()}")
+        if mkdir and parent:
+            script = f"mkdir -p {shlex.quote(parent)} && {script}"
+        return script
 
+    def _write_bytes(self, resolved: str, data: bytes, *, append: bool) -> None:
+        # The parent directory is created by the first command, so a small
+        # write or append (e.g. a growing log) costs a single exec.
         b64 = base64.b64encode(data).decode("ascii")
-        if not b64:  # empty file — create/truncate without piping
-            r = self._sh(f": {'>>' if append else '>'} {shlex.quote(resolved)}")
-            if r.exit_code not in (0, None):
-                raise OSError(f"write '{resolved}' failed: {(r.stderr or '').strip()}")
-            return
-
-        first = True
-        for i in range(0, len(b64), _B64_CHUNK):
-            chunk = b64[i : i + _B64_CHUNK]
-            redir = ">>" if (append or not first) else ">"
-            r = self._sh(f"printf %s {shlex.quote(chunk)} | base64 -d {redir} {shlex.quote(resolved)}")
+        for i in range(0, max(len(b64), 1), _B64_CHUNK):
+            redir = ">>" if (append or i) else ">"
+            r = self._sh(self._write_script(resolved, b64[i : i + _B64_CHUNK], redir, mkdir=not i))
             if r.exit_code not in (0, None):
                 raise OSError(f"write '{resolved}' failed: {(r.stderr or '').strip()}")
-            first = False
 
     def download_file(self, path: str) -> bytes:
         normalized = self._guard_traversal(path)
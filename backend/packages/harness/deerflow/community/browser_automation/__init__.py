@@ -1,3 +1,4 @@
+from .host import BrowserHost, RemoteBrowserSession, RemoteBrowserSessionManager
 from .session import (
     BrowserLiveViewerError,
     BrowserSession,
@@ -12,6 +13,7 @@ from .session import (
     reset_browser_session_manager,
 )
 from .tools import (
+    avalidate_browser_url,
     browser_back_tool,
     browser_click_tool,
     browser_close_tool,
@@ -25,13 +27,17 @@ from .tools import (
 )
 
 __all__ = [
+    "BrowserHost",
     "BrowserSession",
     "BrowserSessionCapacityError",
     "BrowserSessionManager",
     "BrowserTab",
     "BrowserLiveViewerError",
     "PageSnapshot",
+    "RemoteBrowserSession",
+    "RemoteBrowserSessionManager",
     "SnapshotElement",
+    "avalidate_browser_url",
     "browser_multi_worker_error",
     "browser_back_tool",
     "browser_click_tool",
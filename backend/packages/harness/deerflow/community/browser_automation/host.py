@@ -0,0 +1,711 @@
+"""Cross-worker browser host: one process owns every Playwright session.
+
+Browser sessions hold a live Chromium process plus loop-affine Playwright
+objects, so they cannot migrate between Gateway workers, and ordinary uvicorn
+dispatch gives no ``thread_id`` affinity. With ``GATEWAY_WORKERS > 1`` every
+worker therefore talks to a single *browser host* over a Unix domain socket
+instead of launching browsers itself:
+
+* :class:`BrowserHost` wraps a regular :class:`BrowserSessionManager` (so the
+  ``max_sessions`` LRU cap and idle eviction keep their exact semantics) and
+  serves session calls as newline-delimited JSON on its private Playwright loop.
+* :class:`RemoteBrowserSessionManager` / :class:`RemoteBrowserSession` mirror
+  the local manager/session API that the tools and the Live WebSocket use.
+  Calls are multiplexed over one connection per worker; Live frames are pushed
+  back over the same connection to the viewer's ``on_frame`` callback.
+
+The host is elected lazily: the first worker that finds no listening socket
+takes a non-blocking ``flock`` on ``browser-host.lock`` next to the socket and
+starts an embedded host; the others retry the connection. When that worker
+exits the lock is released and the next caller takes over (its sessions are
+lost with it, as they would be on a single-worker restart). Operators who want
+sessions to outlive worker restarts run the host on its own with
+``python -m deerflow.community.browser_automation.host``.
+
+Leases are tied to the connection that took them: when a worker disconnects,
+the host releases its pins and detaches its Live viewers so a crashed worker
+can never wedge the session cap. The SSRF ``url_guard`` cannot cross the
+process boundary; the host applies :func:`avalidate_browser_url` (the policy
+every caller passes) whenever the caller asked for a guarded session.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import contextlib
+import dataclasses
+import hashlib
+import itertools
+import json
+import logging
+import os
+import stat
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from deerflow.config.paths import get_paths
+
+from .session import (
+    BrowserLiveViewerError,
+    BrowserSession,
+    BrowserSessionCapacityError,
+    BrowserSessionManager,
+    BrowserTab,
+    PageSnapshot,
+    SnapshotElement,
+    UrlGuard,
+    _PlaywrightLoopThread,
+)
+
+logger = logging.getLogger(__name__)
+
+# The socket lives in its own 0700 directory: ``bind()`` creates it with the
+# process umask, so a socket in a shared directory would be connectable by
+# other users until the ``chmod`` that follows.
+_SOCKET_DIR_NAME = "browser-host"
+_SOCKET_NAME = "host.sock"
+_LOCK_NAME = "browser-host.lock"
+# sun_path is 108 bytes on Linux and 104 on macOS; stay under both.
+_MAX_SOCKET_PATH_BYTES = 100
+# Full-page screenshots and Live frames travel base64-encoded on one line.
+_MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+# Live frames are lossy: drop them instead of queueing behind a slow worker.
+_FRAME_BACKLOG_LIMIT_BYTES = 4 * 1024 * 1024
+_CONNECT_TIMEOUT_S = 10.0
+_CONNECT_RETRY_DELAY_S = 0.1
+_SYNC_CALL_TIMEOUT_S = 30.0
+
+_SNAPSHOT_METHODS = frozenset({"navigate", "snapshot", "click", "type_text", "back"})
+_SESSION_METHODS = _SNAPSHOT_METHODS | {
+    "get_text",
+    "screenshot_bytes",
+    "live_frame",
+    "push_live_frame",
+    "schedule_live_frames",
+    "current_url",
+    "tabs",
+    "dispatch_input",
+    "start_screencast",
+    "stop_screencast",
+    "close",
+}
+_REMOTE_ERRORS: dict[str, type[Exception]] = {
+    "BrowserSessionCapacityError": BrowserSessionCapacityError,
+    "BrowserLiveViewerError": BrowserLiveViewerError,
+    "ValueError": ValueError,
+    "TimeoutError": TimeoutError,
+}
+
+
+def browser_host_socket_path() -> Path:
+    """Return the host socket path under the DeerFlow base dir.
+
+    Falls back to a per-base-dir name in the temp dir when the base dir is too
+    deep for a Unix socket path.
+    """
+    base_dir = get_paths().base_dir
+    path = base_dir / _SOCKET_DIR_NAME / _SOCKET_NAME
+    if len(os.fsencode(path)) <= _MAX_SOCKET_PATH_BYTES:
+        return path
+    digest = hashlib.sha256(os.fsencode(base_dir)).hexdigest()[:16]
+    return Path(tempfile.gettempdir()) / f"deerflow-browser-{digest}" / _SOCKET_NAME
+
+
+def _ensure_private_dir(directory: Path) -> None:
+    """Create *directory* as 0700, refusing one that another user controls."""
+    directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+    info = directory.lstat()
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid():
+        raise PermissionError(f"Browser host socket directory {directory} is not a directory owned by the current user")
+    if stat.S_IMODE(info.st_mode) & 0o077:
+        os.chmod(directory, 0o700)
+
+
+def browser_host_lock_path() -> Path:
+    return get_paths().base_dir / _LOCK_NAME
+
+
+def _try_lock(lock_path: Path) -> int | None:
+    """Take the host election lock without blocking; return its fd or None."""
+    import fcntl
+
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, (PageSnapshot, BrowserTab)):
+        return dataclasses.asdict(value)
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode("ascii")
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    return value
+
+
+def _decode(method: str, value: Any) -> Any:
+    if method in _SNAPSHOT_METHODS:
+        elements = [SnapshotElement(**element) for element in value.get("elements", [])]
+        return PageSnapshot(url=value["url"], title=value["title"], elements=elements)
+    if method == "tabs":
+        return [BrowserTab(**tab) for tab in value]
+    if method == "screenshot_bytes":
+        return base64.b64decode(value)
+    return value
+
+
+def _remote_error(error: dict[str, Any]) -> Exception:
+    exc_type = _REMOTE_ERRORS.get(error.get("type", ""), RuntimeError)
+    return exc_type(error.get("message", "browser host call failed"))
+
+
+def _dumps(message: dict[str, Any]) -> bytes:
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class _HostConnection:
+    """Per-worker state on the host: session handles, pins and Live streams."""
+
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        self.writer = writer
+        self.sessions: dict[int, BrowserSession] = {}
+        self.pins: list[tuple[str | None, BrowserSession]] = []
+        self.streams: dict[int, tuple[BrowserSession, Callable[[str], None]]] = {}
+        self.tasks: set[asyncio.Task] = set()
+
+    def send(self, message: dict[str, Any]) -> None:
+        if not self.writer.is_closing():
+            self.writer.write(_dumps(message))
+
+    def frame_callback(self, stream: int) -> Callable[[str], None]:
+        # Invoked on the host's Playwright loop, which is also the loop that
+        # owns this writer, so writing directly is safe.
+        def _on_frame(data: str) -> None:
+            transport = self.writer.transport
+            if transport is None or transport.get_write_buffer_size() > _FRAME_BACKLOG_LIMIT_BYTES:
+                return
+            self.send({"event": "frame", "stream": stream, "data": data})
+
+        return _on_frame
+
+
+class BrowserHost:
+    """Serve a :class:`BrowserSessionManager` to other processes over a Unix socket."""
+
+    def __init__(self, manager: BrowserSessionManager | None = None, *, socket_path: Path | None = None) -> None:
+        self._manager = manager or BrowserSessionManager(enforce_single_worker=False)
+        self._socket_path = socket_path or browser_host_socket_path()
+        self._server: asyncio.AbstractServer | None = None
+
+    @property
+    def manager(self) -> BrowserSessionManager:
+        return self._manager
+
+    @property
+    def socket_path(self) -> Path:
+        return self._socket_path
+
+    def start(self) -> None:
+        """Start listening; the server runs on the manager's Playwright loop."""
+        self._manager._ensure_loop().run_sync(self._serve(), timeout=_CONNECT_TIMEOUT_S)
+
+    async def _serve(self) -> None:
+        path = self._socket_path
+        _ensure_private_dir(path.parent)
+        # Only the election winner gets here, so a leftover socket belongs to a
+        # host that has exited.
+        with contextlib.suppress(FileNotFoundError):
+            path.unlink()
+        self._server = await asyncio.start_unix_server(self._handle_connection, path=str(path), limit=_MAX_MESSAGE_BYTES)
+        os.chmod(path, 0o600)
+        logger.info("Browser host listening on %s", path)
+
+    async def aclose(self) -> int:
+        """Stop serving and close every session; returns the number closed."""
+        return await self._manager._ensure_loop().run(self._close())
+
+    def stop(self) -> int:
+        return self._manager._ensure_loop().run_sync(self._close(), timeout=_CONNECT_TIMEOUT_S)
+
+    async def _close(self) -> int:
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+            with contextlib.suppress(FileNotFoundError):
+                self._socket_path.unlink()
+        return await self._manager.close_all_sessions()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        conn = _HostConnection(writer)
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    logger.warning("Browser host dropped a malformed request")
+                    continue
+                task = asyncio.create_task(self._dispatch(conn, request))
+                conn.tasks.add(task)
+                task.add_done_callback(conn.tasks.discard)
+        except (ConnectionError, ValueError) as exc:
+            logger.warning("Browser host connection failed: %s", exc)
+        finally:
+            await self._detach(conn)
+
+    async def _detach(self, conn: _HostConnection) -> None:
+        """Release everything a disconnected worker still held."""
+        for session, callback in conn.streams.values():
+            with contextlib.suppress(Exception):
+                await session.stop_screencast(callback)
+        conn.streams.clear()
+        pins, conn.pins = conn.pins, []
+        for thread_id, session in pins:
+            self._manager.release_session(thread_id, session)
+        conn.sessions.clear()
+        with contextlib.suppress(Exception):
+            conn.writer.close()
+
+    async def _dispatch(self, conn: _HostConnection, request: dict[str, Any]) -> None:
+        request_id = request.get("id")
+        try:
+            result = await self._handle(conn, request.get("op"), request.get("args") or {})
+        except Exception as exc:
+            conn.send({"id": request_id, "error": {"type": type(exc).__name__, "message": str(exc)}})
+        else:
+            conn.send({"id": request_id, "result": _encode(result)})
+        with contextlib.suppress(ConnectionError):
+            await conn.writer.drain()
+
+    async def _handle(self, conn: _HostConnection, op: str | None, args: dict[str, Any]) -> Any:
+        if op == "get_session":
+            return self._get_session(conn, **args)
+        if op == "release":
+            self._release(conn, args.get("thread_id"), args.get("handle"))
+            return None
+        if op == "call":
+            return await self._call(conn, args.get("handle"), args.get("method"), args.get("args") or {})
+        if op == "close_session":
+            return await self._manager.close_session(args.get("thread_id"))
+        raise ValueError(f"unknown browser host operation: {op!r}")
+
+    def _get_session(self, conn: _HostConnection, *, thread_id: str | None, guarded: bool = True, pin: bool = False, **kwargs: Any) -> int:
+        url_guard = None
+        if guarded:
+            from .tools import avalidate_browser_url
+
+            url_guard = avalidate_browser_url
+        session = self._manager.get_session(thread_id, url_guard=url_guard, pin=pin, **kwargs)
+        if pin:
+            conn.pins.append((thread_id, session))
+        # Forget handles of sessions the manager has since evicted or closed.
+        held = {id(pinned) for _, pinned in conn.pins}
+        conn.sessions = {handle: known for handle, known in conn.sessions.items() if handle in held or self._manager._owns(known)}
+        handle = id(session)
+        conn.sessions[handle] = session
+        return handle
+
+    def _release(self, conn: _HostConnection, thread_id: str | None, handle: int | None) -> None:
+        session = conn.sessions.get(handle) if handle is not None else None
+        if session is None or (thread_id, session) not in conn.pins:
+            return
+        conn.pins.remove((thread_id, session))
+        self._manager.release_session(thread_id, session)
+
+    async def _call(self, conn: _HostConnection, handle: int | None, method: str | None, args: dict[str, Any]) -> Any:
+        if method not in _SESSION_METHODS:
+            raise ValueError(f"unsupported browser session method: {method!r}")
+        session = conn.sessions.get(handle) if handle is not None else None
+        if session is None:
+            raise RuntimeError("Browser session is no longer available; retry the browser action")
+        if method == "schedule_live_frames":
+            session.schedule_live_frames()
+            return None
+        if method == "start_screencast":
+            stream = int(args["stream"])
+            callback = conn.frame_callback(stream)
+            conn.streams[stream] = (session, callback)
+            try:
+                await session.start_screencast(callback)
+            except Exception:
+                conn.streams.pop(stream, None)
+                raise
+            return None
+        if method == "stop_screencast":
+            stream = args.get("stream")
+            if stream is None:
+                for other, (owner, _) in list(conn.streams.items()):
+                    if owner is session:
+                        conn.streams.pop(other, None)
+                await session.stop_screencast()
+                return None
+            entry = conn.streams.pop(int(stream), None)
+            if entry is not None:
+                await session.stop_screencast(entry[1])
+            return None
+        return await getattr(session, method)(**args)
+
+
+class RemoteBrowserSession:
+    """Worker-side proxy for a :class:`BrowserSession` living in the browser host."""
+
+    def __init__(self, manager: RemoteBrowserSessionManager, thread_id: str, handle: int) -> None:
+        self._manager = manager
+        self._thread_id = thread_id
+        self._handle = handle
+
+    async def _invoke(self, method: str, **args: Any) -> Any:
+        value = await self._manager._call("call", {"handle": self._handle, "method": method, "args": args})
+        return _decode(method, value)
+
+    async def navigate(self, url: str) -> PageSnapshot:
+        return await self._invoke("navigate", url=url)
+
+    async def snapshot(self) -> PageSnapshot:
+        return await self._invoke("snapshot")
+
+    async def click(self, ref: int) -> PageSnapshot:
+        return await self._invoke("click", ref=ref)
+
+    async def type_text(self, ref: int, text: str, submit: bool = False) -> PageSnapshot:
+        return await self._invoke("type_text", ref=ref, text=text, submit=submit)
+
+    async def get_text(self, max_chars: int = 8000) -> str:
+        return await self._invoke("get_text", max_chars=max_chars)
+
+    async def screenshot_bytes(self, full_page: bool = False) -> bytes:
+        return await self._invoke("screenshot_bytes", full_page=full_page)
+
+    async def live_frame(self) -> str:
+        return await self._invoke("live_frame")
+
+    async def push_live_frame(self) -> None:
+        await self._invoke("push_live_frame")
+
+    def schedule_live_frames(self) -> None:
+        self._manager._submit("call", {"handle": self._handle, "method": "schedule_live_frames", "args": {}})
+
+    async def back(self) -> PageSnapshot:
+        return await self._invoke("back")
+
+    async def current_url(self) -> str | None:
+        return await self._invoke("current_url")
+
+    async def tabs(self) -> list[BrowserTab]:
+        return await self._invoke("tabs")
+
+    async def start_screencast(self, on_frame: Callable[[str], None]) -> None:
+        stream = self._manager._register_stream(on_frame)
+        try:
+            await self._invoke("start_screencast", stream=stream)
+        except BaseException:
+            self._manager._unregister_stream(stream)
+            raise
+
+    async def stop_screencast(self, on_frame: Callable[[str], None] | None = None) -> None:
+        stream = None
+        if on_frame is not None:
+            stream = self._manager._stream_for(on_frame)
+            if stream is None:
+                return
+        try:
+            await self._invoke("stop_screencast", stream=stream)
+        finally:
+            if stream is not None:
+                self._manager._unregister_stream(stream)
+
+    async def dispatch_input(self, event: dict) -> None:
+        await self._invoke("dispatch_input", event=event)
+
+    async def close(self) -> None:
+        await self._invoke("close")
+
+
+class RemoteBrowserSessionManager:
+    """Drop-in :class:`BrowserSessionManager` that routes to the browser host.
+
+    Every worker holds one multiplexed connection, driven by a private daemon
+    loop so callers on any event loop (Gateway, TUI, tests) can share it.
+    Session construction on the host is lazy, so ``get_session`` never waits
+    on a browser launch, but it still blocks its caller for a socket round
+    trip (and, on the first call, a host election); async callers use
+    ``aget_session`` / ``aacquire_session``.
+    """
+
+    def __init__(self, *, socket_path: Path | None = None, lock_path: Path | None = None) -> None:
+        self._socket_path = socket_path or browser_host_socket_path()
+        self._lock_path = lock_path or browser_host_lock_path()
+        self._loop: _PlaywrightLoopThread | None = None
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._streams: dict[int, Callable[[str], None]] = {}
+        # The live connection's writer and its in-flight requests by id.
+        self._conn: tuple[asyncio.StreamWriter, dict[int, asyncio.Future]] | None = None
+        self._reader_task: asyncio.Task | None = None
+        self._connect_lock: asyncio.Lock | None = None
+        self._host: BrowserHost | None = None
+        self._host_lock_fd: int | None = None
+
+    @property
+    def hosting(self) -> bool:
+        """Whether this process won the election and runs the embedded host."""
+        return self._host is not None
+
+    def _ensure_loop(self) -> _PlaywrightLoopThread:
+        with self._lock:
+            if self._loop is None:
+                self._loop = _PlaywrightLoopThread()
+            return self._loop
+
+    def _try_become_host(self) -> bool:
+        if self._host is not None:
+            return False
+        fd = _try_lock(self._lock_path)
+        if fd is None:
+            return False
+        host = BrowserHost(socket_path=self._socket_path)
+        try:
+            host.start()
+        except Exception:
+            os.close(fd)
+            raise
+        self._host, self._host_lock_fd = host, fd
+        logger.info("This worker (pid %s) now hosts the shared browser sessions", os.getpid())
+        return True
+
+    def _live_connection(self) -> tuple[asyncio.StreamWriter, dict[int, asyncio.Future]] | None:
+        conn = self._conn
+        return conn if conn is not None and not conn[0].is_closing() else None
+
+    async def _connection(self) -> tuple[asyncio.StreamWriter, dict[int, asyncio.Future]]:
+        if (conn := self._live_connection()) is not None:
+            return conn
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if (conn := self._live_connection()) is not None:
+                return conn
+            deadline = time.monotonic() + _CONNECT_TIMEOUT_S
+            while True:
+                try:
+                    reader, writer = await asyncio.open_unix_connection(str(self._socket_path), limit=_MAX_MESSAGE_BYTES)
+                    break
+                except OSError as exc:
+                    if await asyncio.to_thread(self._try_become_host):
+                        continue
+                    if time.monotonic() >= deadline:
+                        raise RuntimeError(f"Browser host is not reachable at {self._socket_path}: {exc}") from exc
+                    await asyncio.sleep(_CONNECT_RETRY_DELAY_S)
+            conn = (writer, {})
+            self._conn = conn
+            self._reader_task = asyncio.create_task(self._read_responses(reader, conn))
+            return conn
+
+    async def _read_responses(self, reader: asyncio.StreamReader, conn: tuple[asyncio.StreamWriter, dict[int, asyncio.Future]]) -> None:
+        writer, pending = conn
+        try:
+            while line := await reader.readline():
+                message = json.loads(line)
+                if message.get("event") == "frame":
+                    with self._lock:
+                        on_frame = self._streams.get(message.get("stream"))
+                    if on_frame is not None:
+                        try:
+                            on_frame(message.get("data", ""))
+                        except Exception:
+                            logger.debug("browser live frame callback failed", exc_info=True)
+                    continue
+                future = pending.pop(message.get("id"), None)
+                if future is None or future.done():
+                    continue
+                if "error" in message:
+                    future.set_exception(_remote_error(message["error"]))
+                else:
+                    future.set_result(message.get("result"))
+        except (ConnectionError, ValueError) as exc:
+            logger.warning("Browser host connection lost: %s", exc)
+        finally:
+            if self._conn is conn:
+                self._conn = None
+            with contextlib.suppress(Exception):
+                writer.close()
+            for future in list(pending.values()):
+                if not future.done():
+                    future.set_exception(ConnectionError("Browser host connection closed"))
+            # Live viewers die with the connection; the host detaches them too.
+            with self._lock:
+                self._streams.clear()
+
+    async def _request(self, op: str, args: dict[str, Any]) -> Any:
+        writer, pending = await self._connection()
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        pending[request_id] = future
+        try:
+            writer.write(_dumps({"id": request_id, "op": op, "args": args}))
+            await writer.drain()
+            return await future
+        finally:
+            pending.pop(request_id, None)
+
+    async def _call(self, op: str, args: dict[str, Any]) -> Any:
+        return await self._ensure_loop().run(self._request(op, args))
+
+    def _call_sync(self, op: str, args: dict[str, Any]) -> Any:
+        return self._ensure_loop().run_sync(self._request(op, args), timeout=_SYNC_CALL_TIMEOUT_S)
+
+    def _submit(self, op: str, args: dict[str, Any]) -> None:
+        self._ensure_loop().submit(self._request(op, args))
+
+    def _register_stream(self, on_frame: Callable[[str], None]) -> int:
+        stream = next(self._ids)
+        with self._lock:
+            self._streams[stream] = on_frame
+        return stream
+
+    def _unregister_stream(self, stream: int) -> None:
+        with self._lock:
+            self._streams.pop(stream, None)
+
+    def _stream_for(self, on_frame: Callable[[str], None]) -> int | None:
+        with self._lock:
+            return next((stream for stream, callback in self._streams.items() if callback is on_frame), None)
+
+    def get_session(
+        self,
+        thread_id: str | None,
+        *,
+        headless: bool = True,
+        timeout_ms: int = 30000,
+        viewport: dict[str, int] | None = None,
+        cdp_url: str | None = None,
+        allow_unguarded_cdp: bool = False,
+        url_guard: UrlGuard | None = None,
+        pin: bool = False,
+    ) -> RemoteBrowserSession:
+        key = thread_id or "default"
+        handle = self._call_sync("get_session", _session_args(key, headless, timeout_ms, viewport, cdp_url, allow_unguarded_cdp, url_guard, pin))
+        return RemoteBrowserSession(self, key, handle)
+
+    async def aget_session(
+        self,
+        thread_id: str | None,
+        *,
+        headless: bool = True,
+        timeout_ms: int = 30000,
+        viewport: dict[str, int] | None = None,
+        cdp_url: str | None = None,
+        allow_unguarded_cdp: bool = False,
+        url_guard: UrlGuard | None = None,
+        pin: bool = False,
+    ) -> RemoteBrowserSession:
+        """Async counterpart of :meth:`get_session` that never blocks the caller's loop."""
+        key = thread_id or "default"
+        handle = await self._call("get_session", _session_args(key, headless, timeout_ms, viewport, cdp_url, allow_unguarded_cdp, url_guard, pin))
+        return RemoteBrowserSession(self, key, handle)
+
+    @contextlib.contextmanager
+    def acquire_session(self, thread_id: str | None, **kwargs: Any):
+        """Acquire an atomically pinned session for one browser operation."""
+        key = thread_id or "default"
+        session = self.get_session(key, pin=True, **kwargs)
+        try:
+            yield session
+        finally:
+            self.release_session(key, session)
+
+    @contextlib.asynccontextmanager
+    async def aacquire_session(self, thread_id: str | None, **kwargs: Any):
+        """Async counterpart of :meth:`acquire_session`."""
+        key = thread_id or "default"
+        session = await self.aget_session(key, pin=True, **kwargs)
+        try:
+            yield session
+        finally:
+            self.release_session(key, session)
+
+    def release_session(self, thread_id: str | None, session: RemoteBrowserSession) -> None:
+        self._submit("release", {"thread_id": thread_id or "default", "handle": session._handle})
+
+    async def close_session(self, thread_id: str | None) -> bool:
+        return await self._call("close_session", {"thread_id": thread_id or "default"})
+
+    async def close_all_sessions(self) -> int:
+        """Disconnect from the host; close every session only if we host them.
+
+        Called on worker shutdown, where the other workers' sessions must
+        survive unless they live in this process anyway.
+        """
+        closed = 0
+        if self._host is not None:
+            closed = await self._host.aclose()
+            self._host = None
+            if self._host_lock_fd is not None:
+                os.close(self._host_lock_fd)
+                self._host_lock_fd = None
+        if self._loop is not None:
+            await self._loop.run(self._disconnect())
+        return closed
+
+    async def _disconnect(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            writer = conn[0]
+            writer.close()
+            with contextlib.suppress(Exception):
+                await writer.wait_closed()
+
+
+def _session_args(
+    thread_id: str,
+    headless: bool,
+    timeout_ms: int,
+    viewport: dict[str, int] | None,
+    cdp_url: str | None,
+    allow_unguarded_cdp: bool,
+    url_guard: UrlGuard | None,
+    pin: bool,
+) -> dict[str, Any]:
+    return {
+        "thread_id": thread_id,
+        "headless": headless,
+        "timeout_ms": timeout_ms,
+        "viewport": viewport,
+        "cdp_url": cdp_url,
+        "allow_unguarded_cdp": allow_unguarded_cdp,
+        "guarded": url_guard is not None,
+        "pin": pin,
+    }
+
+
+def main() -> None:
+    """Run a standalone browser host until interrupted."""
+    import signal
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    lock_fd = _try_lock(browser_host_lock_path())
+    if lock_fd is None:
+        raise SystemExit(f"Another browser host already holds {browser_host_lock_path()}")
+    host = BrowserHost()
+    host.start()
+    stopped = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stopped.set())
+    stopped.wait()
+    closed = host.stop()
+    logger.info("Browser host stopped; closed %d session(s)", closed)
+    os.close(lock_fd)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,10 @@ tools await the result via :func:`asyncio.wrap_future`.
 
 Playwright itself is an optional dependency — it is imported lazily inside the
 private loop so the core harness installs without it.
+
+Sessions are process-local. With ``GATEWAY_WORKERS > 1``,
+:func:`get_browser_session_manager` returns a proxy that routes every call to a
+single browser host process (see :mod:`.host`), which owns all sessions.
 """
 
 from __future__ import annotations
@@ -17,11 +21,12 @@ from __future__ import annotations
 import asyncio
 import base64
 import contextlib
+import inspect
 import logging
 import os
 import threading
 import time
-from collections.abc import Callable, Coroutine
+from collections.abc import Awaitable, Callable, Coroutine
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any, TypeVar
 from urllib.parse import urlparse
@@ -29,10 +34,17 @@ from urllib.parse import urlparse
 if TYPE_CHECKING:
     from playwright.async_api import Browser, BrowserContext, Page, Playwright
 
+    from .host import RemoteBrowserSessionManager
+
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
+# SSRF guard for browser requests: returns an error string to block a URL or
+# ``None`` to allow it. May be a coroutine function so DNS screening does not
+# block the Playwright loop.
+UrlGuard = Callable[[str], "str | None | Awaitable[str | None]"]
+
 # Element roles/tags treated as interactive when building a page snapshot. The
 # model addresses elements by the ``data-df-ref`` index this snapshot stamps, so
 # it never has to guess a CSS selector or hold a stale element handle.
@@ -140,23 +152,32 @@ _DEFAULT_MAX_SESSIONS = 32
 _DEFAULT_IDLE_TIMEOUT_S = 30 * 60.0
 
 
+def _gateway_workers() -> int:
+    try:
+        return int(os.environ.get("GATEWAY_WORKERS", "1"))
+    except (TypeError, ValueError):
+        return 1
+
+
+def _browser_host_supported() -> bool:
+    """Whether sessions can be shared through the Unix-socket browser host."""
+    return os.name == "posix"
+
+
 def browser_multi_worker_error(workers: int | None = None) -> str | None:
-    """Return the fail-closed reason for process-local browser sessions."""
+    """Return the fail-closed reason when workers cannot share browser sessions."""
     if workers is None:
-        try:
-            workers = int(os.environ.get("GATEWAY_WORKERS", "1"))
-        except (TypeError, ValueError):
-            workers = 1
-    if workers <= 1:
+        workers = _gateway_workers()
+    if workers <= 1 or _browser_host_supported():
         return None
-    return f"GATEWAY_WORKERS={workers} cannot enable agentic browser tools: browser sessions are process-local and uvicorn does not provide thread affinity. Set GATEWAY_WORKERS=1 or disable the browser_navigate tool."
+    return f"GATEWAY_WORKERS={workers} cannot enable agentic browser tools: browser sessions are process-local and the shared browser host needs Unix domain sockets. Set GATEWAY_WORKERS=1 or disable the browser_navigate tool."
 
 
 def ensure_browser_worker_compatibility() -> None:
-    """Reject runtime browser use when requests can land in another worker."""
-    error = browser_multi_worker_error()
-    if error is not None:
-        raise RuntimeError(error)
+    """Reject process-local browser use when requests can land in another worker."""
+    workers = _gateway_workers()
+    if workers > 1:
+        raise RuntimeError(f"GATEWAY_WORKERS={workers}: browser sessions are process-local and uvicorn does not provide thread affinity; use get_browser_session_manager(), which routes through the shared browser host.")
 
 
 class BrowserSessionCapacityError(RuntimeError):
@@ -265,7 +286,7 @@ class BrowserSession:
         timeout_ms: int,
         viewport: dict[str, int],
         cdp_url: str | None = None,
-        url_guard: Callable[[str], str | None] | None = None,
+        url_guard: UrlGuard | None = None,
         on_activity: Callable[[], None] | None = None,
     ) -> None:
         self._loop = loop
@@ -441,7 +462,12 @@ class BrowserSession:
             url = ""
             with contextlib.suppress(Exception):
                 url = route.request.url
-            if url.startswith(("http://", "https://")) and guard(url) is not None:
+            verdict = None
+            if url.startswith(("http://", "https://")):
+                verdict = guard(url)
+                if inspect.isawaitable(verdict):
+                    verdict = await verdict
+            if verdict is not None:
                 logger.warning("browser request blocked by SSRF guard: %s", redact_browser_url(url))
                 with contextlib.suppress(Exception):
                     await route.abort("blockedbyclient")
@@ -845,9 +871,20 @@ class BrowserSessionManager:
     is pinned, a new thread is rejected instead of exceeding ``max_sessions``.
     Eviction is fire-and-forget on the private Playwright loop so it never
     blocks the caller; the just-requested thread is always kept.
+
+    ``enforce_single_worker`` refuses use under ``GATEWAY_WORKERS > 1``; the
+    browser host, the one process that owns sessions for every worker, turns it
+    off.
     """
 
-    def __init__(self, *, max_sessions: int = _DEFAULT_MAX_SESSIONS, idle_timeout_s: float = _DEFAULT_IDLE_TIMEOUT_S) -> None:
+    def __init__(
+        self,
+        *,
+        max_sessions: int = _DEFAULT_MAX_SESSIONS,
+        idle_timeout_s: float = _DEFAULT_IDLE_TIMEOUT_S,
+        enforce_single_worker: bool = True,
+    ) -> None:
+        self._enforce_single_worker = enforce_single_worker
         self._loop: _PlaywrightLoopThread | None = None
         self._sessions: dict[str, BrowserSession] = {}
         self._last_used: dict[str, float] = {}
@@ -865,6 +902,10 @@ class BrowserSessionManager:
             self._loop = _PlaywrightLoopThread()
         return self._loop
 
+    def _owns(self, session: BrowserSession) -> bool:
+        with self._lock:
+            return any(known is session for known in self._sessions.values())
+
     def get_session(
         self,
         thread_id: str | None,
@@ -874,10 +915,11 @@ class BrowserSessionManager:
         viewport: dict[str, int] | None = None,
         cdp_url: str | None = None,
         allow_unguarded_cdp: bool = False,
-        url_guard: Callable[[str], str | None] | None = None,
+        url_guard: UrlGuard | None = None,
         pin: bool = False,
     ) -> BrowserSession:
-        ensure_browser_worker_compatibility()
+        if self._enforce_single_worker:
+            ensure_browser_worker_compatibility()
         if cdp_url and not allow_unguarded_cdp:
             raise RuntimeError("cdp_url uses a browser context where DeerFlow cannot enforce its SSRF request guard; set allow_unguarded_cdp: true only for an explicitly trusted local Chrome session")
         key = thread_id or "default"
@@ -910,6 +952,14 @@ class BrowserSessionManager:
             self._schedule_close(evicted_session)
         return session
 
+    async def aget_session(self, thread_id: str | None, **kwargs: Any) -> BrowserSession:
+        """Async counterpart of :meth:`get_session`.
+
+        Creating a local session never blocks (Playwright starts lazily on the
+        private loop); this exists so async callers can use either manager.
+        """
+        return self.get_session(thread_id, **kwargs)
+
     @contextlib.contextmanager
     def acquire_session(self, thread_id: str | None, **kwargs: Any):
         """Acquire an atomically pinned session for one browser operation."""
@@ -920,6 +970,16 @@ class BrowserSessionManager:
         finally:
             self.release_session(key, session)
 
+    @contextlib.asynccontextmanager
+    async def aacquire_session(self, thread_id: str | None, **kwargs: Any):
+        """Async counterpart of :meth:`acquire_session`."""
+        key = thread_id or "default"
+        session = await self.aget_session(key, pin=True, **kwargs)
+        try:
+            yield session
+        finally:
+            self.release_session(key, session)
+
     def release_session(self, thread_id: str | None, session: BrowserSession) -> None:
         """Release a lease and restore idle/LRU bounds when it becomes evictable."""
         key = thread_id or "default"
@@ -1002,16 +1062,26 @@ class BrowserSessionManager:
         return len(sessions)
 
 
-_manager: BrowserSessionManager | None = None
+_manager: BrowserSessionManager | RemoteBrowserSessionManager | None = None
 _manager_lock = threading.Lock()
 
 
-def get_browser_session_manager() -> BrowserSessionManager:
+def get_browser_session_manager() -> BrowserSessionManager | RemoteBrowserSessionManager:
+    """Return this process's session manager.
+
+    Multi-worker gateways get a :class:`~.host.RemoteBrowserSessionManager`
+    with the same API, so every worker reaches the same per-thread sessions.
+    """
     global _manager
     if _manager is None:
         with _manager_lock:
             if _manager is None:
-                _manager = BrowserSessionManager()
+                if _gateway_workers() > 1 and _browser_host_supported():
+                    from .host import RemoteBrowserSessionManager
+
+                    _manager = RemoteBrowserSessionManager()
+                else:
+                    _manager = BrowserSessionManager()
     return _manager
 
 
@@ -17,6 +17,7 @@ import asyncio
 import contextlib
 import logging
 import re
+from collections.abc import AsyncIterator
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Annotated
@@ -25,14 +26,15 @@ from langchain.tools import InjectedToolCallId, tool
 from langchain_core.messages import ToolMessage
 from langgraph.types import Command
 
+from deerflow.community.url_safety import aresolve_host_addresses as _aresolve_host_addresses
+from deerflow.community.url_safety import avalidate_public_http_url, validate_public_http_url
 from deerflow.community.url_safety import resolve_host_addresses as _resolve_host_addresses
-from deerflow.community.url_safety import validate_public_http_url
 from deerflow.config import get_app_config
 from deerflow.config.paths import VIRTUAL_PATH_PREFIX
 from deerflow.constants import BROWSER_FRAMES_DIRNAME
 from deerflow.tools.types import Runtime
 
-from .session import BrowserSession, BrowserSessionManager, PageSnapshot, get_browser_session_manager
+from .session import BrowserSession, PageSnapshot, get_browser_session_manager
 
 logger = logging.getLogger(__name__)
 
@@ -87,22 +89,9 @@ def _as_str(value: object) -> str | None:
     return None
 
 
-class _SessionLease:
-    """Context manager that keeps a process-local browser session pinned."""
-
-    def __init__(self, manager: BrowserSessionManager, thread_id: str | None, session: BrowserSession) -> None:
-        self._manager = manager
-        self._thread_id = thread_id
-        self.session = session
-
-    def __enter__(self) -> BrowserSession:
-        return self.session
-
-    def __exit__(self, exc_type, exc_value, traceback) -> None:
-        self._manager.release_session(self._thread_id, self.session)
-
-
-def _resolve_session(runtime: Runtime, tool_name: str) -> _SessionLease:
+@contextlib.asynccontextmanager
+async def _resolve_session(runtime: Runtime, tool_name: str) -> AsyncIterator[BrowserSession]:
+    """Keep the thread's (local or host-routed) browser session pinned for one tool call."""
     # Launch config (headless/viewport/timeout/cdp_url) is read from a single
     # canonical source — always ``browser_navigate`` — regardless of which tool
     # first creates the session. ``get_session`` caches per thread and ignores
@@ -120,17 +109,20 @@ def _resolve_session(runtime: Runtime, tool_name: str) -> _SessionLease:
     cdp_url = _as_str(cfg.get("cdp_url"))
     manager = get_browser_session_manager()
     thread_id = _thread_id(runtime)
-    session = manager.get_session(
+    session = await manager.aget_session(
         thread_id,
         headless=headless,
         timeout_ms=timeout_ms,
         viewport={"width": width, "height": height},
         cdp_url=cdp_url,
         allow_unguarded_cdp=_as_bool(cfg.get("allow_unguarded_cdp"), False),
-        url_guard=validate_browser_url,
+        url_guard=avalidate_browser_url,
         pin=True,
     )
-    return _SessionLease(manager, thread_id, session)
+    try:
+        yield session
+    finally:
+        manager.release_session(thread_id, session)
 
 
 def validate_browser_url(url: str, *, tool_name: str = "browser_navigate") -> str | None:
@@ -151,8 +143,25 @@ def validate_browser_url(url: str, *, tool_name: str = "browser_navigate") -> st
     )
 
 
-def _validate_url(tool_name: str, url: str) -> str | None:
-    return validate_browser_url(url, tool_name=tool_name)
+async def avalidate_browser_url(url: str, *, tool_name: str = "browser_navigate") -> str | None:
+    """Async counterpart of :func:`validate_browser_url`.
+
+    Resolves through the event loop instead of a blocking ``getaddrinfo``, so
+    async tools, the Gateway live stream and the per-request guard on the
+    Playwright loop never stall on DNS.
+    """
+    cfg = _get_tool_config(tool_name)
+    allow_private = _as_bool(cfg.get("allow_private_addresses"), False)
+    return await avalidate_public_http_url(
+        url,
+        allow_private_addresses=allow_private,
+        action="browse",
+        resolver=_aresolve_host_addresses,
+    )
+
+
+async def _validate_url(tool_name: str, url: str) -> str | None:
+    return await avalidate_browser_url(url, tool_name=tool_name)
 
 
 def _snapshot_message(snapshot: PageSnapshot, prefix: str = "") -> str:
@@ -227,19 +236,19 @@ async def navigate_and_capture(*, thread_id: str | None, url: str, outputs_path:
     Returns ``{"screenshot": virtual_path|None, "url": str, "title": str}``.
     Raises :class:`ValueError` when the URL fails SSRF validation.
     """
-    url_error = _validate_url("browser_navigate", url)
+    url_error = await _validate_url("browser_navigate", url)
     if url_error:
         raise ValueError(url_error)
     cfg = _get_tool_config("browser_navigate")
     manager = get_browser_session_manager()
-    with manager.acquire_session(
+    async with manager.aacquire_session(
         thread_id,
         headless=_as_bool(cfg.get("headless"), True),
         timeout_ms=_as_int(cfg.get("timeout_ms"), 30000),
         viewport={"width": _as_int(cfg.get("viewport_width"), 1280), "height": _as_int(cfg.get("viewport_height"), 720)},
         cdp_url=_as_str(cfg.get("cdp_url")),
         allow_unguarded_cdp=_as_bool(cfg.get("allow_unguarded_cdp"), False),
-        url_guard=validate_browser_url,
+        url_guard=avalidate_browser_url,
     ) as session:
         snapshot = await session.navigate(url)
         screenshot_path: str | None = None
@@ -271,10 +280,10 @@ async def browser_navigate_tool(runtime: Runtime, url: str, tool_call_id: Annota
         url: The http(s) URL to open.
     """
     try:
-        url_error = _validate_url("browser_navigate", url)
+        url_error = await _validate_url("browser_navigate", url)
         if url_error:
             return _tool_message(url_error, tool_call_id)
-        with _resolve_session(runtime, "browser_navigate") as session:
+        async with _resolve_session(runtime, "browser_navigate") as session:
             snapshot = await session.navigate(url)
             screenshot = await _capture_step_screenshot(runtime, session, "navigate")
             return _snapshot_command(runtime, session, snapshot, tool_call_id, f"Navigated to {url}.", screenshot)
@@ -287,7 +296,7 @@ async def browser_navigate_tool(runtime: Runtime, url: str, tool_call_id: Annota
 async def browser_snapshot_tool(runtime: Runtime, tool_call_id: Annotated[str, InjectedToolCallId]) -> Command:
     """Re-read the current page's interactive elements without acting. Use this to refresh the [ref] element list after the page changed on its own (e.g. async content loaded) or when you are unsure of the current state."""
     try:
-        with _resolve_session(runtime, "browser_snapshot") as session:
+        async with _resolve_session(runtime, "browser_snapshot") as session:
             snapshot = await session.snapshot()
             screenshot = await _capture_step_screenshot(runtime, session, "snapshot")
             return _snapshot_command(runtime, session, snapshot, tool_call_id, "", screenshot)
@@ -308,7 +317,7 @@ async def browser_click_tool(runtime: Runtime, ref: int, tool_call_id: Annotated
         ref: The element reference number to click.
     """
     try:
-        with _resolve_session(runtime, "browser_click") as session:
+        async with _resolve_session(runtime, "browser_click") as session:
             snapshot = await session.click(ref)
             screenshot = await _capture_step_screenshot(runtime, session, "click")
             return _snapshot_command(runtime, session, snapshot, tool_call_id, f"Clicked element [{ref}].", screenshot)
@@ -336,7 +345,7 @@ async def browser_type_tool(
         submit: When true, press Enter after typing to submit.
     """
     try:
-        with _resolve_session(runtime, "browser_type") as session:
+        async with _resolve_session(runtime, "browser_type") as session:
             snapshot = await session.type_text(ref, text, submit=submit)
             action = f"Typed into element [{ref}] and submitted." if submit else f"Typed into element [{ref}]."
             screenshot = await _capture_step_screenshot(runtime, session, "type")
@@ -350,7 +359,7 @@ async def browser_type_tool(
 async def browser_get_text_tool(runtime: Runtime, tool_call_id: Annotated[str, InjectedToolCallId]) -> Command:
     """Read the visible text content of the current page. Use this to extract readable text after navigating/interacting, e.g. to quote results or summarize content. Output is truncated for large pages."""
     try:
-        with _resolve_session(runtime, "browser_get_text") as session:
+        async with _resolve_session(runtime, "browser_get_text") as session:
             cfg = _get_tool_config("browser_get_text")
             max_chars = _as_int(cfg.get("max_chars"), 8000)
             text = await session.get_text(max_chars=max_chars)
@@ -364,7 +373,7 @@ async def browser_get_text_tool(runtime: Runtime, tool_call_id: Annotated[str, I
 async def browser_back_tool(runtime: Runtime, tool_call_id: Annotated[str, InjectedToolCallId]) -> Command:
     """Go back to the previous page in the browser session's history."""
     try:
-        with _resolve_session(runtime, "browser_back") as session:
+        async with _resolve_session(runtime, "browser_back") as session:
             snapshot = await session.back()
             screenshot = await _capture_step_screenshot(runtime, session, "back")
             return _snapshot_command(runtime, session, snapshot, tool_call_id, "Went back.", screenshot)
@@ -419,7 +428,7 @@ async def browser_screenshot_tool(
         outputs_path = _thread_outputs_path(runtime)
         if isinstance(outputs_path, str):
             return _tool_message(outputs_path, tool_call_id)
-        with _resolve_session(runtime, "browser_screenshot") as session:
+        async with _resolve_session(runtime, "browser_screenshot") as session:
             content = await session.screenshot_bytes(full_page=full_page)
             name = _safe_screenshot_name(filename)
             final_name = await asyncio.to_thread(_write_screenshot, outputs_path, name, content)
@@ -11,8 +11,8 @@ from langchain.tools import InjectedToolCallId, tool
 from langchain_core.messages import ToolMessage
 from langgraph.types import Command
 
-from deerflow.community.url_safety import resolve_host_addresses as _resolve_host_addresses
-from deerflow.community.url_safety import validate_public_http_url
+from deerflow.community.url_safety import aresolve_host_addresses as _resolve_host_addresses
+from deerflow.community.url_safety import avalidate_public_http_url
 from deerflow.config import get_app_config
 from deerflow.config.paths import VIRTUAL_PATH_PREFIX
 from deerflow.tools.types import Runtime
@@ -92,7 +92,7 @@ def _normalize_output_format(value: object) -> str:
     return output_format if output_format in _OUTPUT_FORMAT_TO_EXTENSION else "png"
 
 
-def _validate_capture_url(url: str, allow_private_addresses: bool = False) -> str | None:
+async def _validate_capture_url(url: str, allow_private_addresses: bool = False) -> str | None:
     """Validate a capture URL for scheme and (unless opted out) SSRF safety.
 
     Blocks requests that resolve to loopback, private, link-local (incl. the
@@ -100,7 +100,7 @@ def _validate_capture_url(url: str, allow_private_addresses: bool = False) -> st
     unspecified addresses. Operators who intentionally point the tool at an
     internal Browserless target can opt out via ``allow_private_addresses``.
     """
-    return validate_public_http_url(
+    return await avalidate_public_http_url(
         url,
         allow_private_addresses=allow_private_addresses,
         action="capture",
@@ -203,7 +203,7 @@ async def web_fetch_tool(url: str) -> str:
     try:
         cfg = _get_tool_config("web_fetch") or {}
         allow_private_addresses = _as_bool(cfg.get("allow_private_addresses"), False)
-        url_error = validate_public_http_url(
+        url_error = await avalidate_public_http_url(
             url,
             allow_private_addresses=allow_private_addresses,
             resolver=_resolve_host_addresses,
@@ -274,7 +274,7 @@ async def web_capture_tool(
         cfg = _get_tool_config("web_capture") or {}
         allow_private_addresses = _as_bool(cfg.get("allow_private_addresses"), False)
 
-        url_error = _validate_capture_url(url, allow_private_addresses=allow_private_addresses)
+        url_error = await _validate_capture_url(url, allow_private_addresses=allow_private_addresses)
         if url_error:
             return _tool_message(url_error, tool_call_id)
 
@@ -4,6 +4,8 @@ from typing import Any
 
 import httpx
 
+from deerflow.community.http_pool import get_async_http_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,26 +34,26 @@ class Crawl4AiClient:
 
         logger.debug(f"Fetching URL via Crawl4AI: {url}")
         try:
-            async with httpx.AsyncClient(timeout=self.timeout_s) as client:
-                resp = await client.post(f"{self.base_url}/md", json=payload, headers=headers)
+            client = get_async_http_client()
+            resp = await client.post(f"{self.base_url}/md", json=payload, headers=headers, timeout=self.timeout_s)
 
-                if resp.status_code != 200:
-                    return f"Error: Crawl4AI HTTP {resp.status_code}: {resp.text[:200]}"
+            if resp.status_code != 200:
+                return f"Error: Crawl4AI HTTP {resp.status_code}: {resp.text[:200]}"
 
-                try:
-                    data = resp.json()
-                except (json.JSONDecodeError, ValueError):
-                    content_type = resp.headers.get("content-type", "unknown")
-                    return f"Error: Crawl4AI returned a non-JSON 200 response (content-type: {content_type}): {resp.text[:200]}"
+            try:
+                data = resp.json()
+            except (json.JSONDecodeError, ValueError):
+                content_type = resp.headers.get("content-type", "unknown")
+                return f"Error: Crawl4AI returned a non-JSON 200 response (content-type: {content_type}): {resp.text[:200]}"
 
-                if not data.get("success", False):
-                    return f"Error: Crawl4AI reported failure for {url}"
+            if not data.get("success", False):
+                return f"Error: Crawl4AI reported failure for {url}"
 
-                markdown = data.get("markdown") or ""
-                if not markdown.strip():
-                    return "Error: Crawl4AI returned empty markdown"
+            markdown = data.get("markdown") or ""
+            if not markdown.strip():
+                return "Error: Crawl4AI returned empty markdown"
 
-                return markdown
+            return markdown
 
         except httpx.TimeoutException:
             return f"Error: Crawl4AI request timed out after {self.timeout_s}s"
@@ -7,6 +7,7 @@ import logging
 
 from langchain.tools import tool
 
+from deerflow.community.web_cache import cached_web_call, make_web_cache_key, web_cache_artifact
 from deerflow.config import get_app_config
 
 logger = logging.getLogger(__name__)
@@ -130,29 +131,14 @@ def _search_text(
         return []
 
 
-@tool("web_search", parse_docstring=True)
-def web_search_tool(
+def _render_results(
     query: str,
-    max_results: int = 5,
+    *,
+    max_results: int,
+    region: str | None,
+    safesearch: str | None,
+    backend: str | list[str] | tuple[str, ...] | None,
 ) -> str:
-    """Search the web for information. Use this tool to find current information, news, articles, and facts from the internet.
-
-    Args:
-        query: Search keywords describing what you want to find. Be specific for better results.
-        max_results: Maximum number of results to return. Default is 5.
-    """
-    config = get_app_config().get_tool_config("web_search")
-    region = DEFAULT_REGION
-    safesearch = DEFAULT_SAFESEARCH
-    backend = DEFAULT_BACKEND
-
-    if config is not None:
-        # Override tool call defaults from config if set.
-        max_results = config.model_extra.get("max_results", max_results)
-        region = config.model_extra.get("region", region)
-        safesearch = config.model_extra.get("safesearch", safesearch)
-        backend = config.model_extra.get("backend", backend)
-
     results = _search_text(
         query=query,
         max_results=max_results,
@@ -180,3 +166,36 @@ def web_search_tool(
     }
 
     return json.dumps(output, indent=2, ensure_ascii=False)
+
+
+@tool("web_search", parse_docstring=True, response_format="content_and_artifact")
+def web_search_tool(
+    query: str,
+    max_results: int = 5,
+) -> tuple[str, dict[str, str]]:
+    """Search the web for information. Use this tool to find current information, news, articles, and facts from the internet.
+
+    Args:
+        query: Search keywords describing what you want to find. Be specific for better results.
+        max_results: Maximum number of results to return. Default is 5.
+    """
+    app_config = get_app_config()
+    config = app_config.get_tool_config("web_search")
+    region = DEFAULT_REGION
+    safesearch = DEFAULT_SAFESEARCH
+    backend = DEFAULT_BACKEND
+
+    if config is not None:
+        # Override tool call defaults from config if set.
+        max_results = config.model_extra.get("max_results", max_results)
+        region = config.model_extra.get("region", region)
+        safesearch = config.model_extra.get("safesearch", safesearch)
+        backend = config.model_extra.get("backend", backend)
+
+    content, status = cached_web_call(
+        app_config,
+        make_web_cache_key("search", "ddg", query=query, max_results=max_results, region=region, safesearch=safesearch, backend=backend),
+        lambda: _render_results(query, max_results=max_results, region=region, safesearch=safesearch, backend=backend),
+        cacheable=lambda result: not result.startswith('{"error"'),
+    )
+    return content, web_cache_artifact(status)
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import base64
 import errno
 import logging
+import posixpath
 import re
 import shlex
 import threading
+import uuid
+from collections.abc import Mapping
 
 from e2b_code_interpreter import Sandbox as E2BClientSandbox
 
@@ -16,6 +20,10 @@ logger = logging.getLogger(__name__)
 
 _MAX_DOWNLOAD_SIZE = 100 * 1024 * 1024  # 100 MB
 
+# Appends up to this size travel base64-encoded inside a single shell
+# command; larger ones are uploaded to a staging file and ``cat``-ed on.
+_APPEND_INLINE_BYTES = 48 * 1024
+
 # Where DeerFlow's ``/mnt/user-data`` virtual prefix is materialised inside
 # the e2b sandbox.  e2b code-interpreter templates default to ``/home/user``
 # as the working directory.
@@ -333,19 +341,46 @@ class E2BSandbox(Sandbox):
                 raise RuntimeError("sandbox client has been closed")
             try:
                 if append:
-                    existing = ""
-                    try:
-                        existing = client.files.read(resolved) or ""
-                        if isinstance(existing, bytes):
-                            existing = existing.decode("utf-8", errors="replace")
-                    except Exception:
-                        existing = ""
-                    content = (existing or "") + content
-                client.files.write(resolved, content)
+                    self._append(client, resolved, content)
+                else:
+                    client.files.write(resolved, content)
             except Exception as e:
                 logger.error("Failed to write file %s in e2b sandbox: %s", resolved, e)
                 raise
 
+    @staticmethod
+    def _append(client: E2BClientSandbox, resolved: str, content: str) -> None:
+        """Append *content* with a remote ``>>`` instead of re-uploading the file."""
+        data = content.encode("utf-8")
+        target = shlex.quote(resolved)
+        if len(data) <= _APPEND_INLINE_BYTES:
+            encoded = base64.b64encode(data).decode("ascii")
+            script = f"mkdir -p {shlex.quote(posixpath.dirname(resolved) or '/')} && printf %s {encoded} | base64 -d >> {target}"
+        else:
+            staging = f"{resolved}.append-{uuid.uuid4().hex}"
+            # ``files.write`` creates the parent directory on the way.
+            client.files.write(staging, data)
+            script = f"cat {shlex.quote(staging)} >> {target}; status=$?; rm -f {shlex.quote(staging)}; exit $status"
+        result = client.commands.run(script)
+        exit_code = getattr(result, "exit_code", 0)
+        if exit_code:
+            raise OSError(f"append to {resolved} exited with {exit_code}: {(getattr(result, 'stderr', '') or '').strip()}")
+
+    def write_files(self, files: Mapping[str, str]) -> None:
+        if not files:
+            return
+        entries = [{"path": self._resolve_path(path), "data": content} for path, content in files.items()]
+        with self._lock:
+            client = self._client
+            if client is None:
+                raise RuntimeError("sandbox client has been closed")
+            try:
+                # One multipart upload for the whole batch.
+                client.files.write_files(entries)
+            except Exception as e:
+                logger.error("Failed to write %d files in e2b sandbox: %s", len(entries), e)
+                raise
+
     def update_file(self, path: str, content: bytes) -> None:
         resolved = self._resolve_path(path)
         with self._lock:
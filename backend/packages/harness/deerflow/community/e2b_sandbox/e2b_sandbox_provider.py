@@ -42,7 +42,9 @@ from typing import Any
 from e2b_code_interpreter import Sandbox as E2BClientSandbox
 
 from deerflow.config import get_app_config
+from deerflow.config.paths import VIRTUAL_PATH_PREFIX
 from deerflow.runtime.user_context import get_effective_user_id
+from deerflow.sandbox.bulk_sync import BULK_SYNC_MIN_FILES, fetch_files, push_tree
 from deerflow.sandbox.sandbox import Sandbox
 from deerflow.sandbox.sandbox_provider import SandboxProvider
 
@@ -479,12 +481,12 @@ class E2BSandboxProvider(SandboxProvider):
 
         # One-shot mount uploads.  e2b has no host bind-mount, so we copy
         # files from ``host_path`` into ``container_path`` at sandbox start.
+        sandbox = E2BSandbox(id=sandbox_id, client=client, home_dir=self._config["home_dir"])
         try:
-            self._apply_mounts(client)
+            self._apply_mounts(sandbox)
         except Exception as e:
             logger.warning("Failed to apply some mounts to e2b sandbox %s: %s", sandbox_id, e)
 
-        sandbox = E2BSandbox(id=sandbox_id, client=client, home_dir=self._config["home_dir"])
         with self._lock:
             self._sandboxes[sandbox_id] = sandbox
             if thread_id:
@@ -680,7 +682,7 @@ class E2BSandboxProvider(SandboxProvider):
         if exit_code not in (0, None) or "BOOTSTRAP_OK" not in stdout:
             raise RuntimeError(f"e2b bootstrap script failed with exit code {exit_code}; stderr={stderr.strip()}")
 
-    def _apply_mounts(self, client: E2BClientSandbox) -> None:
+    def _apply_mounts(self, sandbox: E2BSandbox) -> None:
         mounts = self._config.get("mounts") or []
         if not mounts:
             return
@@ -705,14 +707,7 @@ class E2BSandboxProvider(SandboxProvider):
                 continue
 
             try:
-                make_dir = getattr(client.files, "make_dir", None)
-                if callable(make_dir):
-                    make_dir(container_path)
-            except Exception as e:
-                logger.debug("make_dir(%s) failed (continuing): %s", container_path, e)
-
-            try:
-                self._upload_tree(client, host_path, container_path, read_only)
+                self._upload_tree(sandbox, host_path, container_path, read_only)
             except Exception as e:
                 logger.warning("Failed to upload mount %s -> %s: %s", host_path, container_path, e)
 
@@ -843,6 +838,7 @@ class E2BSandboxProvider(SandboxProvider):
         synced = 0
         skipped = 0
         seen_manifest_keys: set[str] = set()
+        pending: list[tuple[str, Path, str, int, int]] = []
         from .e2b_sandbox import _MAX_DOWNLOAD_SIZE
 
         for entry in stdout.split("\0"):
@@ -900,16 +896,34 @@ class E2BSandboxProvider(SandboxProvider):
             except OSError:
                 pass
 
+            pending.append((virtual_path, host_path, manifest_key, remote_size, remote_mtime_ns))
+
+        # Many changed files come back in one archive instead of one download
+        # each; on any failure fall back to per-file downloads.
+        fetched: dict[str, bytes] | None = None
+        if len(pending) >= BULK_SYNC_MIN_FILES:
+            names = [virtual_path[len(VIRTUAL_PATH_PREFIX) + 1 :] for virtual_path, *_ in pending]
             try:
-                data = sandbox.download_file(virtual_path)
+                fetched = fetch_files(sandbox, VIRTUAL_PATH_PREFIX, names)
             except Exception as e:
-                logger.warning(
-                    "e2b sync: failed to download %s from sandbox %s: %s",
-                    virtual_path,
-                    sandbox.id,
-                    e,
-                )
-                continue
+                logger.warning("e2b sync: archive download failed for sandbox %s, downloading files one by one: %s", sandbox.id, e)
+
+        for virtual_path, host_path, manifest_key, remote_size, remote_mtime_ns in pending:
+            if fetched is not None:
+                data = fetched.get(virtual_path[len(VIRTUAL_PATH_PREFIX) + 1 :])
+                if data is None:
+                    continue
+            else:
+                try:
+                    data = sandbox.download_file(virtual_path)
+                except Exception as e:
+                    logger.warning(
+                        "e2b sync: failed to download %s from sandbox %s: %s",
+                        virtual_path,
+                        sandbox.id,
+                        e,
+                    )
+                    continue
 
             try:
                 host_path.parent.mkdir(parents=True, exist_ok=True)
@@ -949,43 +963,21 @@ class E2BSandboxProvider(SandboxProvider):
 
     @staticmethod
     def _upload_tree(
-        client: E2BClientSandbox,
+        sandbox: E2BSandbox,
         src: Path,
         dest_dir: str,
         read_only: bool,
     ) -> None:
-        """Recursively upload ``src`` into ``dest_dir`` inside the sandbox."""
+        """Upload ``src`` into ``dest_dir`` inside the sandbox as one archive."""
         if src.is_file():
+            report = push_tree(sandbox, src.parent, dest_dir, only=[src.name])
             target = f"{dest_dir}/{src.name}"
-            with src.open("rb") as fh:
-                client.files.write(target, fh.read())
-            if read_only:
-                try:
-                    client.commands.run(f"chmod a-w {shlex.quote(target)}")
-                except Exception:
-                    pass
-            return
-
-        for path in src.rglob("*"):
-            if not path.is_file():
-                continue
-            rel = path.relative_to(src).as_posix()
-            target = f"{dest_dir}/{rel}"
-            try:
-                make_dir = getattr(client.files, "make_dir", None)
-                if callable(make_dir):
-                    parent = target.rsplit("/", 1)[0]
-                    if parent and parent != dest_dir:
-                        make_dir(parent)
-            except Exception:
-                pass
-            with path.open("rb") as fh:
-                client.files.write(target, fh.read())
+        else:
+            report = push_tree(sandbox, src, dest_dir)
+            target = dest_dir
+        logger.debug("e2b mount %s -> %s: uploaded=%d unchanged=%d", src, dest_dir, len(report.transferred), len(report.skipped))
         if read_only:
-            try:
-                client.commands.run(f"chmod -R a-w {shlex.quote(dest_dir)}")
-            except Exception:
-                pass
+            sandbox.execute_command(f"chmod -R a-w {shlex.quote(target)}")
 
     def _evict_oldest_warm(self) -> str | None:
         with self._lock:
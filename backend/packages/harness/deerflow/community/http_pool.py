@@ -0,0 +1,104 @@
+"""Shared, lifecycle-managed ``httpx.AsyncClient`` pool for community web tools.
+
+Research-heavy runs issue dozens of searches and fetches. Opening a fresh
+``httpx.AsyncClient`` per call pays a new TCP + TLS handshake every time, so
+web tools borrow a long-lived client from this pool instead and keep their
+connections alive between calls.
+
+``httpx.AsyncClient`` connections are bound to the event loop that opened
+them, and tools run on more than one loop (the Gateway loop, plus the private
+loops subagents and sync entry points create). Clients are therefore pooled
+per ``(event loop, proxy, trust_env)``. Entries whose loop has been closed or
+garbage-collected are pruned lazily on the next lookup; the Gateway closes the
+remaining clients on shutdown via :func:`aclose_http_clients`.
+
+Per-request settings (timeout, headers) are passed on each request, never on
+the pooled client, so callers with different timeouts can share connections.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import weakref
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Generous enough for a research fan-out (parallel subagents searching at
+# once) while still bounding sockets per loop.
+_MAX_CONNECTIONS = 64
+_MAX_KEEPALIVE_CONNECTIONS = 16
+_KEEPALIVE_EXPIRY_SECONDS = 30.0
+_DEFAULT_TIMEOUT_SECONDS = 30.0
+
+_PoolKey = tuple[int, str | None, bool]
+
+_clients: dict[_PoolKey, tuple[weakref.ref[asyncio.AbstractEventLoop], httpx.AsyncClient]] = {}
+_lock = threading.Lock()
+
+
+def _prune_dead_loops_locked() -> None:
+    for key, (loop_ref, _client) in list(_clients.items()):
+        loop = loop_ref()
+        if loop is None or loop.is_closed():
+            # The owning loop is gone, so the client cannot be closed from
+            # here; dropping the reference lets its sockets be collected.
+            del _clients[key]
+
+
+def get_async_http_client(*, proxy: str | None = None, trust_env: bool = True) -> httpx.AsyncClient:
+    """Return the pooled client for the running loop and proxy settings.
+
+    Must be called from inside a running event loop. Callers must not close
+    or use the returned client as a context manager.
+    """
+    loop = asyncio.get_running_loop()
+    key: _PoolKey = (id(loop), proxy, trust_env)
+    with _lock:
+        _prune_dead_loops_locked()
+        entry = _clients.get(key)
+        if entry is not None and entry[0]() is loop and not entry[1].is_closed:
+            return entry[1]
+        client_kwargs: dict[str, object] = {
+            "trust_env": trust_env,
+            "timeout": _DEFAULT_TIMEOUT_SECONDS,
+            "limits": httpx.Limits(
+                max_connections=_MAX_CONNECTIONS,
+                max_keepalive_connections=_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+        }
+        if proxy:
+            client_kwargs["proxy"] = proxy
+        client = httpx.AsyncClient(**client_kwargs)
+        _clients[key] = (weakref.ref(loop), client)
+        return client
+
+
+async def aclose_http_clients() -> int:
+    """Close every pooled client owned by the running loop.
+
+    Clients that belong to other (still running) loops are left alone; those
+    are closed by their own loop or pruned once it shuts down. Returns the
+    number of clients closed.
+    """
+    loop = asyncio.get_running_loop()
+    with _lock:
+        owned = [(key, client) for key, (loop_ref, client) in _clients.items() if loop_ref() is loop]
+        for key, _client in owned:
+            del _clients[key]
+    for _key, client in owned:
+        try:
+            await client.aclose()
+        except Exception:
+            logger.debug("Failed to close pooled web-tool HTTP client", exc_info=True)
+    return len(owned)
+
+
+def reset_http_clients() -> None:
+    """Forget every pooled client without closing it (test helper)."""
+    with _lock:
+        _clients.clear()
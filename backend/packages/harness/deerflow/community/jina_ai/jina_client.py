@@ -1,7 +1,7 @@
 import logging
 import os
 
-import httpx
+from deerflow.community.http_pool import get_async_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -23,11 +23,8 @@ class JinaClient:
             logger.warning("Jina API key is not set. Provide your own key to access a higher rate limit. See https://jina.ai/reader for more information.")
         data = {"url": url}
         try:
-            client_kwargs: dict[str, object] = {"trust_env": trust_env}
-            if proxy:
-                client_kwargs["proxy"] = proxy
-            async with httpx.AsyncClient(**client_kwargs) as client:
-                response = await client.post("https://r.jina.ai/", headers=headers, json=data, timeout=timeout)
+            client = get_async_http_client(proxy=proxy, trust_env=trust_env)
+            response = await client.post("https://r.jina.ai/", headers=headers, json=data, timeout=timeout)
 
             if response.status_code != 200:
                 error_message = f"Jina API returned status {response.status_code}: {response.text}"
@@ -3,6 +3,7 @@ import asyncio
 from langchain.tools import tool
 
 from deerflow.community.jina_ai.jina_client import JinaClient
+from deerflow.community.web_cache import acached_web_call, make_web_cache_key, web_cache_artifact
 from deerflow.config import get_app_config
 from deerflow.utils.readability import ReadabilityExtractor
 
@@ -41,8 +42,8 @@ def _coerce_proxy(value: object) -> str | None:
     return proxy or None
 
 
-@tool("web_fetch", parse_docstring=True)
-async def web_fetch_tool(url: str) -> str:
+@tool("web_fetch", parse_docstring=True, response_format="content_and_artifact")
+async def web_fetch_tool(url: str) -> tuple[str, dict[str, str]]:
     """Fetch the contents of a web page at a given URL.
     Only fetch EXACT URLs that have been provided directly by the user or have been returned in results from the web_search and web_fetch tools.
     This tool can NOT access content that requires authentication, such as private Google Docs or pages behind login walls.
@@ -56,13 +57,24 @@ async def web_fetch_tool(url: str) -> str:
     timeout = 10
     proxy = None
     trust_env = True
-    config = get_app_config().get_tool_config("web_fetch")
+    app_config = get_app_config()
+    config = app_config.get_tool_config("web_fetch")
     if config is not None:
         timeout = _coerce_timeout(config.model_extra.get("timeout"), timeout)
         proxy = _coerce_proxy(config.model_extra.get("proxy"))
         trust_env = _coerce_bool(config.model_extra.get("trust_env"), trust_env)
-    html_content = await jina_client.crawl(url, return_format="html", timeout=timeout, proxy=proxy, trust_env=trust_env)
-    if isinstance(html_content, str) and html_content.startswith("Error:"):
-        return html_content
-    article = await asyncio.to_thread(readability_extractor.extract_article, html_content)
-    return article.to_markdown()[:4096]
+
+    async def _fetch() -> str:
+        html_content = await jina_client.crawl(url, return_format="html", timeout=timeout, proxy=proxy, trust_env=trust_env)
+        if isinstance(html_content, str) and html_content.startswith("Error:"):
+            return html_content
+        article = await asyncio.to_thread(readability_extractor.extract_article, html_content)
+        return article.to_markdown()[:4096]
+
+    content, status = await acached_web_call(
+        app_config,
+        make_web_cache_key("fetch", "jina", url=url),
+        _fetch,
+        cacheable=lambda result: not result.startswith("Error:"),
+    )
+    return content, web_cache_artifact(status)
@@ -3,6 +3,8 @@ from typing import Any
 
 import httpx
 
+from deerflow.community.http_pool import get_async_http_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -41,19 +43,20 @@ class SearxngClient:
 
         logger.debug(f"Searching SearXNG at {self.base_url} with query: {query}")
         try:
-            async with httpx.AsyncClient(timeout=30) as client:
-                resp = await client.get(
-                    f"{self.base_url}/search",
-                    params=params,
-                    headers={
-                        "User-Agent": "Mozilla/5.0 (compatible; DeerFlow/1.0)",
-                        "Accept": "application/json",
-                    },
-                )
-                resp.raise_for_status()
-                data = resp.json()
-                results = data.get("results", [])
-                return results[:max_results] if max_results else results
+            client = get_async_http_client()
+            resp = await client.get(
+                f"{self.base_url}/search",
+                params=params,
+                headers={
+                    "User-Agent": "Mozilla/5.0 (compatible; DeerFlow/1.0)",
+                    "Accept": "application/json",
+                },
+                timeout=30,
+            )
+            resp.raise_for_status()
+            data = resp.json()
+            results = data.get("results", [])
+            return results[:max_results] if max_results else results
         except httpx.HTTPStatusError as e:
             logger.error(f"SearXNG search returned error status: {e}")
             raise
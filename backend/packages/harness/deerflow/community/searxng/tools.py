@@ -1,58 +1,75 @@
+from __future__ import annotations
+
 import json
 import logging
+from typing import TYPE_CHECKING
 
 from langchain.tools import tool
 
+from deerflow.community.web_cache import acached_web_call, make_web_cache_key, web_cache_artifact
 from deerflow.config import get_app_config
 
 from .searxng_client import SearxngClient
 
+if TYPE_CHECKING:
+    from deerflow.config.app_config import AppConfig
+
 logger = logging.getLogger(__name__)
 
 
-def _get_tool_config(tool_name: str) -> dict | None:
+def _get_tool_config(tool_name: str, app_config: AppConfig | None = None) -> dict | None:
     """Get tool config extras safely, returning None if not configured."""
-    config = get_app_config().get_tool_config(tool_name)
+    config = (app_config or get_app_config()).get_tool_config(tool_name)
     if config is None:
         return None
     extras = config.model_extra
     return extras if extras is not None else {}
 
 
-def _get_searxng_client() -> SearxngClient:
-    cfg = _get_tool_config("web_search")
+def _get_searxng_client(app_config: AppConfig | None = None) -> SearxngClient:
+    cfg = _get_tool_config("web_search", app_config)
     base_url = "http://localhost:8088"
     if cfg is not None:
         base_url = cfg.get("base_url", base_url)
     return SearxngClient(base_url=base_url)
 
 
-@tool("web_search", parse_docstring=True)
-async def web_search_tool(query: str) -> str:
+@tool("web_search", parse_docstring=True, response_format="content_and_artifact")
+async def web_search_tool(query: str) -> tuple[str, dict[str, str] | None]:
     """Search the web using SearXNG.
 
     Args:
         query: The query to search for.
     """
     try:
-        cfg = _get_tool_config("web_search")
+        app_config = get_app_config()
+        cfg = _get_tool_config("web_search", app_config)
         max_results = 5
         if cfg is not None:
             raw = cfg.get("max_results", max_results)
             max_results = int(raw) if not isinstance(raw, int) else raw
 
-        client = _get_searxng_client()
-        results = await client.search(query, max_results=max_results)
-
-        normalized = [
-            {
-                "title": r.get("title", ""),
-                "url": r.get("url", ""),
-                "snippet": r.get("content", ""),
-            }
-            for r in results
-        ]
-        return json.dumps(normalized, indent=2, ensure_ascii=False)
+        client = _get_searxng_client(app_config)
+
+        async def _search() -> str:
+            results = await client.search(query, max_results=max_results)
+            normalized = [
+                {
+                    "title": r.get("title", ""),
+                    "url": r.get("url", ""),
+                    "snippet": r.get("content", ""),
+                }
+                for r in results
+            ]
+            return json.dumps(normalized, indent=2, ensure_ascii=False)
+
+        content, status = await acached_web_call(
+            app_config,
+            make_web_cache_key("search", "searxng", base_url=client.base_url, query=query, max_results=max_results),
+            _search,
+            cacheable=lambda result: result.strip() != "[]",
+        )
+        return content, web_cache_artifact(status)
     except Exception as e:
         logger.error(f"Error in web_search_tool: {e}")
-        return json.dumps({"error": str(e), "query": query}, ensure_ascii=False)
+        return json.dumps({"error": str(e), "query": query}, ensure_ascii=False), None
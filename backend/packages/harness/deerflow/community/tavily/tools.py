@@ -3,6 +3,7 @@ import json
 from langchain.tools import tool
 from tavily import TavilyClient
 
+from deerflow.community.web_cache import cached_web_call, make_web_cache_key, web_cache_artifact
 from deerflow.config import get_app_config
 
 
@@ -14,34 +15,43 @@ def _get_tavily_client() -> TavilyClient:
     return TavilyClient(api_key=api_key)
 
 
-@tool("web_search", parse_docstring=True)
-def web_search_tool(query: str) -> str:
+@tool("web_search", parse_docstring=True, response_format="content_and_artifact")
+def web_search_tool(query: str) -> tuple[str, dict[str, str]]:
     """Search the web.
 
     Args:
         query: The query to search for.
     """
-    config = get_app_config().get_tool_config("web_search")
+    app_config = get_app_config()
+    config = app_config.get_tool_config("web_search")
     max_results = 5
     if config is not None and "max_results" in config.model_extra:
         max_results = config.model_extra.get("max_results")
 
-    client = _get_tavily_client()
-    res = client.search(query, max_results=max_results)
-    normalized_results = [
-        {
-            "title": result["title"],
-            "url": result["url"],
-            "snippet": result["content"],
-        }
-        for result in res["results"]
-    ]
-    json_results = json.dumps(normalized_results, indent=2, ensure_ascii=False)
-    return json_results
-
-
-@tool("web_fetch", parse_docstring=True)
-def web_fetch_tool(url: str) -> str:
+    def _search() -> str:
+        client = _get_tavily_client()
+        res = client.search(query, max_results=max_results)
+        normalized_results = [
+            {
+                "title": result["title"],
+                "url": result["url"],
+                "snippet": result["content"],
+            }
+            for result in res["results"]
+        ]
+        return json.dumps(normalized_results, indent=2, ensure_ascii=False)
+
+    content, status = cached_web_call(
+        app_config,
+        make_web_cache_key("search", "tavily", query=query, max_results=max_results),
+        _search,
+        cacheable=lambda result: result.strip() != "[]",
+    )
+    return content, web_cache_artifact(status)
+
+
+@tool("web_fetch", parse_docstring=True, response_format="content_and_artifact")
+def web_fetch_tool(url: str) -> tuple[str, dict[str, str]]:
     """Fetch the contents of a web page at a given URL.
     Only fetch EXACT URLs that have been provided directly by the user or have been returned in results from the web_search and web_fetch tools.
     This tool can NOT access content that requires authentication, such as private Google Docs or pages behind login walls.
@@ -51,12 +61,22 @@ def web_fetch_tool(url: str) -> str:
     Args:
         url: The URL to fetch the contents of.
     """
-    client = _get_tavily_client()
-    res = client.extract([url])
-    if "failed_results" in res and len(res["failed_results"]) > 0:
-        return f"Error: {res['failed_results'][0]['error']}"
-    elif "results" in res and len(res["results"]) > 0:
-        result = res["results"][0]
-        return f"# {result['title']}\n\n{result['raw_content'][:4096]}"
-    else:
-        return "Error: No results found"
+
+    def _fetch() -> str:
+        client = _get_tavily_client()
+        res = client.extract([url])
+        if "failed_results" in res and len(res["failed_results"]) > 0:
+            return f"Error: {res['failed_results'][0]['error']}"
+        elif "results" in res and len(res["results"]) > 0:
+            result = res["results"][0]
+            return f"# {result['title']}\n\n{result['raw_content'][:4096]}"
+        else:
+            return "Error: No results found"
+
+    content, status = cached_web_call(
+        get_app_config(),
+        make_web_cache_key("fetch", "tavily", url=url),
+        _fetch,
+        cacheable=lambda result: not result.startswith("Error:"),
+    )
+    return content, web_cache_artifact(status)
@@ -1,28 +1,144 @@
-"""Shared URL safety checks for server-side web tools."""
+"""Shared URL safety checks for server-side web tools.
+
+Hostname screening resolves the host and rejects it when any address is
+private, loopback, link-local or otherwise internal. Resolution results are
+kept in a small TTL-bounded cache so an agent fetching many pages from the
+same site does not pay a resolver round trip per call, and async tools use
+:func:`avalidate_public_http_url`, whose resolver runs off the event loop.
+
+The cache holds resolved *addresses*, never verdicts: every validation still
+screens the (possibly cached) addresses against the current policy. Positive
+entries live for at most :data:`_DNS_POSITIVE_TTL_SECONDS`, which is shorter
+than the TTL of practically all public records; ``getaddrinfo`` does not expose
+the record TTL, so the cache stays deliberately below it rather than trying to
+honour it. Failed lookups are cached briefly so a burst of calls for a dead host
+does not hammer the resolver.
+"""
 
 from __future__ import annotations
 
+import asyncio
+import inspect
 import ipaddress
 import socket
-from collections.abc import Callable
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
 from urllib.parse import urlparse
 
 _BLOCKED_HOSTNAMES = {"localhost", "metadata.google.internal"}
 
+_DNS_POSITIVE_TTL_SECONDS = 30.0
+_DNS_NEGATIVE_TTL_SECONDS = 5.0
+_DNS_CACHE_MAX_ENTRIES = 1024
 
-def resolve_host_addresses(hostname: str) -> list[ipaddress._BaseAddress]:
-    """Resolve a hostname to all IP addresses for SSRF screening."""
+Resolver = Callable[[str], "list[ipaddress._BaseAddress] | Awaitable[list[ipaddress._BaseAddress]]"]
+
+
+class _DnsCache:
+    """Hostname -> addresses cache with separate positive/negative expiry."""
+
+    def __init__(
+        self,
+        *,
+        positive_ttl: float = _DNS_POSITIVE_TTL_SECONDS,
+        negative_ttl: float = _DNS_NEGATIVE_TTL_SECONDS,
+        max_entries: int = _DNS_CACHE_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._positive_ttl = positive_ttl
+        self._negative_ttl = negative_ttl
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, tuple[ipaddress._BaseAddress, ...]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, hostname: str) -> list[ipaddress._BaseAddress] | None:
+        with self._lock:
+            entry = self._entries.get(hostname)
+            if entry is None:
+                return None
+            expires_at, addresses = entry
+            if expires_at <= self._clock():
+                del self._entries[hostname]
+                return None
+            self._entries.move_to_end(hostname)
+            return list(addresses)
+
+    def put(self, hostname: str, addresses: list[ipaddress._BaseAddress]) -> None:
+        ttl = self._positive_ttl if addresses else self._negative_ttl
+        with self._lock:
+            self._entries[hostname] = (self._clock() + ttl, tuple(addresses))
+            self._entries.move_to_end(hostname)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_dns_cache = _DnsCache()
+
+
+def clear_dns_cache() -> None:
+    """Forget every cached resolution (used by tests)."""
+    _dns_cache.clear()
+
+
+def _cache_key(hostname: str) -> str:
+    return hostname.strip().rstrip(".").lower()
+
+
+def _addresses_from_infos(infos: list[tuple]) -> list[ipaddress._BaseAddress]:
     addresses: list[ipaddress._BaseAddress] = []
-    try:
-        infos = socket.getaddrinfo(hostname, None)
-    except (socket.gaierror, UnicodeError):
-        return addresses
     for info in infos:
         sockaddr = info[4]
         try:
-            addresses.append(ipaddress.ip_address(sockaddr[0]))
+            address = ipaddress.ip_address(sockaddr[0])
         except ValueError:
             continue
+        if address not in addresses:
+            addresses.append(address)
+    return addresses
+
+
+def resolve_host_addresses(hostname: str) -> list[ipaddress._BaseAddress]:
+    """Resolve a hostname to all IP addresses for SSRF screening.
+
+    Blocking; async callers should use :func:`aresolve_host_addresses`.
+    """
+    key = _cache_key(hostname)
+    cached = _dns_cache.get(key)
+    if cached is not None:
+        return cached
+    try:
+        infos = socket.getaddrinfo(key, None)
+    except (socket.gaierror, UnicodeError):
+        infos = []
+    addresses = _addresses_from_infos(infos)
+    _dns_cache.put(key, addresses)
+    return addresses
+
+
+async def aresolve_host_addresses(hostname: str) -> list[ipaddress._BaseAddress]:
+    """Async counterpart of :func:`resolve_host_addresses`.
+
+    Uses ``loop.getaddrinfo`` (which runs the resolver in the default executor)
+    so a slow resolver never stalls the event loop. Shares the cache with the
+    sync path.
+    """
+    key = _cache_key(hostname)
+    cached = _dns_cache.get(key)
+    if cached is not None:
+        return cached
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(key, None)
+    except (socket.gaierror, UnicodeError):
+        infos = []
+    addresses = _addresses_from_infos(infos)
+    _dns_cache.put(key, addresses)
     return addresses
 
 
@@ -31,48 +147,84 @@ def is_blocked_address(address: ipaddress._BaseAddress) -> bool:
     return address.is_private or address.is_loopback or address.is_link_local or address.is_reserved or address.is_multicast or address.is_unspecified
 
 
-def validate_public_http_url(
-    url: str,
-    *,
-    allow_private_addresses: bool = False,
-    action: str = "fetch",
-    resolver: Callable[[str], list[ipaddress._BaseAddress]] | None = None,
-) -> str | None:
-    """Validate an http(s) URL before a server-side web tool fetches it.
+def _precheck_url(url: str, *, allow_private_addresses: bool, action: str) -> tuple[str | None, str | None]:
+    """Run every check that does not need DNS.
 
-    Returns an ``"Error: ..."`` string when the URL should be rejected, or
-    ``None`` when the caller may proceed.  The check is intentionally conservative
-    for self-hosted fetch/render services because those services run inside the
-    deployment network and can otherwise reach cloud metadata or private hosts.
+    Returns ``(error, hostname)``: an error string to reject with, or the
+    hostname that still has to be resolved and screened. ``(None, None)`` means
+    the URL may proceed without resolution (opt-out or a public literal IP).
     """
     parsed = urlparse(url)
     if parsed.scheme not in {"http", "https"} or not parsed.netloc:
-        return "Error: Only http:// and https:// URLs are supported"
+        return "Error: Only http:// and https:// URLs are supported", None
 
     if allow_private_addresses:
-        return None
+        return None, None
 
     hostname = parsed.hostname
     if not hostname:
-        return "Error: URL host could not be parsed"
+        return "Error: URL host could not be parsed", None
 
     normalized_host = hostname.strip().rstrip(".").lower()
     if normalized_host in _BLOCKED_HOSTNAMES:
-        return f"Error: Refusing to {action} a private or loopback address"
+        return f"Error: Refusing to {action} a private or loopback address", None
 
     try:
         literal_ip = ipaddress.ip_address(normalized_host)
     except ValueError:
-        literal_ip = None
+        return None, hostname
 
-    if literal_ip is not None:
-        candidates = [literal_ip]
-    else:
-        resolve = resolver or resolve_host_addresses
-        candidates = resolve(hostname)
-        if not candidates:
-            return "Error: URL host could not be resolved"
+    return _screen_addresses([literal_ip], action), None
 
+
+def _screen_addresses(candidates: list[ipaddress._BaseAddress], action: str) -> str | None:
+    if not candidates:
+        return "Error: URL host could not be resolved"
     if any(is_blocked_address(addr) for addr in candidates):
         return f"Error: Refusing to {action} a private, loopback, or metadata address"
     return None
+
+
+def validate_public_http_url(
+    url: str,
+    *,
+    allow_private_addresses: bool = False,
+    action: str = "fetch",
+    resolver: Callable[[str], list[ipaddress._BaseAddress]] | None = None,
+) -> str | None:
+    """Validate an http(s) URL before a server-side web tool fetches it.
+
+    Returns an ``"Error: ..."`` string when the URL should be rejected, or
+    ``None`` when the caller may proceed.  The check is intentionally conservative
+    for self-hosted fetch/render services because those services run inside the
+    deployment network and can otherwise reach cloud metadata or private hosts.
+    """
+    error, hostname = _precheck_url(url, allow_private_addresses=allow_private_addresses, action=action)
+    if error or hostname is None:
+        return error
+    resolve = resolver or resolve_host_addresses
+    return _screen_addresses(resolve(hostname), action)
+
+
+async def avalidate_public_http_url(
+    url: str,
+    *,
+    allow_private_addresses: bool = False,
+    action: str = "fetch",
+    resolver: Resolver | None = None,
+) -> str | None:
+    """Async counterpart of :func:`validate_public_http_url` for async tools.
+
+    *resolver* may be sync or async; it defaults to
+    :func:`aresolve_host_addresses`.
+    """
+    error, hostname = _precheck_url(url, allow_private_addresses=allow_private_addresses, action=action)
+    if error or hostname is None:
+        return error
+    if resolver is None:
+        candidates = await aresolve_host_addresses(hostname)
+    else:
+        candidates = resolver(hostname)
+        if inspect.isawaitable(candidates):
+            candidates = await candidates
+    return _screen_addresses(candidates, action)
@@ -0,0 +1,274 @@
+"""URL- and query-keyed result cache shared by the community web tools.
+
+``web_search`` / ``web_fetch`` providers route their upstream call through
+:meth:`WebToolCache.aget_or_fetch` (async tools) or
+:meth:`WebToolCache.get_or_fetch` (sync tools). A fresh identical request is
+served from memory, and concurrent identical requests are deduplicated in
+flight: one caller performs the upstream call while the others wait for its
+result. Only results the tool reports as successful (``cacheable``) and no
+longer than ``max_entry_chars`` are stored, so errors are always retried.
+
+Every lookup yields a :data:`CacheStatus` that tools surface on the
+``ToolMessage.artifact`` (``{"web_cache": "hit"}``) via
+:func:`web_cache_artifact`, so cache behaviour is visible in tool results
+without changing the text the model reads.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Literal
+
+from deerflow.config.web_tool_cache_config import WebToolCacheConfig
+
+if TYPE_CHECKING:
+    from deerflow.config.app_config import AppConfig
+
+logger = logging.getLogger(__name__)
+
+#: ``hit``: served from the cache. ``miss``: fetched upstream (and stored when
+#: cacheable). ``shared``: joined an identical in-flight request. ``bypass``:
+#: caching is disabled.
+CacheStatus = Literal["hit", "miss", "shared", "bypass"]
+
+_FAILED = object()
+
+
+def make_web_cache_key(kind: str, provider: str, **params: object) -> str:
+    """Return a stable cache key for one provider request.
+
+    *kind* is ``"search"`` or ``"fetch"``; *params* holds every input that
+    changes the upstream result (query, URL, result count, return format...).
+    """
+    payload = json.dumps([kind, provider, params], sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def web_cache_artifact(status: CacheStatus) -> dict[str, str]:
+    """Return the ``ToolMessage.artifact`` payload describing *status*."""
+    return {"web_cache": status}
+
+
+class WebToolCache:
+    """Bounded TTL + LRU cache with in-flight request deduplication."""
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: int,
+        max_entries: int,
+        max_entry_chars: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._max_entry_chars = max_entry_chars
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._async_inflight: dict[tuple[int, str], asyncio.Future] = {}
+        self._sync_inflight: dict[str, tuple[threading.Event, list[object]]] = {}
+        self._counters: dict[str, int] = {"hit": 0, "miss": 0, "shared": 0}
+
+    def _lookup(self, key: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _store(self, key: str, value: str, cacheable: Callable[[str], bool]) -> None:
+        if len(value) > self._max_entry_chars:
+            return
+        try:
+            if not cacheable(value):
+                return
+        except Exception:
+            logger.debug("Web cache cacheable() predicate failed; not caching", exc_info=True)
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + self._ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def _count(self, status: CacheStatus) -> None:
+        with self._lock:
+            self._counters[status] = self._counters.get(status, 0) + 1
+
+    async def aget_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[str]],
+        *,
+        cacheable: Callable[[str], bool],
+    ) -> tuple[str, CacheStatus]:
+        """Return ``(result, status)``, calling *fetch* only when needed.
+
+        If the request leading an in-flight fetch fails or is cancelled, the
+        waiters fall back to their own upstream call instead of inheriting the
+        failure.
+        """
+        cached = self._lookup(key)
+        if cached is not None:
+            self._count("hit")
+            return cached, "hit"
+
+        loop = asyncio.get_running_loop()
+        inflight_key = (id(loop), key)
+        pending = self._async_inflight.get(inflight_key)
+        if pending is not None:
+            shared = await asyncio.shield(pending)
+            if shared is not _FAILED:
+                self._count("shared")
+                return shared, "shared"
+            value = await fetch()
+            self._count("miss")
+            return value, "miss"
+
+        future: asyncio.Future = loop.create_future()
+        self._async_inflight[inflight_key] = future
+        try:
+            value = await fetch()
+        except BaseException:
+            future.set_result(_FAILED)
+            raise
+        else:
+            future.set_result(value)
+        finally:
+            self._async_inflight.pop(inflight_key, None)
+        self._store(key, value, cacheable)
+        self._count("miss")
+        return value, "miss"
+
+    def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], str],
+        *,
+        cacheable: Callable[[str], bool],
+    ) -> tuple[str, CacheStatus]:
+        """Synchronous counterpart of :meth:`aget_or_fetch` for sync tools."""
+        cached = self._lookup(key)
+        if cached is not None:
+            self._count("hit")
+            return cached, "hit"
+
+        with self._lock:
+            pending = self._sync_inflight.get(key)
+            if pending is None:
+                leader = (threading.Event(), [])
+                self._sync_inflight[key] = leader
+        if pending is not None:
+            event, holder = pending
+            event.wait()
+            if holder and holder[0] is not _FAILED:
+                self._count("shared")
+                return holder[0], "shared"
+            value = fetch()
+            self._count("miss")
+            return value, "miss"
+
+        event, holder = leader
+        try:
+            value = fetch()
+        except BaseException:
+            holder.append(_FAILED)
+            raise
+        else:
+            holder.append(value)
+        finally:
+            with self._lock:
+                self._sync_inflight.pop(key, None)
+            event.set()
+        self._store(key, value, cacheable)
+        self._count("miss")
+        return value, "miss"
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss/shared counters and the current entry count."""
+        with self._lock:
+            return {**self._counters, "entries": len(self._entries)}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_cache: WebToolCache | None = None
+_cache_config: WebToolCacheConfig | None = None
+_cache_lock = threading.Lock()
+
+
+def get_web_tool_cache(app_config: AppConfig | None = None) -> WebToolCache | None:
+    """Return the process-wide cache when ``web_tool_cache.enabled``, else ``None``."""
+    global _cache, _cache_config
+
+    if app_config is None:
+        try:
+            from deerflow.config.app_config import get_app_config
+
+            app_config = get_app_config()
+        except Exception:
+            return None
+    config = getattr(app_config, "web_tool_cache", None)
+    if not isinstance(config, WebToolCacheConfig) or not config.enabled:
+        return None
+
+    with _cache_lock:
+        if _cache is None or _cache_config != config:
+            _cache = WebToolCache(
+                ttl_seconds=config.ttl_seconds,
+                max_entries=config.max_entries,
+                max_entry_chars=config.max_entry_chars,
+            )
+            _cache_config = config
+        return _cache
+
+
+def reset_web_tool_cache() -> None:
+    """Drop the process cache singleton (used by tests and config resets)."""
+    global _cache, _cache_config
+    with _cache_lock:
+        _cache = None
+        _cache_config = None
+
+
+async def acached_web_call(
+    app_config: AppConfig | None,
+    key: str,
+    fetch: Callable[[], Awaitable[str]],
+    *,
+    cacheable: Callable[[str], bool],
+) -> tuple[str, CacheStatus]:
+    """Run *fetch* through the cache when enabled, else call it directly."""
+    cache = get_web_tool_cache(app_config)
+    if cache is None:
+        return await fetch(), "bypass"
+    return await cache.aget_or_fetch(key, fetch, cacheable=cacheable)
+
+
+def cached_web_call(
+    app_config: AppConfig | None,
+    key: str,
+    fetch: Callable[[], str],
+    *,
+    cacheable: Callable[[str], bool],
+) -> tuple[str, CacheStatus]:
+    """Synchronous counterpart of :func:`acached_web_call`."""
+    cache = get_web_tool_cache(app_config)
+    if cache is None:
+        return fetch(), "bypass"
+    return cache.get_or_fetch(key, fetch, cacheable=cacheable)
@@ -1,7 +1,9 @@
 import logging
 import os
-from collections.abc import Mapping
+import threading
+from collections.abc import Callable, Mapping
 from contextvars import ContextVar
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Literal, Self
 
@@ -15,14 +17,17 @@ from deerflow.config.auth_config import AuthAppConfig
 from deerflow.config.authorization_config import AuthorizationConfig, load_authorization_config_from_dict
 from deerflow.config.channel_connections_config import ChannelConnectionsConfig
 from deerflow.config.checkpointer_config import CheckpointerConfig, load_checkpointer_config_from_dict
+from deerflow.config.config_watcher import DEFAULT_POLL_INTERVAL_SECONDS, ConfigWatcher, WatchBackend
 from deerflow.config.database_config import DatabaseConfig
 from deerflow.config.extensions_config import ExtensionsConfig
 from deerflow.config.file_signature import ConfigSignature as _ConfigSignature
 from deerflow.config.file_signature import get_config_signature as _get_config_signature
 from deerflow.config.guardrails_config import GuardrailsConfig, load_guardrails_config_from_dict
 from deerflow.config.input_polish_config import InputPolishConfig
+from deerflow.config.llm_response_cache_config import LlmResponseCacheConfig
 from deerflow.config.loop_detection_config import LoopDetectionConfig
 from deerflow.config.memory_config import MemoryConfig, load_memory_config_from_dict
+from deerflow.config.metrics_config import MetricsConfig
 from deerflow.config.model_config import ModelConfig
 from deerflow.config.read_before_write_config import ReadBeforeWriteConfig
 from deerflow.config.reload_boundary import format_field_description
@@ -46,6 +51,7 @@ from deerflow.config.tool_config import ToolConfig, ToolGroupConfig
 from deerflow.config.tool_output_config import ToolOutputConfig
 from deerflow.config.tool_progress_config import ToolProgressConfig
 from deerflow.config.tool_search_config import ToolSearchConfig, load_tool_search_config_from_dict
+from deerflow.config.web_tool_cache_config import WebToolCacheConfig
 
 load_dotenv()
 
@@ -221,6 +227,7 @@ class AppConfig(BaseModel):
     extensions: ExtensionsConfig = Field(default_factory=ExtensionsConfig, description="Extensions configuration (MCP servers and skills state)")
     tool_output: ToolOutputConfig = Field(default_factory=ToolOutputConfig, description="Tool output budget protection configuration")
     tool_search: ToolSearchConfig = Field(default_factory=ToolSearchConfig, description="Tool search / deferred loading configuration")
+    web_tool_cache: WebToolCacheConfig = Field(default_factory=WebToolCacheConfig, description="Result cache for community web_search / web_fetch tools")
     title: TitleConfig = Field(default_factory=TitleConfig, description="Automatic title generation configuration")
     summarization: SummarizationConfig = Field(default_factory=SummarizationConfig, description="Conversation summarization configuration")
     memory: MemoryConfig = Field(default_factory=MemoryConfig, description="Memory subsystem configuration")
@@ -233,6 +240,7 @@ class AppConfig(BaseModel):
     suggestions: SuggestionsConfig = Field(default_factory=SuggestionsConfig, description="Follow-up suggestions configuration.")
     circuit_breaker: CircuitBreakerConfig = Field(default_factory=CircuitBreakerConfig, description="LLM circuit breaker configuration")
     llm_call: LlmCallConfig = Field(default_factory=LlmCallConfig, description="LLM call execution configuration (concurrency / rate shaping)")
+    llm_response_cache: LlmResponseCacheConfig = Field(default_factory=LlmResponseCacheConfig, description="Response cache for auxiliary one-shot LLM calls (titles, suggestions, input polish, skill moderation)")
     channel_connections: ChannelConnectionsConfig = Field(
         default_factory=ChannelConnectionsConfig,
         description=format_field_description(
@@ -274,6 +282,13 @@ class AppConfig(BaseModel):
             field_doc="LangGraph state-persistence checkpointer configuration.",
         ),
     )
+    metrics: MetricsConfig = Field(
+        default_factory=MetricsConfig,
+        description=format_field_description(
+            "metrics",
+            field_doc="Latency histograms for middleware hooks, tools, model calls and persistence, exposed on the gateway's /metrics endpoint.",
+        ),
+    )
     stream_bridge: StreamBridgeConfig | None = Field(
         default=None,
         description=format_field_description(
@@ -585,6 +600,10 @@ _app_config_path: Path | None = None
 _app_config_mtime: float | None = None
 _app_config_signature: _ConfigSignature | None = None
 _app_config_is_custom = False
+_app_config_version = 0
+_app_config_watcher: ConfigWatcher | None = None
+_app_config_listeners: list["AppConfigListener"] = []
+_app_config_lock = threading.RLock()
 _current_app_config: ContextVar[AppConfig | None] = ContextVar("deerflow_current_app_config", default=None)
 _current_app_config_stack: ContextVar[tuple[AppConfig | None, ...]] = ContextVar("deerflow_current_app_config_stack", default=())
 
@@ -597,17 +616,58 @@ def _get_config_mtime(config_path: Path) -> float | None:
         return None
 
 
+@dataclass(frozen=True, slots=True)
+class AppConfigSnapshot:
+    """One published ``AppConfig`` and the file state it was loaded from.
+
+    ``version`` increases by one every time a config is published (load,
+    reload or ``set_app_config``), so callers can cheaply tell whether the
+    config they derived something from is still current. Treat ``config``
+    as read-only: it is shared by every reader until the next publish.
+    """
+
+    config: AppConfig
+    version: int
+    path: Path | None = None
+    signature: _ConfigSignature | None = None
+
+
+#: Called as ``listener(previous, current)`` after a new config is published.
+#: ``previous`` is ``None`` on the first load.
+AppConfigListener = Callable[[AppConfig | None, AppConfig], None]
+
+
+def _publish_app_config(config: AppConfig, path: Path | None, mtime: float | None, signature: _ConfigSignature | None, *, is_custom: bool) -> None:
+    global _app_config, _app_config_path, _app_config_mtime, _app_config_signature, _app_config_is_custom, _app_config_version
+
+    with _app_config_lock:
+        previous = _app_config
+        _app_config_path = path
+        _app_config_mtime = mtime
+        _app_config_signature = signature
+        _app_config_is_custom = is_custom
+        _app_config_version += 1
+        # Readers on the fast path only look at ``_app_config``; assign it last.
+        _app_config = config
+        listeners = list(_app_config_listeners)
+
+    for listener in listeners:
+        try:
+            listener(previous, config)
+        except Exception:
+            logger.exception("AppConfig change listener %r failed", listener)
+
+
 def _load_and_cache_app_config(config_path: str | None = None) -> AppConfig:
     """Load config from disk and refresh cache metadata."""
-    global _app_config, _app_config_path, _app_config_mtime, _app_config_signature, _app_config_is_custom
-
     resolved_path = AppConfig.resolve_config_path(config_path)
-    _app_config = AppConfig.from_file(str(resolved_path))
-    _app_config_path = resolved_path
-    _app_config_mtime = _get_config_mtime(resolved_path)
-    _app_config_signature = _get_config_signature(resolved_path)
-    _app_config_is_custom = False
-    return _app_config
+    # Sign before parsing: an edit that lands mid-load then leaves a stale
+    # signature behind and is picked up by the next check instead of lost.
+    mtime = _get_config_mtime(resolved_path)
+    signature = _get_config_signature(resolved_path)
+    config = AppConfig.from_file(str(resolved_path))
+    _publish_app_config(config, resolved_path, mtime, signature, is_custom=False)
+    return config
 
 
 def get_app_config() -> AppConfig:
@@ -617,15 +677,22 @@ def get_app_config() -> AppConfig:
     underlying config file path or content signature changes. Use
     `reload_app_config()` to force a reload, or `reset_app_config()` to clear
     the cache.
-    """
-    global _app_config, _app_config_path, _app_config_mtime, _app_config_signature
 
+    While `start_app_config_watcher()` is running, change detection happens
+    on the watcher thread and this returns the published config without
+    touching the filesystem.
+    """
     runtime_override = _current_app_config.get()
     if runtime_override is not None:
         return runtime_override
 
-    if _app_config is not None and _app_config_is_custom:
-        return _app_config
+    config = _app_config
+    if config is not None and _app_config_is_custom:
+        return config
+
+    watcher = _app_config_watcher
+    if config is not None and watcher is not None and watcher.running:
+        return config
 
     resolved_path = AppConfig.resolve_config_path()
     current_mtime = _get_config_mtime(resolved_path)
@@ -669,11 +736,13 @@ def reset_app_config() -> None:
     or when switching between different configurations.
     """
     global _app_config, _app_config_path, _app_config_mtime, _app_config_signature, _app_config_is_custom
-    _app_config = None
-    _app_config_path = None
-    _app_config_mtime = None
-    _app_config_signature = None
-    _app_config_is_custom = False
+    stop_app_config_watcher()
+    with _app_config_lock:
+        _app_config = None
+        _app_config_path = None
+        _app_config_mtime = None
+        _app_config_signature = None
+        _app_config_is_custom = False
 
 
 def set_app_config(config: AppConfig) -> None:
@@ -684,12 +753,106 @@ def set_app_config(config: AppConfig) -> None:
     Args:
         config: The AppConfig instance to use.
     """
-    global _app_config, _app_config_path, _app_config_mtime, _app_config_signature, _app_config_is_custom
-    _app_config = config
-    _app_config_path = None
-    _app_config_mtime = None
-    _app_config_signature = None
-    _app_config_is_custom = True
+    _publish_app_config(config, None, None, None, is_custom=True)
+
+
+def get_app_config_snapshot() -> AppConfigSnapshot:
+    """Return the current config together with its publish version.
+
+    Resolves the config exactly like `get_app_config()`. A runtime-scoped
+    override (`push_current_app_config`) is returned with the version of the
+    process-wide config it shadows and no path.
+    """
+    config = get_app_config()
+    with _app_config_lock:
+        if config is _app_config:
+            return AppConfigSnapshot(config=config, version=_app_config_version, path=_app_config_path, signature=_app_config_signature)
+        return AppConfigSnapshot(config=config, version=_app_config_version)
+
+
+def subscribe_app_config(listener: AppConfigListener) -> Callable[[], None]:
+    """Call *listener* after every config publish; returns an unsubscribe function.
+
+    Listeners run synchronously on the publishing thread (the watcher thread
+    for file edits, the caller's thread for `reload_app_config()` and
+    `set_app_config()`), so they should only invalidate or flag caches and
+    leave the rebuild to the next reader. Startup-only fields (see
+    `deerflow.config.reload_boundary`) are published like any other field;
+    the subsystems that captured them at startup keep their snapshot.
+    """
+    with _app_config_lock:
+        _app_config_listeners.append(listener)
+
+    def unsubscribe() -> None:
+        with _app_config_lock:
+            try:
+                _app_config_listeners.remove(listener)
+            except ValueError:
+                pass
+
+    return unsubscribe
+
+
+def _on_watched_config_change(changed: frozenset[Path]) -> None:
+    if _app_config_is_custom or _app_config_path is None:
+        return
+    logger.info("Config file(s) changed on disk (%s), reloading AppConfig", ", ".join(sorted(str(path) for path in changed)))
+    try:
+        _load_and_cache_app_config(str(_app_config_path))
+    except Exception:
+        # Keep serving the last good config; the next edit retries.
+        logger.exception("Reloading AppConfig after a file change failed; keeping the previous config")
+
+
+def start_app_config_watcher(*, backend: WatchBackend = "auto", poll_interval: float = DEFAULT_POLL_INTERVAL_SECONDS) -> ConfigWatcher:
+    """Watch ``config.yaml`` and the extensions config, and reload on change.
+
+    Loads the config if needed, then starts a `ConfigWatcher` on the
+    resolved ``config.yaml`` and ``extensions_config.json`` (both feed
+    `AppConfig`). From then on `get_app_config()` serves the published
+    config with no per-call ``stat``/hash, and an edit to either file
+    reloads and republishes it. A reload that fails validation is logged
+    and the previous config stays in place.
+
+    The watched paths are resolved once: changing ``DEER_FLOW_CONFIG_PATH``
+    or ``DEER_FLOW_EXTENSIONS_CONFIG_PATH`` at runtime needs
+    `stop_app_config_watcher()` + `start_app_config_watcher()`.
+    Returns the running watcher; calling it again returns the same one.
+    """
+    global _app_config_watcher
+
+    with _app_config_lock:
+        if _app_config_watcher is not None and _app_config_watcher.running:
+            return _app_config_watcher
+        get_app_config()
+        if _app_config_path is None:
+            raise RuntimeError("Cannot watch an AppConfig injected with set_app_config()")
+        baseline = {_app_config_path: _app_config_signature}
+        try:
+            extensions_path = ExtensionsConfig.resolve_config_path()
+        except FileNotFoundError:
+            extensions_path = None
+        paths = [_app_config_path] + ([extensions_path] if extensions_path is not None else [])
+        watcher = ConfigWatcher(paths, _on_watched_config_change, backend=backend, poll_interval=poll_interval, baseline=baseline)
+        watcher.start()
+        _app_config_watcher = watcher
+        return watcher
+
+
+def stop_app_config_watcher() -> None:
+    """Stop the config watcher; `get_app_config()` goes back to per-call checks."""
+    global _app_config_watcher
+
+    with _app_config_lock:
+        watcher, _app_config_watcher = _app_config_watcher, None
+    if watcher is not None:
+        watcher.stop()
+
+
+def get_app_config_watcher() -> ConfigWatcher | None:
+    """Return the running config watcher, if any."""
+    watcher = _app_config_watcher
+    return watcher if watcher is not None and watcher.running else None
 
 
 def peek_current_app_config() -> AppConfig | None:
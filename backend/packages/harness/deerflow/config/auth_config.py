@@ -81,8 +81,36 @@ class LocalAuthConfig(BaseModel):
     )
 
 
+class SessionCacheConfig(BaseModel):
+    """Cache of verified session cookies in front of the per-request user lookup.
+
+    Every authenticated request otherwise decodes the JWT and loads the user row
+    to compare ``token_version``. Entries are dropped as soon as the user row
+    changes (password change, role change, admin reset), so the TTL only bounds
+    how long a change made by a process that cannot reach this cache goes
+    unnoticed. Opt-in: a hit skips the per-request revocation check.
+    """
+
+    enabled: bool = Field(default=False, description="Cache verified sessions (token hash -> user) for ttl_seconds")
+    type: Literal["memory", "redis"] | None = Field(
+        default=None,
+        description=(
+            "Cache backend. 'memory' is per-process; 'redis' is shared by every gateway worker so an invalidation on one worker is seen by all of them. "
+            "When omitted, redis is used if the stream bridge is configured for redis (a multi-worker deployment), otherwise memory."
+        ),
+    )
+    ttl_seconds: float = Field(default=30.0, gt=0, description="Maximum lifetime of a cached session (never beyond the token's own expiry)")
+    max_entries: int = Field(default=10_000, ge=1, description="Upper bound on cached sessions for the memory backend (least recently used are evicted)")
+    redis_url: str | None = Field(
+        default=None,
+        description="Redis URL for the redis backend. If omitted, DEER_FLOW_STREAM_BRIDGE_REDIS_URL, REDIS_URL, or redis://localhost:6379/0 is used.",
+    )
+    key_prefix: str = Field(default="deerflow:auth:session", description="Redis key prefix. Only applies to the redis backend.")
+
+
 class AuthAppConfig(BaseModel):
     """Authentication configuration section for the DeerFlow app config."""
 
     oidc: OIDCAuthConfig = Field(default_factory=OIDCAuthConfig, description="OIDC SSO authentication settings")
     local: LocalAuthConfig = Field(default_factory=LocalAuthConfig, description="Built-in email/password authentication settings")
+    session_cache: SessionCacheConfig = Field(default_factory=SessionCacheConfig, description="Verified-session cache for request authentication")
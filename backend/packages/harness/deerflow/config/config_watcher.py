@@ -0,0 +1,229 @@
+"""Background change detection for runtime-editable config files.
+
+``get_app_config()`` normally re-checks ``config.yaml`` on every call: it
+resolves the path, stats the file and hashes its content (see
+``file_signature``). That keeps hot reload simple, but it puts a ``stat`` plus
+a full read on every gateway request, every ``get_run_context`` call and
+every middleware that resolves the config — thousands of syscalls per second
+under load, and worse on network filesystems.
+
+:class:`ConfigWatcher` moves that work off the request path. It watches a
+fixed set of files from one daemon thread and calls ``on_change`` with the
+files whose ``(mtime, size, sha256)`` signature actually changed:
+
+- ``native``: filesystem notifications (inotify / FSEvents / ReadDirectoryChangesW)
+  through the optional ``watchfiles`` package, which ships with
+  ``uvicorn[standard]``. Parent directories are watched non-recursively so
+  editors that replace the file by rename are still seen.
+- ``poll``: re-signs the files every ``poll_interval`` seconds. Used when
+  ``watchfiles`` is not installed, when native watching fails to start, and
+  on filesystems that do not deliver notifications (NFS, SMB, some FUSE and
+  container bind mounts).
+
+Notifications on the parent directory miss some deployments entirely: a
+single file bind-mounted into a container (the host edit never reaches the
+container's directory watch) and Kubernetes ConfigMap volumes beyond the
+``..data`` symlink swap this module recognises. The native backend therefore
+also re-signs the files every ``backstop_interval`` seconds, so such an edit
+is picked up late instead of never.
+
+Notifications are only hints: both backends confirm a change by the file's
+content digest, so ``touch`` produces no ``on_change`` call and an editor's
+write-then-rename burst produces at most one.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from collections.abc import Callable, Iterable, Mapping
+from pathlib import Path
+from typing import Literal
+
+from deerflow.config.file_signature import ConfigSignature, get_config_signature
+
+logger = logging.getLogger(__name__)
+
+WatchBackend = Literal["auto", "native", "poll"]
+
+#: Default seconds between polls when no native watcher is available.
+DEFAULT_POLL_INTERVAL_SECONDS = 1.0
+
+#: Default seconds between the native backend's backstop polls.
+DEFAULT_BACKSTOP_INTERVAL_SECONDS = 10.0
+
+# Kubernetes mounts ConfigMap files as symlinks through this entry and updates
+# them by swapping it, so the watched file names themselves never change.
+_CONFIGMAP_DATA_LINK = "..data"
+
+# How often (ms) the native watcher wakes up to check for ``stop()``.
+_NATIVE_STOP_CHECK_MS = 500
+# watchfiles groups events for this long (ms) before yielding, which folds an
+# editor's truncate/write/rename sequence into one check.
+_NATIVE_DEBOUNCE_MS = 200
+
+
+def _content_key(signature: ConfigSignature | None) -> object:
+    # Compare by digest so ``touch`` or a timestamp-preserving copy of the same
+    # bytes is not a change; fall back to the whole signature when the content
+    # could not be read.
+    if signature is None or signature[2] is None:
+        return signature
+    return signature[2]
+
+
+def _native_watch_available() -> bool:
+    try:
+        import watchfiles  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class ConfigWatcher:
+    """Watch a fixed set of config files and report content changes.
+
+    Args:
+        paths: Files to watch. They do not have to exist yet; a file that
+            appears, disappears or changes content is reported.
+        on_change: Called from the watcher thread with the changed paths.
+            Exceptions are logged and do not stop the watcher.
+        backend: ``"native"``, ``"poll"`` or ``"auto"`` (native when
+            ``watchfiles`` is importable, otherwise poll).
+        poll_interval: Seconds between polls for the ``poll`` backend.
+        backstop_interval: Seconds between the polls the ``native`` backend
+            runs for changes it is not notified about; ``None`` disables them.
+        baseline: Signatures already known to the caller (for example the
+            ones recorded when the config was loaded). Files missing from it
+            are signed when the watcher is created, so an edit that lands
+            between the caller's load and ``start()`` is still reported.
+    """
+
+    def __init__(
+        self,
+        paths: Iterable[Path],
+        on_change: Callable[[frozenset[Path]], None],
+        *,
+        backend: WatchBackend = "auto",
+        poll_interval: float = DEFAULT_POLL_INTERVAL_SECONDS,
+        backstop_interval: float | None = DEFAULT_BACKSTOP_INTERVAL_SECONDS,
+        baseline: Mapping[Path, ConfigSignature | None] | None = None,
+    ) -> None:
+        if backend not in ("auto", "native", "poll"):
+            raise ValueError(f"Unknown config watch backend {backend!r}; expected 'auto', 'native' or 'poll'")
+        if poll_interval <= 0 or (backstop_interval is not None and backstop_interval <= 0):
+            raise ValueError("Config watch poll intervals must be positive")
+        self.paths: frozenset[Path] = frozenset(Path(os.path.abspath(path)) for path in paths)
+        self.poll_interval = poll_interval
+        self.backstop_interval = backstop_interval
+        self._on_change = on_change
+        self._requested_backend = backend
+        self._backend: Literal["native", "poll"] | None = None
+        baseline = {Path(os.path.abspath(path)): signature for path, signature in (baseline or {}).items()}
+        self._signatures: dict[Path, ConfigSignature | None] = {path: baseline[path] if path in baseline else get_config_signature(path) for path in self.paths}
+        self._check_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._backstop: threading.Thread | None = None
+
+    @property
+    def backend(self) -> Literal["native", "poll"] | None:
+        """The backend in use once started, or ``None`` before ``start()``."""
+        return self._backend
+
+    @property
+    def running(self) -> bool:
+        thread = self._thread
+        return thread is not None and thread.is_alive() and not self._stop.is_set()
+
+    def watches(self, path: Path) -> bool:
+        return Path(os.path.abspath(path)) in self.paths
+
+    def start(self) -> None:
+        """Start the watcher thread. Calling it again while running is a no-op."""
+        if self.running:
+            return
+        if self._requested_backend == "native" or (self._requested_backend == "auto" and _native_watch_available()):
+            self._backend = "native"
+        else:
+            self._backend = "poll"
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="deerflow-config-watcher", daemon=True)
+        self._thread.start()
+        logger.info("Watching %d config file(s) with the %s backend", len(self.paths), self._backend)
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        """Stop the watcher thread and wait up to *timeout* seconds for it to exit."""
+        self._stop.set()
+        for thread in (self._thread, self._backstop):
+            if thread is not None and thread is not threading.current_thread():
+                thread.join(timeout)
+        self._thread = None
+        self._backstop = None
+
+    def check(self) -> frozenset[Path]:
+        """Re-sign every watched file and report the ones that changed.
+
+        Runs on the watcher thread; public so callers and tests can force a
+        synchronous check.
+        """
+        with self._check_lock:
+            changed = set()
+            for path in self.paths:
+                signature = get_config_signature(path)
+                if _content_key(signature) != _content_key(self._signatures.get(path)):
+                    self._signatures[path] = signature
+                    changed.add(path)
+            if not changed:
+                return frozenset()
+            frozen = frozenset(changed)
+            # Handlers run under the lock so reloads never overlap.
+            try:
+                self._on_change(frozen)
+            except Exception:
+                logger.exception("Config change handler failed for %s", sorted(map(str, frozen)))
+            return frozen
+
+    def _run(self) -> None:
+        if self._backend == "native":
+            try:
+                self._run_native()
+                return
+            except Exception:
+                if self._stop.is_set():
+                    return
+                logger.warning("Native config watching failed; falling back to polling every %.1fs", self.poll_interval, exc_info=True)
+                self._backend = "poll"
+        self._run_poll(self.poll_interval)
+
+    def _run_native(self) -> None:
+        from watchfiles import watch
+
+        directories = sorted({path.parent for path in self.paths if path.parent.is_dir()})
+        if not directories:
+            raise FileNotFoundError("None of the watched config directories exist")
+        names = {str(path) for path in self.paths}
+
+        def watch_filter(_change, changed_path: str) -> bool:
+            return os.path.abspath(changed_path) in names or os.path.basename(changed_path) == _CONFIGMAP_DATA_LINK
+
+        # An edit between the baseline and the first notification is caught here.
+        self.check()
+        if self.backstop_interval is not None:
+            self._backstop = threading.Thread(target=self._run_poll, args=(self.backstop_interval,), name="deerflow-config-watcher-backstop", daemon=True)
+            self._backstop.start()
+        for _changes in watch(
+            *directories,
+            watch_filter=watch_filter,
+            debounce=_NATIVE_DEBOUNCE_MS,
+            stop_event=self._stop,
+            rust_timeout=_NATIVE_STOP_CHECK_MS,
+            recursive=False,
+            raise_interrupt=False,
+        ):
+            self.check()
+
+    def _run_poll(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            self.check()
@@ -352,6 +352,16 @@ def reload_extensions_config(config_path: str | None = None) -> ExtensionsConfig
     """
     global _extensions_config
     _extensions_config = ExtensionsConfig.from_file(config_path)
+
+    # Callers reload right after writing the file. If the AppConfig watcher
+    # is running, have it look now instead of on its next event or poll, so
+    # AppConfig and its listeners (the MCP tools cache) see the write before
+    # the caller returns.
+    from deerflow.config.app_config import get_app_config_watcher
+
+    watcher = get_app_config_watcher()
+    if watcher is not None:
+        watcher.check()
     return _extensions_config
 
 
@@ -0,0 +1,37 @@
+"""Configuration for the auxiliary LLM response cache."""
+
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class LlmResponseCacheConfig(BaseModel):
+    """Configuration for caching short, deterministic auxiliary LLM calls.
+
+    Covers the one-shot helper calls that sit outside the agent graph: thread
+    titles, follow-up suggestions, input polishing and skill security
+    moderation. The agent's own model turns are never cached.
+    """
+
+    enabled: bool = Field(
+        default=False,
+        description="Whether to cache auxiliary one-shot LLM responses (titles, suggestions, input polish, skill moderation).",
+    )
+    backend: Literal["memory", "sqlite"] = Field(
+        default="memory",
+        description="Cache backend: 'memory' is process-local; 'sqlite' persists across restarts and is shared by workers on the same host.",
+    )
+    ttl_seconds: int = Field(
+        default=3600,
+        ge=1,
+        description="How long a cached response stays valid, in seconds.",
+    )
+    max_entries: int = Field(
+        default=1024,
+        ge=1,
+        description="Maximum number of cached responses; the least recently used entries are evicted first.",
+    )
+    sqlite_path: str | None = Field(
+        default=None,
+        description="SQLite file for the 'sqlite' backend. Relative paths resolve against the DeerFlow base dir; null uses {base_dir}/llm_response_cache.db.",
+    )
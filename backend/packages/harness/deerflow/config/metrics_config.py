@@ -0,0 +1,20 @@
+"""Configuration for runtime latency metrics."""
+
+from pydantic import BaseModel, Field
+
+
+class MetricsConfig(BaseModel):
+    """Latency histograms for middleware hooks, tools, model calls and persistence, served on ``/metrics``."""
+
+    enabled: bool = Field(
+        default=False,
+        description="Time lead-agent middleware hooks, tool and model calls, checkpoint writes, run-event writes and stream-bridge publishes, and serve the histograms in Prometheus text format on the gateway's /metrics endpoint.",
+    )
+    run_timing_summary: bool = Field(
+        default=False,
+        description="Also store a per-run timing breakdown (count and total milliseconds per middleware hook, tool, model caller and persistence operation) under metadata.timing of each run record.",
+    )
+    auth_token: str | None = Field(
+        default=None,
+        description="Optional bearer token required by /metrics (Authorization: Bearer <token>). When unset the endpoint is public like /health; it exposes only aggregate timings labelled by middleware, tool and operation names.",
+    )
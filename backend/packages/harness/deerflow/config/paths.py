@@ -181,6 +181,10 @@ class Paths:
         """Directory for a specific user: `{base_dir}/users/{user_id}/`."""
         return self.base_dir / "users" / _validate_user_id(user_id)
 
+    def user_upload_blobs_dir(self, user_id: str) -> Path:
+        """Content-addressed upload store shared by a user's threads: `{base_dir}/users/{user_id}/upload-blobs/`."""
+        return self.user_dir(user_id) / "upload-blobs"
+
     def prepare_user_dir_for_raw_id(self, raw_user_id: str) -> str:
         """Return the safe user ID and migrate this ID's legacy unsafe-id bucket.
 
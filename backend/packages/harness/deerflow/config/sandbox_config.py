@@ -72,6 +72,9 @@ class SandboxConfig(BaseModel):
         use: Class path of the sandbox provider (required)
         allow_host_bash: Enable host-side bash execution for LocalSandboxProvider.
             Dangerous and intended only for fully trusted local workflows.
+        bash_live_output: Stream LocalSandbox bash output as `tool_output` events while commands run.
+        persistent_shell: Reuse one long-lived shell per LocalSandbox for bash commands.
+        branch_hardlinks: Hardlink (copy-on-write via the file tools) user-data into thread branches without reflinks.
 
     AioSandboxProvider and BoxliteProvider shared options:
         image: Sandbox image to use (Docker/AIO image or BoxLite OCI image)
@@ -163,6 +166,30 @@ class SandboxConfig(BaseModel):
         ),
     )
 
+    bash_live_output: bool = Field(
+        default=True,
+        description=(
+            "Stream host bash output to run subscribers while the command runs (LocalSandboxProvider, POSIX), as throttled `tool_output` custom events "
+            "(every 250 ms, newest 4 KB per stream, masked like the final result). The final tool message and its truncation are unchanged."
+        ),
+    )
+    persistent_shell: bool = Field(
+        default=False,
+        description=(
+            "Run host bash commands in one long-lived shell per sandbox instead of a fresh process per call (LocalSandboxProvider, POSIX). "
+            "Saves process start-up on every call and keeps shell state (cwd, exports) between commands; timeout, output capture and process-group kill still apply, "
+            "but a timeout also stops background jobs started from that shell. Calls carrying request-scoped secrets always run in a fresh process."
+        ),
+    )
+    branch_hardlinks: bool = Field(
+        default=False,
+        description=(
+            "When branching a thread on a filesystem without reflink support, hardlink its user-data files instead of copying them. "
+            "LocalSandbox write_file / str_replace give a hardlinked file its own copy before writing, so each thread diverges on first write; "
+            "in-place writes from bash (e.g. `>>`) or from inside a container sandbox still reach every thread sharing the file. Reflinks are always used where supported."
+        ),
+    )
+
     provisioner_api_key: str | None = Field(
         default=None,
         description=(
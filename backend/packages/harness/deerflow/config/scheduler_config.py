@@ -3,7 +3,10 @@ from pydantic import BaseModel, Field
 
 class SchedulerConfig(BaseModel):
     enabled: bool = Field(default=False)
-    poll_interval_seconds: int = Field(default=5, ge=1, le=300)
+    # Reconciliation poll only: due tasks are woken from an in-memory
+    # next-due heap, so this bounds how late another worker's edits or an
+    # expired lease are noticed, not cron accuracy.
+    poll_interval_seconds: int = Field(default=60, ge=1, le=300)
     lease_seconds: int = Field(default=120, ge=5, le=3600)
     max_concurrent_runs: int = Field(default=3, ge=1, le=32)
     min_once_delay_seconds: int = Field(default=60, ge=1, le=86400)
@@ -10,3 +10,13 @@ class SkillScanConfig(BaseModel):
         default=True,
         description="Whether native deterministic SkillScan analyzers run before the LLM skill scanner.",
     )
+    cache_max_entries: int = Field(
+        default=8192,
+        ge=0,
+        description="Per-file and per-archive scan results kept in memory, keyed by content hash and ruleset version. 0 disables the cache.",
+    )
+    max_workers: int = Field(
+        default=2,
+        ge=0,
+        description="Worker processes for scans large enough to stall the gateway. 0 scans in the calling thread.",
+    )
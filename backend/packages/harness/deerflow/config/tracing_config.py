@@ -1,5 +1,6 @@
 import os
 import threading
+from typing import Literal
 
 from pydantic import BaseModel, Field
 
@@ -82,12 +83,63 @@ class MonocleTracingConfig(BaseModel):
             raise ValueError("Monocle 'okahu' exporter is selected but OKAHU_API_KEY is not set.")
 
 
+class TracingSamplingConfig(BaseModel):
+    """Which runs the LangSmith/Langfuse callbacks record, and how spans are exported.
+
+    Head sampling decides per request trace when its root run starts: the
+    first matching per-user rate, else the per-agent rate, else
+    ``sample_rate``. With ``keep_errored_runs`` the spans of an unsampled
+    run are buffered (up to ``buffer_limit`` callback events) and exported
+    if the run fails. ``export_mode="batched"`` hands callbacks to a
+    background exporter through a queue of ``queue_size`` events instead of
+    running the provider handlers on the agent's thread.
+    """
+
+    sample_rate: float = Field(default=1.0)
+    agent_sample_rates: dict[str, float] = Field(default_factory=dict)
+    user_sample_rates: dict[str, float] = Field(default_factory=dict)
+    keep_errored_runs: bool = Field(default=True)
+    buffer_limit: int = Field(default=2000)
+    export_mode: Literal["inline", "batched"] = Field(default="inline")
+    queue_size: int = Field(default=10_000)
+    batch_size: int = Field(default=256)
+
+    @property
+    def is_sampling(self) -> bool:
+        rates = [self.sample_rate, *self.agent_sample_rates.values(), *self.user_sample_rates.values()]
+        return any(rate < 1.0 for rate in rates)
+
+    @property
+    def is_active(self) -> bool:
+        """Whether tracing callbacks need wrapping at all; the defaults record every run inline."""
+        return self.is_sampling or self.export_mode == "batched"
+
+    def rate_for(self, *, agent_name: str | None, user_id: str | None) -> float:
+        if user_id is not None and user_id in self.user_sample_rates:
+            return self.user_sample_rates[user_id]
+        if agent_name is not None and agent_name in self.agent_sample_rates:
+            return self.agent_sample_rates[agent_name]
+        return self.sample_rate
+
+    def validate(self) -> None:
+        rates = {"DEER_FLOW_TRACE_SAMPLE_RATE": self.sample_rate}
+        rates.update({f"DEER_FLOW_TRACE_AGENT_SAMPLE_RATES[{k}]": v for k, v in self.agent_sample_rates.items()})
+        rates.update({f"DEER_FLOW_TRACE_USER_SAMPLE_RATES[{k}]": v for k, v in self.user_sample_rates.items()})
+        for name, rate in rates.items():
+            if not 0.0 <= rate <= 1.0:
+                raise ValueError(f"{name} must be between 0 and 1, got {rate}.")
+        for name, value in (("DEER_FLOW_TRACE_BUFFER_LIMIT", self.buffer_limit), ("DEER_FLOW_TRACE_QUEUE_SIZE", self.queue_size), ("DEER_FLOW_TRACE_BATCH_SIZE", self.batch_size)):
+            if value < 1:
+                raise ValueError(f"{name} must be a positive integer, got {value}.")
+
+
 class TracingConfig(BaseModel):
     """Tracing configuration for supported providers."""
 
     langsmith: LangSmithTracingConfig = Field(...)
     langfuse: LangfuseTracingConfig = Field(...)
     monocle: MonocleTracingConfig = Field(...)
+    sampling: TracingSamplingConfig = Field(default_factory=TracingSamplingConfig)
 
     @property
     def is_configured(self) -> bool:
@@ -114,6 +166,7 @@ class TracingConfig(BaseModel):
     def validate_enabled(self) -> None:
         self.langsmith.validate()
         self.langfuse.validate()
+        self.sampling.validate()
 
 
 _tracing_config: TracingConfig | None = None
@@ -140,6 +193,39 @@ def _first_env_value(*names: str) -> str | None:
     return None
 
 
+def _env_value(name: str, default: str) -> str:
+    return _first_env_value(name) or default
+
+
+def _env_number(name: str, default: float, cast: type[int] | type[float]):
+    value = _first_env_value(name)
+    if value is None:
+        return default
+    try:
+        return cast(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a number, got {value!r}.") from None
+
+
+def _env_rate_map(name: str) -> dict[str, float]:
+    """Parse ``key=rate,key=rate`` (e.g. ``lead-agent=0.1,subagent:bash=0``)."""
+    value = _first_env_value(name)
+    if value is None:
+        return {}
+    rates: dict[str, float] = {}
+    for entry in value.split(","):
+        if not entry.strip():
+            continue
+        key, sep, rate = entry.rpartition("=")
+        try:
+            if not sep or not key.strip():
+                raise ValueError
+            rates[key.strip()] = float(rate)
+        except ValueError:
+            raise ValueError(f"{name} entries must look like 'name=rate', got {entry.strip()!r}.") from None
+    return rates
+
+
 def get_tracing_config() -> TracingConfig:
     """Get the current tracing configuration from environment variables."""
     global _tracing_config
@@ -166,6 +252,16 @@ def get_tracing_config() -> TracingConfig:
                 exporters=_first_env_value("MONOCLE_EXPORTERS") or "file",
                 okahu_api_key=_first_env_value("OKAHU_API_KEY"),
             ),
+            sampling=TracingSamplingConfig(
+                sample_rate=_env_number("DEER_FLOW_TRACE_SAMPLE_RATE", 1.0, float),
+                agent_sample_rates=_env_rate_map("DEER_FLOW_TRACE_AGENT_SAMPLE_RATES"),
+                user_sample_rates=_env_rate_map("DEER_FLOW_TRACE_USER_SAMPLE_RATES"),
+                keep_errored_runs=_env_value("DEER_FLOW_TRACE_KEEP_ERRORS", "true").lower() in _TRUTHY_VALUES,
+                buffer_limit=_env_number("DEER_FLOW_TRACE_BUFFER_LIMIT", 2000, int),
+                export_mode=_env_value("DEER_FLOW_TRACE_EXPORT", "inline").lower(),
+                queue_size=_env_number("DEER_FLOW_TRACE_QUEUE_SIZE", 10_000, int),
+                batch_size=_env_number("DEER_FLOW_TRACE_BATCH_SIZE", 256, int),
+            ),
         )
         return _tracing_config
 
@@ -0,0 +1,22 @@
+"""Configuration for the shared web search/fetch result cache."""
+
+from pydantic import BaseModel, Field
+
+
+class WebToolCacheConfig(BaseModel):
+    """Configuration for caching community web search and fetch results.
+
+    Research runs often repeat the same query or URL across turns and
+    subagents. When enabled, identical requests within ``ttl_seconds`` are
+    served from a process-local cache and concurrent identical requests share
+    one upstream call. Error results are never cached.
+    """
+
+    enabled: bool = Field(default=False, description="Whether to cache web_search / web_fetch results from the community web tools.")
+    ttl_seconds: int = Field(default=900, ge=1, description="How long a cached search or fetch result stays valid, in seconds.")
+    max_entries: int = Field(default=512, ge=1, description="Maximum number of cached results; least recently used entries are evicted first.")
+    max_entry_chars: int = Field(
+        default=200_000,
+        ge=1,
+        description="Results longer than this many characters are returned but never cached, bounding cache memory per entry.",
+    )
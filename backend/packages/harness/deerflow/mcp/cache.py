@@ -6,6 +6,7 @@ from pathlib import Path
 
 from langchain_core.tools import BaseTool
 
+from deerflow.config.app_config import get_app_config_watcher, subscribe_app_config
 from deerflow.config.file_signature import ConfigSignature as _ConfigSignature
 from deerflow.config.file_signature import get_config_signature as _get_config_signature
 
@@ -27,6 +28,20 @@ _initialization_lock = asyncio.Lock()
 _config_path: Path | None = None  # Resolved extensions config path at init time
 _config_signature: _ConfigSignature | None = None  # (mtime, size, sha256) at init time
 
+# While the AppConfig watcher (``start_app_config_watcher``) covers the
+# extensions config, ``_is_cache_stale`` skips the per-call signature and only
+# re-signs after the watcher has published a change. Starts ``True`` so the
+# first check after the watcher starts is a full one.
+_config_recheck_pending = True
+
+
+def _on_app_config_change(previous, current) -> None:
+    global _config_recheck_pending
+    _config_recheck_pending = True
+
+
+subscribe_app_config(_on_app_config_change)
+
 
 def _resolve_config_path() -> Path | None:
     """Resolve the extensions config file path, or ``None`` when unconfigured.
@@ -81,12 +96,23 @@ def _is_cache_stale() -> bool:
     ``>`` comparison detects same-second edits and backward mtime moves, and
     tracking the resolved path detects a switch to a different config file.
 
+    When the AppConfig watcher is watching the recorded extensions config,
+    the signature is only recomputed after the watcher reported a change.
+
     Returns:
         True if the cache should be invalidated, False otherwise.
     """
+    global _config_recheck_pending
+
     if not _cache_initialized:
         return False  # Not initialized yet, not stale
 
+    watcher = get_app_config_watcher()
+    if watcher is not None and _config_path is not None and watcher.watches(_config_path):
+        if not _config_recheck_pending:
+            return False
+        _config_recheck_pending = False
+
     current_path, current_signature = _current_config_state()
 
     # Preserve the original "config missing / not yet recorded" behavior: if
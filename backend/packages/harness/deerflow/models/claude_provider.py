@@ -26,9 +26,11 @@ from typing import Any
 
 import anthropic
 from langchain_anthropic import ChatAnthropic
-from langchain_core.messages import BaseMessage
+from langchain_core.messages import BaseMessage, SystemMessage
 from pydantic import PrivateAttr
 
+from deerflow.utils.messages import STABLE_PREFIX_CHARS_KEY
+
 logger = logging.getLogger(__name__)
 
 MAX_RETRIES = 3
@@ -145,7 +147,7 @@ class ClaudeChatModel(ChatAnthropic):
             self._apply_oauth_billing(payload)
 
         if self.enable_prompt_caching:
-            self._apply_prompt_caching(payload)
+            self._apply_prompt_caching(payload, stable_prefix_chars=self._stable_prefix_chars(input_))
 
         if self.auto_thinking_budget:
             self._apply_thinking_budget(payload)
@@ -189,7 +191,19 @@ class ClaudeChatModel(ChatAnthropic):
                 }
             )
 
-    def _apply_prompt_caching(self, payload: dict) -> None:
+    def _stable_prefix_chars(self, input_: Any) -> int | None:
+        """Length of the static prompt at the head of a coalesced system message, if marked."""
+        try:
+            messages = self._convert_input(input_).to_messages()
+        except Exception:
+            return None
+        if messages and isinstance(messages[0], SystemMessage):
+            value = messages[0].additional_kwargs.get(STABLE_PREFIX_CHARS_KEY)
+            if isinstance(value, int) and value > 0:
+                return value
+        return None
+
+    def _apply_prompt_caching(self, payload: dict, stable_prefix_chars: int | None = None) -> None:
         """Apply ephemeral cache_control to system, recent messages, and last tool definition.
 
         Uses a budget of MAX_CACHE_BREAKPOINTS (4) breakpoints — the hard limit
@@ -197,9 +211,12 @@ class ClaudeChatModel(ChatAnthropic):
         placed on the *last* eligible blocks because later breakpoints cover a
         larger prefix and yield better cache hit rates.
 
-        The system prompt is expected to be fully static (no per-user memory or
-        current date).  Dynamic context is injected per-turn via
-        DynamicContextMiddleware as a <system-reminder> in the first HumanMessage.
+        ``stable_prefix_chars`` marks where the static system prompt ends inside
+        a system string that SystemMessageCoalescingMiddleware extended with
+        per-turn reminders (date, durable-context contract). The string is then
+        split into two text blocks with the same concatenated text and the
+        first one always gets a breakpoint, so a changed reminder or a long
+        conversation never pushes the static prompt out of the cache.
         """
         MAX_CACHE_BREAKPOINTS = 4
 
@@ -209,16 +226,25 @@ class ClaudeChatModel(ChatAnthropic):
         #   3. the last tool definition
         candidates: list[dict] = []
 
-        # 1. System blocks
         system = payload.get("system")
+        if system and isinstance(system, str):
+            system = payload["system"] = [{"type": "text", "text": system}]
+
+        # Split off the static prompt. Anthropic caches tools before system,
+        # so its breakpoint also covers the tool definitions and the separate
+        # last-tool candidate is dropped.
+        pinned: dict | None = None
+        if stable_prefix_chars and isinstance(system, list) and len(system) == 1 and isinstance(system[0], dict) and system[0].get("type") == "text":
+            text = system[0].get("text") or ""
+            if 0 < stable_prefix_chars < len(text):
+                pinned = {"type": "text", "text": text[:stable_prefix_chars]}
+                system = payload["system"] = [pinned, {"type": "text", "text": text[stable_prefix_chars:]}]
+
+        # 1. System blocks
         if system and isinstance(system, list):
             for block in system:
-                if isinstance(block, dict) and block.get("type") == "text":
+                if isinstance(block, dict) and block.get("type") == "text" and block is not pinned:
                     candidates.append(block)
-        elif system and isinstance(system, str):
-            new_block: dict = {"type": "text", "text": system}
-            payload["system"] = [new_block]
-            candidates.append(new_block)
 
         # 2. Recent message blocks
         messages = payload.get("messages", [])
@@ -239,12 +265,16 @@ class ClaudeChatModel(ChatAnthropic):
 
         # 3. Last tool definition
         tools = payload.get("tools", [])
-        if tools and isinstance(tools[-1], dict):
+        if pinned is None and tools and isinstance(tools[-1], dict):
             candidates.append(tools[-1])
 
         # Apply cache_control only to the last MAX_CACHE_BREAKPOINTS candidates
         # to stay within the API limit.
-        for block in candidates[-MAX_CACHE_BREAKPOINTS:]:
+        budget = MAX_CACHE_BREAKPOINTS
+        if pinned is not None:
+            pinned["cache_control"] = {"type": "ephemeral"}
+            budget -= 1
+        for block in candidates[-budget:]:
             block["cache_control"] = {"type": "ephemeral"}
 
     def _apply_thinking_budget(self, payload: dict) -> None:
@@ -13,6 +13,7 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+from typing import Any
 
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
@@ -81,7 +82,7 @@ async def _auto_create_postgres_db(url: str) -> None:
         await maint_engine.dispose()
 
 
-async def init_engine(
+async def create_engine(
     backend: str,
     *,
     url: str = "",
@@ -90,8 +91,12 @@ async def init_engine(
     pool_recycle: int = POSTGRES_POOL_RECYCLE_SECONDS,
     command_timeout: float | None = POSTGRES_COMMAND_TIMEOUT_SECONDS,
     sqlite_dir: str = "",
-) -> None:
-    """Create the async engine and session factory, then auto-create tables.
+) -> AsyncEngine | None:
+    """Create an async engine and bootstrap the schema, without touching the module singleton.
+
+    :func:`init_engine` wraps this for the process-wide engine. Embedded callers
+    that run on their own event loop (``DeerFlowClient``) use it directly so the
+    pool they own is bound to that loop and disposed with them.
 
     Args:
         backend: "memory", "sqlite", or "postgres".
@@ -101,12 +106,12 @@ async def init_engine(
         pool_recycle: Seconds before Postgres connections are recycled.
         command_timeout: Timeout in seconds for app ORM Postgres commands, or None to disable.
         sqlite_dir: Directory to create for SQLite (ensured to exist).
-    """
-    global _engine, _session_factory
 
+    Returns:
+        The engine, or None when backend is "memory".
+    """
     if backend == "memory":
-        logger.info("Persistence backend=memory -- ORM engine not initialized")
-        return
+        return None
 
     if backend == "postgres":
         try:
@@ -133,7 +138,7 @@ async def init_engine(
         # syscall) blocks it during startup. Mirrors the #1912 fix for the
         # checkpointer's ``ensure_sqlite_parent_dir``.
         await asyncio.to_thread(os.makedirs, sqlite_dir or ".", exist_ok=True)
-        _engine = create_async_engine(url, echo=echo, json_serializer=_json_serializer)
+        engine = create_async_engine(url, echo=echo, json_serializer=_json_serializer)
 
         # Enable WAL on every new connection. SQLite PRAGMA settings are
         # per-connection, so we wire the listener instead of running PRAGMA
@@ -150,7 +155,7 @@ async def init_engine(
         # mirrored on the alembic-spawned engine in
         # ``migrations/env.py::run_migrations_online`` so its connections
         # behave identically.
-        @event.listens_for(_engine.sync_engine, "connect")
+        @event.listens_for(engine.sync_engine, "connect")
         def _enable_sqlite_wal(dbapi_conn, _record):  # noqa: ARG001 — SQLAlchemy contract
             cursor = dbapi_conn.cursor()
             try:
@@ -161,7 +166,7 @@ async def init_engine(
             finally:
                 cursor.close()
     elif backend == "postgres":
-        _engine = create_async_engine(
+        engine = create_async_engine(
             url,
             **_postgres_engine_kwargs(
                 echo=echo,
@@ -173,8 +178,6 @@ async def init_engine(
     else:
         raise ValueError(f"Unknown persistence backend: {backend!r}")
 
-    _session_factory = async_sessionmaker(_engine, expire_on_commit=False)
-
     # Schema bootstrap (hybrid):
     #   - empty DB        -> create_all + alembic stamp head
     #   - legacy DB       -> create_all (baseline tables only, backfill) + alembic stamp baseline + upgrade head
@@ -187,14 +190,14 @@ async def init_engine(
     from deerflow.persistence.bootstrap import bootstrap_schema
 
     try:
-        await bootstrap_schema(_engine, backend=backend)
+        await bootstrap_schema(engine, backend=backend)
     except Exception as exc:
         if backend == "postgres" and "does not exist" in str(exc):
             # Database not yet created -- attempt to auto-create it, then retry.
             await _auto_create_postgres_db(url)
             # Rebuild engine against the now-existing database
-            await _engine.dispose()
-            _engine = create_async_engine(
+            await engine.dispose()
+            engine = create_async_engine(
                 url,
                 **_postgres_engine_kwargs(
                     echo=echo,
@@ -203,28 +206,70 @@ async def init_engine(
                     command_timeout=command_timeout,
                 ),
             )
-            _session_factory = async_sessionmaker(_engine, expire_on_commit=False)
-            await bootstrap_schema(_engine, backend=backend)
+            await bootstrap_schema(engine, backend=backend)
         else:
             raise
 
+    return engine
+
+
+async def init_engine(
+    backend: str,
+    *,
+    url: str = "",
+    echo: bool = False,
+    pool_size: int = 5,
+    pool_recycle: int = POSTGRES_POOL_RECYCLE_SECONDS,
+    command_timeout: float | None = POSTGRES_COMMAND_TIMEOUT_SECONDS,
+    sqlite_dir: str = "",
+) -> None:
+    """Create the process-wide async engine and session factory, then auto-create tables.
+
+    Takes the same arguments as :func:`create_engine`.
+    """
+    global _engine, _session_factory
+
+    engine = await create_engine(
+        backend,
+        url=url,
+        echo=echo,
+        pool_size=pool_size,
+        pool_recycle=pool_recycle,
+        command_timeout=command_timeout,
+        sqlite_dir=sqlite_dir,
+    )
+    if engine is None:
+        logger.info("Persistence backend=memory -- ORM engine not initialized")
+        return
+    _engine = engine
+    _session_factory = async_sessionmaker(engine, expire_on_commit=False)
     logger.info("Persistence engine initialized: backend=%s", backend)
 
 
+def _engine_kwargs_from_config(config) -> dict[str, Any]:
+    return {
+        "url": config.app_sqlalchemy_url,
+        "echo": config.echo_sql,
+        "pool_size": config.pool_size,
+        "pool_recycle": config.pool_recycle,
+        "command_timeout": config.command_timeout,
+        "sqlite_dir": config.sqlite_dir if config.backend == "sqlite" else "",
+    }
+
+
 async def init_engine_from_config(config) -> None:
     """Convenience: init engine from a DatabaseConfig object."""
     if config.backend == "memory":
         await init_engine("memory")
         return
-    await init_engine(
-        backend=config.backend,
-        url=config.app_sqlalchemy_url,
-        echo=config.echo_sql,
-        pool_size=config.pool_size,
-        pool_recycle=config.pool_recycle,
-        command_timeout=config.command_timeout,
-        sqlite_dir=config.sqlite_dir if config.backend == "sqlite" else "",
-    )
+    await init_engine(backend=config.backend, **_engine_kwargs_from_config(config))
+
+
+async def create_engine_from_config(config) -> AsyncEngine | None:
+    """Convenience: :func:`create_engine` from a DatabaseConfig object."""
+    if config.backend == "memory":
+        return None
+    return await create_engine(config.backend, **_engine_kwargs_from_config(config))
 
 
 def get_session_factory() -> async_sessionmaker[AsyncSession] | None:
@@ -0,0 +1,138 @@
+"""run usage rollup.
+
+Revision ID: 0006_run_usage_rollup
+Revises: 0005_run_stop_reason
+Create Date: 2026-10-19
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+logger = logging.getLogger(__name__)
+
+revision: str = "0006_run_usage_rollup"
+down_revision: str | Sequence[str] | None = "0005_run_stop_reason"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_BACKFILL_BATCH = 5000
+
+
+def _backfill_run_usage() -> None:
+    """Fold every finished run into ``run_usage_hourly``.
+
+    Costs use the pricing configured at migration time; when config cannot be
+    loaded here the rows are priced with an empty map and the console rebuilds
+    them on first read (their pricing fingerprint will not match).
+    """
+    from deerflow.persistence.run_usage.pricing import build_pricing_map
+    from deerflow.persistence.run_usage.sql import ACTIVE_RUN_STATUSES, RunUsageAccumulator
+
+    runs = sa.table(
+        "runs",
+        sa.column("user_id", sa.String),
+        sa.column("assistant_id", sa.String),
+        sa.column("status", sa.String),
+        sa.column("model_name", sa.String),
+        sa.column("created_at", sa.DateTime(timezone=True)),
+        sa.column("updated_at", sa.DateTime(timezone=True)),
+        sa.column("total_tokens", sa.Integer),
+        sa.column("total_input_tokens", sa.Integer),
+        sa.column("total_output_tokens", sa.Integer),
+        sa.column("token_usage_by_model", sa.JSON),
+    )
+    rollup = sa.table(
+        "run_usage_hourly",
+        *(
+            sa.column(name)
+            for name in (
+                "bucket_start",
+                "user_id",
+                "model_name",
+                "assistant_id",
+                "status",
+                "run_count",
+                "total_tokens",
+                "input_tokens",
+                "output_tokens",
+                "latency_ms",
+                "cost",
+                "model_run_count",
+                "model_tokens",
+                "model_input_tokens",
+                "model_cache_read_tokens",
+                "model_cost",
+                "pricing_fingerprint",
+                "updated_at",
+            )
+        ),
+    )
+    bind = op.get_bind()
+    accumulator = RunUsageAccumulator(build_pricing_map())
+    source = bind.execute(sa.select(runs).where(runs.c.status.not_in(ACTIVE_RUN_STATUSES)).execution_options(yield_per=_BACKFILL_BATCH))
+    for partition in source.partitions():
+        for run in partition:
+            accumulator.add(run)
+    rows = accumulator.rows()
+    for start in range(0, len(rows), _BACKFILL_BATCH):
+        bind.execute(rollup.insert(), rows[start : start + _BACKFILL_BATCH])
+    logger.info("migration 0006_run_usage_rollup: backfilled %d rollup rows", len(rows))
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+
+    # The console's live queries for active runs and the rollup refresh both
+    # filter runs by user and creation time.
+    if "ix_runs_user_created_status" not in {ix["name"] for ix in insp.get_indexes("runs")}:
+        with op.batch_alter_table("runs", schema=None) as batch_op:
+            batch_op.create_index("ix_runs_user_created_status", ["user_id", "created_at", "status"], unique=False)
+
+    if insp.has_table("run_usage_hourly"):
+        # Idempotent: create_all already provisioned the table.
+        return
+    op.create_table(
+        "run_usage_hourly",
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("user_id", sa.String(length=64), nullable=False),
+        sa.Column("model_name", sa.String(length=128), nullable=False),
+        sa.Column("assistant_id", sa.String(length=128), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("run_count", sa.Integer(), nullable=False),
+        sa.Column("total_tokens", sa.BigInteger(), nullable=False),
+        sa.Column("input_tokens", sa.BigInteger(), nullable=False),
+        sa.Column("output_tokens", sa.BigInteger(), nullable=False),
+        sa.Column("latency_ms", sa.BigInteger(), nullable=False),
+        sa.Column("cost", sa.Float(), nullable=False),
+        sa.Column("model_run_count", sa.Integer(), nullable=False),
+        sa.Column("model_tokens", sa.BigInteger(), nullable=False),
+        sa.Column("model_input_tokens", sa.BigInteger(), nullable=False),
+        sa.Column("model_cache_read_tokens", sa.BigInteger(), nullable=False),
+        sa.Column("model_cost", sa.Float(), nullable=True),
+        sa.Column("pricing_fingerprint", sa.String(length=64), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("bucket_start", "user_id", "model_name", "assistant_id", "status"),
+    )
+    with op.batch_alter_table("run_usage_hourly", schema=None) as batch_op:
+        batch_op.create_index("ix_run_usage_hourly_user_bucket", ["user_id", "bucket_start"], unique=False)
+        batch_op.create_index("ix_run_usage_hourly_pricing", ["pricing_fingerprint", "user_id"], unique=False)
+    _backfill_run_usage()
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    if insp.has_table("run_usage_hourly"):
+        with op.batch_alter_table("run_usage_hourly", schema=None) as batch_op:
+            batch_op.drop_index("ix_run_usage_hourly_pricing")
+            batch_op.drop_index("ix_run_usage_hourly_user_bucket")
+        op.drop_table("run_usage_hourly")
+    if "ix_runs_user_created_status" in {ix["name"] for ix in insp.get_indexes("runs")}:
+        with op.batch_alter_table("runs", schema=None) as batch_op:
+            batch_op.drop_index("ix_runs_user_created_status")
@@ -55,6 +55,9 @@ class RunRow(Base):
     __table_args__ = (
         Index("ix_runs_thread_status", "thread_id", "status"),
         Index("ix_runs_lease", "lease_expires_at"),
+        # Per-user time-window scans (console live queries, usage rollup
+        # refresh); ``status`` is included so both filter without row lookups.
+        Index("ix_runs_user_created_status", "user_id", "created_at", "status"),
         # Cross-process atomicity guarantee: at most one pending/running run per
         # thread. Must live in ORM ``__table_args__`` (not just the migration)
         # because the empty-DB bootstrap path runs ``create_all`` + ``stamp head``
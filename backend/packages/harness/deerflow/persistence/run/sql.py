@@ -8,6 +8,7 @@ minutes -- we don't hold connections across long execution.
 from __future__ import annotations
 
 import json
+import logging
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
@@ -15,10 +16,13 @@ from sqlalchemy import or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from deerflow.persistence.run.model import RunRow
+from deerflow.persistence.run_usage.sql import ACTIVE_RUN_STATUSES, RunUsageRepository, hour_bucket
 from deerflow.runtime.runs.store.base import RunStore
 from deerflow.runtime.user_context import AUTO, _AutoSentinel, resolve_user_id
 from deerflow.utils.time import coerce_iso
 
+logger = logging.getLogger(__name__)
+
 
 def _lease_expired_or_null(lease_col, cutoff: datetime):
     """SQLAlchemy filter: True when the lease is NULL or has expired past *cutoff*."""
@@ -28,6 +32,22 @@ def _lease_expired_or_null(lease_col, cutoff: datetime):
 class RunRepository(RunStore):
     def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
         self._sf = session_factory
+        self._usage = RunUsageRepository(session_factory)
+
+    async def _refresh_usage(self, run_ids=(), buckets=()) -> None:
+        """Keep the hourly usage rollup in step with a finished run's row.
+
+        Best-effort: the rollup is derived data and a failure here must not
+        fail the run write that triggered it (the next write to the same
+        bucket, or a pricing-triggered rebuild, repairs it).
+        """
+        try:
+            if run_ids:
+                await self._usage.refresh_runs(run_ids)
+            if buckets:
+                await self._usage.refresh_buckets(buckets)
+        except Exception:
+            logger.warning("Failed to refresh run usage rollup for runs %s", list(run_ids), exc_info=True)
 
     @staticmethod
     def _normalize_model_name(model_name: str | None) -> str | None:
@@ -136,6 +156,8 @@ class RunRepository(RunStore):
                 for key, value in values.items():
                     setattr(row, key, value)
             await session.commit()
+        if status not in ACTIVE_RUN_STATUSES:
+            await self._refresh_usage([run_id])
 
     async def get(
         self,
@@ -219,12 +241,17 @@ class RunRepository(RunStore):
         async with self._sf() as session:
             result = await session.execute(update(RunRow).where(RunRow.run_id == run_id, RunRow.status.in_(("pending", "running", "interrupted"))).values(**values))
             await session.commit()
-            return result.rowcount != 0
+        if result.rowcount == 0:
+            return False
+        if status not in ACTIVE_RUN_STATUSES:
+            await self._refresh_usage([run_id])
+        return True
 
     async def update_model_name(self, run_id, model_name):
         async with self._sf() as session:
             await session.execute(update(RunRow).where(RunRow.run_id == run_id).values(model_name=self._normalize_model_name(model_name), updated_at=datetime.now(UTC)))
             await session.commit()
+        await self._refresh_usage([run_id])
 
     async def delete(
         self,
@@ -239,8 +266,11 @@ class RunRepository(RunStore):
                 return
             if resolved_user_id is not None and row.user_id != resolved_user_id:
                 return
+            bucket = (row.user_id or "", hour_bucket(row.created_at)) if row.created_at is not None else None
             await session.delete(row)
             await session.commit()
+        if bucket is not None:
+            await self._refresh_usage(buckets=[bucket])
 
     async def list_pending(self, *, before=None):
         if before is None:
@@ -291,6 +321,7 @@ class RunRepository(RunStore):
         last_ai_message: str | None = None,
         first_human_message: str | None = None,
         error: str | None = None,
+        metadata_updates: dict[str, Any] | None = None,
     ) -> bool:
         """Update status + token usage + convenience fields on run completion.
 
@@ -316,9 +347,15 @@ class RunRepository(RunStore):
         if error is not None:
             values["error"] = error
         async with self._sf() as session:
+            if metadata_updates:
+                current = await session.scalar(select(RunRow.metadata_json).where(RunRow.run_id == run_id))
+                values["metadata_json"] = {**(current or {}), **(self._safe_json(metadata_updates) or {})}
             result = await session.execute(update(RunRow).where(RunRow.run_id == run_id).values(**values))
             await session.commit()
-            return result.rowcount != 0
+        if result.rowcount == 0:
+            return False
+        await self._refresh_usage([run_id])
+        return True
 
     async def update_run_progress(
         self,
@@ -474,7 +511,10 @@ class RunRepository(RunStore):
                 .values(status="error", error=error, updated_at=datetime.now(UTC))
             )
             await session.commit()
-            return result.rowcount != 0
+        if result.rowcount == 0:
+            return False
+        await self._refresh_usage([run_id])
+        return True
 
     async def list_inflight_with_expired_lease(
         self,
@@ -597,4 +637,7 @@ class RunRepository(RunStore):
             await session.commit()
 
             new_row = await session.get(RunRow, run_id)
-            return self._row_to_dict(new_row), claimed
+            new_run = self._row_to_dict(new_row)
+        if claimed:
+            await self._refresh_usage([row["run_id"] for row in claimed])
+        return new_run, claimed
@@ -0,0 +1,6 @@
+"""Hourly run-usage rollup — ORM, pricing and SQL repository."""
+
+from deerflow.persistence.run_usage.model import RunUsageHourlyRow
+from deerflow.persistence.run_usage.sql import RunUsageRepository
+
+__all__ = ["RunUsageHourlyRow", "RunUsageRepository"]
@@ -0,0 +1,54 @@
+"""ORM model for the hourly run-usage rollup read by the operations console."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+from sqlalchemy import BigInteger, DateTime, Float, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from deerflow.persistence.base import Base
+
+
+class RunUsageHourlyRow(Base):
+    """Finished-run usage aggregated per UTC hour, user, model, agent and status.
+
+    Each finished run contributes two kinds of measures. Run-level measures
+    (``run_count`` .. ``cost``) are attributed once, to the run's
+    ``model_name``. Model-level measures (``model_*``) are attributed to every
+    model in the run's ``token_usage_by_model`` breakdown (or to
+    ``model_name`` for legacy runs without one), matching the console's
+    per-model view. Missing dimensions are stored as ``""`` so they can be
+    part of the primary key.
+    """
+
+    __tablename__ = "run_usage_hourly"
+
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    user_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    model_name: Mapped[str] = mapped_column(String(128), primary_key=True)
+    assistant_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    status: Mapped[str] = mapped_column(String(20), primary_key=True)
+
+    run_count: Mapped[int] = mapped_column(Integer, default=0)
+    total_tokens: Mapped[int] = mapped_column(BigInteger, default=0)
+    input_tokens: Mapped[int] = mapped_column(BigInteger, default=0)
+    output_tokens: Mapped[int] = mapped_column(BigInteger, default=0)
+    latency_ms: Mapped[int] = mapped_column(BigInteger, default=0)
+    cost: Mapped[float] = mapped_column(Float, default=0.0)
+
+    model_run_count: Mapped[int] = mapped_column(Integer, default=0)
+    model_tokens: Mapped[int] = mapped_column(BigInteger, default=0)
+    model_input_tokens: Mapped[int] = mapped_column(BigInteger, default=0)
+    model_cache_read_tokens: Mapped[int] = mapped_column(BigInteger, default=0)
+    model_cost: Mapped[float | None] = mapped_column(Float, nullable=True)
+
+    # Costs are computed with the pricing in effect when the row was written;
+    # rows whose fingerprint no longer matches are rebuilt on the next read.
+    pricing_fingerprint: Mapped[str] = mapped_column(String(64), default="")
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC))
+
+    __table_args__ = (
+        Index("ix_run_usage_hourly_user_bucket", "user_id", "bucket_start"),
+        Index("ix_run_usage_hourly_pricing", "pricing_fingerprint", "user_id"),
+    )
@@ -0,0 +1,140 @@
+"""Per-model spend estimation from ``models[*].pricing`` in config.yaml.
+
+Shared by the console endpoints and the usage rollup so a run's cost is
+computed the same way whether it is read live or from the rollup.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from typing import NamedTuple
+
+from deerflow.config import get_app_config
+
+logger = logging.getLogger(__name__)
+
+
+class ModelPricing(NamedTuple):
+    input_per_million: float
+    output_per_million: float
+    currency: str
+    # Price for prompt-cache-hit input tokens. None → hits are billed at the
+    # full input price (conservative upper bound for providers that don't
+    # discount, or when the operator hasn't configured the hit price).
+    input_cache_hit_per_million: float | None = None
+
+
+def build_pricing_map(models: list | None = None) -> dict[str, ModelPricing]:
+    """Collect per-model prices from ``models[*].pricing`` in config.yaml.
+
+    ``ModelConfig`` allows extra fields, so operators can annotate each model
+    with e.g. ``pricing: {currency: CNY, input_per_million: 8,
+    output_per_million: 32, input_cache_hit_per_million: 0.8}`` without any
+    schema change. Entries are keyed by both the config ``name`` and the
+    provider ``model`` id (plus lowercase variants), because
+    ``token_usage_by_model`` buckets carry the provider-reported model name.
+    *models* defaults to the configured ``models`` list.
+    """
+    if models is None:
+        try:
+            models = get_app_config().models
+        except Exception:  # pragma: no cover - defensive: cost display must not break the console
+            logger.warning("pricing: failed to load model pricing from config", exc_info=True)
+            return {}
+
+    pricing: dict[str, ModelPricing] = {}
+    for model_cfg in models or []:
+        raw = getattr(model_cfg, "pricing", None)
+        if not isinstance(raw, dict):
+            continue
+        try:
+            input_price = float(raw.get("input_per_million") or 0)
+            output_price = float(raw.get("output_per_million") or 0)
+            raw_hit_price = raw.get("input_cache_hit_per_million")
+            cache_hit_price = float(raw_hit_price) if raw_hit_price is not None else None
+        except (TypeError, ValueError):
+            logger.warning("pricing: ignoring malformed pricing on model %s", model_cfg.name)
+            continue
+        if input_price <= 0 and output_price <= 0:
+            continue
+        currency = str(raw.get("currency") or "USD").upper()
+        entry = ModelPricing(input_price, output_price, currency, cache_hit_price)
+        for key in (model_cfg.name, getattr(model_cfg, "model", None)):
+            if key:
+                pricing.setdefault(key, entry)
+                pricing.setdefault(key.lower(), entry)
+    return pricing
+
+
+def pricing_fingerprint(pricing: dict[str, ModelPricing]) -> str:
+    """Stable digest of *pricing*; changes whenever any price changes."""
+    payload = json.dumps(sorted((key, list(price)) for key, price in pricing.items()), separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def pricing_currency(pricing: dict[str, ModelPricing]) -> str | None:
+    """Display currency: the first configured entry's (one currency per deployment)."""
+    return next(iter(pricing.values())).currency if pricing else None
+
+
+def lookup_pricing(pricing: dict[str, ModelPricing], model: str | None) -> ModelPricing | None:
+    if not model:
+        return None
+    return pricing.get(model) or pricing.get(model.lower())
+
+
+def token_cost(input_tokens: int, output_tokens: int, price: ModelPricing, cache_read_tokens: int = 0) -> float:
+    """Cache-aware spend: cache-hit input tokens are billed at the hit price.
+
+    ``cache_read_tokens`` is clamped into ``[0, input_tokens]``; the remainder
+    is billed at the full (cache-miss) input price. Without a configured hit
+    price all input is billed at the miss price.
+    """
+    cache_read = min(max(int(cache_read_tokens or 0), 0), max(int(input_tokens or 0), 0))
+    uncached = max(int(input_tokens or 0), 0) - cache_read
+    hit_price = price.input_cache_hit_per_million if price.input_cache_hit_per_million is not None else price.input_per_million
+    return (uncached / 1_000_000) * price.input_per_million + (cache_read / 1_000_000) * hit_price + (output_tokens / 1_000_000) * price.output_per_million
+
+
+def run_cost(
+    pricing: dict[str, ModelPricing],
+    *,
+    model_name: str | None,
+    total_input_tokens: int | None,
+    total_output_tokens: int | None,
+    token_usage_by_model: dict | None,
+) -> float | None:
+    """Estimate one run's spend, or None when none of its models are priced.
+
+    Prefers the per-model breakdown (accurate for multi-model runs, e.g.
+    subagents on a different model); falls back to run-level totals priced at
+    ``model_name`` for legacy rows. Buckets without an input/output split are
+    skipped rather than guessed.
+    """
+    cost = 0.0
+    priced = False
+    if isinstance(token_usage_by_model, dict):
+        for model, usage in token_usage_by_model.items():
+            if not isinstance(usage, dict):
+                continue
+            price = lookup_pricing(pricing, model)
+            if price is None:
+                continue
+            input_tokens = int(usage.get("input_tokens") or 0)
+            output_tokens = int(usage.get("output_tokens") or 0)
+            if input_tokens == 0 and output_tokens == 0:
+                continue
+            cost += token_cost(input_tokens, output_tokens, price, int(usage.get("cache_read_tokens") or 0))
+            priced = True
+    if priced:
+        return cost
+    price = lookup_pricing(pricing, model_name)
+    if price is None:
+        return None
+    input_tokens = int(total_input_tokens or 0)
+    output_tokens = int(total_output_tokens or 0)
+    if input_tokens == 0 and output_tokens == 0:
+        return None
+    return token_cost(input_tokens, output_tokens, price)
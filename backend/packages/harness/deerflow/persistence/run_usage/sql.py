@@ -0,0 +1,288 @@
+"""Maintenance of the hourly run-usage rollup.
+
+The rollup is derived data: every bucket can be recomputed from the ``runs``
+table at any time. :class:`RunUsageRepository` therefore refreshes a whole
+``(user, hour)`` bucket whenever one of its runs finishes (or is deleted,
+renamed, taken over...) instead of applying deltas, which keeps the rollup
+correct no matter how many times or in what order a run is updated. Active
+(pending/running) runs are never rolled up; readers add them live.
+
+A pricing change makes every stored cost stale. :meth:`RunUsageRepository.ensure_current`
+then starts a rebuild in the background, one at a time per process, and
+readers aggregate the ``runs`` table directly until it lands.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Iterable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import delete, insert, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from deerflow.persistence.run.model import RunRow
+from deerflow.persistence.run_usage.model import RunUsageHourlyRow
+from deerflow.persistence.run_usage.pricing import ModelPricing, build_pricing_map, lookup_pricing, pricing_fingerprint, run_cost, token_cost
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_RUN_STATUSES: tuple[str, ...] = ("pending", "running")
+
+# ``runs`` columns the rollup is computed from (also used by the backfill
+# migration, which reads them through a lightweight table construct).
+USAGE_SOURCE_COLUMNS: tuple[str, ...] = (
+    "user_id",
+    "assistant_id",
+    "status",
+    "model_name",
+    "created_at",
+    "updated_at",
+    "total_tokens",
+    "total_input_tokens",
+    "total_output_tokens",
+    "token_usage_by_model",
+)
+
+_INSERT_CHUNK = 1000
+
+# The background rebuild started by ``ensure_current``; at most one runs per
+# process so concurrent readers never race each other's delete/insert.
+_rebuild_task: asyncio.Task | None = None
+_DIMENSION_LENGTHS = {"user_id": 64, "model_name": 128, "assistant_id": 128, "status": 20}
+
+
+def _as_utc(dt: datetime) -> datetime:
+    """SQLite round-trips timestamps naive, Postgres aware."""
+    return dt.replace(tzinfo=UTC) if dt.tzinfo is None else dt.astimezone(UTC)
+
+
+def hour_bucket(dt: datetime) -> datetime:
+    """Return the start of the UTC hour containing *dt*."""
+    return _as_utc(dt).replace(minute=0, second=0, microsecond=0)
+
+
+def _empty_measures() -> dict[str, Any]:
+    return {
+        "run_count": 0,
+        "total_tokens": 0,
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "latency_ms": 0,
+        "cost": 0.0,
+        "model_run_count": 0,
+        "model_tokens": 0,
+        "model_input_tokens": 0,
+        "model_cache_read_tokens": 0,
+        "model_cost": None,
+    }
+
+
+class RunUsageAccumulator:
+    """Fold finished runs into rollup rows (plain dicts ready for ``INSERT``).
+
+    Runs are added one at a time, so a caller can stream the ``runs`` table
+    through it: memory grows with the number of rollup rows, not runs.
+
+    Runs are objects exposing :data:`USAGE_SOURCE_COLUMNS` as attributes
+    (ORM rows or result rows); active runs and runs without ``created_at``
+    are skipped. The per-model attribution mirrors the console: breakdown
+    buckets when ``token_usage_by_model`` is present, else the run's model.
+    """
+
+    def __init__(self, pricing: dict[str, ModelPricing]) -> None:
+        self._pricing = pricing
+        self._buckets: dict[tuple, dict[str, Any]] = {}
+
+    def _entry(self, bucket_start: datetime, run: Any, model: str | None) -> dict[str, Any]:
+        dims = {
+            "bucket_start": bucket_start,
+            "user_id": run.user_id or "",
+            "model_name": model or "",
+            "assistant_id": run.assistant_id or "",
+            "status": run.status or "",
+        }
+        for column, length in _DIMENSION_LENGTHS.items():
+            dims[column] = dims[column][:length]
+        key = tuple(dims.values())
+        entry = self._buckets.get(key)
+        if entry is None:
+            entry = self._buckets[key] = {**dims, **_empty_measures()}
+        return entry
+
+    def add(self, run: Any) -> None:
+        if run.status in ACTIVE_RUN_STATUSES or run.created_at is None:
+            return
+        pricing = self._pricing
+        created = _as_utc(run.created_at)
+        bucket_start = created.replace(minute=0, second=0, microsecond=0)
+        run_tokens = run.total_tokens or 0
+        cost = run_cost(
+            pricing,
+            model_name=run.model_name,
+            total_input_tokens=run.total_input_tokens,
+            total_output_tokens=run.total_output_tokens,
+            token_usage_by_model=run.token_usage_by_model,
+        )
+
+        entry = self._entry(bucket_start, run, run.model_name)
+        entry["run_count"] += 1
+        entry["total_tokens"] += run_tokens
+        entry["input_tokens"] += run.total_input_tokens or 0
+        entry["output_tokens"] += run.total_output_tokens or 0
+        if run.updated_at is not None:
+            entry["latency_ms"] += max(int((_as_utc(run.updated_at) - created).total_seconds() * 1000), 0)
+        if cost is not None:
+            entry["cost"] += cost
+
+        usage_map = run.token_usage_by_model or {}
+        if isinstance(usage_map, dict) and usage_map:
+            for model, usage in usage_map.items():
+                entry = self._entry(bucket_start, run, model)
+                entry["model_run_count"] += 1
+                if not isinstance(usage, dict):
+                    continue
+                entry["model_tokens"] += int(usage.get("total_tokens", 0) or 0)
+                entry["model_input_tokens"] += int(usage.get("input_tokens") or 0)
+                entry["model_cache_read_tokens"] += int(usage.get("cache_read_tokens") or 0)
+                price = lookup_pricing(pricing, model)
+                if price is not None:
+                    model_cost = token_cost(int(usage.get("input_tokens") or 0), int(usage.get("output_tokens") or 0), price, int(usage.get("cache_read_tokens") or 0))
+                    entry["model_cost"] = (entry["model_cost"] or 0.0) + model_cost
+        elif run.model_name and run_tokens > 0:
+            # Legacy rows predating token_usage_by_model: attribute to the run's model.
+            entry["model_run_count"] += 1
+            entry["model_tokens"] += run_tokens
+            if cost is not None:
+                entry["model_cost"] = (entry["model_cost"] or 0.0) + cost
+
+    def rows(self) -> list[dict[str, Any]]:
+        fingerprint = pricing_fingerprint(self._pricing)
+        now = datetime.now(UTC)
+        return [{**entry, "pricing_fingerprint": fingerprint, "updated_at": now} for entry in self._buckets.values()]
+
+
+def aggregate_run_usage(runs: Iterable[Any], pricing: dict[str, ModelPricing]) -> list[dict[str, Any]]:
+    """Fold *runs* into rollup rows; see :class:`RunUsageAccumulator`."""
+    accumulator = RunUsageAccumulator(pricing)
+    for run in runs:
+        accumulator.add(run)
+    return accumulator.rows()
+
+
+def _user_filter(column, user_id: str | None):
+    """Match a rollup ``user_id`` key against ``runs.user_id`` (NULL ↔ "")."""
+    return or_(column.is_(None), column == "") if not user_id else column == user_id
+
+
+class RunUsageRepository:
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        self._sf = session_factory
+
+    @staticmethod
+    def _source_columns():
+        return [getattr(RunRow, name) for name in USAGE_SOURCE_COLUMNS]
+
+    async def refresh_runs(self, run_ids: Iterable[str], *, pricing: dict[str, ModelPricing] | None = None) -> None:
+        """Recompute the buckets that the given runs belong to."""
+        run_ids = list(run_ids)
+        if not run_ids:
+            return
+        async with self._sf() as session:
+            rows = (await session.execute(select(RunRow.user_id, RunRow.created_at).where(RunRow.run_id.in_(run_ids)))).all()
+        await self.refresh_buckets({(user_id or "", hour_bucket(created)) for user_id, created in rows if created is not None}, pricing=pricing)
+
+    async def refresh_buckets(self, buckets: Iterable[tuple[str, datetime]], *, pricing: dict[str, ModelPricing] | None = None) -> None:
+        """Recompute ``(user_id, bucket_start)`` buckets from the runs table."""
+        if pricing is None:
+            pricing = build_pricing_map()
+        for user_id, bucket_start in buckets:
+            for attempt in range(2):
+                try:
+                    await self._refresh_bucket(user_id, bucket_start, pricing)
+                    break
+                except IntegrityError:
+                    # A peer refreshed the same bucket concurrently; recompute
+                    # once more so the last writer wins with complete data.
+                    if attempt:
+                        raise
+
+    async def _refresh_bucket(self, user_id: str, bucket_start: datetime, pricing: dict[str, ModelPricing]) -> None:
+        bucket_end = bucket_start + timedelta(hours=1)
+        stmt = select(*self._source_columns()).where(
+            _user_filter(RunRow.user_id, user_id),
+            RunRow.created_at >= bucket_start,
+            RunRow.created_at < bucket_end,
+            RunRow.status.not_in(ACTIVE_RUN_STATUSES),
+        )
+        async with self._sf() as session:
+            runs = (await session.execute(stmt)).all()
+            await session.execute(delete(RunUsageHourlyRow).where(RunUsageHourlyRow.user_id == user_id, RunUsageHourlyRow.bucket_start == bucket_start))
+            rows = aggregate_run_usage(runs, pricing)
+            if rows:
+                await session.execute(insert(RunUsageHourlyRow), rows)
+            await session.commit()
+
+    async def rebuild(self, *, user_id: str | None = None, pricing: dict[str, ModelPricing] | None = None) -> int:
+        """Recompute the rollup for one user (or everyone); returns rows written."""
+        if pricing is None:
+            pricing = build_pricing_map()
+        rollup_where = (RunUsageHourlyRow.user_id == user_id,) if user_id else ()
+        stmt = select(*self._source_columns()).where(RunRow.status.not_in(ACTIVE_RUN_STATUSES))
+        if user_id:
+            stmt = stmt.where(RunRow.user_id == user_id)
+        accumulator = RunUsageAccumulator(pricing)
+        async with self._sf() as session:
+            await session.execute(delete(RunUsageHourlyRow).where(*rollup_where))
+            result = await session.stream(stmt.execution_options(yield_per=_INSERT_CHUNK))
+            async for partition in result.partitions():
+                for run in partition:
+                    accumulator.add(run)
+            rows = accumulator.rows()
+            for start in range(0, len(rows), _INSERT_CHUNK):
+                await session.execute(insert(RunUsageHourlyRow), rows[start : start + _INSERT_CHUNK])
+            await session.commit()
+        return len(rows)
+
+    async def ensure_current(self, pricing: dict[str, ModelPricing], *, user_id: str | None = None) -> bool:
+        """Return whether the scope's rollup was priced with *pricing*.
+
+        When it was not, a rebuild of the scope is started in the background
+        (unless one is already running in this process) and the caller should
+        aggregate ``runs`` directly for this request. Cheap when nothing is
+        stale: one ``LIMIT 1`` probe on ``ix_run_usage_hourly_pricing``.
+        """
+        global _rebuild_task
+
+        fingerprint = pricing_fingerprint(pricing)
+        # Two ranges instead of ``!=`` so the probe can seek the index.
+        column = RunUsageHourlyRow.pricing_fingerprint
+        probe = select(RunUsageHourlyRow.bucket_start).where(or_(column < fingerprint, column > fingerprint)).limit(1)
+        if user_id:
+            probe = probe.where(RunUsageHourlyRow.user_id == user_id)
+        async with self._sf() as session:
+            stale = (await session.execute(probe)).first() is not None
+        if not stale:
+            return True
+        running = _rebuild_task
+        if running is None or running.done() or running.get_loop() is not asyncio.get_running_loop():
+            logger.info("Model pricing changed; rebuilding the run usage rollup in the background")
+            _rebuild_task = asyncio.create_task(self._rebuild_in_background(user_id, pricing))
+        return False
+
+    async def _rebuild_in_background(self, user_id: str | None, pricing: dict[str, ModelPricing]) -> None:
+        try:
+            await self.rebuild(user_id=user_id, pricing=pricing)
+        except Exception:
+            # The rollup stays stale, so the next read starts another attempt.
+            logger.exception("Rebuilding the run usage rollup failed")
+
+
+async def wait_for_rollup_rebuild() -> None:
+    """Wait for the background rebuild started by ``ensure_current``, if any."""
+    task = _rebuild_task
+    if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+        await asyncio.shield(task)
@@ -12,6 +12,11 @@ from deerflow.utils.time import coerce_iso
 TERMINAL_TASK_STATUSES: frozenset[str] = frozenset({"completed", "failed", "cancelled"})
 
 
+def _as_utc(dt: datetime) -> datetime:
+    """SQLite round-trips timestamps naive, Postgres aware."""
+    return dt.replace(tzinfo=UTC) if dt.tzinfo is None else dt.astimezone(UTC)
+
+
 class ScheduledTaskRepository:
     def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
         self._sf = session_factory
@@ -155,6 +160,31 @@ class ScheduledTaskRepository:
             await session.commit()
             return [self._row_to_dict(row) for row in rows]
 
+    async def list_due_times(self, *, limit: int) -> list[tuple[str, datetime]]:
+        """Return ``(task_id, due_at)`` for tasks ``claim_due_tasks`` can admit.
+
+        ``due_at`` is ``next_run_at`` for enabled tasks and the lease expiry
+        for claimed (``running``, leased) ones, whichever is later. Enabled
+        tasks are the earliest *limit* by ``next_run_at``; leased tasks are
+        always included (there are at most ``max_concurrent_runs`` per worker).
+        """
+        enabled = (
+            select(ScheduledTaskRow.id, ScheduledTaskRow.next_run_at)
+            .where(ScheduledTaskRow.status == "enabled", ScheduledTaskRow.next_run_at.is_not(None))
+            .order_by(ScheduledTaskRow.next_run_at.asc(), ScheduledTaskRow.id.asc())
+            .limit(limit)
+        )
+        leased = select(ScheduledTaskRow.id, ScheduledTaskRow.next_run_at, ScheduledTaskRow.lease_expires_at).where(
+            ScheduledTaskRow.status == "running",
+            ScheduledTaskRow.next_run_at.is_not(None),
+            ScheduledTaskRow.lease_expires_at.is_not(None),
+        )
+        async with self._sf() as session:
+            due = [(task_id, _as_utc(next_at)) for task_id, next_at in (await session.execute(enabled)).all()]
+            for task_id, next_at, lease_expires_at in (await session.execute(leased)).all():
+                due.append((task_id, max(_as_utc(next_at), _as_utc(lease_expires_at))))
+        return due
+
     async def update_after_launch(
         self,
         task_id: str,
@@ -30,6 +30,7 @@ from langchain_core.messages import AIMessage, AnyMessage, BaseMessage, HumanMes
 from langgraph.types import Command
 
 from deerflow.agents.human_input import read_human_input_response
+from deerflow.runtime.metrics import MODEL_CALL_SECONDS, TOOL_CALL_SECONDS
 from deerflow.utils.messages import message_to_text, restore_original_human_message
 
 if TYPE_CHECKING:
@@ -113,6 +114,7 @@ class RunJournal(BaseCallbackHandler):
 
         # Latency tracking
         self._llm_start_times: dict[str, float] = {}  # langchain run_id -> start time
+        self._tool_start_times: dict[str, tuple[str, float]] = {}  # langchain run_id -> (tool name, start time)
 
         # LLM request/response tracking
         self._llm_call_index = 0
@@ -265,7 +267,10 @@ class RunJournal(BaseCallbackHandler):
             # Latency
             rid = str(run_id)
             start = self._llm_start_times.pop(rid, None)
-            latency_ms = int((time.monotonic() - start) * 1000) if start else None
+            elapsed = time.monotonic() - start if start else None
+            latency_ms = int(elapsed * 1000) if elapsed is not None else None
+            if elapsed is not None:
+                MODEL_CALL_SECONDS.observe(elapsed, caller.split(":", 1)[0])
 
             # Token usage from message
             usage = getattr(message, "usage_metadata", None)
@@ -348,9 +353,12 @@ class RunJournal(BaseCallbackHandler):
         """Handle tool start event, cache tool call ID for later correlation"""
         tool_call_id = str(run_id)
         logger.debug("Tool start for node %s, tool_call_id=%s, tags=%s", run_id, tool_call_id, tags)
+        tool_name = (serialized or {}).get("name") or kwargs.get("name") or "unknown"
+        self._tool_start_times[tool_call_id] = (tool_name, time.monotonic())
 
     def on_tool_end(self, output, *, run_id, parent_run_id=None, **kwargs):
         """Handle tool end event, append message and clear node data"""
+        self._observe_tool_latency(run_id, getattr(output, "status", None) or "success")
         try:
             if isinstance(output, ToolMessage):
                 msg = cast(ToolMessage, output)
@@ -368,6 +376,14 @@ class RunJournal(BaseCallbackHandler):
         finally:
             logger.debug("Tool end for node %s", run_id)
 
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._observe_tool_latency(run_id, "error")
+
+    def _observe_tool_latency(self, run_id: UUID, status: str) -> None:
+        started = self._tool_start_times.pop(str(run_id), None)
+        if started is not None:
+            TOOL_CALL_SECONDS.observe(time.monotonic() - started[1], started[0], status)
+
     # -- Internal methods --
 
     @staticmethod
@@ -0,0 +1,320 @@
+"""In-process latency histograms for agent runs (``metrics`` in ``config.yaml``).
+
+When a run is slow the question is where the time went: the model, one
+middleware in the lead-agent chain, a tool, checkpoint writes, run-event
+writes or stream publishing. With ``metrics.enabled`` each of those is timed
+into a fixed-bucket histogram and the gateway serves them in Prometheus text
+format on ``/metrics``.
+
+Timing is attached without touching the timed code:
+
+- ``instrument_middlewares`` shadows each hook a middleware overrides with a
+  timed wrapper on the instance. LangChain detects hooks on the class and
+  calls them through the instance, so the graph is built exactly as before.
+  ``wrap_*`` hooks are charged their own time only: the handler they call
+  (inner middlewares, the model or the tool) is subtracted.
+- ``instrument_methods`` does the same for the checkpointer, run event store
+  and stream bridge built once at gateway startup.
+- ``RunJournal`` observes model and tool latency from its callbacks.
+
+An observation costs two ``perf_counter`` calls, a bisect and an
+uncontended lock; ``scripts/benchmark/bench_middleware_metrics.py`` measures
+the overhead on a real middleware chain. With ``metrics.run_timing_summary``
+the worker also collects the run's own observations in a ``RunTimings``
+(through a context variable, so concurrent runs stay apart) and stores the
+breakdown under ``metadata.timing`` of the run record.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import logging
+import threading
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from contextvars import ContextVar, Token
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from deerflow.config.metrics_config import MetricsConfig
+
+logger = logging.getLogger(__name__)
+
+#: Upper bounds (seconds) shared by every histogram: sub-millisecond
+#: middleware hooks through multi-minute tool calls.
+DEFAULT_BUCKETS: tuple[float, ...] = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+_enabled = False
+_run_timing_summary = False
+_current_run_timings: ContextVar[RunTimings | None] = ContextVar("deerflow_run_timings", default=None)
+
+
+class _Series:
+    __slots__ = ("buckets", "count", "sum")
+
+    def __init__(self, size: int) -> None:
+        self.buckets = [0] * size
+        self.count = 0
+        self.sum = 0.0
+
+
+class Histogram:
+    """A labelled latency histogram, rendered in the Prometheus text format."""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...], *, summary_key: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.summary_key = summary_key
+        self._buckets = buckets
+        self._series: dict[tuple[str, ...], _Series] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, *labels: str) -> None:
+        """Record one duration; a no-op while metrics are disabled."""
+        if not _enabled:
+            return
+        index = bisect_left(self._buckets, seconds)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = _Series(len(self._buckets) + 1)
+            series.buckets[index] += 1
+            series.count += 1
+            series.sum += seconds
+        timings = _current_run_timings.get()
+        if timings is not None:
+            timings.add(self.summary_key, ".".join(labels), seconds)
+
+    def snapshot(self) -> dict[tuple[str, ...], tuple[list[int], int, float]]:
+        with self._lock:
+            return {labels: (list(series.buckets), series.count, series.sum) for labels, series in self._series.items()}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, (buckets, count, total) in sorted(self.snapshot().items()):
+            base = ",".join(f'{name}="{_escape_label(value)}"' for name, value in zip(self.labelnames, labels, strict=True))
+            prefix = f"{base}," if base else ""
+            cumulative = 0
+            for bound, bucket in zip(self._buckets, buckets, strict=False):
+                cumulative += bucket
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound:g}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {count}')
+            lines.append(f"{self.name}_sum{{{base}}} {total!r}")
+            lines.append(f"{self.name}_count{{{base}}} {count}")
+        return lines
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+MIDDLEWARE_HOOK_SECONDS = Histogram(
+    "deerflow_middleware_hook_seconds",
+    "Time spent in a lead-agent middleware hook, excluding the handler a wrap_* hook delegates to.",
+    ("middleware", "hook"),
+    summary_key="middleware",
+)
+MODEL_CALL_SECONDS = Histogram("deerflow_model_call_seconds", "Chat model call latency by caller (lead_agent, subagent, middleware).", ("caller",), summary_key="model")
+TOOL_CALL_SECONDS = Histogram("deerflow_tool_call_seconds", "Tool execution latency.", ("tool", "status"), summary_key="tool")
+CHECKPOINT_SECONDS = Histogram("deerflow_checkpoint_seconds", "Checkpointer write latency.", ("operation",), summary_key="checkpoint")
+RUN_EVENT_STORE_SECONDS = Histogram("deerflow_run_event_store_seconds", "RunEventStore write latency.", ("operation",), summary_key="run_event_store")
+STREAM_BRIDGE_SECONDS = Histogram("deerflow_stream_bridge_seconds", "Stream bridge publish latency.", ("operation",), summary_key="stream_bridge")
+
+HISTOGRAMS: tuple[Histogram, ...] = (MIDDLEWARE_HOOK_SECONDS, MODEL_CALL_SECONDS, TOOL_CALL_SECONDS, CHECKPOINT_SECONDS, RUN_EVENT_STORE_SECONDS, STREAM_BRIDGE_SECONDS)
+
+
+class RunTimings:
+    """One run's observations: count and total time per category and label."""
+
+    def __init__(self) -> None:
+        self._totals: dict[str, dict[str, list[float]]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, category: str, key: str, seconds: float) -> None:
+        with self._lock:
+            entry = self._totals.setdefault(category, {}).setdefault(key, [0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+
+    def summary(self) -> dict[str, dict[str, dict[str, float]]]:
+        """``{category: {label: {"count": n, "total_ms": ms}}}``, JSON-serialisable."""
+        with self._lock:
+            return {category: {key: {"count": int(count), "total_ms": round(total * 1000, 3)} for key, (count, total) in entries.items()} for category, entries in self._totals.items()}
+
+
+def configure_metrics(config: MetricsConfig | None) -> None:
+    """Apply ``metrics`` from ``config.yaml``; called once at gateway startup."""
+    global _enabled, _run_timing_summary
+    _enabled = bool(config is not None and config.enabled)
+    _run_timing_summary = _enabled and bool(config.run_timing_summary)
+
+
+def metrics_enabled() -> bool:
+    return _enabled
+
+
+def reset_metrics() -> None:
+    """Disable metrics and drop every recorded series (tests, config reload)."""
+    global _enabled, _run_timing_summary
+    _enabled = False
+    _run_timing_summary = False
+    for histogram in HISTOGRAMS:
+        histogram.clear()
+
+
+def start_run_timings() -> tuple[RunTimings, Token] | None:
+    """Start collecting the current run's observations when ``metrics.run_timing_summary`` is on.
+
+    Returns the collector and the token to pass to ``stop_run_timings``.
+    """
+    if not _run_timing_summary:
+        return None
+    timings = RunTimings()
+    return timings, _current_run_timings.set(timings)
+
+
+def stop_run_timings(token: Token) -> None:
+    _current_run_timings.reset(token)
+
+
+def render_prometheus() -> str:
+    """All histograms in the Prometheus text exposition format (version 0.0.4)."""
+    lines: list[str] = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+    return "\n".join(lines) + "\n"
+
+
+# -- Instrumentation ---------------------------------------------------------
+
+_MIDDLEWARE_HOOKS = ("before_agent", "abefore_agent", "before_model", "abefore_model", "after_model", "aafter_model", "after_agent", "aafter_agent")
+_MIDDLEWARE_WRAP_HOOKS = ("wrap_model_call", "awrap_model_call", "wrap_tool_call", "awrap_tool_call")
+_INSTRUMENTED_ATTR = "__deerflow_timed__"
+
+
+def _timed(fn: Callable[..., Any], observe: Callable[[float], None]) -> Callable[..., Any]:
+    if inspect.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        async def timed_async(*args: Any, **kwargs: Any) -> Any:
+            start = perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                observe(perf_counter() - start)
+
+        timed = timed_async
+    else:
+
+        @functools.wraps(fn)
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            start = perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(perf_counter() - start)
+
+    setattr(timed, _INSTRUMENTED_ATTR, True)
+    return timed
+
+
+def _timed_wrap_hook(fn: Callable[..., Any], observe: Callable[[float], None]) -> Callable[..., Any]:
+    """Time a ``wrap_*`` hook minus the time spent in the handler it calls."""
+    if inspect.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        async def timed_async(request: Any, handler: Callable[[Any], Any]) -> Any:
+            inner = 0.0
+
+            async def timed_handler(inner_request: Any) -> Any:
+                nonlocal inner
+                start = perf_counter()
+                try:
+                    return await handler(inner_request)
+                finally:
+                    inner += perf_counter() - start
+
+            start = perf_counter()
+            try:
+                return await fn(request, timed_handler)
+            finally:
+                observe(perf_counter() - start - inner)
+
+        timed = timed_async
+    else:
+
+        @functools.wraps(fn)
+        def timed(request: Any, handler: Callable[[Any], Any]) -> Any:
+            inner = 0.0
+
+            def timed_handler(inner_request: Any) -> Any:
+                nonlocal inner
+                start = perf_counter()
+                try:
+                    return handler(inner_request)
+                finally:
+                    inner += perf_counter() - start
+
+            start = perf_counter()
+            try:
+                return fn(request, timed_handler)
+            finally:
+                observe(perf_counter() - start - inner)
+
+    setattr(timed, _INSTRUMENTED_ATTR, True)
+    return timed
+
+
+def instrument_middlewares[M](middlewares: list[M]) -> list[M]:
+    """Time every hook each middleware overrides; returns *middlewares* (a no-op while disabled).
+
+    Call before the list reaches ``create_agent``: LangChain binds the hooks
+    when it builds the graph.
+    """
+    if not _enabled:
+        return middlewares
+    from langchain.agents.middleware import AgentMiddleware
+
+    for middleware in middlewares:
+        name = getattr(middleware, "name", type(middleware).__name__)
+        for hook in (*_MIDDLEWARE_HOOKS, *_MIDDLEWARE_WRAP_HOOKS):
+            if getattr(type(middleware), hook, None) is getattr(AgentMiddleware, hook):
+                continue
+            bound = getattr(middleware, hook)
+            if getattr(bound, _INSTRUMENTED_ATTR, False):
+                continue
+            label = hook.removeprefix("a") if hook.startswith(("aafter", "abefore", "awrap")) else hook
+            observe = functools.partial(_observe_hook, name, label)
+            wrapper = _timed_wrap_hook if hook in _MIDDLEWARE_WRAP_HOOKS else _timed
+            setattr(middleware, hook, wrapper(bound, observe))
+    return middlewares
+
+
+def _observe_hook(middleware: str, hook: str, seconds: float) -> None:
+    MIDDLEWARE_HOOK_SECONDS.observe(seconds, middleware, hook)
+
+
+def instrument_methods[T](target: T, histogram: Histogram, methods: Iterable[str]) -> T:
+    """Time *methods* of *target* into *histogram*, labelled by method name; a no-op while disabled."""
+    if not _enabled or target is None:
+        return target
+    for method in methods:
+        bound = getattr(target, method, None)
+        if bound is None or getattr(bound, _INSTRUMENTED_ATTR, False):
+            continue
+        try:
+            setattr(target, method, _timed(bound, functools.partial(_observe_operation, histogram, method)))
+        except (AttributeError, TypeError):
+            logger.debug("Cannot instrument %s.%s", type(target).__name__, method)
+    return target
+
+
+def _observe_operation(histogram: Histogram, operation: str, seconds: float) -> None:
+    histogram.observe(seconds, operation)
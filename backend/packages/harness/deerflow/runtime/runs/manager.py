@@ -420,10 +420,12 @@ class RunManager:
             record = self._runs.get(run_id)
             if record is not None:
                 for key, value in kwargs.items():
-                    if key == "status":
+                    if key in ("status", "metadata_updates"):
                         continue
                     if hasattr(record, key) and value is not None:
                         setattr(record, key, value)
+                if kwargs.get("metadata_updates"):
+                    record.metadata = {**(record.metadata or {}), **kwargs["metadata_updates"]}
                 record.updated_at = _now_iso()
                 row_recovery_payload = self._store_put_payload(record, error=kwargs.get("error"))
         if self._store is None:
@@ -125,9 +125,13 @@ class RunStore(abc.ABC):
         last_ai_message: str | None = None,
         first_human_message: str | None = None,
         error: str | None = None,
+        metadata_updates: dict[str, Any] | None = None,
     ) -> bool | None:
         """Persist final completion fields.
 
+        *metadata_updates* keys are merged into the run's ``metadata``
+        (e.g. ``timing`` from ``metrics.run_timing_summary``).
+
         Returns ``False`` when the store can prove no row was updated.
         """
         pass
@@ -133,9 +133,11 @@ class MemoryRunStore(RunStore):
         if run is not None:
             self._unindex_run(run_id, run["thread_id"])
 
-    async def update_run_completion(self, run_id, *, status, **kwargs):
+    async def update_run_completion(self, run_id, *, status, metadata_updates=None, **kwargs):
         if run_id in self._runs:
             self._runs[run_id]["status"] = status
+            if metadata_updates:
+                self._runs[run_id]["metadata"] = {**(self._runs[run_id].get("metadata") or {}), **metadata_updates}
             for key, value in kwargs.items():
                 if value is not None:
                     self._runs[run_id][key] = value
@@ -53,6 +53,7 @@ from deerflow.runtime.goal import (
     visible_conversation_signature,
     write_thread_goal,
 )
+from deerflow.runtime.metrics import start_run_timings, stop_run_timings
 from deerflow.runtime.serialization import serialize
 from deerflow.runtime.stream_bridge import StreamBridge
 from deerflow.runtime.user_context import get_effective_user_id, resolve_runtime_user_id
@@ -94,6 +95,11 @@ async def _checkpoint_thread_lock(thread_id: str) -> AsyncIterator[None]:
         yield
 
 
+# Upper bound on how long a finished run waits for its background title.
+_BACKGROUND_TITLE_TIMEOUT_SECONDS = 30.0
+# Strong references to detached title tasks so they are not garbage-collected.
+_background_title_tasks: set[asyncio.Task] = set()
+
 # Valid stream_mode values for LangGraph's graph.astream()
 _VALID_LG_MODES = {"values", "updates", "checkpoints", "tasks", "debug", "messages", "custom"}
 
@@ -286,6 +292,11 @@ async def run_agent(
     # streaming starts and flushed in the finally block. Pre-bound to None so the
     # finally is safe even if an exception fires before streaming begins.
     subagent_events: _SubagentEventBuffer | None = None
+    # Per-run timing breakdown (metrics.run_timing_summary); None when off.
+    run_timings = start_run_timings()
+    # LLM title started by TitleMiddleware after the first model response;
+    # settled (or cancelled) in the finally block.
+    background_title = None
 
     # Track whether "events" was requested but skipped
     if "events" in requested_modes:
@@ -360,6 +371,8 @@ async def run_agent(
         from langchain_core.runnables import RunnableConfig
         from langgraph.runtime import Runtime
 
+        from deerflow.agents.middlewares.title_middleware import BACKGROUND_TITLE_CONTEXT_KEY, BackgroundTitle
+
         # Inject runtime context so middlewares and tools (via ToolRuntime.context) can
         # access thread-level data. langgraph-cli does this automatically; we must do it
         # manually here because we drive the graph through ``agent.astream(config=...)``
@@ -380,6 +393,14 @@ async def run_agent(
         # runtime-internal channel; user code must not depend on the key name.
         if journal is not None:
             runtime_ctx["__run_journal"] = journal
+
+        async def _publish_title(title: str) -> None:
+            await bridge.publish(run_id, "custom", {"type": "title_updated", "thread_id": thread_id, "title": title})
+
+        # The first-turn LLM title runs beside the agent instead of in front
+        # of it; see ``BackgroundTitle``.
+        background_title = BackgroundTitle(on_ready=_publish_title)
+        runtime_ctx[BACKGROUND_TITLE_CONTEXT_KEY] = background_title
         _install_runtime_context(config, runtime_ctx)
         runtime = Runtime(context=cast(Any, runtime_ctx), store=store)
         config.setdefault("configurable", {})["__pregel_runtime"] = runtime
@@ -633,6 +654,11 @@ async def run_agent(
         if subagent_events is not None:
             await subagent_events.flush()
 
+        # A background title still pending on success is finished after the
+        # stream has ended (see ``_finish_background_title``); drop it otherwise.
+        if background_title is not None and record.status != RunStatus.success:
+            background_title.cancel()
+
         if event_store is not None and pre_run_workspace_snapshot is not None:
             try:
                 await record_workspace_changes(
@@ -655,9 +681,13 @@ async def run_agent(
             try:
                 # Persist token usage + convenience fields to RunStore
                 completion = journal.get_completion_data()
+                if run_timings is not None:
+                    completion["metadata_updates"] = {"timing": run_timings[0].summary()}
                 await run_manager.update_run_completion(run_id, status=record.status.value, **completion)
             except Exception:
                 logger.warning("Failed to persist run completion for %s (non-fatal)", run_id, exc_info=True)
+        if run_timings is not None:
+            stop_run_timings(run_timings[1])
 
         if checkpointer is not None and record.status == RunStatus.interrupted:
             try:
@@ -718,6 +748,20 @@ async def run_agent(
         await bridge.publish_end(run_id)
         asyncio.create_task(bridge.cleanup(run_id, delay=60))
 
+        if checkpointer is not None and background_title is not None and background_title.started and record.status == RunStatus.success:
+            task = asyncio.create_task(
+                _finish_background_title(
+                    background_title,
+                    checkpointer=checkpointer,
+                    thread_store=thread_store,
+                    run_manager=run_manager,
+                    thread_id=thread_id,
+                    run_id=run_id,
+                )
+            )
+            _background_title_tasks.add(task)
+            task.add_done_callback(_background_title_tasks.discard)
+
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -1319,6 +1363,44 @@ async def _persist_run_duration(
     )
 
 
+async def _put_title_checkpoint(checkpointer: Any, thread_id: str, latest_tuple: Any, checkpoint: dict[str, Any], title: str, *, source: str) -> None:
+    """Write *checkpoint* (a copy of *latest_tuple*'s) back with *title* set."""
+    channel_values = dict(checkpoint.get("channel_values", {}) or {})
+    channel_values["title"] = title
+    marker = _new_checkpoint_marker()
+    checkpoint.update({"id": marker["id"], "ts": marker["ts"], "channel_values": channel_values})
+
+    # Bump ``channel_versions["title"]`` and declare the bump in ``new_versions``
+    # so DB-backed savers (SqliteSaver v4 / PostgresSaver) actually persist the
+    # new blob — those savers strip inline ``channel_values`` from ``put`` and
+    # only write blobs for channels listed in ``new_versions``. The legacy
+    # single-table sqlite saver ignores ``new_versions`` and inlines the
+    # snapshot, so this path is correct for both layouts. Mirrors
+    # ``_rollback_to_pre_run_checkpoint`` in the same file.
+    channel_versions = dict(checkpoint.get("channel_versions", {}) or {})
+    next_title_version = _bump_channel_version(checkpointer, channel_versions.get("title"))
+    channel_versions["title"] = next_title_version
+    checkpoint["channel_versions"] = channel_versions
+
+    metadata = dict(getattr(latest_tuple, "metadata", {}) or {})
+    metadata["source"] = "update"
+    prev_step = metadata.get("step")
+    metadata["step"] = (prev_step + 1) if isinstance(prev_step, int) else 1
+    metadata["writes"] = {source: {"title": title}}
+
+    checkpoint_ns = _checkpoint_namespace(latest_tuple)
+    write_config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns}}
+    await _call_checkpointer_method(
+        checkpointer,
+        "aput",
+        "put",
+        write_config,
+        checkpoint,
+        metadata,
+        {"title": next_title_version},
+    )
+
+
 async def _ensure_interrupted_title(*, checkpointer: Any, thread_id: str, app_config: AppConfig | None, graph_input: Any | None = None) -> str | None:
     """Persist a local fallback title for interrupted first-turn runs.
 
@@ -1363,44 +1445,63 @@ async def _ensure_interrupted_title(*, checkpointer: Any, thread_id: str, app_co
         if existing_title:
             return existing_title
 
-        channel_values["title"] = title
-        marker = _new_checkpoint_marker()
-        checkpoint.update({"id": marker["id"], "ts": marker["ts"], "channel_values": channel_values})
-
-        # Bump ``channel_versions["title"]`` and declare the bump in ``new_versions``
-        # so DB-backed savers (SqliteSaver v4 / PostgresSaver) actually persist the
-        # new blob — those savers strip inline ``channel_values`` from ``put`` and
-        # only write blobs for channels listed in ``new_versions``. The legacy
-        # single-table sqlite saver ignores ``new_versions`` and inlines the
-        # snapshot, so this path is correct for both layouts. Mirrors
-        # ``_rollback_to_pre_run_checkpoint`` in the same file.
-        channel_versions = dict(checkpoint.get("channel_versions", {}) or {})
-        next_title_version = _bump_channel_version(checkpointer, channel_versions.get("title"))
-        channel_versions["title"] = next_title_version
-        checkpoint["channel_versions"] = channel_versions
-
-        metadata = dict(getattr(latest_tuple, "metadata", {}) or {})
-        metadata["source"] = "update"
-        prev_step = metadata.get("step")
-        metadata["step"] = (prev_step + 1) if isinstance(prev_step, int) else 1
-        metadata["writes"] = {"runtime_interrupt_title": {"title": title}}
-
-        checkpoint_ns = _checkpoint_namespace(latest_tuple)
-        write_config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns}}
-        await _call_checkpointer_method(
-            checkpointer,
-            "aput",
-            "put",
-            write_config,
-            checkpoint,
-            metadata,
-            {"title": next_title_version},
-        )
+        await _put_title_checkpoint(checkpointer, thread_id, latest_tuple, checkpoint, title, source="runtime_interrupt_title")
         return title
 
     return None
 
 
+async def _persist_background_title(*, checkpointer: Any, thread_id: str, title: str, fallback: str | None) -> bool:
+    """Replace the fallback title with the background LLM title after the run.
+
+    Only writes while the latest checkpoint still carries *fallback*, so a
+    title the graph already applied or a later rename is never overwritten.
+    Returns whether a checkpoint was written.
+    """
+    ckpt_config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+    latest_tuple = await _call_checkpointer_method(checkpointer, "aget_tuple", "get_tuple", ckpt_config)
+    if latest_tuple is None:
+        return False
+    checkpoint = copy.deepcopy(getattr(latest_tuple, "checkpoint", {}) or {})
+    if (checkpoint.get("channel_values", {}) or {}).get("title") != fallback:
+        return False
+    await _put_title_checkpoint(checkpointer, thread_id, latest_tuple, checkpoint, title, source="runtime_background_title")
+    return True
+
+
+async def _finish_background_title(
+    background_title: Any,
+    *,
+    checkpointer: Any,
+    thread_store: Any | None,
+    run_manager: RunManager,
+    thread_id: str,
+    run_id: str,
+) -> None:
+    """Wait for a run's background title and persist it once the run has ended.
+
+    Runs detached from ``run_agent`` so neither the stream end nor the
+    ``threads_meta`` status update waits on the title model. The title only
+    replaces the run's fallback title, and only while no later run started
+    on the thread. The check and the checkpoint write hold the thread's
+    checkpoint lock, which a later run streams under, so such a run cannot
+    start between them.
+    """
+    title = await background_title.settle(_BACKGROUND_TITLE_TIMEOUT_SECONDS)
+    if not title:
+        return
+    try:
+        async with _checkpoint_thread_lock(thread_id):
+            if await run_manager.has_later_started_run(thread_id, run_id):
+                return
+            if not await _persist_background_title(checkpointer=checkpointer, thread_id=thread_id, title=title, fallback=background_title.fallback):
+                return
+        if thread_store is not None:
+            await thread_store.update_display_name(thread_id, title)
+    except Exception:
+        logger.debug("Failed to persist background title for thread %s (non-fatal)", thread_id, exc_info=True)
+
+
 def _lg_mode_to_sse_event(mode: str) -> str:
     """Map LangGraph internal stream_mode name to SSE event name.
 
@@ -1,4 +1,14 @@
-"""Redis Streams-backed stream bridge."""
+"""Redis Streams-backed stream bridge.
+
+Subscribers in one process share a single reader per run: the first
+subscriber to a run starts a task that tails the stream with a blocking
+``XREAD``, decodes each entry once and fans it out to every local
+subscriber's bounded queue.  A subscriber reads the retained history itself
+(non-blocking ``XREAD`` from its ``Last-Event-ID``) and then drains its queue,
+skipping ids it has already yielded, so replay and live delivery meet without
+gaps or duplicates.  A subscriber whose queue fills up is marked lagged and
+catches up from Redis the same way instead of stalling the shared reader.
+"""
 
 from __future__ import annotations
 
@@ -8,6 +18,7 @@ import json
 import logging
 import re
 from collections.abc import AsyncIterator, Mapping
+from dataclasses import dataclass, field
 from typing import Any
 
 try:
@@ -47,13 +58,47 @@ _XREAD_COUNT = 64
 # capped at ``heartbeat_interval``.
 _MAX_SUBSCRIBE_RETRIES = 3
 
+# ``BLOCK`` for the shared per-run reader.  Heartbeats are produced per
+# subscriber from its own queue timeout, so this only bounds how long an idle
+# reader holds its connection before re-issuing the read.
+_READER_BLOCK_MS = 5000
+
+_ParsedId = tuple[int, int]
+_QueueItem = tuple[_ParsedId, StreamEvent] | None
+
+
+def _parse_stream_id(stream_id: str) -> _ParsedId:
+    ms, _, seq = stream_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+@dataclass(eq=False)
+class _Subscriber:
+    queue: asyncio.Queue[_QueueItem]
+    # A lagged subscriber is skipped by the reader and must re-read from Redis
+    # before trusting its queue again.  Every subscriber starts lagged: its
+    # first catch-up read is the ``Last-Event-ID`` replay.
+    lagged: bool = True
+
+
+@dataclass(eq=False)
+class _RunReader:
+    key: str
+    subscribers: set[_Subscriber] = field(default_factory=set)
+    task: asyncio.Task | None = None
+    # Set once the reader has fixed its starting id; catch-up reads issued
+    # after that cover everything the reader will not deliver.
+    ready: asyncio.Event = field(default_factory=asyncio.Event)
+    ended: bool = False
+
 
 class RedisStreamBridge(StreamBridge):
     """Per-run stream bridge backed by Redis Streams.
 
-    Each run is stored in one Redis Stream and subscribers read directly with
-    ``XREAD``.  This keeps the SSE bridge usable across multiple gateway
-    worker processes while preserving ``Last-Event-ID`` replay semantics.
+    Each run is stored in one Redis Stream.  This keeps the SSE bridge usable
+    across multiple gateway worker processes while preserving
+    ``Last-Event-ID`` replay semantics; within a process, concurrent
+    subscribers to the same run share one ``XREAD`` reader.
     """
 
     supports_cross_process = True
@@ -75,11 +120,13 @@ class RedisStreamBridge(StreamBridge):
             self._stream_ttl_seconds = stream_ttl_seconds
         else:
             self._stream_ttl_seconds = None
-        # Each live SSE subscriber holds one pooled connection blocked in
-        # ``XREAD ... BLOCK`` for up to ``heartbeat_interval``. ``max_connections``
-        # caps that pool; ``None`` keeps redis-py's effectively-unbounded default.
+        # Each run with live subscribers in this process holds one pooled
+        # connection blocked in ``XREAD ... BLOCK``; catch-up reads borrow one
+        # briefly. ``max_connections`` caps that pool; ``None`` keeps
+        # redis-py's effectively-unbounded default.
         self._redis = client if client is not None else Redis.from_url(redis_url, decode_responses=True, max_connections=max_connections)
         self._owns_client = client is None
+        self._readers: dict[str, _RunReader] = {}
 
     def _stream_key(self, run_id: str) -> str:
         return f"{self._key_prefix}:{run_id}"
@@ -178,21 +225,94 @@ class RedisStreamBridge(StreamBridge):
             return "0-0"
         return self._decode(event_id)
 
-    async def subscribe(
-        self,
-        run_id: str,
-        *,
-        last_event_id: str | None = None,
-        heartbeat_interval: float = 15.0,
-    ) -> AsyncIterator[StreamEvent]:
-        key = self._stream_key(run_id)
-        stream_id = await self._resolve_start_stream_id(key, last_event_id)
-        block_ms = max(1, int(heartbeat_interval * 1000)) if heartbeat_interval > 0 else 1
+    async def _tail_stream_id(self, key: str) -> str:
+        entries = await self._redis.xrevrange(key, count=1)
+        return self._decode(entries[0][0]) if entries else "0-0"
+
+    # -- shared reader ---------------------------------------------------------
+
+    def _attach(self, key: str, subscriber: _Subscriber) -> _RunReader:
+        reader = self._readers.get(key)
+        if reader is None:
+            reader = self._readers[key] = _RunReader(key=key)
+        reader.subscribers.add(subscriber)
+        self._ensure_reader(reader)
+        return reader
+
+    def _detach(self, reader: _RunReader, subscriber: _Subscriber) -> None:
+        reader.subscribers.discard(subscriber)
+        if reader.subscribers:
+            return
+        if self._readers.get(reader.key) is reader:
+            del self._readers[reader.key]
+        if reader.task is not None:
+            reader.task.cancel()
+
+    def _ensure_reader(self, reader: _RunReader) -> None:
+        if reader.ended or (reader.task is not None and not reader.task.done()):
+            return
+        reader.ready = asyncio.Event()
+        reader.task = asyncio.create_task(self._read_run(reader))
+
+    async def _read_run(self, reader: _RunReader) -> None:
+        """Tail *reader*'s stream and fan each decoded entry out to subscribers."""
         consecutive_errors = 0
+        try:
+            stream_id = await self._tail_stream_id(reader.key)
+            reader.ready.set()
+            while reader.subscribers:
+                try:
+                    response = await self._redis.xread({reader.key: stream_id}, count=_XREAD_COUNT, block=_READER_BLOCK_MS)
+                except RedisError:
+                    consecutive_errors += 1
+                    if consecutive_errors > _MAX_SUBSCRIBE_RETRIES:
+                        raise
+                    await asyncio.sleep(min(2**consecutive_errors, _READER_BLOCK_MS / 1000))
+                    continue
+                consecutive_errors = 0
+                for _stream_name, entries in response or ():
+                    for event_id, fields in entries:
+                        stream_id = self._decode(event_id)
+                        entry = self._entry_from_redis(stream_id, fields)
+                        self._fan_out(reader, (_parse_stream_id(stream_id), entry))
+                        if entry is END_SENTINEL:
+                            reader.ended = True
+                            return
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Subscribers fall back to their own reads, which retry and surface
+            # persistent errors to the caller; the next catch-up restarts us.
+            logger.warning("Shared Redis stream reader for %s stopped", reader.key, exc_info=True)
+            for subscriber in reader.subscribers:
+                subscriber.lagged = True
+                self._wake(subscriber)
+        finally:
+            reader.ready.set()
+
+    @staticmethod
+    def _wake(subscriber: _Subscriber) -> None:
+        try:
+            subscriber.queue.put_nowait(None)
+        except asyncio.QueueFull:
+            pass  # a full queue already wakes the consumer
+
+    @staticmethod
+    def _fan_out(reader: _RunReader, item: _QueueItem) -> None:
+        for subscriber in reader.subscribers:
+            if subscriber.lagged:
+                continue
+            try:
+                subscriber.queue.put_nowait(item)
+            except asyncio.QueueFull:
+                subscriber.lagged = True
 
+    async def _catch_up(self, key: str, stream_id: str, heartbeat_interval: float) -> list[tuple[str, Mapping[Any, Any]]]:
+        """Return the next batch retained after *stream_id* without blocking."""
+        consecutive_errors = 0
         while True:
             try:
-                response = await self._redis.xread({key: stream_id}, count=_XREAD_COUNT, block=block_ms)
+                response = await self._redis.xread({key: stream_id}, count=_XREAD_COUNT)
             except ResponseError:
                 # Last-Event-ID is client-controlled and validated before XREAD.
                 # If Redis still rejects the id, fail instead of resetting to
@@ -217,22 +337,55 @@ class RedisStreamBridge(StreamBridge):
                 )
                 await asyncio.sleep(delay)
                 continue
-            else:
-                consecutive_errors = 0
+            return [entry for _stream_name, entries in response or () for entry in entries]
 
-            if not response:
-                yield HEARTBEAT_SENTINEL
-                continue
+    async def subscribe(
+        self,
+        run_id: str,
+        *,
+        last_event_id: str | None = None,
+        heartbeat_interval: float = 15.0,
+    ) -> AsyncIterator[StreamEvent]:
+        key = self._stream_key(run_id)
+        stream_id = await self._resolve_start_stream_id(key, last_event_id)
+        last_seen = _parse_stream_id(stream_id)
+        timeout = heartbeat_interval if heartbeat_interval > 0 else 0.001
+        subscriber = _Subscriber(queue=asyncio.Queue(maxsize=self._maxsize))
+        reader = self._attach(key, subscriber)
+        try:
+            while True:
+                if subscriber.lagged and subscriber.queue.empty():
+                    # Drain what was queued before overflowing (it may already
+                    # be trimmed from Redis), then clear the flag before
+                    # reading: anything the reader fans out from here on is
+                    # queued, anything before it is already in Redis.
+                    subscriber.lagged = False
+                    self._ensure_reader(reader)
+                    await reader.ready.wait()
+                    while entries := await self._catch_up(key, stream_id, heartbeat_interval):
+                        for event_id, fields in entries:
+                            stream_id = self._decode(event_id)
+                            last_seen = _parse_stream_id(stream_id)
+                            entry = self._entry_from_redis(stream_id, fields)
+                            yield entry
+                            if entry is END_SENTINEL:
+                                return
+                    continue
 
-            for _stream_name, entries in response:
-                for event_id, fields in entries:
-                    event_id = self._decode(event_id)
-                    stream_id = event_id
-                    entry = self._entry_from_redis(event_id, fields)
-                    if entry is END_SENTINEL:
-                        yield END_SENTINEL
-                        return
-                    yield entry
+                try:
+                    item = await asyncio.wait_for(subscriber.queue.get(), timeout=timeout)
+                except TimeoutError:
+                    yield HEARTBEAT_SENTINEL
+                    continue
+                if item is None or item[0] <= last_seen:
+                    continue
+                last_seen, entry = item
+                stream_id = f"{last_seen[0]}-{last_seen[1]}"
+                yield entry
+                if entry is END_SENTINEL:
+                    return
+        finally:
+            self._detach(reader, subscriber)
 
     async def cleanup(self, run_id: str, *, delay: float = 0) -> None:
         if delay > 0:
@@ -240,6 +393,10 @@ class RedisStreamBridge(StreamBridge):
         await self._redis.delete(self._stream_key(run_id))
 
     async def close(self) -> None:
+        readers, self._readers = list(self._readers.values()), {}
+        for reader in readers:
+            if reader.task is not None:
+                reader.task.cancel()
         if not self._owns_client:
             return
         close = getattr(self._redis, "aclose", None) or getattr(self._redis, "close", None)
@@ -0,0 +1,308 @@
+"""Move directory trees in and out of a sandbox as one tar archive.
+
+Remote sandboxes (AIO, E2B, BoxLite) share no filesystem with the host, so
+seeding one with a skill or an unzipped dataset used to cost an
+``update_file`` round trip per file. :func:`push_tree` instead hashes the
+local tree, asks the sandbox for the SHA-256 of what it already holds (one
+shell call), packs only the files that differ into a tar archive, uploads it
+as a single file and extracts it with one more shell call that also reports
+the checksums of what landed. :func:`fetch_files` and :func:`pull_tree` do
+the reverse for collecting outputs.
+
+Everything goes through the base :class:`Sandbox` API plus ``tar``,
+``sha256sum`` and ``xargs`` in the sandbox image, so every provider gets it.
+Archives are gzip-compressed by default; ``compression="zstd"`` needs the
+optional ``zstandard`` package here and ``zstd`` in the image. Files are
+never deleted on the receiving side, and symlinks are not followed.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import io
+import re
+import shlex
+import tarfile
+import uuid
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+
+from deerflow.config.paths import VIRTUAL_PATH_PREFIX
+
+from .exceptions import SandboxFileError
+from .sandbox import Sandbox
+
+COMPRESSIONS = ("none", "gzip", "zstd")
+
+# Below this many files one request per file is no slower than the three
+# round trips of an archive sync (checksums, upload, extract).
+BULK_SYNC_MIN_FILES = 4
+
+_SUFFIXES = {"none": ".tar", "gzip": ".tar.gz", "zstd": ".tar.zst"}
+_DONE_MARKER = "__DEERFLOW_SYNC_DONE__"
+_CHECKSUM_LINE = re.compile(r"^([0-9a-f]{64})  (?:\./)?(.+)$")
+# File lists up to this size travel inside the shell command; larger ones
+# are uploaded next to the archive first.
+_INLINE_LIST_BYTES = 48 * 1024
+_COMMAND_TIMEOUT_SECONDS = 600
+
+
+@dataclass
+class SyncReport:
+    """What a :func:`push_tree` or :func:`pull_tree` call moved.
+
+    Attributes:
+        transferred: Relative paths sent in the archive.
+        skipped: Relative paths whose content already matched on the receiving side.
+        checksums: SHA-256 of every synced file, transferred or skipped, by relative path.
+    """
+
+    transferred: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    checksums: dict[str, str] = field(default_factory=dict)
+
+
+def local_checksums(root: Path, only: Iterable[str] | None = None) -> dict[str, str]:
+    """Return the SHA-256 of the regular files under *root* by POSIX relative path.
+
+    Args:
+        root: Directory to hash.
+        only: Relative paths to restrict the result to; missing ones are left out.
+    """
+    candidates = (root / name for name in only) if only is not None else root.rglob("*")
+    checksums: dict[str, str] = {}
+    for path in candidates:
+        if path.is_symlink() or not path.is_file():
+            continue
+        digest = hashlib.sha256()
+        with path.open("rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        checksums[path.relative_to(root).as_posix()] = digest.hexdigest()
+    return dict(sorted(checksums.items()))
+
+
+def remote_checksums(sandbox: Sandbox, remote_dir: str) -> dict[str, str]:
+    """Return the SHA-256 of the regular files under *remote_dir* in the sandbox.
+
+    A missing directory yields an empty mapping.
+
+    Raises:
+        SandboxFileError: If the sandbox could not hash the directory.
+    """
+    directory = shlex.quote(remote_dir)
+    command = f"{{ [ ! -d {directory} ] || (cd {directory} && find . -type f -exec sha256sum {{}} +); }} && echo {_DONE_MARKER}"
+    return _parse_checksums(_run(sandbox, command, remote_dir, "checksum"))
+
+
+def push_tree(
+    sandbox: Sandbox,
+    local_dir: Path,
+    remote_dir: str,
+    *,
+    only: Iterable[str] | None = None,
+    compression: str = "gzip",
+) -> SyncReport:
+    """Copy the files under *local_dir* that differ into *remote_dir*.
+
+    Args:
+        sandbox: Sandbox to write to.
+        local_dir: Host directory to copy.
+        remote_dir: Absolute sandbox directory; created when missing.
+        only: Relative paths to copy instead of the whole tree.
+        compression: One of :data:`COMPRESSIONS`.
+
+    Returns:
+        The files sent and skipped, with the checksums the sandbox reported.
+
+    Raises:
+        SandboxFileError: If extraction failed or a checksum did not match.
+    """
+    _check_compression(compression)
+    local = local_checksums(local_dir, only)
+    remote = remote_checksums(sandbox, remote_dir)
+    report = SyncReport(checksums=dict(local))
+    for name, digest in local.items():
+        (report.skipped if remote.get(name) == digest else report.transferred).append(name)
+    if not report.transferred:
+        return report
+
+    staging = _staging_path(compression)
+    sandbox.update_file(staging, _pack(local_dir, report.transferred, compression))
+    directory, archive = shlex.quote(remote_dir), shlex.quote(staging)
+    command = (
+        f"mkdir -p {directory} && {_extract_command(archive, directory, compression)}"
+        f" && (cd {directory} && {_list_command(archive, compression)} | tr '\\n' '\\0' | xargs -0 -r sha256sum --)"
+        f"; status=$?; rm -f {archive}; [ $status -eq 0 ] && echo {_DONE_MARKER}"
+    )
+    landed = _parse_checksums(_run(sandbox, command, remote_dir, "push"))
+    mismatched = [name for name in report.transferred if landed.get(name) != local[name]]
+    if mismatched:
+        raise SandboxFileError(f"checksum mismatch after sync for {len(mismatched)} file(s): {', '.join(mismatched[:5])}", path=remote_dir, operation="push")
+    return report
+
+
+def fetch_files(sandbox: Sandbox, remote_dir: str, names: Iterable[str], *, compression: str = "gzip") -> dict[str, bytes]:
+    """Download several files under *remote_dir* in one archive.
+
+    Args:
+        sandbox: Sandbox to read from.
+        remote_dir: Absolute sandbox directory the names are relative to.
+        names: POSIX paths relative to *remote_dir*.
+        compression: One of :data:`COMPRESSIONS`.
+
+    Returns:
+        File contents by relative path; files that vanished are left out.
+
+    Raises:
+        SandboxFileError: If the sandbox could not build the archive.
+    """
+    _check_compression(compression)
+    names = sorted(set(names))
+    if not names:
+        return {}
+    staging = _staging_path(compression)
+    listing = "\0".join(names).encode("utf-8")
+    cleanup = ""
+    if len(listing) <= _INLINE_LIST_BYTES:
+        feed = f"printf %s {base64.b64encode(listing).decode('ascii')} | base64 -d"
+    else:
+        list_path = f"{staging}.list"
+        sandbox.update_file(list_path, listing)
+        feed = f"cat {shlex.quote(list_path)}"
+        cleanup = f"; rm -f {shlex.quote(list_path)}"
+    # ``--ignore-failed-read`` keeps files deleted since the listing from
+    # failing the whole archive.
+    command = f"cd {shlex.quote(remote_dir)} && {feed} | {_create_command(shlex.quote(staging), compression)}; status=$?{cleanup}; [ $status -eq 0 ] && echo {_DONE_MARKER}"
+    try:
+        _run(sandbox, command, remote_dir, "fetch")
+        data = sandbox.download_file(staging)
+    finally:
+        sandbox.execute_command(f"rm -f {shlex.quote(staging)}")
+    return _unpack(data, set(names), compression)
+
+
+def pull_tree(sandbox: Sandbox, remote_dir: str, local_dir: Path, *, compression: str = "gzip") -> SyncReport:
+    """Copy the files under *remote_dir* that differ into *local_dir*.
+
+    Returns:
+        The files fetched and skipped, with the checksums the sandbox reported.
+
+    Raises:
+        SandboxFileError: If the archive could not be built or a checksum did not match.
+    """
+    remote = remote_checksums(sandbox, remote_dir)
+    local = local_checksums(local_dir, remote)
+    report = SyncReport(checksums=dict(remote))
+    for name, digest in remote.items():
+        (report.skipped if local.get(name) == digest else report.transferred).append(name)
+    if not report.transferred:
+        return report
+
+    fetched = fetch_files(sandbox, remote_dir, report.transferred, compression=compression)
+    mismatched = [name for name in report.transferred if hashlib.sha256(fetched.get(name, b"")).hexdigest() != remote[name]]
+    if mismatched:
+        raise SandboxFileError(f"checksum mismatch after sync for {len(mismatched)} file(s): {', '.join(mismatched[:5])}", path=remote_dir, operation="pull")
+    for name in report.transferred:
+        target = local_dir / name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f"{target.name}.sync.tmp")
+        tmp.write_bytes(fetched[name])
+        tmp.replace(target)
+    return report
+
+
+def _check_compression(compression: str) -> None:
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"compression must be one of {', '.join(COMPRESSIONS)}, got {compression!r}")
+    if compression == "zstd":
+        _import_zstandard()
+
+
+def _import_zstandard():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError("zstd-compressed sandbox sync requires the optional 'zstandard' package. Install it with: pip install zstandard") from e
+    return zstandard
+
+
+def _staging_path(compression: str) -> str:
+    # Under the virtual prefix so every provider's update_file/download_file
+    # accepts it.
+    return f"{VIRTUAL_PATH_PREFIX}/.deerflow-sync-{uuid.uuid4().hex}{_SUFFIXES[compression]}"
+
+
+def _run(sandbox: Sandbox, command: str, path: str, operation: str) -> str:
+    output = sandbox.execute_command(command, timeout=_COMMAND_TIMEOUT_SECONDS)
+    if _DONE_MARKER not in output.splitlines():
+        raise SandboxFileError(f"sandbox {operation} failed: {output.strip()[-500:]}", path=path, operation=operation)
+    return output
+
+
+def _parse_checksums(output: str) -> dict[str, str]:
+    checksums: dict[str, str] = {}
+    for line in output.splitlines():
+        match = _CHECKSUM_LINE.match(line)
+        if match:
+            checksums[match.group(2)] = match.group(1)
+    return checksums
+
+
+def _extract_command(archive: str, directory: str, compression: str) -> str:
+    if compression == "zstd":
+        return f"zstd -dcq {archive} | tar --no-same-owner -xf - -C {directory}"
+    return f"tar --no-same-owner -x{'z' if compression == 'gzip' else ''}f {archive} -C {directory}"
+
+
+def _list_command(archive: str, compression: str) -> str:
+    if compression == "zstd":
+        return f"zstd -dcq {archive} | tar -tf -"
+    return f"tar -t{'z' if compression == 'gzip' else ''}f {archive}"
+
+
+def _create_command(archive: str, compression: str) -> str:
+    create = "tar --ignore-failed-read --no-recursion --null -T -"
+    if compression == "zstd":
+        return f"{create} -cf - | zstd -qc > {archive}"
+    return f"{create} -c{'z' if compression == 'gzip' else ''}f {archive}"
+
+
+def _anonymous(info: tarfile.TarInfo) -> tarfile.TarInfo:
+    info.uid = info.gid = 0
+    info.uname = info.gname = ""
+    return info
+
+
+def _pack(root: Path, names: list[str], compression: str) -> bytes:
+    buffer = io.BytesIO()
+    if compression == "zstd":
+        writer = _import_zstandard().ZstdCompressor().stream_writer(buffer, closefd=False)
+        with writer, tarfile.open(fileobj=writer, mode="w|") as tar:
+            for name in names:
+                tar.add(root / name, arcname=name, recursive=False, filter=_anonymous)
+        return buffer.getvalue()
+    mode = "w:gz" if compression == "gzip" else "w"
+    options = {"compresslevel": 6} if compression == "gzip" else {}
+    with tarfile.open(fileobj=buffer, mode=mode, **options) as tar:
+        for name in names:
+            tar.add(root / name, arcname=name, recursive=False, filter=_anonymous)
+    return buffer.getvalue()
+
+
+def _unpack(data: bytes, names: set[str], compression: str) -> dict[str, bytes]:
+    if compression == "zstd":
+        data = _import_zstandard().ZstdDecompressor().decompressobj().decompress(data)
+    files: dict[str, bytes] = {}
+    with tarfile.open(fileobj=io.BytesIO(data), mode="r:*") as tar:
+        for member in tar:
+            # Only regular files that were asked for; nothing outside the tree.
+            name = PurePosixPath(member.name).as_posix().removeprefix("./")
+            if not member.isfile() or name not in names:
+                continue
+            extracted = tar.extractfile(member)
+            if extracted is not None:
+                files[name] = extracted.read()
+    return files
@@ -1,3 +1,4 @@
+import codecs
 import errno
 import logging
 import ntpath
@@ -7,10 +8,11 @@ import shutil
 import signal
 import subprocess
 import threading
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
 from functools import cached_property
 from pathlib import Path
-from typing import NamedTuple
+from typing import TYPE_CHECKING, NamedTuple
 
 from deerflow.config.paths import VIRTUAL_PATH_PREFIX
 from deerflow.sandbox.env_policy import build_sandbox_env
@@ -18,6 +20,10 @@ from deerflow.sandbox.local.list_dir import list_dir
 from deerflow.sandbox.path_patterns import build_output_mask_pattern
 from deerflow.sandbox.sandbox import Sandbox, _validate_extra_env
 from deerflow.sandbox.search import GrepMatch, find_glob_matches, find_grep_matches
+from deerflow.utils.file_clone import break_hardlink
+
+if TYPE_CHECKING:
+    from deerflow.sandbox.local.persistent_shell import PersistentShell
 
 logger = logging.getLogger(__name__)
 
@@ -29,19 +35,31 @@ logger = logging.getLogger(__name__)
 DEFAULT_COMMAND_TIMEOUT_SECONDS = 600
 _COMMAND_CAPTURE_LIMIT_BYTES = 10 * 1024 * 1024
 _PIPE_DRAIN_JOIN_TIMEOUT_SECONDS = 0.2
+# Live output (``execute_command(on_output=...)``) is forwarded at most every
+# interval, each forward carrying at most the newest chunk-size bytes of a
+# stream, so a chatty command costs a bounded event rate however fast it writes.
+_LIVE_OUTPUT_INTERVAL_SECONDS = 0.25
+_LIVE_OUTPUT_CHUNK_BYTES = 4096
+# A line longer than a chunk is forwarded in pieces; the newest bytes are held
+# back so a host path is rarely split before reverse resolution. Injected env
+# values are never split at all (see ``_secret_safe_cut``).
+_LIVE_OUTPUT_HOLDBACK_BYTES = 1024
 
 
 class _BoundedPipeCapture:
     """Drain a subprocess pipe while keeping only bounded output in memory."""
 
-    def __init__(self, *, limit_bytes: int = _COMMAND_CAPTURE_LIMIT_BYTES) -> None:
+    def __init__(self, *, limit_bytes: int = _COMMAND_CAPTURE_LIMIT_BYTES, on_chunk: Callable[[bytes], None] | None = None) -> None:
         self._limit_bytes = limit_bytes
+        self._on_chunk = on_chunk
         self._chunks: list[bytes] = []
         self._kept_bytes = 0
         self._total_bytes = 0
         self._lock = threading.Lock()
 
     def append(self, chunk: bytes) -> None:
+        if self._on_chunk is not None:
+            self._on_chunk(chunk)
         with self._lock:
             self._total_bytes += len(chunk)
             if self._kept_bytes >= self._limit_bytes:
@@ -65,6 +83,132 @@ class _BoundedPipeCapture:
         return output
 
 
+def _secret_safe_cut(buf: bytes | bytearray, cut: int, secrets: tuple[bytes, ...]) -> int:
+    """Move *cut* back until it no longer falls inside a secret value.
+
+    Catches complete occurrences that straddle *cut* and, near the end of
+    *buf*, a trailing prefix of a secret whose remaining bytes have not
+    arrived yet. Each forwarded piece then holds either all of a secret or
+    none of it, so the caller's per-piece masking can match it.
+    """
+    moved = True
+    while moved and cut > 0:
+        moved = False
+        for secret in secrets:
+            for index in range(max(0, cut - len(secret) + 1), cut):
+                if secret.startswith(buf[index : index + len(secret)]):
+                    cut = index
+                    moved = True
+                    break
+    return cut
+
+
+def _secret_safe_drop(buf: bytes | bytearray, cut: int, secrets: tuple[bytes, ...]) -> int:
+    """Move *cut* forward past every complete secret value it falls inside.
+
+    Fallback for when ``_secret_safe_cut`` finds no cut before *cut* (a long
+    run of overlapping occurrences of a repetitive value): everything before
+    the returned cut is dropped unforwarded, so the kept bytes never start
+    with the tail of a secret.
+    """
+    moved = True
+    while moved and cut < len(buf):
+        moved = False
+        for secret in secrets:
+            for index in range(max(0, cut - len(secret) + 1), cut):
+                if buf[index : index + len(secret)] == secret:
+                    cut = index + len(secret)
+                    moved = True
+                    break
+    return cut
+
+
+class _LiveOutput:
+    """Forward a running command's output to ``on_output(stream, text, offset)``.
+
+    Drain threads ``append`` raw bytes; a flusher thread forwards whole lines
+    every ``_LIVE_OUTPUT_INTERVAL_SECONDS``. ``offset`` is the byte position of
+    ``text`` in its stream: when more than ``_LIVE_OUTPUT_CHUNK_BYTES`` piled up
+    between forwards only the newest lines are sent, and the offset jump tells
+    the receiver what was skipped. The command's captured output is unaffected.
+    ``transform`` maps text before forwarding (host → virtual paths).
+    No cut point ever falls inside one of the ``secrets`` values (the
+    command's injected env), so the caller can mask them per piece.
+    """
+
+    def __init__(self, on_output: Callable[[str, str, int], None], transform: Callable[[str], str], secrets: Iterable[str] = ()) -> None:
+        self._on_output = on_output
+        self._transform = transform
+        self._secrets = tuple({secret.encode("utf-8") for secret in secrets if len(secret) > 1})
+        self._lock = threading.Lock()
+        self._pending = {"stdout": bytearray(), "stderr": bytearray()}
+        self._offsets = {"stdout": 0, "stderr": 0}
+        self._decoders = {name: codecs.getincrementaldecoder("utf-8")("replace") for name in self._pending}
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="deerflow-bash-live-output", daemon=True)
+        self._thread.start()
+
+    def capture(self, stream: str) -> _BoundedPipeCapture:
+        return _BoundedPipeCapture(on_chunk=lambda chunk: self._append(stream, chunk))
+
+    def _append(self, stream: str, chunk: bytes) -> None:
+        with self._lock:
+            pending = self._pending[stream]
+            pending += chunk
+            if len(pending) > 2 * _LIVE_OUTPUT_CHUNK_BYTES:
+                # Only the newest chunk can be forwarded; drop the rest now so
+                # a fast writer cannot grow the buffer between forwards.
+                cut = len(pending) - 2 * _LIVE_OUTPUT_CHUNK_BYTES
+                skip = _secret_safe_cut(pending, cut, self._secrets)
+                if skip <= 0:
+                    skip = _secret_safe_drop(pending, cut, self._secrets)
+                del pending[:skip]
+                self._offsets[stream] += skip
+                self._decoders[stream].reset()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(_LIVE_OUTPUT_INTERVAL_SECONDS):
+            self._flush(final=False)
+
+    def close(self) -> None:
+        """Stop the flusher and forward everything still pending."""
+        self._stopped.set()
+        self._thread.join()
+        self._flush(final=True)
+
+    def _flush(self, *, final: bool) -> None:
+        for stream in ("stdout", "stderr"):
+            with self._lock:
+                pending = self._pending[stream]
+                if final:
+                    end = len(pending)
+                else:
+                    end = pending.rfind(b"\n") + 1
+                    if end == 0 and len(pending) > _LIVE_OUTPUT_CHUNK_BYTES:
+                        end = len(pending) - _LIVE_OUTPUT_HOLDBACK_BYTES
+                    end = _secret_safe_cut(pending, end, self._secrets)
+                if end <= 0:
+                    continue
+                start = 0
+                if end > _LIVE_OUTPUT_CHUNK_BYTES:
+                    start = end - _LIVE_OUTPUT_CHUNK_BYTES
+                    line_start = pending.find(b"\n", start, end) + 1
+                    if 0 < line_start < end:
+                        start = line_start
+                    start = _secret_safe_cut(pending, start, self._secrets)
+                    self._decoders[stream].reset()
+                data = bytes(pending[start:end])
+                offset = self._offsets[stream] + start
+                del pending[:end]
+                self._offsets[stream] += end
+                text = self._decoders[stream].decode(data, final=final)
+            if text:
+                try:
+                    self._on_output(stream, self._transform(text), offset)
+                except Exception:
+                    logger.debug("Live bash output callback failed", exc_info=True)
+
+
 @dataclass(frozen=True)
 class PathMapping:
     """A path mapping from a container path to a local path with optional read-only flag."""
@@ -158,8 +302,8 @@ class LocalSandbox(Sandbox):
                 pass
 
     @staticmethod
-    def _start_pipe_drain(fd: int, name: str) -> tuple[_BoundedPipeCapture, threading.Thread]:
-        capture = _BoundedPipeCapture()
+    def _start_pipe_drain(fd: int, name: str, capture: _BoundedPipeCapture | None = None) -> tuple[_BoundedPipeCapture, threading.Thread]:
+        capture = capture or _BoundedPipeCapture()
         thread = threading.Thread(target=LocalSandbox._drain_pipe, args=(fd, capture), name=name, daemon=True)
         thread.start()
         return capture, thread
@@ -178,7 +322,7 @@ class LocalSandbox(Sandbox):
         except OSError:
             return False
 
-    def __init__(self, id: str, path_mappings: list[PathMapping] | None = None):
+    def __init__(self, id: str, path_mappings: list[PathMapping] | None = None, *, persistent_shell: bool = False):
         """
         Initialize local sandbox with optional path mappings.
 
@@ -186,9 +330,15 @@ class LocalSandbox(Sandbox):
             id: Sandbox identifier
             path_mappings: List of path mappings with optional read-only flag.
                           Skills directory is read-only by default.
+            persistent_shell: Run POSIX commands in one long-lived shell per
+                          sandbox instead of a fresh process per call
+                          (``sandbox.persistent_shell``).
         """
         super().__init__(id)
         self.path_mappings = path_mappings or []
+        self._persistent_shell_enabled = persistent_shell and os.name != "nt"
+        self._persistent_shell: PersistentShell | None = None
+        self._persistent_shell_lock = threading.Lock()
         # Track files written through write_file so read_file only
         # reverse-resolves paths in agent-authored content.
         self._agent_written_paths: set[str] = set()
@@ -468,7 +618,16 @@ class LocalSandbox(Sandbox):
         command: str,
         env: dict[str, str] | None = None,
         timeout: float | None = None,
+        *,
+        on_output: Callable[[str, str, int], None] | None = None,
     ) -> str:
+        """Run *command* on the host; see :meth:`Sandbox.execute_command`.
+
+        ``on_output(stream, text, offset)`` receives throttled live output
+        (POSIX only; see :class:`_LiveOutput`) while the command runs. It is
+        called from a helper thread and must not block; the return value is
+        unchanged either way.
+        """
         # Validate ``env`` keys against the POSIX env-var rule. Defense in
         # depth: ``subprocess.run(env=...)`` does not go through a shell so a
         # metachar in a key here would not actually inject — but the public
@@ -518,8 +677,16 @@ class LocalSandbox(Sandbox):
                 stderr = self._coerce_process_output(exc.stderr)
                 returncode = 0
         else:
-            args = [shell, "-c", resolved_command]
-            stdout, stderr, returncode, timed_out = self._run_posix_command(args, timeout, sandbox_env)
+            live = _LiveOutput(on_output, self._reverse_resolve_paths_in_output, secrets=(env or {}).values()) if on_output is not None else None
+            try:
+                result = self._run_in_persistent_shell(shell, resolved_command, timeout, env, live)
+                if result is None:
+                    args = [shell, "-c", resolved_command]
+                    result = self._run_posix_command(args, timeout, sandbox_env, live)
+            finally:
+                if live is not None:
+                    live.close()
+            stdout, stderr, returncode, timed_out = result
 
         output = stdout
         if stderr:
@@ -534,11 +701,44 @@ class LocalSandbox(Sandbox):
         # Reverse resolve local paths back to container paths in output
         return self._reverse_resolve_paths_in_output(final_output)
 
+    def _run_in_persistent_shell(
+        self,
+        shell: str,
+        command: str,
+        timeout: float,
+        env: dict[str, str] | None,
+        live: _LiveOutput | None = None,
+    ) -> tuple[str, str, int, bool] | None:
+        """Run *command* in this sandbox's long-lived shell, or return ``None`` for a one-shot run.
+
+        Calls carrying request-scoped ``env`` always run one-shot so injected
+        secrets never outlive the call in a shared shell, and so do calls that
+        arrive while the shell is busy with a concurrent command.
+        """
+        if not self._persistent_shell_enabled or env:
+            return None
+        from deerflow.sandbox.local.persistent_shell import PersistentShell
+
+        with self._persistent_shell_lock:
+            if self._persistent_shell is None:
+                self._persistent_shell = PersistentShell(shell, build_sandbox_env(None))
+            persistent_shell = self._persistent_shell
+        return persistent_shell.run(command, timeout, live)
+
+    def close(self) -> None:
+        """Stop this sandbox's persistent shell, if any."""
+        with self._persistent_shell_lock:
+            self._persistent_shell_enabled = False
+            persistent_shell, self._persistent_shell = self._persistent_shell, None
+        if persistent_shell is not None:
+            persistent_shell.close()
+
     @staticmethod
     def _run_posix_command(
         args: list[str],
         timeout: float,
         env: dict[str, str] | None = None,
+        live: _LiveOutput | None = None,
     ) -> tuple[str, str, int, bool]:
         """Run a command on POSIX with bounded pipe capture.
 
@@ -555,7 +755,8 @@ class LocalSandbox(Sandbox):
         killed in full (children included) when it times out.
 
         ``env`` is forwarded to :class:`subprocess.Popen`; ``None`` means
-        inherit the current process environment (the common case).
+        inherit the current process environment (the common case). ``live``
+        additionally receives output as it is drained.
 
         Returns ``(stdout, stderr, returncode, timed_out)``.
         """
@@ -588,8 +789,8 @@ class LocalSandbox(Sandbox):
                     # The write fd may already be closed by the exception cleanup above.
                     pass
 
-        stdout_capture, stdout_thread = LocalSandbox._start_pipe_drain(stdout_read_fd, "deerflow-bash-stdout-drain")
-        stderr_capture, stderr_thread = LocalSandbox._start_pipe_drain(stderr_read_fd, "deerflow-bash-stderr-drain")
+        stdout_capture, stdout_thread = LocalSandbox._start_pipe_drain(stdout_read_fd, "deerflow-bash-stdout-drain", live.capture("stdout") if live else None)
+        stderr_capture, stderr_thread = LocalSandbox._start_pipe_drain(stderr_read_fd, "deerflow-bash-stderr-drain", live.capture("stderr") if live else None)
         try:
             process_group_id = os.getpgid(process.pid)
         except OSError:
@@ -729,6 +930,9 @@ class LocalSandbox(Sandbox):
             # using the content-specific resolver (forward-slash safe)
             resolved_content = self._resolve_paths_in_content(content)
             mode = "a" if append else "w"
+            # A file shared with a thread branch (sandbox.branch_hardlinks) is
+            # copied before the write, so the other thread keeps its content.
+            break_hardlink(resolved_path)
             with open(resolved_path, mode, encoding="utf-8") as f:
                 f.write(resolved_content)
             # Track this path so read_file knows to reverse-resolve on read.
@@ -781,6 +985,7 @@ class LocalSandbox(Sandbox):
             dir_path = os.path.dirname(resolved_path)
             if dir_path:
                 os.makedirs(dir_path, exist_ok=True)
+            break_hardlink(resolved_path)
             with open(resolved_path, "wb") as f:
                 f.write(content)
         except OSError as e:
@@ -61,6 +61,9 @@ class LocalSandboxProvider(SandboxProvider):
     next ``acquire``; the evicted thread's next ``acquire`` rebuilds a fresh
     sandbox (losing only its ``_agent_written_paths`` reverse-resolve hint,
     which gracefully degrades read_file output).
+
+    With ``sandbox.persistent_shell`` each sandbox also owns a long-lived
+    shell process; eviction, ``reset()`` and ``shutdown()`` close it.
     """
 
     uses_thread_data_mounts = True
@@ -75,11 +78,21 @@ class LocalSandboxProvider(SandboxProvider):
                 evicted on the next ``acquire``.
         """
         self._path_mappings = self._setup_path_mappings()
+        self._persistent_shell = self._persistent_shell_enabled()
         self._generic_sandbox: LocalSandbox | None = None
         self._thread_sandboxes: OrderedDict[tuple[str, str], LocalSandbox] = OrderedDict()
         self._max_cached_threads = max_cached_threads
         self._lock = threading.Lock()
 
+    @staticmethod
+    def _persistent_shell_enabled() -> bool:
+        try:
+            from deerflow.config import get_app_config
+
+            return bool(getattr(get_app_config().sandbox, "persistent_shell", False))
+        except Exception:
+            return False
+
     def _setup_path_mappings(self) -> list[PathMapping]:
         """
         Setup static path mappings shared by every sandbox this provider yields.
@@ -342,7 +355,7 @@ class LocalSandboxProvider(SandboxProvider):
         if thread_id is None:
             with self._lock:
                 if self._generic_sandbox is None:
-                    self._generic_sandbox = LocalSandbox("local", path_mappings=list(self._path_mappings))
+                    self._generic_sandbox = LocalSandbox("local", path_mappings=list(self._path_mappings), persistent_shell=self._persistent_shell)
                     _singleton = self._generic_sandbox
                 return self._generic_sandbox.id
 
@@ -367,7 +380,11 @@ class LocalSandboxProvider(SandboxProvider):
             # populated the cache while we were computing mappings.
             cached = self._thread_sandboxes.get(key)
             if cached is None:
-                cached = LocalSandbox(self._sandbox_id_for_thread(thread_id, effective_user_id), path_mappings=new_mappings)
+                cached = LocalSandbox(
+                    self._sandbox_id_for_thread(thread_id, effective_user_id),
+                    path_mappings=new_mappings,
+                    persistent_shell=self._persistent_shell,
+                )
                 self._thread_sandboxes[key] = cached
                 self._evict_until_within_cap_locked()
             else:
@@ -380,7 +397,8 @@ class LocalSandboxProvider(SandboxProvider):
         Caller MUST hold ``self._lock``.
         """
         while len(self._thread_sandboxes) > self._max_cached_threads:
-            evicted_key, _ = self._thread_sandboxes.popitem(last=False)
+            evicted_key, evicted = self._thread_sandboxes.popitem(last=False)
+            evicted.close()
             logger.info(
                 "Evicting LocalSandbox cache entry for user/thread %s/%s (cap=%d)",
                 evicted_key[0],
@@ -432,9 +450,14 @@ class LocalSandboxProvider(SandboxProvider):
         """
         global _singleton
         with self._lock:
+            dropped = list(self._thread_sandboxes.values())
+            if self._generic_sandbox is not None:
+                dropped.append(self._generic_sandbox)
             self._generic_sandbox = None
             self._thread_sandboxes.clear()
             _singleton = None
+        for sandbox in dropped:
+            sandbox.close()
 
     def shutdown(self) -> None:
         # LocalSandboxProvider has no extra resources beyond the cached
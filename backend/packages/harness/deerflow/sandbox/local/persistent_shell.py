@@ -0,0 +1,273 @@
+"""Long-lived shell for ``LocalSandbox`` commands (``sandbox.persistent_shell``).
+
+A one-shot ``execute_command`` forks and execs a fresh shell per call, so a
+turn of many small commands spends most of its time on process start-up. A
+``PersistentShell`` keeps one shell per sandbox and writes each command to its
+stdin framed as::
+
+    eval '<command>' < /dev/null
+    printf '%s%s %d\\n' '<marker head>' '<marker tail>' "$?"
+    printf '%s%s\\n' '<marker head>' '<marker tail>' >&2
+
+The command's stdout/stderr are whatever the shell writes to each stream
+before that stream's marker. The marker is a per-shell random token plus a
+sequence number and never appears whole in the shell's input, so neither
+command output nor an echoed script (``set -v``) can forge it. The framing
+adds no bytes to the command's own output.
+
+One-shot semantics are kept: output goes through the same bounded capture,
+the command's stdin is ``/dev/null``, and a timeout kills the shell's whole
+process group (the next command starts a fresh shell). Unlike one-shot mode
+that group also holds background jobs started by earlier commands, so a
+timeout stops those too. Shell state — working directory, exported
+variables, functions — carries over between commands, as in a terminal.
+
+POSIX only; ``LocalSandbox`` keeps the one-shot path on Windows.
+"""
+
+import logging
+import os
+import secrets
+import shlex
+import signal
+import subprocess
+import threading
+import time
+
+from deerflow.sandbox.local.local_sandbox import _PIPE_DRAIN_JOIN_TIMEOUT_SECONDS, _BoundedPipeCapture, _LiveOutput
+
+logger = logging.getLogger(__name__)
+
+# How often a command wait re-checks that the shell is still alive. Normal
+# completion wakes the waiter immediately; this only bounds how late a shell
+# that died while a background job still holds its pipes is noticed.
+_LIVENESS_POLL_SECONDS = 0.1
+
+
+class _StreamReader:
+    """Drain one shell output pipe for the shell's lifetime, splitting it at command markers.
+
+    State is guarded by the owning shell's condition. Output arriving while no
+    command is running (background jobs) is discarded, as it would be once a
+    one-shot command's drain threads exit.
+    """
+
+    def __init__(self, fd: int, name: str, cond: threading.Condition) -> None:
+        self._fd = fd
+        self._cond = cond
+        self._capture: _BoundedPipeCapture | None = None
+        self._marker = b""
+        self._pending = b""
+        self.trailer: bytes | None = None
+        self.closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def begin(self, marker: bytes, capture: _BoundedPipeCapture | None = None) -> _BoundedPipeCapture:
+        self._capture = capture or _BoundedPipeCapture()
+        self._marker = marker
+        self._pending = b""
+        self.trailer = None
+        return self._capture
+
+    def end(self) -> None:
+        self._capture = None
+
+    def _run(self) -> None:
+        try:
+            while chunk := os.read(self._fd, 65536):
+                with self._cond:
+                    self._feed(chunk)
+        except OSError:
+            logger.debug("Persistent shell output pipe closed while draining", exc_info=True)
+        finally:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+            with self._cond:
+                if self._capture is not None and self.trailer is None and self._pending:
+                    self._capture.append(self._pending)
+                    self._pending = b""
+                self.closed = True
+                self._cond.notify_all()
+
+    def _feed(self, chunk: bytes) -> None:
+        capture = self._capture
+        if capture is None or self.trailer is not None:
+            return
+        data = self._pending + chunk
+        start = data.find(self._marker)
+        if start < 0:
+            # Hold back only a trailing marker prefix (split across reads), so
+            # ordinary output reaches the capture — and live output — at once.
+            cut = len(data)
+            for size in range(min(len(self._marker) - 1, len(data)), 0, -1):
+                if data.endswith(self._marker[:size]):
+                    cut -= size
+                    break
+            capture.append(data[:cut])
+            self._pending = data[cut:]
+            return
+        capture.append(data[:start])
+        end = data.find(b"\n", start + len(self._marker))
+        if end < 0:
+            self._pending = data[start:]
+            return
+        self.trailer = data[start + len(self._marker) : end]
+        self._pending = b""
+        self._cond.notify_all()
+
+
+class PersistentShell:
+    """One long-lived shell process running commands one at a time."""
+
+    def __init__(self, shell: str, env: dict[str, str]) -> None:
+        self._shell = shell
+        self._env = env
+        self._token = secrets.token_hex(8)
+        self._seq = 0
+        self._process: subprocess.Popen | None = None
+        self._stdout: _StreamReader | None = None
+        self._stderr: _StreamReader | None = None
+        self._cond = threading.Condition()
+        self._run_lock = threading.Lock()
+        self._closed = False
+
+    def run(self, command: str, timeout: float, live: _LiveOutput | None = None) -> tuple[str, str, int, bool] | None:
+        """Run *command*; same result tuple as ``LocalSandbox._run_posix_command``.
+
+        Returns ``None`` when the shell is busy with another command or closed,
+        so the caller can fall back to a one-shot process instead of queueing
+        behind it.
+        """
+        if not self._run_lock.acquire(blocking=False):
+            return None
+        try:
+            if self._closed:
+                return None
+            return self._run_locked(command, timeout, live)
+        finally:
+            if self._closed:
+                self._kill()
+            self._run_lock.release()
+
+    def close(self) -> None:
+        """Kill the shell and its process group; deferred until a running command finishes."""
+        self._closed = True
+        if self._run_lock.acquire(blocking=False):
+            try:
+                self._kill()
+            finally:
+                self._run_lock.release()
+
+    def _start(self) -> None:
+        stdout_read_fd, stdout_write_fd = os.pipe()
+        stderr_read_fd, stderr_write_fd = os.pipe()
+        try:
+            self._process = subprocess.Popen(
+                [self._shell],
+                shell=False,
+                stdin=subprocess.PIPE,
+                stdout=stdout_write_fd,
+                stderr=stderr_write_fd,
+                start_new_session=True,
+                env=self._env,
+            )
+        except Exception:
+            for fd in (stdout_read_fd, stderr_read_fd):
+                os.close(fd)
+            raise
+        finally:
+            for fd in (stdout_write_fd, stderr_write_fd):
+                os.close(fd)
+        self._stdout = _StreamReader(stdout_read_fd, "deerflow-shell-stdout-drain", self._cond)
+        self._stderr = _StreamReader(stderr_read_fd, "deerflow-shell-stderr-drain", self._cond)
+
+    def _kill(self) -> None:
+        """SIGKILL the shell's process group (background jobs included) and reap the shell."""
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            # start_new_session made the shell its group leader; the group id
+            # stays valid while any member lives, even after the shell is reaped.
+            os.killpg(process.pid, signal.SIGKILL)
+        except OSError:
+            logger.debug("Persistent shell group %s already gone", process.pid)
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            logger.warning("Persistent shell %s did not exit after SIGKILL", process.pid)
+        self._close_stdin(process)
+
+    @staticmethod
+    def _close_stdin(process: subprocess.Popen) -> None:
+        try:
+            if process.stdin is not None:
+                process.stdin.close()
+        except OSError:
+            pass
+
+    def _run_locked(self, command: str, timeout: float, live: _LiveOutput | None) -> tuple[str, str, int, bool]:
+        if self._process is None or self._process.poll() is not None:
+            self._discard_exited()
+            self._start()
+        process, stdout, stderr = self._process, self._stdout, self._stderr
+        assert process is not None and stdout is not None and stderr is not None
+
+        self._seq += 1
+        marker = f"__DEERFLOW_{self._token}_{self._seq}__"
+        head, tail = shlex.quote(marker[:10]), shlex.quote(marker[10:])
+        script = f"eval {shlex.quote(command)} < /dev/null\nprintf '%s%s %d\\n' {head} {tail} \"$?\"\nprintf '%s%s\\n' {head} {tail} >&2\n"
+        with self._cond:
+            stdout_capture = stdout.begin(marker.encode(), live.capture("stdout") if live else None)
+            stderr_capture = stderr.begin(marker.encode(), live.capture("stderr") if live else None)
+        try:
+            process.stdin.write(script.encode())
+            process.stdin.flush()
+        except OSError:
+            # The shell exited between the liveness check and the write; the
+            # wait below reports it like any other shell exit.
+            logger.debug("Persistent shell %s closed its stdin", process.pid)
+
+        timed_out = False
+        exited = False
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while stdout.trailer is None or stderr.trailer is None:
+                if process.poll() is not None:
+                    exited = True
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    timed_out = True
+                    break
+                self._cond.wait(min(remaining, _LIVENESS_POLL_SECONDS))
+
+        if timed_out:
+            self._kill()
+        if timed_out or exited:
+            # Let the drain threads flush what the shell wrote before it died.
+            with self._cond:
+                self._cond.wait_for(lambda: stdout.closed and stderr.closed, timeout=10 if timed_out else _PIPE_DRAIN_JOIN_TIMEOUT_SECONDS)
+
+        with self._cond:
+            stdout.end()
+            stderr.end()
+        if timed_out:
+            returncode = 0
+        elif exited:
+            returncode = process.returncode
+            self._discard_exited()
+        else:
+            returncode = int(stdout.trailer.strip())
+        return stdout_capture.read(), stderr_capture.read(), returncode, timed_out
+
+    def _discard_exited(self) -> None:
+        # The shell exited on its own (``exit``, a fatal syntax error, ...).
+        # Its background jobs are left running, as a one-shot command's would be.
+        process, self._process = self._process, None
+        if process is not None:
+            process.wait()
+            self._close_stdin(process)
@@ -1,5 +1,6 @@
 import re
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
 
 from deerflow.sandbox.search import GrepMatch
 
@@ -145,6 +146,19 @@ class Sandbox(ABC):
         """
         pass
 
+    def write_files(self, files: Mapping[str, str]) -> None:
+        """Write several text files, creating or overwriting each.
+
+        Remote sandboxes override this to move the whole batch in as few
+        round trips as their backend allows; the default writes the files
+        one at a time with :meth:`write_file`.
+
+        Args:
+            files: Absolute file path -> text content.
+        """
+        for path, content in files.items():
+            self.write_file(path, content)
+
     @abstractmethod
     def glob(self, path: str, pattern: str, *, include_dirs: bool = False, max_results: int = 200) -> tuple[list[str], bool]:
         """Find paths that match a glob pattern under a root directory."""
@@ -1697,6 +1697,37 @@ def _github_env_from_runtime(runtime: Runtime) -> dict[str, str] | None:
     return {"GH_TOKEN": token, "GITHUB_TOKEN": token}
 
 
+def _bash_live_output_writer(
+    runtime: Runtime,
+    thread_data: ThreadDataState | None,
+    injected_env: dict[str, str] | None,
+) -> Callable[[str, str, int], None] | None:
+    """Build the ``LocalSandbox.execute_command(on_output=...)`` callback for a bash call.
+
+    Live output reaches run subscribers as ``tool_output`` custom stream
+    events, masked exactly like the final tool result (host paths, injected
+    secrets). The final ToolMessage keeps its own truncation; these events are
+    a progress view only. Returns ``None`` outside a streaming run.
+    """
+    writer = getattr(runtime, "stream_writer", None)
+    tool_call_id = getattr(runtime, "tool_call_id", None)
+    if writer is None or not tool_call_id:
+        return None
+
+    def on_output(stream: str, text: str, offset: int) -> None:
+        writer(
+            {
+                "type": "tool_output",
+                "tool_call_id": tool_call_id,
+                "stream": stream,
+                "offset": offset,
+                "text": mask_secret_values(mask_local_paths_in_output(text, thread_data), injected_env),
+            }
+        )
+
+    return on_output
+
+
 @tool("bash", parse_docstring=True)
 def bash_tool(runtime: Runtime, description: str, command: str) -> str:
     """Execute a bash command in a Linux environment.
@@ -1743,10 +1774,16 @@ def bash_tool(runtime: Runtime, description: str, command: str) -> str:
                 sandbox_cfg = get_app_config().sandbox
                 max_chars = sandbox_cfg.bash_output_max_chars if sandbox_cfg else 20000
                 command_timeout = sandbox_cfg.bash_command_timeout if sandbox_cfg else None
+                live_output = getattr(sandbox_cfg, "bash_live_output", True)
             except Exception:
                 max_chars = 20000
                 command_timeout = None
-            output = sandbox.execute_command(command, env=injected_env, timeout=command_timeout)
+                live_output = True
+            on_output = _bash_live_output_writer(runtime, thread_data, injected_env) if live_output else None
+            if on_output is not None:
+                output = sandbox.execute_command(command, env=injected_env, timeout=command_timeout, on_output=on_output)
+            else:
+                output = sandbox.execute_command(command, env=injected_env, timeout=command_timeout)
             return _truncate_bash_output(
                 mask_secret_values(mask_local_paths_in_output(output, thread_data), injected_env),
                 max_chars,
@@ -15,9 +15,14 @@ from deerflow.models import create_chat_model
 from deerflow.runtime.user_context import get_effective_user_id
 from deerflow.skills.types import SKILL_MD_FILE
 from deerflow.tracing import inject_langfuse_metadata
+from deerflow.utils.llm_response_cache import build_cache_key, get_llm_response_cache, resolve_cache_model_name
 
 logger = logging.getLogger(__name__)
 
+# Bump when the moderation rubric or the decision parsing changes, so verdicts
+# cached under the old rubric are never served.
+_MODERATION_CACHE_VERSION = "1"
+
 
 @dataclass(slots=True)
 class ScanResult:
@@ -126,6 +131,18 @@ async def scan_skill_content(
     try:
         config = app_config or get_app_config()
         model_name = config.skill_evolution.moderation_model_name
+        cache = get_llm_response_cache(config)
+        cache_key = build_cache_key(
+            call_site="security_agent",
+            model_name=resolve_cache_model_name(model_name, config),
+            prompt_version=_MODERATION_CACHE_VERSION,
+            parts=(rubric, prompt),
+        )
+        if cache is not None:
+            cached = await cache.aget("security_agent", cache_key)
+            parsed_cached = _extract_json_object(cached) if cached is not None else None
+            if parsed_cached and parsed_cached.get("decision") in {"allow", "warn", "block"}:
+                return ScanResult(parsed_cached["decision"], str(parsed_cached.get("reason") or "No reason provided."))
         model_kwargs = {"thinking_enabled": False, "app_config": config, "attach_tracing": attach_tracing}
         model = create_chat_model(name=model_name, **model_kwargs) if model_name else create_chat_model(**model_kwargs)
         invoke_config: dict[str, Any] = {"run_name": "security_agent"}
@@ -160,7 +177,10 @@ async def scan_skill_content(
         if parsed:
             decision = str(parsed.get("decision", "")).lower()
             if decision in {"allow", "warn", "block"}:
-                return ScanResult(decision, str(parsed.get("reason") or "No reason provided."))
+                result = ScanResult(decision, str(parsed.get("reason") or "No reason provided."))
+                if cache is not None:
+                    await cache.aset("security_agent", cache_key, json.dumps({"decision": result.decision, "reason": result.reason}, ensure_ascii=False))
+                return result
         logger.warning("Security scan produced unparseable output: %s", raw[:200])
     except Exception:
         logger.warning("Skill security scan model call failed; applying configured fail-closed/fail-open policy", exc_info=True)
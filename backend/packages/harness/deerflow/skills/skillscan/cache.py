@@ -0,0 +1,192 @@
+"""Content-addressed cache and worker pool for SkillScan.
+
+Scan results are pure functions of the scanned bytes, the path they live at
+(rules key off names such as ``SKILL.md`` or ``*.py``) and the analyzer code,
+so they are cached under a SHA-256 of exactly those inputs. The analyzer part
+is ``ruleset_version()``, a digest of the modules that define the rules:
+editing any rule invalidates every cached result without a hand-bumped
+constant.
+
+Cache misses large enough to stall the gateway are scanned in a small
+``spawn`` process pool so the CPU-bound AST/regex work runs outside the
+gateway's GIL. Both are process-wide singletons sized from ``skill_scan`` in
+``config.yaml``; ``reset_scan_cache()`` / ``shutdown_scan_pool()`` drop them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import multiprocessing
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any
+
+from deerflow.skills.skillscan.models import ScanResult
+
+logger = logging.getLogger(__name__)
+
+# Misses smaller than this are scanned inline: a SKILL.md edit should not pay
+# a round-trip to a worker process, nor the first large scan a worker's
+# start-up (a spawned interpreter importing ``deerflow.skills`` takes seconds).
+POOL_MIN_BYTES = 1024 * 1024
+
+
+def _ruleset_version() -> str:
+    from deerflow.skills import package_paths
+    from deerflow.skills.skillscan import models, orchestrator
+
+    digest = hashlib.sha256()
+    for module in (orchestrator, models, package_paths):
+        digest.update(Path(module.__file__).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+_ruleset_version_value: str | None = None
+
+
+def ruleset_version() -> str:
+    """Digest of the analyzer sources; part of every cache key."""
+    global _ruleset_version_value
+    if _ruleset_version_value is None:
+        _ruleset_version_value = _ruleset_version()
+    return _ruleset_version_value
+
+
+def _key_digest(kind: str, name: str) -> hashlib._Hash:
+    digest = hashlib.sha256()
+    for part in (ruleset_version().encode(), kind.encode(), name.encode("utf-8", "surrogateescape")):
+        digest.update(part)
+        digest.update(b"\0")
+    return digest
+
+
+def content_key(kind: str, name: str, data: bytes) -> str:
+    digest = _key_digest(kind, name)
+    digest.update(data)
+    return digest.hexdigest()
+
+
+def file_content_key(kind: str, path: Path) -> str:
+    """``content_key`` of a file's bytes, streamed so large archives are never held whole."""
+    digest = _key_digest(kind, "")
+    with open(path, "rb") as f:
+        hashlib.file_digest(f, lambda: digest)
+    return digest.hexdigest()
+
+
+class ScanCache:
+    """Thread-safe LRU of ``ScanResult`` values, copied in and out."""
+
+    def __init__(self, max_entries: int = 8192) -> None:
+        self._max_entries = max(0, max_entries)
+        self._entries: OrderedDict[str, ScanResult] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> ScanResult | None:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                return None
+            self._entries.move_to_end(key)
+        return _copy_result(value)
+
+    def put(self, key: str, value: ScanResult) -> None:
+        if self._max_entries == 0:
+            return
+        value = _copy_result(value)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _copy_result(result: ScanResult) -> ScanResult:
+    # Finding values are str/int/None, so copying each dict is a full copy.
+    return {
+        "findings": [dict(finding) for finding in result["findings"]],  # type: ignore[misc]
+        "blocked": result["blocked"],
+        "scanner_errors": list(result["scanner_errors"]),
+    }
+
+
+def _skill_scan_config() -> Any | None:
+    try:
+        from deerflow.config import get_app_config
+
+        return getattr(get_app_config(), "skill_scan", None)
+    except Exception:
+        return None
+
+
+_cache: ScanCache | None = None
+_pool: ProcessPoolExecutor | None = None
+_pool_workers = 0
+_lock = threading.Lock()
+
+
+def get_scan_cache() -> ScanCache:
+    global _cache
+    if _cache is None:
+        with _lock:
+            if _cache is None:
+                config = _skill_scan_config()
+                _cache = ScanCache(getattr(config, "cache_max_entries", 8192))
+    return _cache
+
+
+def reset_scan_cache() -> None:
+    global _cache
+    _cache = None
+
+
+def _get_pool() -> tuple[ProcessPoolExecutor, int] | None:
+    global _pool, _pool_workers
+    if _pool is None:
+        with _lock:
+            if _pool is None:
+                workers = getattr(_skill_scan_config(), "max_workers", 2)
+                if workers <= 0:
+                    return None
+                # spawn, not fork: the gateway has live threads and event loops.
+                _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+                _pool_workers = workers
+    return _pool, _pool_workers
+
+
+def shutdown_scan_pool() -> None:
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def run_scan_jobs[T](fn: Callable[..., T], jobs: list[tuple[Any, ...]], *, size: int) -> list[T]:
+    """Return ``[fn(*args) for args in jobs]``, fanned out to the scan pool when *size* bytes justify it.
+
+    Blocks the calling thread either way; async callers already dispatch scans
+    with ``asyncio.to_thread``. Scanner exceptions propagate unchanged; a
+    broken pool degrades to an inline scan rather than failing the install.
+    """
+    pool = _get_pool() if jobs and size >= POOL_MIN_BYTES else None
+    if pool is not None:
+        executor, workers = pool
+        try:
+            return list(executor.map(fn, *zip(*jobs, strict=True), chunksize=max(1, len(jobs) // (workers * 4))))
+        except BrokenProcessPool:
+            logger.warning("SkillScan worker pool broke; scanning inline", exc_info=True)
+            shutdown_scan_pool()
+    return [fn(*args) for args in jobs]
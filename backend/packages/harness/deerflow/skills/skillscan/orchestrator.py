@@ -2,7 +2,8 @@
 
 ``scan_archive_preflight()`` and ``scan_skill_dir()`` are synchronous pure
 functions of their inputs; async callers must dispatch them off the event
-loop. Policy is one code constant — ``CRITICAL`` blocks, everything else is a
+loop. Results are cached by content hash and large scans run in a worker
+process (see ``skillscan.cache``). Policy is one code constant — ``CRITICAL`` blocks, everything else is a
 warning — applied by ``enforce_static_scan()``, which also honours the
 ``skill_scan.enabled`` kill switch. Rule specs live next to the analyzers
 that match them so a rule is authored, read, and tested in one place.
@@ -23,6 +24,7 @@ from pathlib import Path, PurePosixPath, PureWindowsPath
 from typing import Any
 
 from deerflow.skills.package_paths import is_eval_fixture_skill_md
+from deerflow.skills.skillscan.cache import content_key, file_content_key, get_scan_cache, run_scan_jobs
 from deerflow.skills.skillscan.models import (
     FindingSeverity,
     RuleSpec,
@@ -175,6 +177,58 @@ def enforce_static_scan(
 
 
 def scan_archive_preflight(archive_path: Path) -> ScanResult:
+    try:
+        key = file_content_key("archive", Path(archive_path))
+        size = Path(archive_path).stat().st_size
+    except OSError as e:
+        raise StaticScannerError(f"failed to read skill archive: {e}") from e
+
+    cache = get_scan_cache()
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+    [result] = run_scan_jobs(_scan_archive_preflight_uncached, [(Path(archive_path),)], size=size)
+    cache.put(key, result)
+    return result
+
+
+def scan_skill_dir(skill_dir: Path) -> ScanResult:
+    root = Path(skill_dir)
+    if not root.is_dir():
+        raise StaticScannerError(f"skill_dir is not a directory: {root}")
+
+    cache = get_scan_cache()
+    # One per-file ScanResult slot in path order; cache misses stay None until
+    # they are scanned, fanned out across the worker pool when large.
+    slots: list[ScanResult | None] = []
+    misses: list[tuple[int, str, str, bytes]] = []
+    for path in sorted(candidate for candidate in root.rglob("*") if candidate.is_file()):
+        rel_path = _relative_file(path, root)
+        try:
+            file_bytes = path.read_bytes()
+        except OSError as e:
+            slots.append(_scan_result([], [f"{rel_path}: failed to read file: {e}"]))
+            continue
+        key = content_key("file", rel_path, file_bytes)
+        cached = cache.get(key)
+        if cached is None:
+            misses.append((len(slots), key, rel_path, file_bytes))
+        slots.append(cached)
+
+    scanned = run_scan_jobs(_scan_file, [(rel_path, file_bytes) for _, _, rel_path, file_bytes in misses], size=sum(len(miss[3]) for miss in misses))
+    for (index, key, _, _), file_result in zip(misses, scanned, strict=True):
+        cache.put(key, file_result)
+        slots[index] = file_result
+
+    findings: list[SecurityFinding] = []
+    scanner_errors: list[str] = []
+    for file_result in slots:
+        findings.extend(file_result["findings"])  # type: ignore[index]
+        scanner_errors.extend(file_result["scanner_errors"])  # type: ignore[index]
+    return _scan_result(_dedupe(findings), scanner_errors)
+
+
+def _scan_archive_preflight_uncached(archive_path: Path) -> ScanResult:
     findings: list[SecurityFinding] = []
     scanner_errors: list[str] = []
     total_size = 0
@@ -218,33 +272,17 @@ def scan_archive_preflight(archive_path: Path) -> ScanResult:
     return _scan_result(_dedupe(findings), scanner_errors)
 
 
-def scan_skill_dir(skill_dir: Path) -> ScanResult:
-    root = Path(skill_dir)
-    if not root.is_dir():
-        raise StaticScannerError(f"skill_dir is not a directory: {root}")
-
-    findings: list[SecurityFinding] = []
+def _scan_file(rel_path: str, file_bytes: bytes) -> ScanResult:
+    findings = _scan_file_package_properties(rel_path, file_bytes, len(file_bytes))
     scanner_errors: list[str] = []
-    for path in sorted(candidate for candidate in root.rglob("*") if candidate.is_file()):
-        rel_path = _relative_file(path, root)
-        try:
-            file_bytes = path.read_bytes()
-        except OSError as e:
-            scanner_errors.append(f"{rel_path}: failed to read file: {e}")
-            continue
-
-        findings.extend(_scan_file_package_properties(rel_path, file_bytes, path.stat().st_size))
-        text = _decode_text_for_analysis(file_bytes)
-        if text is None:
-            continue
-
+    text = _decode_text_for_analysis(file_bytes)
+    if text is not None:
         try:
             findings.extend(_scan_text_file(rel_path, text))
         except Exception as e:
             scanner_errors.append(f"{rel_path}: analyzer failed: {e}")
             logger.warning("SkillScan analyzer failed for %s", rel_path, exc_info=True)
-
-    return _scan_result(_dedupe(findings), scanner_errors)
+    return _scan_result(findings, scanner_errors)
 
 
 def _scan_archive_member_metadata(info: zipfile.ZipInfo, normalized: str) -> list[SecurityFinding]:
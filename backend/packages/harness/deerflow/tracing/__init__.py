@@ -1,10 +1,13 @@
 from .factory import build_tracing_callbacks
 from .metadata import build_langfuse_trace_metadata, inject_langfuse_metadata
 from .monocle import setup_monocle_tracing_if_enabled
+from .sampling import SampledTracingHandler, get_trace_export_stats
 
 __all__ = [
     "build_langfuse_trace_metadata",
     "build_tracing_callbacks",
+    "get_trace_export_stats",
     "inject_langfuse_metadata",
+    "SampledTracingHandler",
     "setup_monocle_tracing_if_enabled",
 ]
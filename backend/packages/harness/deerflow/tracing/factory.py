@@ -35,7 +35,12 @@ def _create_langfuse_handler(config) -> Any:
 
 
 def build_tracing_callbacks() -> list[Any]:
-    """Build callbacks for all explicitly enabled tracing providers."""
+    """Build callbacks for all explicitly enabled tracing providers.
+
+    With sampling or batched export configured (``DEER_FLOW_TRACE_*``), the
+    provider handlers come back wrapped in a single
+    :class:`~deerflow.tracing.sampling.SampledTracingHandler`.
+    """
     validate_enabled_tracing_providers()
     # Monocle is not a callback provider; this per-run path is just where an
     # embedded process that skipped Gateway-lifespan setup can be told about it.
@@ -62,4 +67,9 @@ def build_tracing_callbacks() -> list[Any]:
             except Exception as exc:  # pragma: no cover - exercised via tests with monkeypatch
                 raise RuntimeError(f"Langfuse tracing initialization failed: {exc}") from exc
 
+    sampling = getattr(tracing_config, "sampling", None)
+    if callbacks and sampling is not None and sampling.is_active:
+        from deerflow.tracing.sampling import SampledTracingHandler
+
+        return [SampledTracingHandler(callbacks, sampling)]
     return callbacks
@@ -0,0 +1,459 @@
+"""Head/tail sampling and batched export for the tracing callbacks.
+
+``build_tracing_callbacks`` wraps the LangSmith/Langfuse handlers in one
+:class:`SampledTracingHandler` when ``TracingSamplingConfig.is_active``.
+The wrapper sees every callback of the run tree it is attached to and:
+
+- decides once per root run whether it is sampled — keyed by the DeerFlow
+  request trace id when there is one, so a request's lead agent, subagents
+  and model calls are kept or dropped together;
+- forwards a sampled run's callbacks to the provider handlers, either inline
+  or through the process-wide :class:`TraceExporter`;
+- buffers an unsampled run's callbacks when ``keep_errored_runs`` is on, and
+  replays them if the root run fails (tail-based promotion). Buffered
+  callbacks are replayed in order, so the exported spans carry the replay
+  time rather than their original timing.
+
+A root that never reports its end (an abandoned stream, a cancelled task)
+would otherwise stay tracked for the life of the handler, which for a
+model-level handler is the life of the model. Roots older than
+``root_ttl`` seconds, and the oldest roots beyond ``max_roots``, are
+forgotten: their buffered callbacks are dropped, and any later callback of
+their runs is treated like one from a run the handler never saw.
+
+The exporter is a bounded queue drained by one daemon thread. A full queue
+drops the event and counts it; nothing on the agent's thread ever waits for
+a provider. Tests swap the exporter's sink for an in-process fake.
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field, fields
+from typing import Any
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import get_buffer_string
+
+from deerflow.config.tracing_config import TracingSamplingConfig
+from deerflow.trace_context import DEERFLOW_TRACE_METADATA_KEY
+
+logger = logging.getLogger(__name__)
+
+#: Default seconds a root run stays tracked without reporting its end.
+DEFAULT_ROOT_TTL_SECONDS = 3600.0
+
+#: Default number of root runs one handler tracks at a time.
+DEFAULT_MAX_ROOTS = 10_000
+
+# The handler flag LangChain consults before delivering each callback.
+_IGNORE_FLAGS = {
+    "on_llm_start": "ignore_llm",
+    "on_llm_new_token": "ignore_llm",
+    "on_llm_end": "ignore_llm",
+    "on_llm_error": "ignore_llm",
+    "on_chat_model_start": "ignore_chat_model",
+    "on_chain_start": "ignore_chain",
+    "on_chain_end": "ignore_chain",
+    "on_chain_error": "ignore_chain",
+    "on_tool_start": "ignore_agent",
+    "on_tool_end": "ignore_agent",
+    "on_tool_error": "ignore_agent",
+    "on_agent_action": "ignore_agent",
+    "on_agent_finish": "ignore_agent",
+    "on_retriever_start": "ignore_retriever",
+    "on_retriever_end": "ignore_retriever",
+    "on_retriever_error": "ignore_retriever",
+    "on_retry": "ignore_retry",
+    "on_custom_event": "ignore_custom_event",
+}
+
+
+@dataclass(slots=True)
+class TraceEvent:
+    """One callback, captured for delivery to the provider handlers."""
+
+    handlers: tuple[BaseCallbackHandler, ...]
+    method: str
+    args: tuple[Any, ...]
+    kwargs: dict[str, Any]
+    run_id: UUID | None = None
+    root_run_id: UUID | None = None
+    created: float = field(default_factory=time.time)
+
+
+@dataclass
+class TraceExportStats:
+    """Counters for sampling decisions and export; read via :func:`get_trace_export_stats`."""
+
+    runs_sampled: int = 0
+    runs_unsampled: int = 0
+    runs_promoted: int = 0
+    events_queued: int = 0
+    events_exported: int = 0
+    events_dropped: int = 0
+    buffer_overflows: int = 0
+    roots_evicted: int = 0
+    batches: int = 0
+
+
+def deliver_events(batch: Sequence[TraceEvent]) -> None:
+    """Default exporter sink: call each event's provider handlers in order."""
+    for event in batch:
+        for handler in event.handlers:
+            _deliver(handler, event)
+
+
+def _deliver(handler: BaseCallbackHandler, event: TraceEvent) -> None:
+    flag = _IGNORE_FLAGS.get(event.method)
+    if flag is not None and getattr(handler, flag, False):
+        return
+    try:
+        getattr(handler, event.method)(*event.args, **event.kwargs)
+    except NotImplementedError:
+        # Same fallback as LangChain's callback manager for handlers that
+        # only understand string prompts.
+        if event.method == "on_chat_model_start" and not getattr(handler, "ignore_llm", False):
+            serialized, messages = event.args
+            handler.on_llm_start(serialized, [get_buffer_string(m) for m in messages], **event.kwargs)
+    except Exception:
+        logger.warning("Tracing callback %s.%s failed", type(handler).__name__, event.method, exc_info=True)
+
+
+class TraceExporter:
+    """Bounded queue of :class:`TraceEvent` drained in batches by a daemon thread.
+
+    The worker takes whatever is queued, up to ``batch_size`` events, and
+    hands it to ``sink`` at once, so batches grow with load while a quiet
+    process still exports each span promptly.
+    """
+
+    def __init__(
+        self,
+        *,
+        queue_size: int = 10_000,
+        batch_size: int = 256,
+        sink: Callable[[Sequence[TraceEvent]], None] = deliver_events,
+    ) -> None:
+        self.batch_size = batch_size
+        self.sink = sink
+        self.stats = TraceExportStats()
+        self._queue: queue.Queue[TraceEvent | None] = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    def submit(self, event: TraceEvent) -> bool:
+        """Queue *event* without blocking; returns False (and counts it) when dropped."""
+        if self._closed:
+            self.count("events_dropped")
+            return False
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.count("events_dropped")
+            return False
+        self.count("events_queued")
+        return True
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            setattr(self.stats, name, getattr(self.stats, name) + n)
+
+    def snapshot(self) -> TraceExportStats:
+        with self._lock:
+            return TraceExportStats(**{f.name: getattr(self.stats, f.name) for f in fields(TraceExportStats)})
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until every queued event has been handed to the sink."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Export what is queued, then stop the worker."""
+        self._closed = True
+        thread = self._thread
+        if thread is None:
+            return
+        self.flush(timeout)
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        thread.join(timeout)
+
+    def _ensure_worker(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="deerflow-trace-exporter", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            event = self._queue.get()
+            if event is None:
+                self._queue.task_done()
+                return
+            batch = [event]
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    extra = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if extra is None:
+                    stop = True
+                    break
+                batch.append(extra)
+            try:
+                self.sink(batch)
+            except Exception:
+                logger.warning("Trace exporter sink failed; dropped %d events", len(batch), exc_info=True)
+                self.count("events_dropped", len(batch))
+            else:
+                self.count("events_exported", len(batch))
+            self.count("batches")
+            for _ in range(len(batch) + stop):
+                self._queue.task_done()
+            if stop:
+                return
+
+
+_exporter: TraceExporter | None = None
+_exporter_lock = threading.Lock()
+
+
+def get_trace_exporter(config: TracingSamplingConfig) -> TraceExporter:
+    """The process-wide exporter, created on first use with *config*'s sizes.
+
+    It also holds the sampling counters, so they are kept in inline mode too;
+    its worker thread only starts once something is queued.
+    """
+    global _exporter
+    if _exporter is None:
+        with _exporter_lock:
+            if _exporter is None:
+                _exporter = TraceExporter(queue_size=config.queue_size, batch_size=config.batch_size)
+                atexit.register(_exporter.close)
+    return _exporter
+
+
+def get_trace_export_stats() -> TraceExportStats:
+    """A snapshot of this process's sampling and export counters."""
+    exporter = _exporter
+    return exporter.snapshot() if exporter is not None else TraceExportStats()
+
+
+def reset_trace_exporter() -> None:
+    """Close the process-wide exporter, dropping its counters (for tests)."""
+    global _exporter
+    with _exporter_lock:
+        exporter, _exporter = _exporter, None
+    if exporter is not None:
+        atexit.unregister(exporter.close)
+        exporter.close()
+
+
+def _unit_interval(key: str) -> float:
+    digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") / 2**64
+
+
+@dataclass(slots=True)
+class _RootRun:
+    sampled: bool
+    buffer: list[TraceEvent] | None = None
+    members: set[UUID] = field(default_factory=set)
+    started: float = 0.0
+
+
+class SampledTracingHandler(BaseCallbackHandler):
+    """Forward callbacks to the provider *handlers* for sampled runs only.
+
+    Attach it where the provider handlers would have been attached; it is
+    inheritable like them, so it sees every child run of the graph. Roots
+    that never end are forgotten after *root_ttl* seconds, or oldest first
+    once more than *max_roots* are tracked.
+    """
+
+    def __init__(
+        self,
+        handlers: Sequence[BaseCallbackHandler],
+        config: TracingSamplingConfig,
+        *,
+        exporter: TraceExporter | None = None,
+        root_ttl: float = DEFAULT_ROOT_TTL_SECONDS,
+        max_roots: int = DEFAULT_MAX_ROOTS,
+    ) -> None:
+        super().__init__()
+        self.root_ttl = root_ttl
+        self.max_roots = max_roots
+        self.handlers = tuple(handlers)
+        self.config = config
+        self.exporter = exporter if exporter is not None else get_trace_exporter(config)
+        self.batched = config.export_mode == "batched"
+        # Batched export only enqueues on the agent's thread; inline export
+        # runs the providers here, so keep their own inline preference.
+        self.run_inline = self.batched or all(getattr(h, "run_inline", False) for h in self.handlers)
+        self._lock = threading.Lock()
+        self._roots: dict[UUID, _RootRun] = {}
+        self._root_of: dict[UUID, UUID] = {}
+
+    # -- sampling ------------------------------------------------------
+
+    def _head_decision(self, run_id: UUID, metadata: dict[str, Any] | None) -> bool:
+        metadata = metadata or {}
+        agent_name = metadata.get("agent_name") or metadata.get("langfuse_trace_name")
+        user_id = metadata.get("langfuse_user_id") or metadata.get("user_id")
+        if user_id is None:
+            from deerflow.runtime.user_context import get_effective_user_id
+
+            user_id = get_effective_user_id()
+        rate = self.config.rate_for(agent_name=agent_name, user_id=str(user_id))
+        if rate >= 1.0:
+            return True
+        if rate <= 0.0:
+            return False
+        return _unit_interval(str(metadata.get(DEERFLOW_TRACE_METADATA_KEY) or run_id)) < rate
+
+    def _begin(self, run_id: UUID, parent_run_id: UUID | None, metadata: dict[str, Any] | None) -> None:
+        root_id = self._root_of.get(parent_run_id) if parent_run_id is not None else None
+        if root_id is None:
+            # A parent this handler never saw counts as a root too (e.g. a
+            # model-level handler under an untraced graph).
+            now = time.monotonic()
+            self._evict_stale_roots(now)
+            sampled = self._head_decision(run_id, metadata)
+            buffer = [] if not sampled and self.config.keep_errored_runs else None
+            self._roots[run_id] = _RootRun(sampled=sampled, buffer=buffer, started=now)
+            self.exporter.count("runs_sampled" if sampled else "runs_unsampled")
+            root_id = run_id
+        self._root_of[run_id] = root_id
+        self._roots[root_id].members.add(run_id)
+
+    def _forget(self, root_id: UUID) -> _RootRun:
+        root = self._roots.pop(root_id)
+        for member in root.members:
+            self._root_of.pop(member, None)
+        return root
+
+    def _evict_stale_roots(self, now: float) -> None:
+        # ``_roots`` is in start order, so expired roots are at the front.
+        deadline = now - self.root_ttl
+        for root_id, root in list(self._roots.items()):
+            if root.started > deadline and len(self._roots) < self.max_roots:
+                break
+            self._forget(root_id)
+            self.exporter.count("roots_evicted")
+
+    # -- dispatch ------------------------------------------------------
+
+    def _on(self, method: str, args: tuple[Any, ...], kwargs: dict[str, Any]) -> None:
+        run_id: UUID | None = kwargs.get("run_id")
+        parent_run_id: UUID | None = kwargs.get("parent_run_id")
+        event = TraceEvent(self.handlers, method, args, kwargs, run_id=run_id)
+        deliver: list[TraceEvent] = []
+        with self._lock:
+            if run_id is not None and run_id not in self._root_of and method.endswith("_start"):
+                self._begin(run_id, parent_run_id, kwargs.get("metadata"))
+            root_id = self._root_of.get(run_id) if run_id is not None else None
+            if root_id is None and parent_run_id is not None:
+                root_id = self._root_of.get(parent_run_id)
+            root = self._roots.get(root_id) if root_id is not None else None
+            event.root_run_id = root_id
+
+            if root is None or root.sampled:
+                deliver.append(event)
+            elif root.buffer is not None:
+                root.buffer.append(event)
+                if len(root.buffer) > self.config.buffer_limit:
+                    root.buffer = None
+                    self.exporter.count("buffer_overflows")
+
+            if root is not None and run_id == root_id and method.endswith(("_end", "_error")):
+                if method.endswith("_error") and not root.sampled and root.buffer is not None:
+                    deliver.extend(root.buffer)
+                    self.exporter.count("runs_promoted")
+                self._forget(root_id)
+
+        for item in deliver:
+            if self.batched:
+                self.exporter.submit(item)
+            else:
+                for handler in self.handlers:
+                    _deliver(handler, item)
+
+    # -- callbacks -----------------------------------------------------
+
+    def on_llm_start(self, serialized: dict[str, Any], prompts: list[str], **kwargs: Any) -> None:
+        self._on("on_llm_start", (serialized, prompts), kwargs)
+
+    def on_chat_model_start(self, serialized: dict[str, Any], messages: list[list[Any]], **kwargs: Any) -> None:
+        self._on("on_chat_model_start", (serialized, messages), kwargs)
+
+    def on_llm_new_token(self, token: str, **kwargs: Any) -> None:
+        self._on("on_llm_new_token", (token,), kwargs)
+
+    def on_llm_end(self, response: Any, **kwargs: Any) -> None:
+        self._on("on_llm_end", (response,), kwargs)
+
+    def on_llm_error(self, error: BaseException, **kwargs: Any) -> None:
+        self._on("on_llm_error", (error,), kwargs)
+
+    def on_chain_start(self, serialized: dict[str, Any], inputs: dict[str, Any], **kwargs: Any) -> None:
+        self._on("on_chain_start", (serialized, inputs), kwargs)
+
+    def on_chain_end(self, outputs: dict[str, Any], **kwargs: Any) -> None:
+        self._on("on_chain_end", (outputs,), kwargs)
+
+    def on_chain_error(self, error: BaseException, **kwargs: Any) -> None:
+        self._on("on_chain_error", (error,), kwargs)
+
+    def on_tool_start(self, serialized: dict[str, Any], input_str: str, **kwargs: Any) -> None:
+        self._on("on_tool_start", (serialized, input_str), kwargs)
+
+    def on_tool_end(self, output: Any, **kwargs: Any) -> None:
+        self._on("on_tool_end", (output,), kwargs)
+
+    def on_tool_error(self, error: BaseException, **kwargs: Any) -> None:
+        self._on("on_tool_error", (error,), kwargs)
+
+    def on_agent_action(self, action: Any, **kwargs: Any) -> None:
+        self._on("on_agent_action", (action,), kwargs)
+
+    def on_agent_finish(self, finish: Any, **kwargs: Any) -> None:
+        self._on("on_agent_finish", (finish,), kwargs)
+
+    def on_retriever_start(self, serialized: dict[str, Any], query: str, **kwargs: Any) -> None:
+        self._on("on_retriever_start", (serialized, query), kwargs)
+
+    def on_retriever_end(self, documents: Any, **kwargs: Any) -> None:
+        self._on("on_retriever_end", (documents,), kwargs)
+
+    def on_retriever_error(self, error: BaseException, **kwargs: Any) -> None:
+        self._on("on_retriever_error", (error,), kwargs)
+
+    def on_text(self, text: str, **kwargs: Any) -> None:
+        self._on("on_text", (text,), kwargs)
+
+    def on_retry(self, retry_state: Any, **kwargs: Any) -> None:
+        self._on("on_retry", (retry_state,), kwargs)
+
+    def on_custom_event(self, name: str, data: Any, **kwargs: Any) -> None:
+        self._on("on_custom_event", (name, data), kwargs)
@@ -13,7 +13,7 @@ from functools import partial
 
 from textual.app import App, ComposeResult
 from textual.binding import Binding
-from textual.containers import Vertical, VerticalScroll
+from textual.containers import Vertical
 from textual.screen import ModalScreen
 from textual.widgets import Input, Label, OptionList, Static
 from textual.widgets.option_list import Option
@@ -21,7 +21,7 @@ from textual.widgets.option_list import Option
 from deerflow.runtime.goal import parse_goal_command
 
 from .input_history import InputHistory
-from .render import render_header, render_status, render_transcript
+from .render import render_header, render_status
 from .runtime import stream_actions
 from .theme import SYMBOLS, THEME
 from .view_state import (
@@ -35,6 +35,10 @@ from .view_state import (
     reduce,
 )
 from .widgets.composer import ComposerInput
+from .widgets.transcript import TranscriptView
+
+# Streaming deltas mark the transcript dirty; it is redrawn at most this often.
+_TRANSCRIPT_FRAME_SECONDS = 1 / 16
 
 _HELP_TEXT = "Commands:  /new  /clear  /threads  /goal  /model  /skills  /tools  /mcp  /memory  /usage  /config  /quit\nKeys:  Enter send · Ctrl+C interrupt or quit · Ctrl+L redraw · / commands · Esc close overlay"
 
@@ -75,16 +79,12 @@ class DeerFlowTUI(App):
         padding: 0 1;
         background: {THEME.panel};
     }}
-    #scroll {{
+    #transcript {{
         height: 1fr;
         padding: 1 2;
         background: {THEME.bg};
         scrollbar-size-vertical: 1;
     }}
-    #transcript {{
-        width: 100%;
-        height: auto;
-    }}
     #status {{
         height: 1;
         padding: 0 1;
@@ -179,8 +179,7 @@ class DeerFlowTUI(App):
 
     def compose(self) -> ComposeResult:
         yield Static(id="header")
-        with VerticalScroll(id="scroll"):
-            yield Static(id="transcript")
+        yield TranscriptView(id="transcript")
         yield Static(id="status")
         yield Static(id="palette")
         yield ComposerInput(placeholder="Message DeerFlow…   ( / for commands )", id="composer")
@@ -189,7 +188,7 @@ class DeerFlowTUI(App):
         self._load_session_info()
         self._refresh_all()
         self.set_interval(0.1, self._tick_spinner)
-        self.set_interval(0.06, self._flush_transcript)  # coalesce streaming re-renders
+        self.set_interval(_TRANSCRIPT_FRAME_SECONDS, self._flush_transcript)  # coalesce streaming re-renders
         self.query_one("#composer", Input).focus()
         if self.plan and getattr(self.plan, "message", None):
             self._send_to_agent(self.plan.message)
@@ -683,8 +682,7 @@ class DeerFlowTUI(App):
         )
 
     def _refresh_transcript(self) -> None:
-        self.query_one("#transcript", Static).update(render_transcript(self.state))
-        self.query_one("#scroll", VerticalScroll).scroll_end(animate=False)
+        self.query_one("#transcript", TranscriptView).show(self.state)
 
     def _refresh_status(self) -> None:
         spinner = SYMBOLS["spinner"][self._spinner_idx] if self._streaming else ""
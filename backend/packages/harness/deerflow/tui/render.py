@@ -7,8 +7,11 @@ Rich ``Console`` and inspecting the text.
 
 from __future__ import annotations
 
-from rich.console import Group, RenderableType
+from collections import OrderedDict
+
+from rich.console import Console, Group, RenderableType
 from rich.markdown import Markdown
+from rich.segment import Segment
 from rich.table import Table
 from rich.text import Text
 
@@ -21,6 +24,10 @@ _TOOL_STATUS_SYMBOL = {"running": SYMBOLS["running"], "ok": SYMBOLS["ok"], "erro
 _TOOL_STATUS_STYLE = {"running": THEME.warning, "ok": THEME.accent, "error": THEME.error}
 
 
+def _is_streaming_row(state: ViewState, row: Row) -> bool:
+    return state.streaming and isinstance(row, AssistantRow) and row.id is not None and row.id == state.streaming_id
+
+
 def render_transcript(state: ViewState) -> RenderableType:
     if not state.rows:
         return Text(_EMPTY_HINT, style=f"italic {THEME.dim}")
@@ -30,12 +37,79 @@ def render_transcript(state: ViewState) -> RenderableType:
     # Markdown, so a follow-up turn never reverts prior answers to raw text.
     blocks: list[RenderableType] = []
     for row in state.rows:
-        streaming_now = state.streaming and isinstance(row, AssistantRow) and row.id is not None and row.id == state.streaming_id
-        blocks.append(render_row(row, as_markdown=not streaming_now))
+        blocks.append(render_row(row, as_markdown=not _is_streaming_row(state, row)))
         blocks.append(Text(""))  # one blank line between blocks for breathing room
     return Group(*blocks[:-1])
 
 
+class TranscriptRenderer:
+    """Lay the transcript out as lines, reusing the lines of unchanged rows.
+
+    ``render_transcript`` re-parses the Markdown of every past answer, which
+    the TUI used to do for each streamed chunk. Rows are frozen dataclasses,
+    so a row is its own cache key (message id plus content); together with
+    the width it pins down the rendered lines. Only the actively streaming
+    row is laid out on every call.
+    """
+
+    def __init__(self, max_rows: int = 4096) -> None:
+        self._max_rows = max_rows
+        self._cache: OrderedDict[tuple[Row, int], list[list[Segment]]] = OrderedDict()
+        # Lines of the streaming row's completed text lines, keyed by (id, width).
+        self._stream_key: tuple[str | None, int] | None = None
+        self._stream_head = ""
+        self._stream_lines: list[list[Segment]] = []
+
+    def lines(self, state: ViewState, console: Console, width: int) -> list[list[Segment]]:
+        """Return the transcript as one segment list per terminal line."""
+        if not state.rows:
+            return self._layout(render_transcript(state), console, width)
+
+        lines: list[list[Segment]] = []
+        for index, row in enumerate(state.rows):
+            if index:
+                lines.append([])  # one blank line between blocks, as in render_transcript
+            if _is_streaming_row(state, row):
+                lines.extend(self._streaming_lines(row, console, width))
+            else:
+                lines.extend(self._row_lines(row, console, width))
+        return lines
+
+    def _row_lines(self, row: Row, console: Console, width: int) -> list[list[Segment]]:
+        key = (row, width)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+        cached = self._layout(render_row(row), console, width)
+        self._cache[key] = cached
+        if len(self._cache) > self._max_rows:
+            self._cache.popitem(last=False)
+        return cached
+
+    def _streaming_lines(self, row: AssistantRow, console: Console, width: int) -> list[list[Segment]]:
+        """Plain-text lines of the growing answer, laying out only what changed.
+
+        Plain text wraps each ``\\n``-separated line on its own, so lines that
+        are already complete keep their layout while the answer grows; only
+        newly completed lines and the last, still growing one are laid out.
+        """
+        text = row.text or "…"
+        if self._stream_key != (row.id, width) or not text.startswith(self._stream_head):
+            self._stream_key, self._stream_head, self._stream_lines = (row.id, width), "", []
+        split = text.rfind("\n") + 1
+        if split > len(self._stream_head):
+            completed = text[len(self._stream_head) : split - 1]
+            self._stream_lines.extend(self._layout(_assistant_plain(completed, THEME.assistant, marker=not self._stream_head), console, width))
+            self._stream_head = text[:split]
+        tail = self._layout(_assistant_plain(text[split:], THEME.assistant, marker=not self._stream_head), console, width)
+        return [*self._stream_lines, *tail]
+
+    @staticmethod
+    def _layout(renderable: RenderableType, console: Console, width: int) -> list[list[Segment]]:
+        return console.render_lines(renderable, console.options.update_width(width), pad=False)
+
+
 def render_row(row: Row, *, as_markdown: bool = True) -> RenderableType:
     if isinstance(row, UserRow):
         text = Text()
@@ -46,11 +120,7 @@ def render_row(row: Row, *, as_markdown: bool = True) -> RenderableType:
     if isinstance(row, AssistantRow):
         if not row.error and as_markdown and row.text.strip():
             return _assistant_markdown(row.text)
-        style = THEME.error if row.error else THEME.assistant
-        text = Text()
-        text.append(f"{SYMBOLS['assistant']} ", style=f"bold {style}")
-        text.append(row.text or "…", style=style)
-        return text
+        return _assistant_plain(row.text or "…", THEME.error if row.error else THEME.assistant)
 
     if isinstance(row, ToolRow):
         return _render_tool(row)
@@ -62,6 +132,14 @@ def render_row(row: Row, *, as_markdown: bool = True) -> RenderableType:
     return Text(str(row))
 
 
+def _assistant_plain(body: str, style: str, *, marker: bool = True) -> Text:
+    text = Text()
+    if marker:
+        text.append(f"{SYMBOLS['assistant']} ", style=f"bold {style}")
+    text.append(body, style=style)
+    return text
+
+
 def _assistant_markdown(text: str) -> RenderableType:
     """A ``●`` speaker marker aligned to the top of the Markdown-rendered body."""
     grid = Table.grid(padding=(0, 1, 0, 0))
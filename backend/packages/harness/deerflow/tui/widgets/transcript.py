@@ -0,0 +1,62 @@
+"""Scrollable transcript that only draws the lines on screen.
+
+A ``Static`` holding the whole transcript re-renders every row on each
+update. ``TranscriptView`` lays rows out through
+:class:`~deerflow.tui.render.TranscriptRenderer` (so unchanged rows cost a
+cache lookup) and uses Textual's line API: rows scrolled off-screen are
+never turned into strips, however long the conversation gets.
+"""
+
+from __future__ import annotations
+
+from rich.segment import Segment
+from textual.geometry import Size
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+from ..render import TranscriptRenderer
+from ..view_state import ViewState, initial_state
+
+
+class TranscriptView(ScrollView):
+    DEFAULT_CSS = """
+    TranscriptView {
+        height: 1fr;
+        overflow-x: hidden;
+        /* Keep the layout width fixed when the scrollbar appears. */
+        scrollbar-gutter: stable;
+    }
+    """
+
+    def __init__(self, *, id: str | None = None) -> None:
+        super().__init__(id=id)
+        self._renderer = TranscriptRenderer()
+        self._state: ViewState = initial_state()
+        self._lines: list[list[Segment]] = []
+
+    def show(self, state: ViewState) -> None:
+        """Lay out *state* and keep the newest line in view."""
+        self._state = state
+        self._layout()
+        self.scroll_end(animate=False, x_axis=False)
+
+    def on_resize(self) -> None:
+        self._layout()
+
+    def _layout(self) -> None:
+        width = self.scrollable_content_region.width
+        if width <= 0:
+            return
+        self._lines = self._renderer.lines(self._state, self.app.console, width)
+        self.virtual_size = Size(width, len(self._lines))
+        self.refresh()
+
+    def render_line(self, y: int) -> Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        width = self.scrollable_content_region.width
+        index = scroll_y + y
+        rich_style = self.rich_style
+        if index >= len(self._lines):
+            return Strip.blank(width, rich_style)
+        line = Strip(self._lines[index]).apply_style(rich_style)
+        return line.crop_extend(scroll_x, scroll_x + width, rich_style).apply_offsets(scroll_x, index)
@@ -1,3 +1,4 @@
+from .blob_store import UploadBlobStore, get_upload_blob_store
 from .manager import (
     UPLOAD_STAGING_PREFIX,
     UPLOAD_STAGING_SUFFIX,
@@ -34,4 +35,6 @@ __all__ = [
     "upload_virtual_path",
     "enrich_file_listing",
     "validate_thread_id",
+    "UploadBlobStore",
+    "get_upload_blob_store",
 ]
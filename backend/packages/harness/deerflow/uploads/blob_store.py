@@ -0,0 +1,236 @@
+"""Per-user content-addressed store for uploaded files (``uploads.dedup``).
+
+Users upload the same handbooks and datasets into many threads. With dedup
+enabled each upload is hashed while it streams in, stored once per user under
+its SHA-256 and materialized into the thread's uploads directory by reflink
+(a copy-on-write clone) where the filesystem supports it, by hardlink when
+``uploads.dedup_hardlinks`` allows it, and by a plain copy otherwise.
+Markdown produced by ``uploads.auto_convert_documents`` is cached next to the
+blob, so uploading a known document again skips the conversion.
+
+Layout under ``{base_dir}/users/{user_id}/upload-blobs/``::
+
+    objects/ab/<sha256>               blob (read-only)
+    objects/ab/<sha256>.<key>.md      cached conversion
+    refs/<sha256>/<thread_id>         one marker per thread holding the blob
+    threads/<thread_id>.json          {filename: sha256} for that thread
+
+A blob and its cached conversions are deleted with the last thread marker:
+on upload deletion, on a re-upload that replaces the file under the same
+name, or on thread deletion. A file the agent removes from inside the
+sandbox keeps its reference until the thread goes, so the store can hold
+space longer than needed but never drops content a thread still names.
+Mutations hold a per-user file lock, so gateway workers sharing the data
+directory agree on reference counts.
+
+A hardlink shares one inode between the blob and every thread's copy, so a
+sandbox that edits an upload in place changes it in every thread — which is
+why hardlinks are opt-in. Reflinks and copies are private to each thread.
+"""
+
+import json
+import logging
+import os
+import secrets
+import shutil
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows fallback
+    fcntl = None  # type: ignore[assignment]
+    import msvcrt
+
+from deerflow.config.paths import get_paths
+from deerflow.uploads.manager import UPLOAD_STAGING_PREFIX, UPLOAD_STAGING_SUFFIX, validate_thread_id
+from deerflow.utils.file_clone import clone_file
+
+logger = logging.getLogger(__name__)
+
+_BLOB_MODE = 0o444
+# Reflinked and copied thread files are private, so they are writable again.
+_THREAD_FILE_MODE = 0o644
+
+
+def _lock_file_exclusive(lock_file) -> None:
+    if fcntl is not None:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        return
+
+    lock_file.seek(0)
+    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+
+
+def _unlock_file(lock_file) -> None:
+    if fcntl is not None:
+        fcntl.flock(lock_file, fcntl.LOCK_UN)
+        return
+
+    lock_file.seek(0)
+    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class UploadBlobStore:
+    """One user's content-addressed upload blobs and their per-thread references."""
+
+    def __init__(self, root: Path, *, allow_hardlinks: bool = False) -> None:
+        self._root = Path(root)
+        self._allow_hardlinks = allow_hardlinks
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def blob_path(self, digest: str) -> Path:
+        return self._root / "objects" / digest[:2] / digest
+
+    def _markdown_path(self, digest: str, key: str) -> Path:
+        return self.blob_path(digest).with_name(f"{digest}.{key}.md")
+
+    def _index_path(self, thread_id: str) -> Path:
+        validate_thread_id(thread_id)
+        return self._root / "threads" / f"{thread_id}.json"
+
+    def _ref_path(self, digest: str, thread_id: str) -> Path:
+        validate_thread_id(thread_id)
+        return self._root / "refs" / digest / thread_id
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        self._root.mkdir(parents=True, exist_ok=True)
+        with open(self._root / ".lock", "a", encoding="utf-8") as lock_file:
+            _lock_file_exclusive(lock_file)
+            try:
+                yield
+            finally:
+                _unlock_file(lock_file)
+
+    def add(self, thread_id: str, filename: str, staged: Path, digest: str, dest: Path) -> str:
+        """Store the staged upload *staged* under *digest* and materialize it at *dest*.
+
+        *staged* is consumed: moved into the store for a new blob, deleted when
+        the content is already stored. *dest* is replaced atomically, and the
+        blob previously recorded for *filename* in this thread is released.
+        Returns how *dest* was created: ``"reflink"``, ``"hardlink"`` or ``"copy"``.
+        """
+        with self._locked():
+            blob = self.blob_path(digest)
+            if blob.exists():
+                staged.unlink()
+            else:
+                blob.parent.mkdir(parents=True, exist_ok=True)
+                shutil.move(staged, blob)
+                os.chmod(blob, _BLOB_MODE)
+            method = self._materialize(blob, dest)
+            self._set_ref(thread_id, filename, digest)
+        return method
+
+    def materialize_markdown(self, digest: str, key: str, dest: Path) -> bool:
+        """Materialize the conversion cached for *digest* under *key* at *dest*, if there is one."""
+        with self._locked():
+            cached = self._markdown_path(digest, key)
+            if not cached.exists():
+                return False
+            self._materialize(cached, dest)
+        return True
+
+    def store_markdown(self, digest: str, key: str, source: Path) -> None:
+        """Cache the conversion at *source* for later uploads of *digest*; *source* is left in place."""
+        with self._locked():
+            cached = self._markdown_path(digest, key)
+            # A blob released meanwhile must not leave an orphaned conversion.
+            if cached.exists() or not self.blob_path(digest).exists():
+                return
+            staged = cached.with_name(f"{UPLOAD_STAGING_PREFIX}{secrets.token_hex(8)}{UPLOAD_STAGING_SUFFIX}")
+            try:
+                shutil.copyfile(source, staged)
+                os.chmod(staged, _BLOB_MODE)
+                os.replace(staged, cached)
+            finally:
+                staged.unlink(missing_ok=True)
+
+    def release(self, thread_id: str, filename: str) -> None:
+        """Drop *thread_id*'s reference for *filename*; deletes the blob if it was the last."""
+        with self._locked():
+            index = self._read_index(thread_id)
+            digest = index.pop(filename, None)
+            if digest is None:
+                return
+            self._write_index(thread_id, index)
+            self._drop_ref_if_unused(thread_id, digest, index)
+
+    def release_thread(self, thread_id: str) -> None:
+        """Drop every reference held by *thread_id* (thread deletion)."""
+        with self._locked():
+            index = self._read_index(thread_id)
+            self._index_path(thread_id).unlink(missing_ok=True)
+            for digest in set(index.values()):
+                self._drop_ref_if_unused(thread_id, digest, {})
+
+    def _materialize(self, source: Path, dest: Path) -> str:
+        # Build the thread file under a staging name and rename it over
+        # *dest*: a replaced upload is swapped atomically, and an interrupted
+        # materialization leaves a file the stale-staging sweep removes.
+        staged = dest.with_name(f"{UPLOAD_STAGING_PREFIX}{secrets.token_hex(8)}{UPLOAD_STAGING_SUFFIX}")
+        try:
+            method = clone_file(source, staged, allow_hardlink=self._allow_hardlinks)
+            if method != "hardlink":
+                os.chmod(staged, _THREAD_FILE_MODE)
+            os.replace(staged, dest)
+        finally:
+            staged.unlink(missing_ok=True)
+        return method
+
+    def _set_ref(self, thread_id: str, filename: str, digest: str) -> None:
+        index = self._read_index(thread_id)
+        previous = index.get(filename)
+        index[filename] = digest
+        self._write_index(thread_id, index)
+        ref = self._ref_path(digest, thread_id)
+        ref.parent.mkdir(parents=True, exist_ok=True)
+        ref.touch()
+        if previous is not None and previous != digest:
+            self._drop_ref_if_unused(thread_id, previous, index)
+
+    def _drop_ref_if_unused(self, thread_id: str, digest: str, index: dict[str, str]) -> None:
+        if digest in index.values():
+            return
+        ref = self._ref_path(digest, thread_id)
+        ref.unlink(missing_ok=True)
+        try:
+            ref.parent.rmdir()
+        except FileNotFoundError:
+            pass
+        except OSError:
+            return  # other threads still hold the blob
+        blob = self.blob_path(digest)
+        blob.unlink(missing_ok=True)
+        for cached in blob.parent.glob(f"{digest}.*.md"):
+            cached.unlink(missing_ok=True)
+        logger.debug("Reclaimed upload blob %s", digest)
+
+    def _read_index(self, thread_id: str) -> dict[str, str]:
+        try:
+            return json.loads(self._index_path(thread_id).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError):
+            logger.warning("Unreadable upload blob index for thread %s; treating it as empty", thread_id, exc_info=True)
+            return {}
+
+    def _write_index(self, thread_id: str, index: dict[str, str]) -> None:
+        path = self._index_path(thread_id)
+        if not index:
+            path.unlink(missing_ok=True)
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        staged = path.with_name(f"{path.name}.{secrets.token_hex(4)}.tmp")
+        staged.write_text(json.dumps(index, sort_keys=True), encoding="utf-8")
+        os.replace(staged, path)
+
+
+def get_upload_blob_store(user_id: str, *, allow_hardlinks: bool = False) -> UploadBlobStore:
+    """Return the upload blob store for *user_id* under the configured data directory."""
+    return UploadBlobStore(get_paths().user_upload_blobs_dir(user_id), allow_hardlinks=allow_hardlinks)
@@ -0,0 +1,118 @@
+"""Duplicate files without duplicating their data, and undo shared hardlinks before writes.
+
+``clone_file`` makes a new file with the same content by the cheapest means
+available: a reflink (a copy-on-write clone, FICLONE on btrfs, XFS,
+bcachefs, ...), then a hardlink when the caller allows one, then a plain
+copy. A reflink is private to its new name from the start. A hardlink shares
+one inode, so it is only copy-on-write if every writer calls
+``break_hardlink`` first — which the LocalSandbox file tools do.
+"""
+
+import errno
+import logging
+import os
+import secrets
+import shutil
+import stat
+from collections import Counter
+from collections.abc import Callable
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# ``FICLONE`` from <linux/fs.h>: clone a whole file on btrfs, XFS, bcachefs, ...
+_FICLONE = 0x40049409
+
+# errnos meaning "this filesystem/pair of files cannot be cloned", after
+# which the next method is tried.
+_CLONE_UNSUPPORTED_ERRNOS = {errno.EBADF, errno.EINVAL, errno.ENOTTY, errno.EOPNOTSUPP, errno.EXDEV, errno.EPERM}
+
+
+def try_reflink(source: Path, target: Path) -> bool:
+    """Clone *source* into the new file *target*; ``False`` when cloning is unsupported."""
+    if fcntl is None or not hasattr(fcntl, "ioctl"):
+        return False
+    try:
+        with open(source, "rb") as src, open(target, "xb") as dst:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+    except OSError as exc:
+        if not isinstance(exc, FileExistsError):
+            Path(target).unlink(missing_ok=True)
+        if exc.errno in _CLONE_UNSUPPORTED_ERRNOS:
+            return False
+        raise
+    return True
+
+
+def _try_hardlink(source: Path, target: Path) -> bool:
+    try:
+        os.link(source, target)
+    except OSError as exc:
+        logger.debug("Hardlinking %s failed: %s", source, exc)
+        return False
+    return True
+
+
+def clone_file(source: Path, target: Path, *, allow_hardlink: bool = False) -> str:
+    """Create the new file *target* with *source*'s content.
+
+    Returns how: ``"reflink"``, ``"hardlink"`` (only with *allow_hardlink*)
+    or ``"copy"``. A reflinked or copied *target* keeps *source*'s mode and
+    timestamps, like ``shutil.copy2``.
+    """
+    if try_reflink(source, target):
+        shutil.copystat(source, target)
+        return "reflink"
+    if allow_hardlink and _try_hardlink(source, target):
+        return "hardlink"
+    shutil.copy2(source, target)
+    return "copy"
+
+
+def clone_tree(source: Path, target: Path, *, ignore: Callable[[str, list[str]], set[str]] | None = None, allow_hardlinks: bool = False) -> Counter[str]:
+    """``shutil.copytree`` (into a possibly existing *target*) cloning each file with ``clone_file``.
+
+    Returns how many files were created by each method.
+    """
+    methods: Counter[str] = Counter()
+
+    def _clone(src: str, dst: str) -> str:
+        # copytree overwrites files that already exist in *target*.
+        Path(dst).unlink(missing_ok=True)
+        methods[clone_file(Path(src), Path(dst), allow_hardlink=allow_hardlinks)] += 1
+        return dst
+
+    shutil.copytree(source, target, ignore=ignore, dirs_exist_ok=True, copy_function=_clone)
+    return methods
+
+
+def break_hardlink(path: str | Path) -> bool:
+    """Give *path* its own inode if it is a hardlinked regular file.
+
+    Call before writing a file in place: the write then changes only this
+    name, not every name sharing the inode. Returns whether a copy was made.
+    """
+    path = Path(path)
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return False
+    if not stat.S_ISREG(st.st_mode) or st.st_nlink < 2:
+        return False
+    staged = path.with_name(f".{path.name}.{secrets.token_hex(4)}.cow")
+    try:
+        if try_reflink(path, staged):
+            shutil.copystat(path, staged)
+        else:
+            shutil.copy2(path, staged)
+        # Shared upload blobs are read-only; the private copy is the thread's to edit.
+        os.chmod(staged, stat.S_IMODE(st.st_mode) | stat.S_IWUSR)
+        os.replace(staged, path)
+    finally:
+        staged.unlink(missing_ok=True)
+    return True
@@ -305,6 +305,17 @@ def _get_uploads_config_value(key: str, default: object) -> object:
     return getattr(uploads_cfg, key, default)
 
 
+def markdown_cache_key(file_path: Path) -> str:
+    """Key naming what a cached conversion of *file_path*'s bytes depends on.
+
+    The converter is chosen by extension and, for PDFs, by
+    ``uploads.pdf_converter``; a conversion cached under one key is only
+    valid for another upload with the same key.
+    """
+    extension = file_path.suffix.lower().lstrip(".")
+    return f"{extension}-{_get_pdf_converter()}" if extension == "pdf" else extension
+
+
 def _get_pdf_converter() -> str:
     """Read pdf_converter setting from app config, defaulting to 'auto'.
 
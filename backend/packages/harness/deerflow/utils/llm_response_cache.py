@@ -0,0 +1,335 @@
+"""Response cache for short, deterministic auxiliary LLM calls.
+
+Title generation, follow-up suggestions, input polishing and skill security
+moderation are one-shot prompts whose output does not meaningfully depend on
+sampling, and they are frequently re-issued with identical inputs (re-scanning
+the same skill archive, polishing the same template prompt). This module lets
+those call sites skip the model round trip when the exact same request was
+answered recently.
+
+Entries are keyed by ``(call site, model, prompt template version, normalized
+prompt hash)``. The template version is owned by each call site: bump it when
+the prompt wording or the post-processing of the raw text changes so stale
+answers produced under the old prompt are never served.
+
+The cache is opt-in (``llm_response_cache.enabled``) and fail-soft: any backend
+error is logged and treated as a miss, so a broken cache can never fail the
+underlying feature.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from deerflow.config.llm_response_cache_config import LlmResponseCacheConfig
+
+if TYPE_CHECKING:
+    from deerflow.config.app_config import AppConfig
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_SQLITE_FILENAME = "llm_response_cache.db"
+
+
+def normalize_prompt_text(text: str) -> str:
+    """Normalize prompt text for hashing without changing its meaning.
+
+    Only whitespace that cannot affect the model's reading of the prompt is
+    folded: line endings, trailing whitespace on each line, and leading /
+    trailing blank space. Interior indentation is preserved because input
+    polishing must keep code blocks byte-exact.
+    """
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip()
+
+
+def build_cache_key(*, call_site: str, model_name: str, prompt_version: str, parts: tuple[str, ...]) -> str:
+    """Return the stable cache key for one auxiliary LLM request."""
+    payload = json.dumps(
+        [call_site, model_name, prompt_version, [normalize_prompt_text(part) for part in parts]],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass(slots=True)
+class CallSiteStats:
+    """Hit/miss counters for one cache call site."""
+
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    errors: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> dict[str, float | int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "errors": self.errors,
+            "hit_rate": self.hit_rate,
+        }
+
+
+class LlmResponseCache(ABC):
+    """Base class for response cache backends.
+
+    Subclasses implement the synchronous ``_get`` / ``_set`` primitives; the
+    public async API takes care of per-call-site metrics and error isolation.
+    """
+
+    def __init__(self, *, ttl_seconds: int, max_entries: int, clock: Callable[[], float] = time.time) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._clock = clock
+        self._stats: dict[str, CallSiteStats] = {}
+        self._stats_lock = threading.Lock()
+
+    @abstractmethod
+    def _get(self, key: str, now: float) -> str | None:
+        """Return the live value stored under *key*, or ``None``."""
+
+    @abstractmethod
+    def _set(self, key: str, call_site: str, value: str, now: float) -> None:
+        """Store *value* under *key*, evicting as ``max_entries`` requires."""
+
+    @abstractmethod
+    def _clear(self) -> None:
+        """Drop every entry."""
+
+    async def _run(self, fn: Callable, *args):
+        return fn(*args)
+
+    def _record(self, call_site: str, field: str) -> None:
+        with self._stats_lock:
+            stats = self._stats.setdefault(call_site, CallSiteStats())
+            setattr(stats, field, getattr(stats, field) + 1)
+
+    async def aget(self, call_site: str, key: str) -> str | None:
+        """Return the cached response for *key*, or ``None`` on a miss."""
+        try:
+            value = await self._run(self._get, key, self._clock())
+        except Exception:
+            logger.warning("LLM response cache lookup failed for %s; treating as a miss", call_site, exc_info=True)
+            self._record(call_site, "errors")
+            value = None
+        self._record(call_site, "hits" if value is not None else "misses")
+        return value
+
+    async def aset(self, call_site: str, key: str, value: str) -> None:
+        """Store *value* under *key*; failures are logged and swallowed."""
+        try:
+            await self._run(self._set, key, call_site, value, self._clock())
+        except Exception:
+            logger.warning("LLM response cache store failed for %s", call_site, exc_info=True)
+            self._record(call_site, "errors")
+            return
+        self._record(call_site, "stores")
+
+    def clear(self) -> None:
+        """Drop every cached entry (metrics are kept)."""
+        self._clear()
+
+    def stats(self) -> dict[str, dict[str, float | int]]:
+        """Return a snapshot of per-call-site metrics."""
+        with self._stats_lock:
+            return {call_site: stats.to_dict() for call_site, stats in self._stats.items()}
+
+
+class MemoryLlmResponseCache(LlmResponseCache):
+    """Process-local LRU cache with a per-entry expiry."""
+
+    def __init__(self, *, ttl_seconds: int, max_entries: int, clock: Callable[[], float] = time.time) -> None:
+        super().__init__(ttl_seconds=ttl_seconds, max_entries=max_entries, clock=clock)
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: str, now: float) -> str | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _set(self, key: str, call_site: str, value: str, now: float) -> None:
+        with self._lock:
+            self._entries[key] = (now + self._ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def _clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SqliteLlmResponseCache(LlmResponseCache):
+    """SQLite-backed cache, persistent across restarts and shared by local workers.
+
+    Every database call runs on a worker thread (``asyncio.to_thread``) so the
+    gateway event loop never blocks on disk I/O.
+    """
+
+    def __init__(self, path: Path, *, ttl_seconds: int, max_entries: int, clock: Callable[[], float] = time.time) -> None:
+        super().__init__(ttl_seconds=ttl_seconds, max_entries=max_entries, clock=clock)
+        self._path = path
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    async def _run(self, fn: Callable, *args):
+        return await asyncio.to_thread(fn, *args)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        if not self._initialized:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self._path, timeout=5.0)
+        try:
+            if not self._initialized:
+                self._initialize(conn)
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _initialize(self, conn: sqlite3.Connection) -> None:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS llm_response_cache (key TEXT PRIMARY KEY, call_site TEXT NOT NULL, value TEXT NOT NULL, expires_at REAL NOT NULL, last_access REAL NOT NULL)")
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_response_cache_last_access ON llm_response_cache (last_access)")
+        conn.commit()
+        self._initialized = True
+
+    def _get(self, key: str, now: float) -> str | None:
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT value, expires_at FROM llm_response_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at <= now:
+                conn.execute("DELETE FROM llm_response_cache WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE llm_response_cache SET last_access = ? WHERE key = ?", (now, key))
+            return value
+
+    def _set(self, key: str, call_site: str, value: str, now: float) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_response_cache (key, call_site, value, expires_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, call_site, value, now + self._ttl_seconds, now),
+            )
+            conn.execute("DELETE FROM llm_response_cache WHERE expires_at <= ?", (now,))
+            conn.execute(
+                "DELETE FROM llm_response_cache WHERE key IN (SELECT key FROM llm_response_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self._max_entries,),
+            )
+
+    def _clear(self) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM llm_response_cache")
+
+
+_cache: LlmResponseCache | None = None
+_cache_config: LlmResponseCacheConfig | None = None
+_cache_lock = threading.Lock()
+
+
+def _resolve_sqlite_path(raw: str | None) -> Path:
+    from deerflow.config.paths import get_paths, resolve_path
+
+    if raw:
+        return resolve_path(raw)
+    return get_paths().base_dir / _DEFAULT_SQLITE_FILENAME
+
+
+def _build_cache(config: LlmResponseCacheConfig) -> LlmResponseCache:
+    if config.backend == "sqlite":
+        return SqliteLlmResponseCache(
+            _resolve_sqlite_path(config.sqlite_path),
+            ttl_seconds=config.ttl_seconds,
+            max_entries=config.max_entries,
+        )
+    return MemoryLlmResponseCache(ttl_seconds=config.ttl_seconds, max_entries=config.max_entries)
+
+
+def get_llm_response_cache(app_config: AppConfig | None = None) -> LlmResponseCache | None:
+    """Return the process cache when ``llm_response_cache.enabled``, else ``None``.
+
+    The backend is rebuilt when the cache section of the config changes, so a
+    hot-reloaded ``config.yaml`` takes effect on the next call. Configs that do
+    not carry a real :class:`LlmResponseCacheConfig` (test doubles, partially
+    built configs) simply disable caching.
+    """
+    global _cache, _cache_config
+
+    if app_config is None:
+        try:
+            from deerflow.config.app_config import get_app_config
+
+            app_config = get_app_config()
+        except Exception:
+            return None
+    config = getattr(app_config, "llm_response_cache", None)
+    if not isinstance(config, LlmResponseCacheConfig) or not config.enabled:
+        return None
+
+    with _cache_lock:
+        if _cache is None or _cache_config != config:
+            _cache = _build_cache(config)
+            _cache_config = config
+        return _cache
+
+
+def get_llm_response_cache_stats() -> dict[str, dict[str, float | int]]:
+    """Return per-call-site hit/miss metrics for the active cache."""
+    cache = _cache
+    return cache.stats() if cache is not None else {}
+
+
+def reset_llm_response_cache() -> None:
+    """Drop the process cache singleton (used by tests and config resets)."""
+    global _cache, _cache_config
+    with _cache_lock:
+        _cache = None
+        _cache_config = None
+
+
+def resolve_cache_model_name(model_name: str | None, app_config: AppConfig | None) -> str:
+    """Return the concrete model name a ``None`` override resolves to.
+
+    Mirrors ``create_chat_model``'s default (first configured model) so a call
+    with ``model_name=None`` and one naming the default model share entries,
+    and a change of default model never serves the old model's answers.
+    """
+    if model_name:
+        return model_name
+    models = getattr(app_config, "models", None) or []
+    if models:
+        return str(getattr(models[0], "name", "") or "default")
+    return "default"
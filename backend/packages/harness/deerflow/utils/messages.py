@@ -8,6 +8,10 @@ from langchain_core.messages import HumanMessage
 
 ORIGINAL_USER_CONTENT_KEY = "original_user_content"
 SUMMARY_MESSAGE_NAME = "summary"
+# Set on a coalesced SystemMessage: length of the leading text that is the
+# static system prompt, so providers with explicit cache breakpoints can cache
+# it separately from the per-turn reminders appended after it.
+STABLE_PREFIX_CHARS_KEY = "stable_prefix_chars"
 
 
 def message_content_to_text(content: Any) -> str:
@@ -11,11 +11,18 @@ silently regressing in whichever copy was forgotten.
 Response-text *cleaning* (think-block / code-fence stripping, JSON parsing) is
 intentionally left to each caller because their post-processing differs; this
 helper stops at the extracted raw text.
+
+Callers may opt into the auxiliary response cache
+(:mod:`deerflow.utils.llm_response_cache`) by passing ``cache_version``; the
+raw text is then served from the cache when the same prompt was answered by
+the same model recently. Cleaning still runs on every call, so a cached raw
+response goes through exactly the same post-processing as a fresh one.
 """
 
 from __future__ import annotations
 
 import os
+from collections.abc import Callable
 
 from langchain_core.messages import HumanMessage, SystemMessage
 
@@ -23,6 +30,7 @@ from deerflow.config.app_config import AppConfig
 from deerflow.models import create_chat_model
 from deerflow.runtime.user_context import get_effective_user_id
 from deerflow.tracing import inject_langfuse_metadata
+from deerflow.utils.llm_response_cache import build_cache_key, get_llm_response_cache, resolve_cache_model_name
 from deerflow.utils.llm_text import extract_response_text
 
 
@@ -38,6 +46,8 @@ async def run_oneshot_llm(
     app_config: AppConfig,
     model_name: str | None = None,
     thread_id: str | None = None,
+    cache_version: str | None = None,
+    cache_validator: Callable[[str], bool] | None = None,
 ) -> str:
     """Run a single non-graph system+user LLM turn and return the raw text.
 
@@ -48,10 +58,29 @@ async def run_oneshot_llm(
         app_config: Application config used to build the model.
         model_name: Optional model override; ``None`` uses the default model.
         thread_id: Optional thread id, forwarded to Langfuse for tracing only.
+        cache_version: Prompt template version of the calling site. When set
+            and ``llm_response_cache`` is enabled, the response is cached under
+            ``run_name`` as the call site; ``None`` (default) never caches.
+        cache_validator: Optional predicate over the raw text; responses the
+            caller would reject (unparseable JSON, empty after cleaning) are
+            not cached so a bad answer is retried on the next call.
 
     Returns:
         The extracted plain-text content of the model response (uncleaned).
     """
+    cache = get_llm_response_cache(app_config) if cache_version is not None else None
+    cache_key: str | None = None
+    if cache is not None:
+        cache_key = build_cache_key(
+            call_site=run_name,
+            model_name=resolve_cache_model_name(model_name, app_config),
+            prompt_version=cache_version,
+            parts=(system_instruction, user_content),
+        )
+        cached = await cache.aget(run_name, cache_key)
+        if cached is not None:
+            return cached
+
     model = create_chat_model(name=model_name, thinking_enabled=False, app_config=app_config)
     invoke_config: dict = {"run_name": run_name}
     inject_langfuse_metadata(
@@ -69,4 +98,7 @@ async def run_oneshot_llm(
         ],
         config=invoke_config,
     )
-    return extract_response_text(response.content)
+    text = extract_response_text(response.content)
+    if cache is not None and cache_key is not None and text.strip() and (cache_validator is None or cache_validator(text)):
+        await cache.aset(run_name, cache_key, text)
+    return text
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""AioSandbox.grep latency against a local stand-in for the sandbox HTTP API.
+
+Serves a generated ``--files``-file repository through a small HTTP server
+that implements the three endpoints grep uses (``/v1/file/list``,
+``/v1/file/search``, ``/v1/shell/exec``). Each request waits
+``--latency-ms`` first, standing in for the round trip to a sandbox
+container. The real ``AioSandbox`` client greps it three ways:
+
+- ``per-file``: one sequential ``search_in_file`` per file (the old grep)
+- ``per-file x8``: the bounded-concurrency fallback for images without ``python3``
+- ``in-sandbox``: the single-call grep (ripgrep when installed, else the bundled walker)
+
+Usage::
+
+    python scripts/benchmark/bench_aio_grep.py
+    python scripts/benchmark/bench_aio_grep.py --files 3000 --latency-ms 20
+
+Run from ``backend/`` so ``deerflow`` is importable.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from deerflow.community.aio_sandbox.aio_sandbox import AioSandbox
+
+
+def _seed(root: Path, files: int) -> None:
+    for i in range(files):
+        directory = root / f"pkg{i % 30}" / f"mod{i % 7}"
+        directory.mkdir(parents=True, exist_ok=True)
+        body = "".join(f"def handler_{i}_{n}(value):\n    return value * {n}\n" for n in range(20))
+        if i % 100 == 0:
+            body += "# FIXME: rare marker\n"
+        (directory / f"file_{i}.py").write_text(body, encoding="utf-8")
+
+
+def _handler(latency: float):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            time.sleep(latency)
+            if self.path == "/v1/file/list":
+                data = {"path": body["path"], "files": _list(body["path"])}
+            elif self.path == "/v1/file/search":
+                data = _search(body["file"], body["regex"])
+            elif self.path == "/v1/shell/exec":
+                completed = subprocess.run(["/bin/sh", "-c", body["command"]], capture_output=True, text=True)
+                data = {"session_id": "bench", "command": body["command"], "status": "completed", "output": completed.stdout + completed.stderr, "exit_code": completed.returncode}
+            else:
+                self.send_error(404)
+                return
+            payload = json.dumps({"success": True, "data": data}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    return Handler
+
+
+def _list(root: str) -> list[dict]:
+    entries = []
+    for current, dirs, files in os.walk(root):
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
+        for name in dirs + [f for f in files if not f.startswith(".")]:
+            path = os.path.join(current, name)
+            entries.append({"name": name, "path": path, "is_directory": name in dirs})
+    return entries
+
+
+def _search(path: str, regex: str) -> dict:
+    compiled = re.compile(regex)
+    matches, line_numbers = [], []
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for number, line in enumerate(f, 1):
+            if compiled.search(line):
+                matches.append(line.rstrip("\n"))
+                line_numbers.append(number)
+    return {"file": path, "matches": matches, "line_numbers": line_numbers}
+
+
+def _time(label: str, sandbox: AioSandbox, root: str, grep) -> None:
+    start = time.perf_counter()
+    matches, truncated = grep(sandbox, root)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<14}{elapsed:>10.2f}{len(matches):>10}{str(truncated):>11}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=3000, help="Files in the repository (default: 3000)")
+    parser.add_argument("--latency-ms", type=float, default=10.0, help="Added latency per API request (default: 10)")
+    parser.add_argument("--pattern", default="FIXME", help="Pattern to grep for (default: FIXME)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        root = Path(scratch) / "workspace"
+        _seed(root, args.files)
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(args.latency_ms / 1000))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            sandbox = AioSandbox(id="bench", base_url=f"http://127.0.0.1:{server.server_address[1]}")
+            regex = f"(?i){args.pattern}"
+
+            print(f"{args.files} files, {args.latency_ms:g} ms per request, pattern {args.pattern!r}\n")
+            print(f"{'mode':<14}{'time s':>10}{'matches':>10}{'truncated':>11}")
+            sequential = AioSandbox(id="bench-seq", base_url=sandbox.base_url)
+            sequential._GREP_FALLBACK_CONCURRENCY = 1
+            _time("per-file", sequential, str(root), lambda sb, r: sb._grep_via_file_api(r, regex, glob=None, max_results=100))
+            _time("per-file x8", sandbox, str(root), lambda sb, r: sb._grep_via_file_api(r, regex, glob=None, max_results=100))
+            _time("in-sandbox", sandbox, str(root), lambda sb, r: sb.grep(r, args.pattern, max_results=100))
+        finally:
+            server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Per-call cost of ``get_app_config()`` with and without the config watcher.
+
+Writes a temporary ``config.yaml`` with ``--models`` model entries (about
+the size of a real deployment's file) and an ``extensions_config.json``,
+then times ``--calls`` back-to-back ``get_app_config()`` calls:
+
+- ``per-call check``: the default without a watcher — resolve the path,
+  ``stat`` and hash ``config.yaml`` on every call
+- ``watched (poll)`` / ``watched (native)``: after
+  ``start_app_config_watcher()``, reading the published config
+
+``file opens`` counts how many times ``config.yaml`` was opened during the
+timed calls. ``reload ms`` is how long an edit took to show up through
+``get_app_config()`` afterwards (the poll interval and native debounce
+dominate it).
+
+Usage::
+
+    python scripts/benchmark/bench_app_config_access.py
+    python scripts/benchmark/bench_app_config_access.py --calls 50000 --models 200 --poll-interval 0.5
+
+Run from ``backend/`` so ``deerflow`` is importable.
+"""
+
+from __future__ import annotations
+
+import argparse
+import builtins
+import io
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+from deerflow.config.app_config import get_app_config, reset_app_config, start_app_config_watcher, stop_app_config_watcher
+
+
+def _write_config(path: Path, models: int, marker: str) -> None:
+    config = {
+        "sandbox": {"use": "deerflow.sandbox.local:LocalSandboxProvider"},
+        "models": [{"name": f"model-{i}", "display_name": f"Model {i} {marker}", "use": "langchain_openai:ChatOpenAI", "model": f"gpt-{i}"} for i in range(models)],
+    }
+    path.write_text(yaml.safe_dump(config), encoding="utf-8")
+
+
+class _OpenCounter:
+    """Counts opens of one path through ``open()`` and ``Path.open()``."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = str(path)
+        self.count = 0
+
+    def __enter__(self) -> _OpenCounter:
+        self._open, self._io_open = builtins.open, io.open
+
+        def counting_open(file, *args, **kwargs):
+            if os.fspath(file) == self.path:
+                self.count += 1
+            return self._open(file, *args, **kwargs)
+
+        builtins.open = io.open = counting_open
+        return self
+
+    def __exit__(self, *exc) -> None:
+        builtins.open, io.open = self._open, self._io_open
+
+
+def _reload_latency_ms(path: Path, models: int, timeout: float = 10.0) -> float:
+    marker = f"edit-{time.monotonic_ns()}"
+    start = time.perf_counter()
+    _write_config(path, models, marker)
+    while time.perf_counter() - start < timeout:
+        if marker in get_app_config().models[0].display_name:
+            return (time.perf_counter() - start) * 1000
+        time.sleep(0.001)
+    return float("nan")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=20_000, help="get_app_config() calls per row (default: 20000)")
+    parser.add_argument("--models", type=int, default=60, help="Model entries in the generated config.yaml (default: 60)")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="Poll backend interval in seconds (default: 1.0)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config_path = Path(tmp) / "config.yaml"
+        extensions_path = Path(tmp) / "extensions_config.json"
+        _write_config(config_path, args.models, "initial")
+        extensions_path.write_text(json.dumps({"mcpServers": {}, "skills": {}}), encoding="utf-8")
+        os.environ["DEER_FLOW_CONFIG_PATH"] = str(config_path)
+        os.environ["DEER_FLOW_EXTENSIONS_CONFIG_PATH"] = str(extensions_path)
+
+        print(f"config.yaml: {config_path.stat().st_size / 1024:.1f} KiB, {args.calls} calls per row\n")
+        print(f"{'mode':<18}{'us/call':>9}{'file opens':>12}{'reload ms':>11}")
+
+        def row(label: str, backend: str | None) -> None:
+            reset_app_config()
+            get_app_config()
+            if backend is not None:
+                start_app_config_watcher(backend=backend, poll_interval=args.poll_interval)
+                time.sleep(0.3)  # let the native backend register its watch
+            with _OpenCounter(config_path) as opens:
+                start = time.perf_counter()
+                for _ in range(args.calls):
+                    get_app_config()
+                elapsed = (time.perf_counter() - start) / args.calls * 1e6
+            reload_ms = _reload_latency_ms(config_path, args.models)
+            stop_app_config_watcher()
+            print(f"{label:<18}{elapsed:>9.2f}{opens.count:>12}{reload_ms:>11.1f}")
+
+        row("per-call check", None)
+        row("watched (poll)", "poll")
+        try:
+            import watchfiles  # noqa: F401
+        except ImportError:
+            print(f"{'watched (native)':<18}  skipped: watchfiles is not installed")
+        else:
+            row("watched (native)", "native")
+        reset_app_config()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Authenticated-request latency through ``AuthMiddleware`` with and without the session cache.
+
+Creates a handful of users in a scratch SQLite database, then sends the same
+number of cookie-authenticated requests through a minimal FastAPI app wrapped
+in the real ``AuthMiddleware`` — once with ``auth.session_cache`` disabled
+(JWT decode + user lookup every request) and once with the memory cache.
+
+Usage::
+
+    python scripts/benchmark/bench_auth_session_cache.py --requests 10000
+    python scripts/benchmark/bench_auth_session_cache.py --requests 10000 --users 50 --concurrency 32
+
+Run from ``backend/`` so ``app`` and ``deerflow`` are importable.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from fastapi import FastAPI
+
+from app.gateway.auth.config import AuthConfig, set_auth_config
+from app.gateway.auth.jwt import create_access_token
+from app.gateway.auth.local_provider import LocalAuthProvider
+from app.gateway.auth.repositories.sqlite import SQLiteUserRepository
+from app.gateway.auth.session_cache import MemorySessionCache, set_session_cache
+from app.gateway.auth_middleware import AuthMiddleware
+from deerflow.persistence.engine import close_engine, get_session_factory, init_engine
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(AuthMiddleware)
+
+    @app.get("/api/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+async def _drive(client: httpx.AsyncClient, tokens: list[str], requests: int, concurrency: int) -> list[float]:
+    samples: list[float] = []
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        for i in counter:
+            start = time.perf_counter()
+            response = await client.get("/api/ping", cookies={"access_token": tokens[i % len(tokens)]})
+            samples.append((time.perf_counter() - start) * 1000)
+            if response.status_code != 200:
+                raise RuntimeError(f"request failed: {response.status_code} {response.text}")
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples
+
+
+async def _run(args: argparse.Namespace, db_dir: Path) -> None:
+    import app.gateway.deps as deps
+
+    set_auth_config(AuthConfig(jwt_secret="bench-secret-key-for-session-cache-min-32-chars"))
+    await init_engine("sqlite", url=f"sqlite+aiosqlite:///{(db_dir / 'users.db').as_posix()}", sqlite_dir=str(db_dir))
+    try:
+        provider = LocalAuthProvider(SQLiteUserRepository(get_session_factory()))
+        deps.get_local_provider = lambda: provider
+        tokens = []
+        for i in range(args.users):
+            user = await provider.create_user(email=f"bench-{i}@example.com")
+            tokens.append(create_access_token(str(user.id), token_version=user.token_version))
+
+        transport = httpx.ASGITransport(app=_app())
+        results = []
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for label, cache in (("no cache", None), ("memory cache", MemorySessionCache())):
+                set_session_cache(cache)
+                await _drive(client, tokens, min(args.requests, 200), args.concurrency)  # warm-up
+                start = time.perf_counter()
+                samples = await _drive(client, tokens, args.requests, args.concurrency)
+                elapsed = time.perf_counter() - start
+                samples.sort()
+                results.append((label, elapsed, statistics.median(samples), samples[int(len(samples) * 0.99) - 1]))
+    finally:
+        await close_engine()
+
+    print(f"{args.requests} requests, {args.users} users, concurrency {args.concurrency}\n")
+    print(f"{'mode':<16}{'total s':>10}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for label, elapsed, p50, p99 in results:
+        print(f"{label:<16}{elapsed:>10.2f}{args.requests / elapsed:>10.0f}{p50:>10.3f}{p99:>10.3f}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=10_000, help="Timed requests per mode (default: 10000)")
+    parser.add_argument("--users", type=int, default=20, help="Distinct users/session cookies (default: 20)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent in-flight requests (default: 16)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(_run(args, Path(tmp)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Listing threads through the embedded ``DeerFlowClient`` on a large SQLite store.
+
+Seeds a temporary ``database.backend: sqlite`` store with ``--threads``
+threads, each with ``--checkpoints`` checkpoints carrying a title and
+``--messages`` messages, plus the matching ``threads_meta`` rows the Gateway
+lists from. Four ways of fetching the ``--limit`` most recent threads are
+timed:
+
+- ``list(limit)``: the old ``list_threads`` — ``checkpointer.list(limit=N)``,
+  which caps checkpoints, not threads, and deserializes each one for its title
+- ``checkpoint scan``: every checkpoint, folded per thread (the current
+  fallback when there is no thread-metadata store)
+- ``list_threads``: the current sync API, one query on ``threads_meta``
+- ``alist_threads``: the async API on the client's shared loop and pool
+
+Usage::
+
+    python scripts/benchmark/bench_client_list_threads.py
+    python scripts/benchmark/bench_client_list_threads.py --threads 2000 --checkpoints 5 --limit 50
+
+Run from ``backend/`` so ``deerflow`` is importable.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.checkpoint.sqlite import SqliteSaver
+from sqlalchemy import insert
+
+from deerflow.client import DeerFlowClient
+from deerflow.config.app_config import AppConfig, set_app_config
+from deerflow.config.database_config import DatabaseConfig
+from deerflow.config.model_config import ModelConfig
+from deerflow.config.sandbox_config import SandboxConfig
+from deerflow.persistence.engine import create_engine_from_config
+from deerflow.persistence.thread_meta.model import ThreadMetaRow
+from deerflow.runtime.user_context import get_effective_user_id
+
+
+def _seed_checkpoints(path: str, threads: int, checkpoints: int, messages: int) -> None:
+    with SqliteSaver.from_conn_string(path) as saver:
+        for t in range(threads):
+            history = []
+            for c in range(checkpoints):
+                history += [HumanMessage(content=f"question {c} " * 20, id=f"h{t}-{c}"), AIMessage(content=f"answer {c} " * 80, id=f"a{t}-{c}")]
+                checkpoint = empty_checkpoint()
+                checkpoint["channel_values"] = {"title": f"Thread {t}", "messages": history[-messages:]}
+                checkpoint["channel_versions"] = versions = {"title": c + 1, "messages": c + 1}
+                saver.put({"configurable": {"thread_id": f"thread-{t:05d}", "checkpoint_ns": ""}}, checkpoint, {"source": "loop", "step": c}, versions)
+
+
+async def _seed_thread_meta(database: DatabaseConfig, threads: int) -> None:
+    engine = await create_engine_from_config(database)
+    start = datetime.now(UTC) - timedelta(days=30)
+    rows = [
+        {
+            "thread_id": f"thread-{t:05d}",
+            "assistant_id": "lead-agent",
+            "user_id": get_effective_user_id(),
+            "display_name": f"Thread {t}",
+            "status": "idle",
+            "metadata_json": {},
+            "created_at": start + timedelta(minutes=t),
+            "updated_at": start + timedelta(minutes=t),
+        }
+        for t in range(threads)
+    ]
+    async with engine.begin() as conn:
+        await conn.execute(insert(ThreadMetaRow), rows)
+    await engine.dispose()
+
+
+def _legacy_list(checkpointer, limit: int) -> list[dict]:
+    thread_info_map: dict[str, dict] = {}
+    for cp in checkpointer.list(config=None, limit=limit):
+        DeerFlowClient._accumulate_thread_info(thread_info_map, cp)
+    return DeerFlowClient._sorted_thread_list(thread_info_map, limit)
+
+
+def _scan_list(checkpointer, limit: int) -> list[dict]:
+    thread_info_map: dict[str, dict] = {}
+    for cp in checkpointer.list(config=None):
+        DeerFlowClient._accumulate_thread_info(thread_info_map, cp)
+    return DeerFlowClient._sorted_thread_list(thread_info_map, limit)
+
+
+def _time(label: str, fn, rounds: int) -> None:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        threads = fn()
+    elapsed = (time.perf_counter() - start) / rounds * 1000
+    print(f"{label:<17}{elapsed:>11.1f}{len(threads):>10}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=10_000, help="Threads in the store (default: 10000)")
+    parser.add_argument("--checkpoints", type=int, default=3, help="Checkpoints per thread (default: 3)")
+    parser.add_argument("--messages", type=int, default=6, help="Messages kept in each checkpoint (default: 6)")
+    parser.add_argument("--limit", type=int, default=20, help="Threads to list (default: 20)")
+    parser.add_argument("--rounds", type=int, default=5, help="Timed rounds per method (default: 5)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as sqlite_dir:
+        database = DatabaseConfig(backend="sqlite", sqlite_dir=sqlite_dir)
+        print(f"seeding {args.threads} threads x {args.checkpoints} checkpoints ...", flush=True)
+        _seed_checkpoints(database.checkpointer_sqlite_path, args.threads, args.checkpoints, args.messages)
+        asyncio.run(_seed_thread_meta(database, args.threads))
+
+        set_app_config(
+            AppConfig(
+                models=[ModelConfig(name="bench", use="langchain_openai:ChatOpenAI", model="bench")],
+                sandbox=SandboxConfig(use="deerflow.sandbox.local:LocalSandboxProvider"),
+                database=database,
+            )
+        )
+
+        print(f"\nlimit={args.limit}, mean of {args.rounds} rounds\n")
+        print(f"{'method':<17}{'time ms':>11}{'threads':>10}")
+        with SqliteSaver.from_conn_string(database.checkpointer_sqlite_path) as checkpointer:
+            _time("list(limit)", lambda: _legacy_list(checkpointer, args.limit), args.rounds)
+            _time("checkpoint scan", lambda: _scan_list(checkpointer, args.limit), args.rounds)
+
+        with DeerFlowClient() as client:
+            client.list_threads(limit=args.limit)  # opens the pool
+            _time("list_threads", lambda: client.list_threads(limit=args.limit)["thread_list"], args.rounds)
+
+        async def alist() -> None:
+            async with DeerFlowClient() as client:
+                await client.alist_threads(limit=args.limit)
+                start = time.perf_counter()
+                for _ in range(args.rounds):
+                    threads = (await client.alist_threads(limit=args.limit))["thread_list"]
+                elapsed = (time.perf_counter() - start) / args.rounds * 1000
+                print(f"{'alist_threads':<17}{elapsed:>11.1f}{len(threads):>10}")
+
+        asyncio.run(alist())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""Console stats/usage latency: full ``runs`` scan vs. the hourly rollup.
+
+Seeds a SQLite database with synthetic finished runs (plus a handful of
+active ones), backfills ``run_usage_hourly`` the way migration 0006 does, then
+times the console endpoints against a reproduction of the pre-rollup
+full-scan queries over the same data.
+
+Usage::
+
+    python scripts/benchmark/bench_console_usage.py --runs 500000 --days 90
+    python scripts/benchmark/bench_console_usage.py --runs 50000 --iterations 20 --db /tmp/console.db
+
+Run from ``backend/`` so ``app`` and ``deerflow`` are importable.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+import sqlalchemy as sa
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import deerflow.persistence.models  # noqa: F401  -- registers ORM models
+from app.gateway.routers import console
+from deerflow.persistence.base import Base
+from deerflow.persistence.run.model import RunRow
+from deerflow.persistence.run_usage import RunUsageRepository
+from deerflow.persistence.run_usage.pricing import build_pricing_map, run_cost
+
+_USERS = [f"user-{i}" for i in range(20)]
+_MODELS = ["gpt-4o", "claude-sonnet", "qwen-max", "deepseek-v3"]
+_STATUSES = ["success"] * 8 + ["error", "timeout", "interrupted"]
+_CONFIG = SimpleNamespace(
+    models=[SimpleNamespace(name=name, model=name, pricing={"currency": "USD", "input_per_million": 2 + i, "output_per_million": 8 + i}) for i, name in enumerate(_MODELS)],
+)
+
+
+def _seed(db_path: Path, runs: int, span_days: int) -> None:
+    engine = sa.create_engine(f"sqlite:///{db_path.as_posix()}")
+    Base.metadata.create_all(engine)
+    rng = random.Random(7)
+    now = datetime.now(UTC)
+    table = RunRow.__table__
+    batch: list[dict] = []
+    with engine.begin() as conn:
+        for i in range(runs):
+            created = now - timedelta(seconds=rng.randrange(span_days * 86400))
+            model = rng.choice(_MODELS)
+            input_tokens, output_tokens = rng.randrange(100, 20_000), rng.randrange(10, 4_000)
+            active = i < 50
+            batch.append(
+                {
+                    "run_id": f"run-{i}",
+                    "thread_id": f"thread-{i}",
+                    "assistant_id": "lead_agent",
+                    "user_id": rng.choice(_USERS),
+                    "status": "running" if active else rng.choice(_STATUSES),
+                    "model_name": model,
+                    "multitask_strategy": "reject",
+                    "metadata_json": {},
+                    "kwargs_json": {},
+                    "message_count": 2,
+                    "total_input_tokens": input_tokens,
+                    "total_output_tokens": output_tokens,
+                    "total_tokens": input_tokens + output_tokens,
+                    "llm_call_count": 1,
+                    "lead_agent_tokens": input_tokens + output_tokens,
+                    "subagent_tokens": 0,
+                    "middleware_tokens": 0,
+                    "token_usage_by_model": {model: {"input_tokens": input_tokens, "output_tokens": output_tokens, "total_tokens": input_tokens + output_tokens}},
+                    "created_at": created,
+                    "updated_at": created + timedelta(seconds=rng.randrange(1, 600)),
+                }
+            )
+            if len(batch) == 5000:
+                conn.execute(table.insert(), batch)
+                batch = []
+        if batch:
+            conn.execute(table.insert(), batch)
+    engine.dispose()
+
+
+async def _full_scan_stats(sf, pricing, user_id: str | None) -> None:
+    """The pre-rollup ``/stats`` queries: aggregates plus a priced scan of every run."""
+    where = (RunRow.user_id == user_id,) if user_id else ()
+    async with sf() as session:
+        await session.scalar(select(func.count()).select_from(RunRow).where(*where))
+        await session.scalar(select(func.count()).select_from(RunRow).where(RunRow.status.in_(("pending", "running")), *where))
+        await session.scalar(select(func.count()).select_from(RunRow).where(RunRow.status.in_(("error", "timeout")), *where))
+        await session.scalar(select(func.coalesce(func.sum(RunRow.total_tokens), 0)).where(*where))
+        rows = (await session.execute(select(RunRow.model_name, RunRow.total_input_tokens, RunRow.total_output_tokens, RunRow.token_usage_by_model).where(*where))).all()
+    for model_name, input_tokens, output_tokens, usage_map in rows:
+        run_cost(pricing, model_name=model_name, total_input_tokens=input_tokens, total_output_tokens=output_tokens, token_usage_by_model=usage_map)
+
+
+async def _full_scan_usage(sf, pricing, user_id: str | None, days: int) -> None:
+    """The pre-rollup ``/usage`` query: every ORM row in the window, folded in Python."""
+    stmt = select(RunRow).where(RunRow.created_at >= datetime.now(UTC) - timedelta(days=days))
+    if user_id:
+        stmt = stmt.where(RunRow.user_id == user_id)
+    async with sf() as session:
+        rows = (await session.execute(stmt)).scalars().all()
+    day_totals: dict[str, int] = {}
+    for row in rows:
+        key = row.created_at.date().isoformat()
+        day_totals[key] = day_totals.get(key, 0) + (row.total_tokens or 0)
+        run_cost(pricing, model_name=row.model_name, total_input_tokens=row.total_input_tokens, total_output_tokens=row.total_output_tokens, token_usage_by_model=row.token_usage_by_model)
+
+
+async def _time(label: str, fn, iterations: int) -> tuple[str, float, float]:
+    await fn()  # warm-up (connection, caches)
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return label, statistics.median(samples), max(samples)
+
+
+async def _run(args: argparse.Namespace, db_path: Path) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path.as_posix()}")
+    sf = async_sessionmaker(engine, expire_on_commit=False)
+    pricing = build_pricing_map(_CONFIG.models)
+
+    start = time.perf_counter()
+    rows = await RunUsageRepository(sf).rebuild(pricing=pricing)
+    print(f"backfilled {rows} rollup rows in {time.perf_counter() - start:.1f}s")
+
+    user_id = None if args.all_users else _USERS[0]
+    console.get_session_factory = lambda: sf
+    console.get_app_config = lambda: _CONFIG
+    console.list_custom_agents = lambda: []
+
+    async def current_user(request):
+        return user_id
+
+    console.get_current_user = current_user
+    stats = console.console_stats.__wrapped__
+    usage = console.console_usage.__wrapped__
+
+    results = [
+        await _time("stats  full scan", lambda: _full_scan_stats(sf, pricing, user_id), args.iterations),
+        await _time("stats  rollup", lambda: stats(request=None), args.iterations),
+        await _time("usage  full scan", lambda: _full_scan_usage(sf, pricing, user_id, args.days), args.iterations),
+        await _time("usage  rollup", lambda: usage(request=None, days=args.days, tz_offset_minutes=0), args.iterations),
+    ]
+    print(f"\n{'endpoint':<20}{'median ms':>12}{'max ms':>12}")
+    for label, median, worst in results:
+        print(f"{label:<20}{median:>12.1f}{worst:>12.1f}")
+    await engine.dispose()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=500_000, help="Synthetic runs to seed (default: 500000)")
+    parser.add_argument("--days", type=int, default=90, help="Usage window and seeded history span in days (default: 90)")
+    parser.add_argument("--iterations", type=int, default=10, help="Timed calls per endpoint (default: 10)")
+    parser.add_argument("--all-users", action="store_true", help="Aggregate across all users (no-auth mode) instead of one user")
+    parser.add_argument("--db", type=Path, default=None, help="Reuse/keep the SQLite file at this path instead of a temp file")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db or Path(tmp) / "console-bench.db"
+        if not db_path.exists():
+            start = time.perf_counter()
+            _seed(db_path, args.runs, args.days)
+            print(f"seeded {args.runs} runs in {time.perf_counter() - start:.1f}s")
+        asyncio.run(_run(args, db_path))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
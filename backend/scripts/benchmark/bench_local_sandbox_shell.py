@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""LocalSandbox bash latency, one shell process per call vs ``sandbox.persistent_shell``.
+
+Runs ``--commands`` trivial commands (``echo``, ``pwd``, ``true``, a failing
+``false``) through ``LocalSandbox.execute_command`` — once in the default
+one-shot mode, which starts a fresh shell for every call, and once with the
+persistent shell. Reports total wall time, per-command p50/p99 and whether
+both modes returned identical output for every command.
+
+Usage::
+
+    python scripts/benchmark/bench_local_sandbox_shell.py
+    python scripts/benchmark/bench_local_sandbox_shell.py --commands 1000
+
+Run from ``backend/`` so ``deerflow`` is importable. POSIX only.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+
+from deerflow.sandbox.local.local_sandbox import LocalSandbox
+
+_COMMANDS = ("echo hello", "pwd", "true", "false", "echo out; echo err >&2")
+
+
+def _run_mode(persistent: bool, commands: list[str]) -> tuple[float, list[float], list[str]]:
+    sandbox = LocalSandbox("bench", persistent_shell=persistent)
+    try:
+        sandbox.execute_command("true")  # start the persistent shell outside the timed loop
+        samples: list[float] = []
+        outputs: list[str] = []
+        start = time.perf_counter()
+        for command in commands:
+            command_start = time.perf_counter()
+            outputs.append(sandbox.execute_command(command))
+            samples.append((time.perf_counter() - command_start) * 1000)
+        return time.perf_counter() - start, samples, outputs
+    finally:
+        sandbox.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--commands", type=int, default=200, help="Commands per mode (default: 200)")
+    args = parser.parse_args(argv)
+
+    commands = [_COMMANDS[i % len(_COMMANDS)] for i in range(args.commands)]
+    results = [("one-shot", *_run_mode(False, commands)), ("persistent", *_run_mode(True, commands))]
+
+    print(f"{args.commands} commands, shell {LocalSandbox._get_shell()}\n")
+    print(f"{'mode':<12}{'total s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for label, elapsed, samples, _outputs in results:
+        samples.sort()
+        print(f"{label:<12}{elapsed:>10.2f}{statistics.median(samples):>10.2f}{samples[int(len(samples) * 0.99) - 1]:>10.2f}")
+    print(f"\nidentical output: {results[0][3] == results[1][3]}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Cost of hashing tool calls in ``LoopDetectionMiddleware``.
+
+Every model turn that requests tools is hashed so repeated calls can be
+counted. ``write_file`` and ``str_replace`` hash their full arguments, so a
+turn that writes a large file pays for the whole body. Two paths are timed
+over ``write_file`` calls with bodies of ``--sizes`` KiB, plus a small
+``bash`` call for reference:
+
+- ``json+md5``: the old path — ``json.dumps(sort_keys=True)`` of the
+  arguments, a second ``json.dumps`` of the sorted key list, then MD5
+- ``xxh3``: the current ``_hash_tool_calls`` — a canonical encoding fed
+  incrementally into XXH3
+
+The ``after_model`` column times the whole middleware step on the current
+path, including restoring the windows from the checkpointed
+``loop_detection`` snapshot and writing the new one.
+
+Usage::
+
+    python scripts/benchmark/bench_loop_detection_hash.py
+    python scripts/benchmark/bench_loop_detection_hash.py --sizes 1 64 1024 4096 --rounds 200
+
+Run from ``backend/`` so ``deerflow`` is importable.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import random
+import string
+import time
+from unittest.mock import MagicMock
+
+from langchain_core.messages import AIMessage
+
+from deerflow.agents.middlewares.loop_detection_middleware import LoopDetectionMiddleware, _hash_tool_calls
+
+
+def _legacy_hash(tool_calls: list[dict]) -> str:
+    normalized = []
+    for tc in tool_calls:
+        name = tc.get("name", "")
+        args = tc.get("args", {})
+        if name in {"write_file", "str_replace"}:
+            key = json.dumps(args, sort_keys=True, default=str)
+        else:
+            key = json.dumps({k: args[k] for k in ("path", "command") if args.get(k) is not None}, sort_keys=True, default=str)
+        normalized.append(f"{name}:{key}")
+    normalized.sort()
+    return hashlib.md5(json.dumps(normalized, sort_keys=True, default=str).encode()).hexdigest()[:12]
+
+
+def _body(size: int, rng: random.Random) -> str:
+    alphabet = string.ascii_letters + string.digits + ' \n\t"\\{}'
+    return "".join(rng.choices(alphabet, k=size))
+
+
+def _per_call_us(fn, calls: list[list[dict]], rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for call in calls:
+            fn(call)
+    return (time.perf_counter() - start) / (rounds * len(calls)) * 1e6
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 16, 256, 1024], help="write_file body sizes in KiB (default: 1 16 256 1024)")
+    parser.add_argument("--rounds", type=int, default=50, help="Timed rounds per payload (default: 50)")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    workloads = [("bash", [[{"name": "bash", "id": "c0", "args": {"command": "ls -la /mnt/user-data/workspace", "description": "list"}}]])]
+    for kib in args.sizes:
+        # Several distinct bodies so nothing is served from a warm cache line.
+        calls = [[{"name": "write_file", "id": f"c{i}", "args": {"path": f"/mnt/user-data/outputs/report_{i}.md", "content": _body(kib * 1024, rng)}}] for i in range(4)]
+        workloads.append((f"write_file {kib} KiB", calls))
+
+    print(f"{args.rounds} rounds per payload, microseconds per tool call\n")
+    print(f"{'payload':<22}{'json+md5':>12}{'xxh3':>12}{'speedup':>9}{'after_model':>13}")
+    for label, calls in workloads:
+        legacy = _per_call_us(_legacy_hash, calls, args.rounds)
+        current = _per_call_us(_hash_tool_calls, calls, args.rounds)
+
+        mw = LoopDetectionMiddleware(hard_limit=10**9, warn_threshold=10**9, tool_freq_warn=10**9, tool_freq_hard_limit=10**9)
+        runtime = MagicMock()
+        runtime.context = {"thread_id": "bench", "run_id": "bench"}
+        states = [{"messages": [AIMessage(content="", tool_calls=call)]} for call in calls]
+        snapshot = None
+
+        def step(state):
+            nonlocal snapshot
+            update = mw.after_model({**state, "loop_detection": snapshot} if snapshot else state, runtime)
+            snapshot = update["loop_detection"]
+
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            for state in states:
+                step(state)
+        step_us = (time.perf_counter() - start) / (args.rounds * len(states)) * 1e6
+        print(f"{label:<22}{legacy:>12.1f}{current:>12.1f}{legacy / current:>8.1f}x{step_us:>13.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Overhead of ``metrics.enabled`` on an agent run through a middleware chain.
+
+Builds a ``create_agent`` graph with ``--middlewares`` middlewares, each
+overriding ``before_model``, ``after_model`` and ``awrap_model_call`` (the
+hooks the lead-agent chain uses most), and a fake model that answers after
+``--model-ms`` milliseconds. The same run is timed ``--iterations`` times
+with metrics off and with every hook instrumented plus a per-run timing
+summary, and the relative overhead is reported.
+
+``--model-ms 0`` is the worst case: nothing but graph and hook overhead is
+measured. The added cost is a fixed amount per hook call, so against real
+model latencies of hundreds of milliseconds it shrinks to noise.
+
+Usage::
+
+    python scripts/benchmark/bench_middleware_metrics.py
+    python scripts/benchmark/bench_middleware_metrics.py --middlewares 15 --iterations 500 --model-ms 0
+
+Run from ``backend/`` so ``deerflow`` is importable.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from langchain.agents import create_agent
+from langchain.agents.middleware import AgentMiddleware
+from langchain_core.language_models.fake_chat_models import FakeMessagesListChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+
+from deerflow.config.metrics_config import MetricsConfig
+from deerflow.runtime import metrics
+
+
+class _FakeModel(FakeMessagesListChatModel):
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+def _middleware_class(index: int) -> type[AgentMiddleware]:
+    def before_model(self, state, runtime):
+        return None
+
+    def after_model(self, state, runtime):
+        return None
+
+    async def awrap_model_call(self, request, handler):
+        return await handler(request)
+
+    namespace = {"before_model": before_model, "after_model": after_model, "awrap_model_call": awrap_model_call}
+    return type(f"BenchMiddleware{index}", (AgentMiddleware,), namespace)
+
+
+def _build_agent(middleware_count: int, model_ms: float, instrumented: bool):
+    middlewares = [_middleware_class(i)() for i in range(middleware_count)]
+    if instrumented:
+        middlewares = metrics.instrument_middlewares(middlewares)
+    model = _FakeModel(responses=[AIMessage(content="done")], sleep=model_ms / 1000 or None)
+    return create_agent(model=model, tools=[], middleware=middlewares)
+
+
+async def _time_runs(agent, iterations: int, summarize: bool) -> list[float]:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        started = metrics.start_run_timings() if summarize else None
+        try:
+            await agent.ainvoke({"messages": [HumanMessage("hi")]})
+        finally:
+            if started is not None:
+                started[0].summary()
+                metrics.stop_run_timings(started[1])
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def _bench(args: argparse.Namespace) -> tuple[list[float], list[float]]:
+    metrics.reset_metrics()
+    baseline_agent = _build_agent(args.middlewares, args.model_ms, instrumented=False)
+    metrics.configure_metrics(MetricsConfig(enabled=True, run_timing_summary=True))
+    timed_agent = _build_agent(args.middlewares, args.model_ms, instrumented=True)
+
+    # Warm both graphs, then interleave rounds so drift hits both modes equally.
+    await _time_runs(baseline_agent, 10, summarize=False)
+    await _time_runs(timed_agent, 10, summarize=True)
+    baseline: list[float] = []
+    timed: list[float] = []
+    rounds = 10
+    for _ in range(rounds):
+        metrics.configure_metrics(MetricsConfig(enabled=False))
+        baseline += await _time_runs(baseline_agent, max(1, args.iterations // rounds), summarize=False)
+        metrics.configure_metrics(MetricsConfig(enabled=True, run_timing_summary=True))
+        timed += await _time_runs(timed_agent, max(1, args.iterations // rounds), summarize=True)
+    return baseline, timed
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--middlewares", type=int, default=12, help="Middlewares in the chain (default: 12)")
+    parser.add_argument("--iterations", type=int, default=300, help="Agent runs per mode (default: 300)")
+    parser.add_argument("--model-ms", type=float, default=0.0, help="Simulated model latency in ms (default: 0)")
+    args = parser.parse_args(argv)
+
+    baseline, timed = asyncio.run(_bench(args))
+    observations = sum(count for _, count, _ in metrics.MIDDLEWARE_HOOK_SECONDS.snapshot().values())
+
+    print(f"{args.middlewares} middlewares, {len(baseline)} runs per mode, model latency {args.model_ms:g} ms\n")
+    print(f"{'mode':<10}{'median ms':>12}{'mean ms':>12}")
+    for name, samples in (("off", baseline), ("metrics", timed)):
+        print(f"{name:<10}{statistics.median(samples) * 1000:>12.3f}{statistics.fmean(samples) * 1000:>12.3f}")
+    overhead = statistics.median(timed) / statistics.median(baseline) - 1
+    print(f"\noverhead (median): {overhead:+.2%}  ({observations} hook observations recorded)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
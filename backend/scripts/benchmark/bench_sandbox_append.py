@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Cost of ``write_file(append=True)`` on a growing file, against local stand-ins.
+
+Appends ``--appends`` lines of ``--line-bytes`` bytes to one file, the way a
+tool streaming a log or a report does. Every request or exec waits
+``--latency-ms`` first, standing in for the round trip to a sandbox.
+
+- ``aio``: the real ``AioSandbox`` client against a small HTTP server for
+  ``/v1/file/read`` and ``/v1/file/write``. ``read-modify-write`` is the
+  old append (download the file, concatenate, upload all of it);
+  ``native`` sends only the new line with the file API's ``append`` flag.
+- ``boxlite``: a ``BoxliteBox`` over a fake box whose ``exec`` runs the
+  shell locally. ``mkdir + append`` is the old two-exec path, ``native``
+  folds the ``mkdir -p`` into the append command.
+
+Usage::
+
+    python scripts/benchmark/bench_sandbox_append.py
+    python scripts/benchmark/bench_sandbox_append.py --appends 1000 --line-bytes 400 --latency-ms 5
+
+Run from ``backend/`` so ``deerflow`` is importable.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import posixpath
+import shlex
+import subprocess
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+
+from deerflow.community.aio_sandbox.aio_sandbox import AioSandbox
+from deerflow.community.boxlite.box import BoxliteBox
+
+
+class _Traffic:
+    def __init__(self) -> None:
+        self.requests = 0
+        self.bytes = 0
+        self.lock = threading.Lock()
+
+    def add(self, size: int) -> None:
+        with self.lock:
+            self.requests += 1
+            self.bytes += size
+
+
+def _handler(root: Path, latency: float, traffic: _Traffic):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            raw = self.rfile.read(int(self.headers["Content-Length"]))
+            body = json.loads(raw)
+            time.sleep(latency)
+            target = root / body["file"].lstrip("/")
+            if self.path == "/v1/file/read":
+                data = {"file": body["file"], "content": target.read_text(encoding="utf-8") if target.exists() else ""}
+            elif self.path == "/v1/file/write":
+                target.parent.mkdir(parents=True, exist_ok=True)
+                with target.open("a" if body.get("append") else "w", encoding="utf-8") as f:
+                    f.write(body["content"])
+                data = {"file": body["file"], "bytes_written": len(body["content"])}
+            else:
+                self.send_error(404)
+                return
+            payload = json.dumps({"success": True, "data": data}).encode("utf-8")
+            traffic.add(len(raw) + len(payload))
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    return Handler
+
+
+class _LocalShellBox:
+    """Fake BoxLite box: ``exec("sh", "-lc", script)`` runs locally under *root*."""
+
+    def __init__(self, root: Path, latency: float, traffic: _Traffic) -> None:
+        self._root = root
+        self._latency = latency
+        self._traffic = traffic
+
+    async def exec(self, *argv, env=None, timeout=None):
+        script = argv[2].replace("/mnt/user-data", f"{self._root}/mnt/user-data")
+        self._traffic.add(len(script))
+        await asyncio.sleep(self._latency)
+        completed = subprocess.run(["/bin/sh", "-c", script], capture_output=True, text=True)
+        return SimpleNamespace(stdout=completed.stdout, stderr=completed.stderr, exit_code=completed.returncode)
+
+
+def _aio_read_modify_write(sandbox: AioSandbox, path: str, line: str) -> None:
+    existing = sandbox.read_file(path)
+    sandbox.write_file(path, existing + line)
+
+
+def _boxlite_mkdir_then_append(box: BoxliteBox, path: str, line: str) -> None:
+    box._sh(f"mkdir -p {shlex.quote(posixpath.dirname(path))}")
+    box.write_file(path, line, append=True)
+
+
+def _time(label: str, mode: str, append, lines: list[str], path: str, traffic: _Traffic, check: Path) -> None:
+    traffic.requests = traffic.bytes = 0
+    start = time.perf_counter()
+    for line in lines:
+        append(path, line)
+    elapsed = time.perf_counter() - start
+    assert check.read_text(encoding="utf-8") == "".join(lines)
+    print(f"{label:<9}{mode:<19}{elapsed:>9.2f}{traffic.requests:>10}{traffic.bytes / 1e6:>10.1f}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--appends", type=int, default=1000, help="Appends to the growing file (default: 1000)")
+    parser.add_argument("--line-bytes", type=int, default=200, help="Bytes per appended line (default: 200)")
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="Added latency per request or exec (default: 2)")
+    args = parser.parse_args(argv)
+
+    lines = [f"{n:06d} " + "x" * max(0, args.line_bytes - 8) + "\n" for n in range(args.appends)]
+    latency = args.latency_ms / 1000
+    traffic = _Traffic()
+
+    print(f"{args.appends} appends of {args.line_bytes} bytes, {args.latency_ms:g} ms per round trip\n")
+    print(f"{'sandbox':<9}{'path':<19}{'time s':>9}{'requests':>10}{'MB moved':>10}")
+    with tempfile.TemporaryDirectory() as scratch:
+        root = Path(scratch)
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(root, latency, traffic))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            sandbox = AioSandbox(id="bench", base_url=f"http://127.0.0.1:{server.server_address[1]}")
+            for mode, append in (
+                ("read-modify-write", lambda p, line: _aio_read_modify_write(sandbox, p, line)),
+                ("native", lambda p, line: sandbox.write_file(p, line, append=True)),
+            ):
+                path = f"/mnt/user-data/workspace/aio-{mode}.log"
+                _time("aio", mode, append, lines, path, traffic, root / path.lstrip("/"))
+        finally:
+            server.shutdown()
+
+        box = BoxliteBox("bench", box=_LocalShellBox(root, latency, traffic), run=lambda coro, timeout=None: asyncio.run(coro))
+        for mode, append in (
+            ("mkdir + append", lambda p, line: _boxlite_mkdir_then_append(box, p, line)),
+            ("native", lambda p, line: box.write_file(p, line, append=True)),
+        ):
+            path = f"/mnt/user-data/workspace/boxlite-{mode.replace(' + ', '-')}.log"
+            _time("boxlite", mode, append, lines, path, traffic, root / path.lstrip("/"))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Seeding a remote sandbox with a many-file tree: per file vs one archive.
+
+Generates a ``--files``-file skill-like tree and copies it into a stand-in
+sandbox whose ``/mnt/user-data`` lives in a temporary directory and whose
+shell runs locally. Every sandbox call (command, upload, download) waits
+``--latency-ms`` first, standing in for the round trip to AIO, E2B or
+BoxLite. Four operations are timed:
+
+- ``per-file push``: one ``update_file`` per file (the old path)
+- ``archive push``: ``push_tree`` into an empty directory
+- ``archive re-push``: ``push_tree`` again after editing ``--changed`` files
+- ``archive pull``: ``pull_tree`` of the whole tree into an empty host directory
+
+Usage::
+
+    python scripts/benchmark/bench_sandbox_bulk_sync.py
+    python scripts/benchmark/bench_sandbox_bulk_sync.py --files 2000 --latency-ms 20 --compression zstd
+
+Run from ``backend/`` so ``deerflow`` is importable.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from deerflow.sandbox.bulk_sync import COMPRESSIONS, pull_tree, push_tree
+from deerflow.sandbox.sandbox import Sandbox
+
+_WORDS = "the agent reads files runs tools and writes a short report about each result it finds".split()
+
+
+class _StandInSandbox(Sandbox):
+    def __init__(self, root: Path, latency: float) -> None:
+        super().__init__("bench")
+        self.root = root
+        self.latency = latency
+        self.calls = 0
+
+    def _wait(self) -> None:
+        self.calls += 1
+        time.sleep(self.latency)
+
+    def execute_command(self, command, env=None, timeout=None) -> str:
+        self._wait()
+        completed = subprocess.run(["/bin/sh", "-c", command.replace("/mnt/user-data", f"{self.root}/mnt/user-data")], capture_output=True, text=True)
+        return completed.stdout + completed.stderr
+
+    def update_file(self, path: str, content: bytes) -> None:
+        self._wait()
+        target = self.root / path.lstrip("/")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(content)
+
+    def download_file(self, path: str) -> bytes:
+        self._wait()
+        return (self.root / path.lstrip("/")).read_bytes()
+
+    def read_file(self, path):
+        raise NotImplementedError
+
+    def list_dir(self, path, max_depth=2):
+        raise NotImplementedError
+
+    def write_file(self, path, content, append=False):
+        raise NotImplementedError
+
+    def glob(self, path, pattern, *, include_dirs=False, max_results=200):
+        raise NotImplementedError
+
+    def grep(self, path, pattern, *, glob=None, literal=False, case_sensitive=False, max_results=100):
+        raise NotImplementedError
+
+
+def _seed(root: Path, files: int, rng: random.Random) -> list[Path]:
+    paths = []
+    for i in range(files):
+        path = root / f"part{i % 12}" / f"module_{i}.md"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("\n".join(" ".join(rng.choice(_WORDS) for _ in range(12)) for _ in range(40)), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def _time(label: str, sandbox: _StandInSandbox, operation) -> None:
+    sandbox.calls = 0
+    start = time.perf_counter()
+    moved = operation()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<17}{elapsed:>9.2f}{sandbox.calls:>8}{moved:>8}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=500, help="Files in the tree (default: 500)")
+    parser.add_argument("--changed", type=int, default=10, help="Files edited before the re-push (default: 10)")
+    parser.add_argument("--latency-ms", type=float, default=10.0, help="Added latency per sandbox call (default: 10)")
+    parser.add_argument("--compression", choices=COMPRESSIONS, default="gzip", help="Archive compression (default: gzip)")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as scratch:
+        scratch = Path(scratch)
+        tree = scratch / "skill"
+        paths = _seed(tree, args.files, rng)
+        sandbox = _StandInSandbox(scratch / "remote", args.latency_ms / 1000)
+
+        print(f"{args.files} files, {args.latency_ms:g} ms per sandbox call, {args.compression} archives\n")
+        print(f"{'operation':<17}{'time s':>9}{'calls':>8}{'files':>8}")
+
+        def per_file() -> int:
+            for path in paths:
+                sandbox.update_file(f"/mnt/user-data/per-file/{path.relative_to(tree).as_posix()}", path.read_bytes())
+            return len(paths)
+
+        _time("per-file push", sandbox, per_file)
+        _time("archive push", sandbox, lambda: len(push_tree(sandbox, tree, "/mnt/user-data/archive", compression=args.compression).transferred))
+        for path in rng.sample(paths, min(args.changed, len(paths))):
+            path.write_text(path.read_text(encoding="utf-8") + "\nedited\n", encoding="utf-8")
+        _time("archive re-push", sandbox, lambda: len(push_tree(sandbox, tree, "/mnt/user-data/archive", compression=args.compression).transferred))
+        _time("archive pull", sandbox, lambda: len(pull_tree(sandbox, "/mnt/user-data/archive", scratch / "pulled", compression=args.compression).transferred))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
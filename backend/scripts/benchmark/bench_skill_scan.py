@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""SkillScan cost for installing the same large skill twice.
+
+Builds a skill archive of roughly ``--size-mb`` megabytes of vendored Python
+(plus a SKILL.md), then runs the two scans an install performs —
+``scan_archive_preflight`` on the ``.skill`` file and ``scan_skill_dir`` on the
+extracted tree — twice in a row. The first pass is a cold cache; the second
+is a re-install of identical content and should be served from the
+content-hash cache. Findings of both passes are compared.
+
+While each pass runs, an asyncio "gateway" loop ticks every 10 ms on the main
+thread (the scan itself runs in ``asyncio.to_thread`` like the real callers);
+the worst tick delay shows how much the scan stalls other requests.
+
+Usage::
+
+    python scripts/benchmark/bench_skill_scan.py
+    python scripts/benchmark/bench_skill_scan.py --size-mb 20 --max-workers 0   # inline, no pool
+
+Run from ``backend/`` so ``deerflow`` is importable.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+from types import SimpleNamespace
+
+from deerflow.skills.skillscan import cache, scan_archive_preflight, scan_skill_dir
+
+_MODULE = '''"""Vendored helper module {index}."""
+
+import json
+import os
+import subprocess
+
+
+class Helper{index}:
+    def __init__(self, root):
+        self.root = root
+        self.items = [value * {index} for value in range(64)]
+
+    def render(self, payload):
+        data = json.dumps({{"root": self.root, "payload": payload, "items": self.items}})
+        return data.replace("{{", "[").replace("}}", "]")
+
+    def run(self):
+        return subprocess.run(["ls", self.root], check=False)
+
+
+def compute_{index}(values):
+    total = 0
+    for position, value in enumerate(values):
+        if position % 3 == 0:
+            total += value
+        elif position % 3 == 1:
+            total -= value
+        else:
+            total ^= value
+    return total + len(os.sep)
+'''
+
+
+def _build_skill(root: Path, size_mb: float) -> Path:
+    skill_dir = root / "src" / "bench-skill"
+    vendor = skill_dir / "vendor" / "pkg"
+    vendor.mkdir(parents=True)
+    (skill_dir / "SKILL.md").write_text("---\nname: bench-skill\ndescription: Benchmark skill with vendored code\n---\n\nSee https://example.com.\n", encoding="utf-8")
+    target = int(size_mb * 1024 * 1024)
+    written = index = 0
+    while written < target:
+        source = "\n\n".join(_MODULE.format(index=index * 50 + part) for part in range(50))
+        (vendor / f"module_{index:04d}.py").write_text(source, encoding="utf-8")
+        written += len(source)
+        index += 1
+    archive = root / "bench-skill.skill"
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+        for path in sorted(skill_dir.rglob("*")):
+            zf.write(path, path.relative_to(skill_dir.parent))
+    return archive
+
+
+async def _timed_scan(archive: Path, extracted: Path) -> tuple[float, float, dict]:
+    worst_tick = 0.0
+    done = False
+
+    async def ticker() -> None:
+        nonlocal worst_tick
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            worst_tick = max(worst_tick, time.perf_counter() - start - 0.01)
+
+    def scan() -> dict:
+        return {"archive": scan_archive_preflight(archive), "dir": scan_skill_dir(extracted)}
+
+    tick_task = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    result = await asyncio.to_thread(scan)
+    elapsed = time.perf_counter() - start
+    done = True
+    await tick_task
+    return elapsed, worst_tick, result
+
+
+async def _run(args: argparse.Namespace, root: Path) -> None:
+    archive = _build_skill(root, args.size_mb)
+    with zipfile.ZipFile(archive) as zf:
+        zf.extractall(root / "installed")
+    extracted = root / "installed" / "bench-skill"
+    files = sum(1 for path in extracted.rglob("*") if path.is_file())
+    size = sum(path.stat().st_size for path in extracted.rglob("*") if path.is_file())
+
+    cache._skill_scan_config = lambda: SimpleNamespace(cache_max_entries=8192, max_workers=args.max_workers)
+    cache.reset_scan_cache()
+    cache.shutdown_scan_pool()
+    if args.max_workers:
+        # Pay worker start-up (interpreter + imports) outside the timed passes,
+        # as a long-running gateway does after its first large scan.
+        cache.run_scan_jobs(time.sleep, [(0.5,)] * args.max_workers, size=cache.POOL_MIN_BYTES)
+
+    try:
+        results = [await _timed_scan(archive, extracted) for _ in range(2)]
+    finally:
+        cache.shutdown_scan_pool()
+
+    print(f"{files} files, {size / 1024 / 1024:.1f} MB extracted, archive {archive.stat().st_size / 1024 / 1024:.1f} MB, max_workers={args.max_workers}\n")
+    print(f"{'pass':<8}{'scan ms':>10}{'worst loop stall ms':>22}{'findings':>10}")
+    for label, (elapsed, stall, result) in zip(("cold", "cached"), results, strict=True):
+        print(f"{label:<8}{elapsed * 1000:>10.1f}{stall * 1000:>22.1f}{len(result['dir']['findings']):>10}")
+    print(f"\nidentical findings: {results[0][2] == results[1][2]}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=float, default=20, help="Approximate uncompressed vendored Python size (default: 20)")
+    parser.add_argument("--max-workers", type=int, default=2, help="SkillScan worker processes; 0 scans inline (default: 2)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(_run(args, Path(tmp)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
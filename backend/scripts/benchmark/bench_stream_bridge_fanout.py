@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Redis stream bridge cost with many SSE watchers on one run.
+
+Starts ``--watchers`` concurrent subscribers on a single run, publishes
+``--events`` events and waits for every watcher to see the end marker — once
+with the pre-multiplexer subscribe loop (every watcher runs its own blocking
+``XREAD`` and decodes every entry) and once with the bridge's shared reader.
+For each mode it reports server-side ``XREAD`` calls (``INFO commandstats``),
+the peak number of connections the bridge held (``CLIENT LIST`` filtered by a
+per-run client name), process CPU time and wall time.
+
+Needs a reachable Redis server; keys are written under a random prefix and
+deleted afterwards.
+
+Usage::
+
+    python scripts/benchmark/bench_stream_bridge_fanout.py
+    python scripts/benchmark/bench_stream_bridge_fanout.py --redis-url redis://localhost:6379/15 --watchers 50 --events 500
+
+Run from ``backend/`` so ``deerflow`` is importable.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+import uuid
+from collections.abc import AsyncIterator
+
+from redis.asyncio import Redis
+
+from deerflow.runtime.stream_bridge.base import END_SENTINEL, HEARTBEAT_SENTINEL, StreamEvent
+from deerflow.runtime.stream_bridge.redis import _XREAD_COUNT, RedisStreamBridge
+
+
+async def _per_watcher_subscribe(bridge: RedisStreamBridge, run_id: str, heartbeat_interval: float) -> AsyncIterator[StreamEvent]:
+    """The subscribe loop before the shared reader, kept as the baseline."""
+    key = bridge._stream_key(run_id)
+    stream_id = "0-0"
+    block_ms = max(1, int(heartbeat_interval * 1000))
+    while True:
+        response = await bridge._redis.xread({key: stream_id}, count=_XREAD_COUNT, block=block_ms)
+        if not response:
+            yield HEARTBEAT_SENTINEL
+            continue
+        for _stream_name, entries in response:
+            for event_id, fields in entries:
+                stream_id = bridge._decode(event_id)
+                entry = bridge._entry_from_redis(stream_id, fields)
+                yield entry
+                if entry is END_SENTINEL:
+                    return
+
+
+async def _xread_calls(admin: Redis) -> int:
+    stats = await admin.info("commandstats")
+    return int(stats.get("cmdstat_xread", {}).get("calls", 0))
+
+
+async def _bridge_connections(admin: Redis, client_name: str) -> int:
+    return sum(1 for client in await admin.client_list() if client.get("name") == client_name)
+
+
+async def _run_mode(args: argparse.Namespace, admin: Redis, label: str, shared: bool) -> tuple[str, int, int, float, float]:
+    client_name = f"bench-fanout-{uuid.uuid4().hex[:8]}"
+    client = Redis.from_url(args.redis_url, decode_responses=True, client_name=client_name)
+    key_prefix = f"deerflow:bench:{uuid.uuid4().hex}"
+    bridge = RedisStreamBridge(redis_url=args.redis_url, queue_maxsize=args.events + 1, key_prefix=key_prefix, client=client)
+    run_id = "bench-run"
+    payload = {"messages": [{"type": "ai", "content": "x" * args.payload_bytes}]}
+    subscribed = asyncio.Event()
+    ready = 0
+    peak_connections = 0
+
+    async def watcher() -> None:
+        nonlocal ready
+        stream = bridge.subscribe(run_id, heartbeat_interval=1.0) if shared else _per_watcher_subscribe(bridge, run_id, 1.0)
+        seen = 0
+        async for entry in stream:
+            if entry is HEARTBEAT_SENTINEL:
+                continue
+            if seen == 0:
+                ready += 1
+                if ready == args.watchers:
+                    subscribed.set()
+            seen += 1
+            if entry is END_SENTINEL:
+                return
+
+    try:
+        xread_before = await _xread_calls(admin)
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        await bridge.publish(run_id, "metadata", {"run_id": run_id})
+        watchers = [asyncio.create_task(watcher()) for _ in range(args.watchers)]
+        await subscribed.wait()
+        peak_connections = await _bridge_connections(admin, client_name)
+        for i in range(args.events):
+            await bridge.publish(run_id, "values", {"step": i, **payload})
+            if i % 50 == 0:
+                peak_connections = max(peak_connections, await _bridge_connections(admin, client_name))
+        await bridge.publish_end(run_id)
+        await asyncio.gather(*watchers)
+        cpu, wall = time.process_time() - cpu_start, time.perf_counter() - wall_start
+        # The admin connection's own commands are not XREADs, so the delta is the bridge's.
+        xreads = await _xread_calls(admin) - xread_before
+    finally:
+        await bridge.cleanup(run_id)
+        await bridge.close()
+        await client.aclose()
+    return label, xreads, peak_connections, cpu, wall
+
+
+async def _run(args: argparse.Namespace) -> None:
+    admin = Redis.from_url(args.redis_url, decode_responses=True)
+    try:
+        results = [
+            await _run_mode(args, admin, "per-watcher", shared=False),
+            await _run_mode(args, admin, "shared reader", shared=True),
+        ]
+    finally:
+        await admin.aclose()
+
+    print(f"{args.watchers} watchers, {args.events} events of ~{args.payload_bytes} bytes\n")
+    print(f"{'mode':<16}{'XREADs':>10}{'conns':>8}{'cpu s':>10}{'wall s':>10}")
+    for label, xreads, connections, cpu, wall in results:
+        print(f"{label:<16}{xreads:>10}{connections:>8}{cpu:>10.2f}{wall:>10.2f}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15", help="Redis server to run against (default: redis://localhost:6379/15)")
+    parser.add_argument("--watchers", type=int, default=50, help="Concurrent subscribers on the run (default: 50)")
+    parser.add_argument("--events", type=int, default=500, help="Events published to the run (default: 500)")
+    parser.add_argument("--payload-bytes", type=int, default=1024, help="Approximate event payload size (default: 1024)")
+    args = parser.parse_args(argv)
+
+    asyncio.run(_run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
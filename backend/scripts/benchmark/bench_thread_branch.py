@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Time and disk usage of cloning a thread's user-data onto a branch.
+
+Fills a thread's uploads, outputs and workspace with ``--size-mb`` of files
+(2 GiB by default) and branches it three ways: the previous byte-by-byte
+``shutil.copytree``, ``clone_tree`` (reflinks where the filesystem supports
+them, copies otherwise) and ``clone_tree`` with ``sandbox.branch_hardlinks``.
+Reports wall time and the blocks actually allocated by each branch, so data
+shared through reflinks or hardlinks is not counted again.
+
+Usage::
+
+    python scripts/benchmark/bench_thread_branch.py
+    python scripts/benchmark/bench_thread_branch.py --size-mb 512 --files 64
+    python scripts/benchmark/bench_thread_branch.py --dir /mnt/btrfs/tmp
+
+Run from ``backend/`` so ``deerflow`` is importable. Needs about three times
+``--size-mb`` of free space on filesystems without reflink support.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from deerflow.utils.file_clone import clone_tree
+
+_CHUNK = 1024 * 1024
+
+
+def _allocated_mb(root: Path, exclude: set[tuple[int, int]]) -> float:
+    blocks = 0
+    seen = set(exclude)
+    for path in root.rglob("*"):
+        st = path.lstat()
+        if path.is_file() and (st.st_dev, st.st_ino) not in seen:
+            seen.add((st.st_dev, st.st_ino))
+            blocks += st.st_blocks
+    return blocks * 512 / (1024 * 1024)
+
+
+def _inodes(root: Path) -> set[tuple[int, int]]:
+    return {(st.st_dev, st.st_ino) for st in (p.lstat() for p in root.rglob("*") if p.is_file())}
+
+
+def _seed(source: Path, size_mb: int, files: int) -> None:
+    chunk = os.urandom(_CHUNK)
+    per_file = max(1, size_mb // files)
+    for i in range(files):
+        directory = source / ("uploads", "outputs", "workspace")[i % 3]
+        directory.mkdir(parents=True, exist_ok=True)
+        with open(directory / f"file-{i}.bin", "wb") as f:
+            for _ in range(per_file):
+                f.write(chunk)
+    os.sync()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=2048, help="Total user-data size in MiB (default: 2048)")
+    parser.add_argument("--files", type=int, default=32, help="Number of files (default: 32)")
+    parser.add_argument("--dir", default=None, help="Scratch directory; its filesystem decides reflink support")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as scratch:
+        scratch_path = Path(scratch)
+        source = scratch_path / "source" / "user-data"
+        _seed(source, args.size_mb, args.files)
+        source_inodes = _inodes(source)
+
+        print(f"branching {args.size_mb} MiB in {args.files} files\n")
+        print(f"{'mode':<22}{'time s':>10}{'new disk MiB':>15}  methods")
+        modes = (
+            ("copytree (before)", None),
+            ("clone_tree", False),
+            ("clone_tree+hardlinks", True),
+        )
+        for index, (name, allow_hardlinks) in enumerate(modes):
+            target = scratch_path / f"branch-{index}" / "user-data"
+            start = time.perf_counter()
+            if allow_hardlinks is None:
+                shutil.copytree(source, target, dirs_exist_ok=True)
+                methods = {"copy": args.files}
+            else:
+                methods = dict(clone_tree(source, target, allow_hardlinks=allow_hardlinks))
+            os.sync()
+            elapsed = time.perf_counter() - start
+            print(f"{name:<22}{elapsed:>10.2f}{_allocated_mb(target, source_inodes):>15.1f}  {methods}")
+            shutil.rmtree(target.parent)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
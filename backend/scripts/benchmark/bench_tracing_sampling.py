@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Agent-thread cost of tracing callbacks: inline, sampled and batched.
+
+Runs ``--runs`` invocations of a ``--steps``-step runnable chain with a
+stand-in provider handler that spends ``--handler-us`` microseconds of CPU
+per callback (serializing inputs, building spans) and then waits
+``--wait-us`` (a provider blocked on its own lock, flush or full buffer).
+Each row times the invocations on the caller's thread:
+
+- ``no tracing``: no callbacks attached
+- ``inline``: the provider handler attached directly (today's default)
+- ``inline, N%``: head sampling at ``--rate``, with errored-run buffering on
+- ``batched``: every run, handed to the background exporter
+- ``batched, N%``: sampling and batched export together
+
+``exported`` counts callbacks that reached the provider and ``dropped``
+counts queue overflows (see ``--queue-size``). Batched export moves waiting
+off the agent's thread; CPU spent in the provider still shares the GIL.
+
+Usage::
+
+    python scripts/benchmark/bench_tracing_sampling.py
+    python scripts/benchmark/bench_tracing_sampling.py --runs 500 --steps 40 --handler-us 50 --wait-us 0 --rate 0.05
+
+Run from ``backend/`` so ``deerflow`` is importable.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.runnables import RunnableLambda
+
+from deerflow.config.tracing_config import TracingSamplingConfig
+from deerflow.tracing.sampling import SampledTracingHandler, TraceExporter
+
+
+class _StandInProvider(BaseCallbackHandler):
+    run_inline = True
+
+    def __init__(self, cost_s: float, wait_s: float) -> None:
+        self.cost_s = cost_s
+        self.wait_s = wait_s
+        self.calls = 0
+
+    def _work(self) -> None:
+        self.calls += 1
+        end = time.perf_counter() + self.cost_s
+        while time.perf_counter() < end:
+            pass
+        if self.wait_s:
+            time.sleep(self.wait_s)
+
+    def on_chain_start(self, serialized, inputs, **kwargs) -> None:
+        self._work()
+
+    def on_chain_end(self, outputs, **kwargs) -> None:
+        self._work()
+
+
+def _chain(steps: int):
+    chain = RunnableLambda(lambda x: x + 1)
+    for _ in range(steps - 1):
+        chain = chain | RunnableLambda(lambda x: x + 1)
+    return chain
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=200, help="Invocations per row (default: 200)")
+    parser.add_argument("--steps", type=int, default=20, help="Steps in the chain (default: 20)")
+    parser.add_argument("--handler-us", type=float, default=30.0, help="Provider CPU cost per callback in microseconds (default: 30)")
+    parser.add_argument("--wait-us", type=float, default=100.0, help="Provider wait per callback in microseconds (default: 100)")
+    parser.add_argument("--rate", type=float, default=0.1, help="Head sampling rate for the sampled rows (default: 0.1)")
+    parser.add_argument("--queue-size", type=int, default=10_000, help="Export queue bound (default: 10000)")
+    args = parser.parse_args(argv)
+
+    chain = _chain(args.steps)
+    cost_s, wait_s = args.handler_us / 1e6, args.wait_us / 1e6
+    pct = f"{args.rate:.0%}"
+    print(f"{args.runs} runs x {args.steps} steps, {args.handler_us:g} us CPU + {args.wait_us:g} us wait per provider callback\n")
+    print(f"{'mode':<16}{'ms/run':>9}{'exported':>10}{'dropped':>9}")
+
+    def row(label: str, make_callbacks) -> None:
+        # One untimed run so lazy imports are not billed to the first row.
+        chain.invoke(0, {"callbacks": make_callbacks(_StandInProvider(0.0, 0.0), TraceExporter())})
+        provider = _StandInProvider(cost_s, wait_s)
+        exporter = TraceExporter(queue_size=args.queue_size)
+        callbacks = make_callbacks(provider, exporter)
+        start = time.perf_counter()
+        for i in range(args.runs):
+            chain.invoke(i, {"callbacks": callbacks, "metadata": {"deerflow_trace_id": f"trace-{i}"}})
+        elapsed = (time.perf_counter() - start) / args.runs * 1000
+        exporter.flush(timeout=60)
+        exporter.close()
+        print(f"{label:<16}{elapsed:>9.2f}{provider.calls:>10}{exporter.snapshot().events_dropped:>9}")
+
+    def sampled(mode: str, rate: float):
+        return lambda provider, exporter: [SampledTracingHandler([provider], TracingSamplingConfig(sample_rate=rate, export_mode=mode), exporter=exporter)]
+
+    row("no tracing", lambda provider, exporter: [])
+    row("inline", lambda provider, exporter: [provider])
+    row(f"inline, {pct}", sampled("inline", args.rate))
+    row("batched", sampled("batched", 1.0))
+    row(f"batched, {pct}", sampled("batched", args.rate))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Headless cost of redrawing the TUI transcript while an answer streams.
+
+Builds a ``--messages``-row transcript (alternating questions and Markdown
+answers with headings, lists and code blocks), then streams ``--tokens``
+tokens into a new answer and redraws every ``--tokens-per-frame`` tokens,
+the way the app's frame timer does. Two redraw paths are timed:
+
+- ``full rebuild``: lay out ``render_transcript(state)`` as a whole (the
+  previous ``Static`` transcript); sampled on ``--sample-frames`` frames
+  because it is slow, the stream total is extrapolated
+- ``cached``: ``TranscriptRenderer.lines``, which ``TranscriptView`` feeds
+  to the line API so only the lines on screen become strips
+
+Usage::
+
+    python scripts/benchmark/bench_tui_transcript.py
+    python scripts/benchmark/bench_tui_transcript.py --messages 400 --tokens 100000 --width 160
+
+Run from ``backend/`` so ``deerflow`` is importable.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import random
+import statistics
+import time
+
+from rich.console import Console
+
+from deerflow.tui.render import TranscriptRenderer, render_transcript
+from deerflow.tui.view_state import AssistantDelta, RunEnded, RunStarted, UserSubmitted, initial_state, reduce
+
+_WORDS = "the agent reads files runs tools and writes a short report about each result it finds".split()
+
+
+def _answer(rng: random.Random, index: int) -> str:
+    paragraphs = [f"## Step {index}"]
+    for _ in range(3):
+        paragraphs.append(" ".join(rng.choice(_WORDS) for _ in range(60)))
+    paragraphs.append("\n".join(f"- **item {n}**: {' '.join(rng.choice(_WORDS) for _ in range(8))}" for n in range(5)))
+    paragraphs.append(f"```python\ndef step_{index}(value):\n    return value * {index}\n```")
+    return "\n\n".join(paragraphs)
+
+
+def _transcript(messages: int, rng: random.Random):
+    state = initial_state()
+    for i in range(messages // 2):
+        state = reduce(state, UserSubmitted(f"question {i}: {' '.join(rng.choice(_WORDS) for _ in range(12))}"))
+        state = reduce(state, RunStarted())
+        state = reduce(state, AssistantDelta(id=f"answer-{i}", text=_answer(rng, i)))
+        state = reduce(state, RunEnded())
+    state = reduce(state, UserSubmitted("one more, in depth please"))
+    return reduce(state, RunStarted())
+
+
+def _tokens(count: int, rng: random.Random):
+    for n in range(1, count + 1):
+        word = rng.choice(_WORDS)
+        yield word + ("\n\n" if n % 120 == 0 else "\n" if n % 15 == 0 else " ")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=200, help="Rows already in the transcript (default: 200)")
+    parser.add_argument("--tokens", type=int, default=50_000, help="Tokens streamed into the new answer (default: 50000)")
+    parser.add_argument("--tokens-per-frame", type=int, default=25, help="Tokens between redraws (default: 25)")
+    parser.add_argument("--width", type=int, default=120, help="Terminal width (default: 120)")
+    parser.add_argument("--sample-frames", type=int, default=10, help="Frames timed on the full-rebuild path (default: 10)")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    console = Console(file=io.StringIO(), width=args.width, color_system="truecolor", force_terminal=True)
+    options = console.options.update_width(args.width)
+    base = _transcript(args.messages, rng)
+
+    frames = []
+    state = base
+    for n, token in enumerate(_tokens(args.tokens, rng), 1):
+        state = reduce(state, AssistantDelta(id="streaming", text=token))
+        if n % args.tokens_per_frame == 0:
+            frames.append(state)
+    sampled = frames[:: max(1, len(frames) // args.sample_frames)][: args.sample_frames]
+
+    full = []
+    for frame in sampled:
+        start = time.perf_counter()
+        console.render_lines(render_transcript(frame), options, pad=False)
+        full.append(time.perf_counter() - start)
+
+    renderer = TranscriptRenderer()
+    start = time.perf_counter()
+    lines = renderer.lines(base, console, args.width)
+    first_layout = time.perf_counter() - start
+    cached = []
+    for frame in frames:
+        start = time.perf_counter()
+        lines = renderer.lines(frame, console, args.width)
+        cached.append(time.perf_counter() - start)
+
+    print(f"{args.messages} rows + {args.tokens} streamed tokens, {len(frames)} frames at width {args.width}, {len(lines)} transcript lines\n")
+    print(f"{'path':<15}{'mean ms':>10}{'max ms':>10}{'stream s':>10}")
+    print(f"{'full rebuild':<15}{statistics.mean(full) * 1000:>10.1f}{max(full) * 1000:>10.1f}{statistics.mean(full) * len(frames):>10.1f}  (extrapolated from {len(full)} frames)")
+    print(f"{'cached':<15}{statistics.mean(cached) * 1000:>10.2f}{max(cached) * 1000:>10.2f}{sum(cached):>10.2f}  (+{first_layout * 1000:.0f} ms first layout)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
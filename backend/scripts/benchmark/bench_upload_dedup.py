@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Disk usage and time for one file uploaded into many threads, with and without ``uploads.dedup``.
+
+Materializes a ``--size-mb`` file into ``--threads`` thread directories —
+once as independent copies (dedup off) and once through ``UploadBlobStore``
+(dedup on, which reflinks where the filesystem supports it and copies
+otherwise; ``--hardlinks`` also allows hardlinks). Reports wall time and the
+blocks actually allocated, so reflinked and hardlinked data is counted once.
+
+Usage::
+
+    python scripts/benchmark/bench_upload_dedup.py
+    python scripts/benchmark/bench_upload_dedup.py --threads 50 --size-mb 20 --hardlinks
+    python scripts/benchmark/bench_upload_dedup.py --dir /mnt/btrfs/tmp
+
+Run from ``backend/`` so ``deerflow`` is importable.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from deerflow.uploads.blob_store import UploadBlobStore
+
+
+def _allocated_mb(root: Path) -> float:
+    seen: set[tuple[int, int]] = set()
+    blocks = 0
+    for path in root.rglob("*"):
+        st = path.lstat()
+        if path.is_file() and (st.st_dev, st.st_ino) not in seen:
+            seen.add((st.st_dev, st.st_ino))
+            blocks += st.st_blocks
+    return blocks * 512 / (1024 * 1024)
+
+
+def _run_copies(root: Path, source: Path, threads: int) -> float:
+    start = time.perf_counter()
+    for i in range(threads):
+        dest = root / f"thread-{i}" / source.name
+        dest.parent.mkdir(parents=True)
+        shutil.copyfile(source, dest)
+    return time.perf_counter() - start
+
+
+def _run_dedup(root: Path, source: Path, threads: int, hardlinks: bool) -> tuple[float, str]:
+    store = UploadBlobStore(root / "upload-blobs", allow_hardlinks=hardlinks)
+    method = ""
+    start = time.perf_counter()
+    for i in range(threads):
+        dest = root / f"thread-{i}" / source.name
+        dest.parent.mkdir(parents=True)
+        # The gateway streams each upload to a staging file while hashing it.
+        staged = dest.with_name(".staged")
+        digest = hashlib.sha256()
+        with open(source, "rb") as src, open(staged, "wb") as dst:
+            while chunk := src.read(1024 * 1024):
+                digest.update(chunk)
+                dst.write(chunk)
+        method = store.add(f"thread-{i}", source.name, staged, digest.hexdigest(), dest)
+    return time.perf_counter() - start, method
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=20, help="Threads receiving the same upload (default: 20)")
+    parser.add_argument("--size-mb", type=int, default=10, help="Upload size in MiB (default: 10)")
+    parser.add_argument("--hardlinks", action="store_true", help="Allow hardlinks (uploads.dedup_hardlinks)")
+    parser.add_argument("--dir", default=None, help="Scratch directory; its filesystem decides reflink support")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as scratch:
+        scratch_path = Path(scratch)
+        source = scratch_path / "dataset.bin"
+        source.write_bytes(os.urandom(args.size_mb * 1024 * 1024))
+
+        copies_root = scratch_path / "copies"
+        copy_elapsed = _run_copies(copies_root, source, args.threads)
+        dedup_root = scratch_path / "dedup"
+        dedup_elapsed, method = _run_dedup(dedup_root, source, args.threads, args.hardlinks)
+
+        print(f"{args.threads} threads x {args.size_mb} MiB, dedup materialized by {method}\n")
+        print(f"{'mode':<10}{'time s':>10}{'disk MiB':>12}")
+        print(f"{'copies':<10}{copy_elapsed:>10.2f}{_allocated_mb(copies_root):>12.1f}")
+        print(f"{'dedup':<10}{dedup_elapsed:>10.2f}{_allocated_mb(dedup_root):>12.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -93,6 +93,26 @@ def _reset_skill_storage_singleton():
         reset_skill_storage()
 
 
+@pytest.fixture(autouse=True)
+def _reset_skill_scan_cache():
+    """Give every test an empty SkillScan result cache.
+
+    Results are keyed by content, so a finding cached while one test had an
+    analyzer monkeypatched would otherwise be served to a later test scanning
+    the same bytes.
+    """
+    try:
+        from deerflow.skills.skillscan.cache import reset_scan_cache
+    except ImportError:
+        yield
+        return
+    reset_scan_cache()
+    try:
+        yield
+    finally:
+        reset_scan_cache()
+
+
 @pytest.fixture(autouse=True)
 def _restore_title_config_singleton():
     """Reset ``_title_config`` to its pristine default after every test.
@@ -1,6 +1,7 @@
 """Tests for AioSandbox concurrent command serialization (#1433)."""
 
 import threading
+import time
 from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
@@ -342,7 +343,8 @@ class TestConcurrentFileWrites:
             return snapshot
 
         def write_back(*, file, content, **kwargs):
-            storage["content"] = content
+            with state_lock:
+                storage["content"] = storage["content"] + content if kwargs.get("append") else content
             return SimpleNamespace(data=SimpleNamespace())
 
         sandbox.read_file = overlapping_read_file
@@ -366,6 +368,38 @@ class TestConcurrentFileWrites:
 
         assert storage["content"] in {"seed\nA\nB\n", "seed\nB\nA\n"}
 
+    def test_append_sends_only_the_new_content(self, sandbox):
+        sandbox.read_file = MagicMock(side_effect=AssertionError("append must not download the file"))
+        sandbox._client.file.write_file = MagicMock()
+
+        sandbox.write_file("/tmp/shared.log", "tail\n", append=True)
+
+        sandbox._client.file.write_file.assert_called_once_with(file="/tmp/shared.log", content="tail\n", append=True)
+
+    def test_write_files_writes_every_file_concurrently(self, sandbox):
+        written = {}
+        in_flight = 0
+        peak = 0
+        state_lock = threading.Lock()
+
+        def write(*, file, content, **kwargs):
+            nonlocal in_flight, peak
+            with state_lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.02)
+            with state_lock:
+                in_flight -= 1
+                written[file] = content
+
+        sandbox._client.file.write_file = write
+        files = {f"/mnt/user-data/outputs/f{i}.txt": f"body {i}" for i in range(20)}
+
+        sandbox.write_files(files)
+
+        assert written == files
+        assert 1 < peak <= sandbox._WRITE_FILES_CONCURRENCY
+
 
 class TestDownloadFile:
     """Tests for AioSandbox.download_file."""
@@ -0,0 +1,174 @@
+"""Tests for the single-call AIO sandbox grep (``remote_grep``).
+
+The sandbox's shell is stood in for by running the generated command
+locally, so the in-sandbox script itself is exercised: both engines must
+agree with ``find_grep_matches`` on ignore rules, truncation and
+case/literal semantics, and images without ``python3`` must fall back to
+concurrent per-file searches.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from deerflow.community.aio_sandbox.aio_sandbox import AioSandbox
+from deerflow.sandbox.search import GrepMatch, find_grep_matches
+
+
+def _sandbox(path_env: str | None = None) -> tuple[AioSandbox, list[str]]:
+    with patch("deerflow.community.aio_sandbox.aio_sandbox.AioSandboxClient"):
+        sandbox = AioSandbox(id="test-sandbox", base_url="http://localhost:8080")
+    commands: list[str] = []
+
+    def exec_command(command, **kwargs):
+        commands.append(command)
+        env = dict(os.environ, PATH=path_env) if path_env is not None else None
+        completed = subprocess.run(["/bin/sh", "-c", command], capture_output=True, text=True, env=env)
+        return SimpleNamespace(data=SimpleNamespace(output=completed.stdout + completed.stderr))
+
+    sandbox._client.shell.exec_command = exec_command
+    return sandbox, commands
+
+
+def _python_only_path(tmp_path: Path) -> str:
+    bin_dir = tmp_path / "python-only-bin"
+    bin_dir.mkdir()
+    (bin_dir / "python3").symlink_to(sys.executable)
+    return str(bin_dir)
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    root = tmp_path / "workspace"
+    (root / "src" / "pkg").mkdir(parents=True)
+    (root / "node_modules" / "dep").mkdir(parents=True)
+    (root / "src" / "app.py").write_text("import os\n# TODO: fix\nvalue = 'todo'\n", encoding="utf-8")
+    (root / "src" / "pkg" / "util.py").write_text("def helper():\n    return 'TODO later'\n", encoding="utf-8")
+    (root / "src" / "notes.md").write_text("TODO (a+b)\n", encoding="utf-8")
+    (root / "node_modules" / "dep" / "index.js").write_text("// TODO ignored\n", encoding="utf-8")
+    (root / "debug.log").write_text("TODO in a log\n", encoding="utf-8")
+    (root / "blob.bin").write_bytes(b"TODO\x00binary")
+    (root / "src" / "long.txt").write_text("TODO" + "x" * 5000 + "\nTODO short\n", encoding="utf-8")
+    return root
+
+
+def _expected(root: Path, pattern: str, **kwargs) -> list[GrepMatch]:
+    matches, _ = find_grep_matches(root, pattern, **kwargs)
+    return sorted(matches, key=lambda m: (m.path, m.line_number))
+
+
+@pytest.mark.parametrize(
+    ("pattern", "kwargs"),
+    [
+        ("TODO", {}),
+        ("TODO", {"case_sensitive": True}),
+        ("(a+b)", {"literal": True}),
+        (r"TODO\b", {"glob_pattern": "**/*.py"}),
+    ],
+)
+def test_walk_engine_matches_local_grep_semantics(tmp_path, workspace, pattern, kwargs):
+    sandbox, commands = _sandbox(path_env=_python_only_path(tmp_path))
+    glob = kwargs.pop("glob_pattern", None)
+
+    matches, truncated = sandbox.grep(str(workspace), pattern, glob=glob, max_results=100, **kwargs)
+
+    assert len(commands) == 1
+    assert sorted(matches, key=lambda m: (m.path, m.line_number)) == _expected(workspace, pattern, glob_pattern=glob, **kwargs)
+    assert truncated is False
+    sandbox._client.file.search_in_file.assert_not_called()
+
+
+def test_rg_engine_matches_local_grep_semantics(workspace):
+    if shutil.which("rg") is None:
+        pytest.skip("ripgrep not installed")
+    sandbox, _ = _sandbox()
+
+    matches, _ = sandbox.grep(str(workspace), "todo")
+
+    assert sorted(matches, key=lambda m: (m.path, m.line_number)) == _expected(workspace, "todo")
+
+
+def test_engines_truncate_to_the_same_matches(tmp_path, workspace):
+    if shutil.which("rg") is None:
+        pytest.skip("ripgrep not installed")
+    with_rg, _ = _sandbox()
+    walk_only, _ = _sandbox(path_env=_python_only_path(tmp_path))
+
+    assert with_rg.grep(str(workspace), "todo", max_results=3) == walk_only.grep(str(workspace), "todo", max_results=3)
+
+
+def test_max_results_truncates(tmp_path, workspace):
+    sandbox, _ = _sandbox(path_env=_python_only_path(tmp_path))
+
+    matches, truncated = sandbox.grep(str(workspace), "TODO", max_results=2)
+
+    assert len(matches) == 2
+    assert truncated is True
+
+
+def test_missing_root_raises(tmp_path):
+    sandbox, _ = _sandbox(path_env=_python_only_path(tmp_path))
+
+    with pytest.raises(FileNotFoundError):
+        sandbox.grep(str(tmp_path / "missing"), "TODO")
+
+
+def test_image_without_python_falls_back_to_concurrent_file_searches(tmp_path):
+    sandbox, commands = _sandbox(path_env=str(tmp_path / "empty-bin"))
+    files = [f"/mnt/user-data/workspace/f{i}.py" for i in range(20)]
+    sandbox._client.file.list_path = lambda **kwargs: SimpleNamespace(data=SimpleNamespace(files=[SimpleNamespace(path=p, is_directory=False) for p in files]))
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def search_in_file(file, regex):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.02)
+        with lock:
+            in_flight -= 1
+        return SimpleNamespace(data=SimpleNamespace(line_numbers=[1], matches=[f"TODO in {file}"]))
+
+    sandbox._client.file.search_in_file = search_in_file
+
+    matches, truncated = sandbox.grep("/mnt/user-data/workspace", "TODO", max_results=12)
+
+    assert [m.path for m in matches] == files[:12]
+    assert truncated is True
+    assert 1 < peak <= AioSandbox._GREP_FALLBACK_CONCURRENCY
+    # The unsupported image is remembered: the next grep skips the shell call.
+    sandbox.grep("/mnt/user-data/workspace", "TODO", max_results=1)
+    assert len(commands) == 1
+
+
+def test_transient_failure_falls_back_for_that_call_only(tmp_path, workspace):
+    sandbox, commands = _sandbox(path_env=_python_only_path(tmp_path))
+    real_exec = sandbox._client.shell.exec_command
+    outputs = iter(["bash: line 1: connection reset\n"])
+
+    def flaky_exec(command, **kwargs):
+        output = next(outputs, None)
+        if output is None:
+            return real_exec(command, **kwargs)
+        commands.append(command)
+        return SimpleNamespace(data=SimpleNamespace(output=output))
+
+    sandbox._client.shell.exec_command = flaky_exec
+    sandbox._client.file.list_path = lambda **kwargs: SimpleNamespace(data=SimpleNamespace(files=[]))
+
+    assert sandbox.grep(str(workspace), "TODO") == ([], False)
+    assert sandbox._remote_grep_unsupported is False
+
+    matches, _ = sandbox.grep(str(workspace), "TODO")
+    assert len(commands) == 2
+    assert sorted(matches, key=lambda m: (m.path, m.line_number)) == _expected(workspace, "TODO")
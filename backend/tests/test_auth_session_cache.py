@@ -0,0 +1,361 @@
+"""Tests for the verified-session cache in front of request authentication.
+
+The contract tests run against every backend through one fixture. Redis
+coverage is opt-in and self-skipping like the sandbox ownership store: point
+``DEER_FLOW_TEST_REDIS_URL`` at a server (default redis://localhost:6379/15).
+The redis backend's atomicity lives in Lua scripts, so there is no fake tier.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import uuid
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.gateway.auth import create_access_token
+from app.gateway.auth.config import AuthConfig, set_auth_config
+from app.gateway.auth.models import User
+from app.gateway.auth.session_cache import (
+    MemorySessionCache,
+    get_session_cache,
+    invalidate_user_sessions,
+    make_session_cache,
+    reset_session_cache,
+    resolve_session_cache_config,
+    set_session_cache,
+)
+from deerflow.config.auth_config import SessionCacheConfig
+from deerflow.config.stream_bridge_config import StreamBridgeConfig
+
+REDIS_TEST_URL = os.environ.get("DEER_FLOW_TEST_REDIS_URL", "redis://localhost:6379/15")
+_JWT_SECRET = "test-secret-key-for-session-cache-testing-min-32"
+
+
+def _redis_available() -> bool:
+    try:
+        import redis
+    except ImportError:
+        return False
+    try:
+        client = redis.Redis.from_url(REDIS_TEST_URL, socket_connect_timeout=0.5)
+        try:
+            client.ping()
+        finally:
+            client.close()
+        return True
+    except Exception:
+        return False
+
+
+requires_redis = pytest.mark.skipif(not _redis_available(), reason=f"Redis not reachable at {REDIS_TEST_URL}")
+
+
+@pytest.fixture(autouse=True)
+def _auth_config():
+    set_auth_config(AuthConfig(jwt_secret=_JWT_SECRET))
+    yield
+
+
+@pytest.fixture(autouse=True)
+def _reset_session_cache_singleton():
+    # Tokens minted in the same second for the same user are byte-identical, so
+    # a cache installed by one test must not answer the next test's requests.
+    reset_session_cache()
+    yield
+    reset_session_cache()
+
+
+@pytest.fixture(params=["memory", pytest.param("redis", marks=[requires_redis, pytest.mark.integration])])
+def make_cache(request):
+    """Build caches of one backend; several caches share a keyspace like workers do."""
+    made = []
+    prefix = f"deerflow:test:{uuid.uuid4().hex}"
+    shared = MemorySessionCache(ttl_seconds=30)
+
+    def _make(ttl_seconds: float = 30):
+        if request.param == "memory":
+            cache = shared if ttl_seconds == 30 else MemorySessionCache(ttl_seconds=ttl_seconds)
+        else:
+            from app.gateway.auth.session_cache_redis import RedisSessionCache
+
+            cache = RedisSessionCache(redis_url=REDIS_TEST_URL, ttl_seconds=ttl_seconds, key_prefix=prefix)
+        made.append(cache)
+        return cache
+
+    yield _make
+
+    async def _cleanup():
+        for cache in made:
+            await cache.clear()
+            await cache.close()
+
+    asyncio.run(_cleanup())
+
+
+def _user(token_version: int = 0) -> User:
+    return User(id=uuid4(), email="user@example.com", password_hash="hash", token_version=token_version)
+
+
+def _expiry(seconds: float = 3600) -> datetime:
+    return datetime.now(UTC) + timedelta(seconds=seconds)
+
+
+# ── Backend contract ─────────────────────────────────────────────────────
+
+
+def test_put_get_and_invalidate_across_workers(make_cache):
+    worker_a, worker_b = make_cache(), make_cache()
+    user = _user()
+
+    async def scenario():
+        generation = await worker_a.generation(str(user.id))
+        await worker_a.put("tok-1", user, expires_at=_expiry(), generation=generation)
+        await worker_a.put("tok-2", user, expires_at=_expiry(), generation=generation)
+        hit = await worker_b.get("tok-1")
+        await worker_b.invalidate_user(str(user.id))
+        return hit, await worker_a.get("tok-1"), await worker_a.get("tok-2")
+
+    hit, after_1, after_2 = asyncio.run(scenario())
+    assert hit == user
+    assert (after_1, after_2) == (None, None)
+
+
+def test_put_after_invalidation_with_stale_generation_is_refused(make_cache):
+    cache = make_cache()
+    user = _user()
+
+    async def scenario():
+        # A lookup reads the generation and the (old) user row, then a
+        # password change invalidates before the lookup caches its result.
+        generation = await cache.generation(str(user.id))
+        await cache.invalidate_user(str(user.id))
+        await cache.put("tok", user, expires_at=_expiry(), generation=generation)
+        return await cache.get("tok")
+
+    assert asyncio.run(scenario()) is None
+
+
+def test_entry_never_outlives_the_token(make_cache):
+    cache = make_cache()
+    user = _user()
+
+    async def scenario():
+        generation = await cache.generation(str(user.id))
+        await cache.put("expired", user, expires_at=_expiry(-1), generation=generation)
+        await cache.put("expiring", user, expires_at=_expiry(0.05), generation=generation)
+        first = await cache.get("expiring")
+        await asyncio.sleep(0.1)
+        return await cache.get("expired"), first, await cache.get("expiring")
+
+    expired, first, later = asyncio.run(scenario())
+    assert expired is None
+    assert first == user
+    assert later is None
+
+
+def test_returned_user_is_a_copy(make_cache):
+    cache = make_cache()
+    user = _user()
+
+    async def scenario():
+        await cache.put("tok", user, expires_at=_expiry(), generation=await cache.generation(str(user.id)))
+        hit = await cache.get("tok")
+        hit.password_hash = "mutated"
+        return await cache.get("tok")
+
+    assert asyncio.run(scenario()).password_hash == "hash"
+
+
+# ── Memory backend ───────────────────────────────────────────────────────
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemorySessionCache(max_entries=2)
+    users = [_user() for _ in range(3)]
+
+    async def scenario():
+        await cache.put("t0", users[0], expires_at=_expiry(), generation=0)
+        await cache.put("t1", users[1], expires_at=_expiry(), generation=0)
+        await cache.get("t0")
+        await cache.put("t2", users[2], expires_at=_expiry(), generation=0)
+        return [await cache.get(t) is not None for t in ("t0", "t1", "t2")]
+
+    assert asyncio.run(scenario()) == [True, False, True]
+    assert len(cache) == 2
+
+
+# ── Config resolution ────────────────────────────────────────────────────
+
+
+def test_type_is_inferred_from_the_stream_bridge(monkeypatch):
+    monkeypatch.delenv("DEER_FLOW_STREAM_BRIDGE_REDIS_URL", raising=False)
+    assert resolve_session_cache_config(SessionCacheConfig()).type == "memory"
+
+    inferred = resolve_session_cache_config(SessionCacheConfig(), stream_bridge=StreamBridgeConfig(type="redis", redis_url="redis://bridge:6379/1"))
+    assert (inferred.type, inferred.redis_url) == ("redis", "redis://bridge:6379/1")
+
+    monkeypatch.setenv("DEER_FLOW_STREAM_BRIDGE_REDIS_URL", "redis://env:6379/0")
+    assert resolve_session_cache_config(SessionCacheConfig()).type == "redis"
+    assert resolve_session_cache_config(SessionCacheConfig(type="memory")).type == "memory"
+
+
+def test_disabled_cache_is_none():
+    assert SessionCacheConfig().enabled is False
+    assert make_session_cache(SessionCacheConfig()) is None
+    assert make_session_cache(SessionCacheConfig(enabled=False)) is None
+
+
+# ── Request authentication ───────────────────────────────────────────────
+
+
+def _request(token: str):
+    request = MagicMock()
+    request.cookies = {"access_token": token}
+    return request
+
+
+def test_repeated_requests_hit_the_cache():
+    from app.gateway.deps import get_current_user_from_request
+
+    set_session_cache(MemorySessionCache())
+    user = _user(token_version=2)
+    token = create_access_token(str(user.id), token_version=2)
+    provider = MagicMock(get_user=AsyncMock(return_value=user))
+
+    async def scenario():
+        return [await get_current_user_from_request(_request(token)) for _ in range(3)]
+
+    with patch("app.gateway.deps.get_local_provider", return_value=provider):
+        users = asyncio.run(scenario())
+
+    assert users == [user] * 3
+    assert provider.get_user.await_count == 1
+
+
+def test_rejected_sessions_are_not_cached():
+    from fastapi import HTTPException
+
+    from app.gateway.deps import get_current_user_from_request
+
+    cache = MemorySessionCache()
+    set_session_cache(cache)
+    user = _user(token_version=1)
+    stale = create_access_token(str(user.id), token_version=0)
+
+    with patch("app.gateway.deps.get_local_provider", return_value=MagicMock(get_user=AsyncMock(return_value=user))):
+        with pytest.raises(HTTPException):
+            asyncio.run(get_current_user_from_request(_request(stale)))
+
+    assert len(cache) == 0
+
+
+def test_expired_token_is_rejected_even_when_cached():
+    """The entry dies with the token, so a hit can never outlive its ``exp``."""
+    from fastapi import HTTPException
+
+    from app.gateway.deps import get_current_user_from_request
+
+    cache = MemorySessionCache(ttl_seconds=3600)
+    set_session_cache(cache)
+    user = _user()
+    token = create_access_token(str(user.id), expires_delta=timedelta(seconds=2))
+    provider = MagicMock(get_user=AsyncMock(return_value=user))
+
+    async def scenario():
+        assert await get_current_user_from_request(_request(token)) == user
+        assert len(cache) == 1
+        await asyncio.sleep(2.1)
+        with pytest.raises(HTTPException) as exc:
+            await get_current_user_from_request(_request(token))
+        return exc.value
+
+    with patch("app.gateway.deps.get_local_provider", return_value=provider):
+        rejected = asyncio.run(scenario())
+
+    assert rejected.status_code == 401
+    assert provider.get_user.await_count == 1
+
+
+def test_revoked_token_is_rejected_after_invalidation():
+    from fastapi import HTTPException
+
+    from app.gateway.deps import get_current_user_from_request
+
+    cache = MemorySessionCache()
+    set_session_cache(cache)
+    user = _user(token_version=0)
+    token = create_access_token(str(user.id), token_version=0)
+    provider = MagicMock(get_user=AsyncMock(return_value=user))
+
+    async def scenario():
+        assert await get_current_user_from_request(_request(token)) == user
+        # Revocation from a code path that updates the row directly.
+        user.token_version = 1
+        await invalidate_user_sessions(str(user.id))
+        with pytest.raises(HTTPException) as exc:
+            await get_current_user_from_request(_request(token))
+        return exc.value
+
+    with patch("app.gateway.deps.get_local_provider", return_value=provider):
+        rejected = asyncio.run(scenario())
+
+    assert rejected.status_code == 401
+    assert len(cache) == 0
+
+
+def test_password_change_drops_cached_sessions(tmp_path):
+    """update_user() on the real repository invalidates before the next request."""
+    from fastapi import HTTPException
+
+    from app.gateway.auth.local_provider import LocalAuthProvider
+    from app.gateway.auth.repositories.sqlite import SQLiteUserRepository
+    from app.gateway.deps import get_current_user_from_request
+    from deerflow.persistence.engine import close_engine, get_session_factory, init_engine
+
+    cache = MemorySessionCache()
+    set_session_cache(cache)
+
+    async def scenario():
+        await init_engine("sqlite", url=f"sqlite+aiosqlite:///{tmp_path / 'users.db'}", sqlite_dir=str(tmp_path))
+        try:
+            provider = LocalAuthProvider(SQLiteUserRepository(get_session_factory()))
+            user = await provider.create_user(email="owner@example.com", password="correct horse battery staple")
+            token = create_access_token(str(user.id), token_version=user.token_version)
+            with patch("app.gateway.deps.get_local_provider", return_value=provider):
+                assert (await get_current_user_from_request(_request(token))).id == user.id
+                assert len(cache) == 1
+
+                user.token_version += 1
+                await provider.update_user(user)
+                assert len(cache) == 0
+                with pytest.raises(HTTPException) as exc:
+                    await get_current_user_from_request(_request(token))
+                assert exc.value.status_code == 401
+
+                # A role change keeps token_version, so only invalidation
+                # stops the cached "user" role from being served.
+                fresh = create_access_token(str(user.id), token_version=user.token_version)
+                assert (await get_current_user_from_request(_request(fresh))).system_role == "user"
+                user.system_role = "admin"
+                await provider.update_user(user)
+                assert (await get_current_user_from_request(_request(fresh))).system_role == "admin"
+        finally:
+            await close_engine()
+
+    asyncio.run(scenario())
+
+
+def test_no_cache_without_config_file(monkeypatch):
+    import deerflow.config.app_config as app_config_module
+
+    def _missing():
+        raise FileNotFoundError("config.yaml")
+
+    monkeypatch.setattr(app_config_module, "get_app_config", _missing)
+    monkeypatch.delenv("DEER_FLOW_STREAM_BRIDGE_REDIS_URL", raising=False)
+    assert get_session_cache() is None
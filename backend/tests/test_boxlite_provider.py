@@ -8,6 +8,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import subprocess
 import sys
 import threading
 import time
@@ -159,6 +160,46 @@ def test_execute_command_forwards_timeout_to_sdk_and_loop_runner() -> None:
     assert run_timeouts == [5]
 
 
+class _ShellBox(_FakeBox):
+    """Fake box whose ``sh -lc`` runs locally with ``/mnt/user-data`` under *root*."""
+
+    def __init__(self, root, **kwargs):
+        super().__init__(**kwargs)
+        self._root = root
+
+    async def exec(self, *argv, env=None, timeout=None):
+        self._exec_history.append((argv, env, timeout))
+        script = argv[2].replace("/mnt/user-data", f"{self._root}/mnt/user-data")
+        completed = subprocess.run(["/bin/sh", "-c", script], capture_output=True, text=True)
+        return types.SimpleNamespace(stdout=completed.stdout, stderr=completed.stderr, exit_code=completed.returncode)
+
+
+def test_write_file_append_is_a_single_exec(tmp_path) -> None:
+    fake = _ShellBox(tmp_path, name="box-id")
+    box = BoxliteBox("box-id", box=fake, run=_fake_run)
+
+    box.write_file("/mnt/user-data/workspace/new/log.txt", "one\n", append=True)
+    box.write_file("/mnt/user-data/workspace/new/log.txt", "two\n", append=True)
+
+    assert len(fake._exec_history) == 2
+    assert (tmp_path / "mnt/user-data/workspace/new/log.txt").read_text() == "one\ntwo\n"
+
+
+def test_write_files_batches_small_files_into_one_exec(tmp_path) -> None:
+    fake = _ShellBox(tmp_path, name="box-id")
+    box = BoxliteBox("box-id", box=fake, run=_fake_run)
+    files = {f"/mnt/user-data/outputs/d{i % 3}/f{i}.txt": f"body {i}\n" for i in range(50)}
+    files["/mnt/user-data/outputs/empty.txt"] = ""
+    files["/mnt/user-data/outputs/big.bin"] = "z" * 100_000
+
+    box.write_files(files)
+
+    for path, content in files.items():
+        assert (tmp_path / path.lstrip("/")).read_text() == content
+    # One exec for all the small files, one per chunk of the big one.
+    assert len(fake._exec_history) == 4
+
+
 def test_execute_command_invalidates_box_on_terminal_transport_error() -> None:
     invalidated: list[tuple[str, str]] = []
 
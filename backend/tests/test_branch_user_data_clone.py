@@ -0,0 +1,126 @@
+"""Tests for cloning a thread's user-data onto a branch without copying its bytes.
+
+A branch must see the parent's files, and neither thread may see the
+other's later edits: reflinks guarantee that on their own, hardlinks
+(``sandbox.branch_hardlinks``) only together with the LocalSandbox file
+tools copying a shared file before writing it.
+"""
+
+import os
+import stat
+
+import pytest
+
+from app.gateway.routers import threads
+from deerflow.config.paths import Paths
+from deerflow.sandbox.local.local_sandbox import LocalSandbox, PathMapping
+from deerflow.utils import file_clone
+from deerflow.utils.file_clone import break_hardlink, clone_file
+
+USER_ID = "branch-user"
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return Paths(tmp_path)
+
+
+def _seed_source(paths: Paths) -> None:
+    outputs = paths.sandbox_outputs_dir("source", user_id=USER_ID)
+    uploads = paths.sandbox_uploads_dir("source", user_id=USER_ID)
+    workspace = paths.sandbox_work_dir("source", user_id=USER_ID)
+    for directory in (outputs, uploads, workspace / "data"):
+        directory.mkdir(parents=True, exist_ok=True)
+    (outputs / "report.md").write_text("# report\n", encoding="utf-8")
+    (uploads / "dataset.csv").write_bytes(b"a,b\n1,2\n" * 1000)
+    (uploads / ".upload-stale.part").write_bytes(b"partial")
+    (workspace / "data" / "run.sh").write_text("echo hi\n", encoding="utf-8")
+    os.chmod(workspace / "data" / "run.sh", 0o755)
+    (workspace / "link").symlink_to(outputs / "report.md")
+
+
+def _branch(paths: Paths, *, allow_hardlinks: bool):
+    mode = threads._copy_branch_user_data_sync(paths, "source", "branch", user_id=USER_ID, allow_hardlinks=allow_hardlinks)
+    assert mode == "current_thread_best_effort"
+    return paths.sandbox_user_data_dir("source", user_id=USER_ID), paths.sandbox_user_data_dir("branch", user_id=USER_ID)
+
+
+def _sandbox(user_data) -> LocalSandbox:
+    return LocalSandbox("t", path_mappings=[PathMapping(container_path="/mnt/user-data", local_path=str(user_data))])
+
+
+def test_branch_without_reflinks_copies_files_and_keeps_modes(paths, monkeypatch):
+    monkeypatch.setattr(file_clone, "try_reflink", lambda source, target: False)
+    _seed_source(paths)
+
+    source, branch = _branch(paths, allow_hardlinks=False)
+
+    assert (branch / "uploads" / "dataset.csv").read_bytes() == (source / "uploads" / "dataset.csv").read_bytes()
+    assert (branch / "uploads" / "dataset.csv").stat().st_ino != (source / "uploads" / "dataset.csv").stat().st_ino
+    assert stat.S_IMODE((branch / "workspace" / "data" / "run.sh").stat().st_mode) == 0o755
+    assert not (branch / "uploads" / ".upload-stale.part").exists()
+    assert not (branch / "workspace" / "link").exists()
+
+
+def test_hardlinked_branch_diverges_on_first_write_through_the_file_tools(paths, monkeypatch):
+    monkeypatch.setattr(file_clone, "try_reflink", lambda source, target: False)
+    _seed_source(paths)
+
+    source, branch = _branch(paths, allow_hardlinks=True)
+
+    assert (branch / "uploads" / "dataset.csv").stat().st_ino == (source / "uploads" / "dataset.csv").stat().st_ino
+    _sandbox(branch).write_file("/mnt/user-data/outputs/report.md", "more\n", append=True)
+    _sandbox(source).update_file("/mnt/user-data/uploads/dataset.csv", b"replaced")
+
+    assert (branch / "outputs" / "report.md").read_text(encoding="utf-8") == "# report\nmore\n"
+    assert (source / "outputs" / "report.md").read_text(encoding="utf-8") == "# report\n"
+    assert (source / "uploads" / "dataset.csv").read_bytes() == b"replaced"
+    assert (branch / "uploads" / "dataset.csv").read_bytes() == b"a,b\n1,2\n" * 1000
+    # Untouched files stay shared.
+    assert (branch / "workspace" / "data" / "run.sh").stat().st_nlink == 2
+
+
+def test_branch_hardlinks_follow_sandbox_config(monkeypatch):
+    class _Config:
+        class sandbox:
+            branch_hardlinks = True
+
+    monkeypatch.setattr("deerflow.config.app_config.get_app_config", lambda: _Config)
+    assert threads._branch_hardlinks_enabled() is True
+
+    def _missing():
+        raise FileNotFoundError("config.yaml")
+
+    monkeypatch.setattr("deerflow.config.app_config.get_app_config", _missing)
+    assert threads._branch_hardlinks_enabled() is False
+
+
+def test_clone_file_prefers_reflink(tmp_path, monkeypatch):
+    source = tmp_path / "source"
+    source.write_bytes(b"payload")
+    reflinked: list[str] = []
+
+    def fake_reflink(src, dst):
+        reflinked.append(dst.name)
+        dst.write_bytes(src.read_bytes())
+        return True
+
+    monkeypatch.setattr(file_clone, "try_reflink", fake_reflink)
+
+    assert clone_file(source, tmp_path / "target", allow_hardlink=True) == "reflink"
+    assert reflinked == ["target"]
+    assert (tmp_path / "target").stat().st_nlink == 1
+
+
+def test_break_hardlink_gives_a_read_only_shared_file_a_writable_private_copy(tmp_path):
+    shared = tmp_path / "blob"
+    shared.write_bytes(b"data")
+    os.chmod(shared, 0o444)
+    os.link(shared, tmp_path / "thread-file")
+
+    assert break_hardlink(tmp_path / "thread-file") is True
+    assert break_hardlink(tmp_path / "thread-file") is False
+    assert (tmp_path / "thread-file").stat().st_ino != shared.stat().st_ino
+    assert (tmp_path / "thread-file").stat().st_mode & stat.S_IWUSR
+    assert shared.stat().st_nlink == 1
+    assert break_hardlink(tmp_path / "missing") is False
@@ -66,7 +66,7 @@ class TestSnapshotRendering:
 class TestBrowserTools:
     async def _patch_session(self, session):
         manager = MagicMock()
-        manager.get_session.return_value = session
+        manager.aget_session = AsyncMock(return_value=session)
         return patch.object(tools, "get_browser_session_manager", return_value=manager), manager
 
     async def test_navigate_returns_snapshot(self):
@@ -83,7 +83,8 @@ class TestBrowserTools:
         assert "Navigated to https://example.com." in content
         assert "[1] a: More info" in content
         session.navigate.assert_awaited_once_with("https://example.com")
-        manager.get_session.assert_called_once()
+        manager.aget_session.assert_awaited_once()
+        manager.release_session.assert_called_once_with("thread-1", session)
 
     async def test_navigate_emits_screenshot_artifact_and_browser_view(self, tmp_path):
         outputs = tmp_path / "outputs"
@@ -143,6 +144,29 @@ class TestBrowserTools:
         assert "private, loopback, or metadata" in result.update["messages"][0].content
         session.navigate.assert_not_awaited()
 
+    async def test_navigate_screens_hostnames_with_the_async_resolver(self):
+        import ipaddress
+
+        session = MagicMock()
+        session.navigate = AsyncMock()
+        ctx, _ = await self._patch_session(session)
+        aresolve = AsyncMock(return_value=[ipaddress.ip_address("10.0.0.5")])
+        blocking_resolve = MagicMock(side_effect=AssertionError("blocking DNS on the event loop"))
+        with (
+            ctx,
+            patch.object(tools, "_get_tool_config", return_value={}),
+            patch.object(tools, "_aresolve_host_addresses", aresolve),
+            patch.object(tools, "_resolve_host_addresses", blocking_resolve),
+        ):
+            result = await tools.browser_navigate_tool.coroutine(
+                runtime=_runtime(),
+                url="https://intranet.example.com/",
+                tool_call_id="t1",
+            )
+        assert "private, loopback, or metadata" in result.update["messages"][0].content
+        aresolve.assert_awaited_once_with("intranet.example.com")
+        session.navigate.assert_not_awaited()
+
     async def test_navigate_rejects_non_http_scheme(self):
         session = MagicMock()
         session.navigate = AsyncMock()
@@ -895,18 +919,25 @@ def test_resolve_session_always_reads_browser_navigate_config():
     captured: dict[str, object] = {}
 
     class _FakeManager:
-        def get_session(self, thread_id, **kwargs):
+        async def aget_session(self, thread_id, **kwargs):
             captured.update(kwargs)
             captured["thread_id"] = thread_id
             return MagicMock()
 
+        def release_session(self, thread_id, session):
+            pass
+
+    async def resolve():
+        async with tools._resolve_session(_runtime(), "browser_snapshot"):
+            pass
+
     with (
         patch.object(tools, "_get_tool_config", lambda name: configs.get(name, {})),
         patch.object(tools, "get_browser_session_manager", return_value=_FakeManager()),
     ):
         # Even when a NON-navigate tool resolves the session, launch config comes
         # from browser_navigate.
-        tools._resolve_session(_runtime(), "browser_snapshot")
+        asyncio.run(resolve())
 
     assert captured["headless"] is False
     assert captured["timeout_ms"] == 12345
@@ -1009,6 +1040,38 @@ async def test_request_guard_aborts_blocked_redirect_target():
     assert allowed.aborted_with is None
 
 
+@pytest.mark.asyncio
+async def test_request_guard_awaits_an_async_guard():
+    captured: dict[str, object] = {}
+
+    class _FakeContext:
+        async def route(self, pattern, handler):
+            captured["handler"] = handler
+
+    async def guard(url: str) -> str | None:
+        await asyncio.sleep(0)
+        return "Error: blocked" if "169.254.169.254" in url else None
+
+    session = BrowserSession(
+        MagicMock(),
+        headless=True,
+        timeout_ms=1000,
+        viewport={"width": 1000, "height": 500},
+        url_guard=guard,
+    )
+    session._context = _FakeContext()
+    await session._install_request_guard()
+    handler = captured["handler"]
+
+    blocked = _FakeRoute("http://169.254.169.254/latest/meta-data/")
+    await handler(blocked)
+    assert blocked.aborted_with == "blockedbyclient"
+
+    allowed = _FakeRoute("https://example.com/page")
+    await handler(allowed)
+    assert allowed.continued is True
+
+
 @pytest.mark.asyncio
 async def test_close_continues_when_browser_driver_is_already_disconnected():
     """Shutdown must clear every handle even if the driver died first."""
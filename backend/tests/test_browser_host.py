@@ -0,0 +1,193 @@
+"""Tests for the cross-worker browser host and its remote session manager.
+
+A fake session stands in for Playwright; everything else — the Unix socket,
+the JSON protocol, pins, Live frames and host election — is real.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import stat
+import threading
+
+import pytest
+
+from deerflow.community.browser_automation import host as host_mod
+from deerflow.community.browser_automation import session as session_mod
+from deerflow.community.browser_automation.host import BrowserHost, RemoteBrowserSessionManager
+from deerflow.community.browser_automation.session import (
+    BrowserSessionCapacityError,
+    BrowserSessionManager,
+    BrowserTab,
+    PageSnapshot,
+    SnapshotElement,
+)
+
+
+class _FakeSession:
+    instances: list[_FakeSession] = []
+
+    def __init__(self, loop, *, url_guard=None, on_activity=None, **kwargs) -> None:
+        self.url_guard = url_guard
+        self.active_refs = 0
+        self.closed = False
+        self.on_frame = None
+        self.url = "about:blank"
+        _FakeSession.instances.append(self)
+
+    def _pin(self) -> None:
+        self.active_refs += 1
+
+    def _unpin(self) -> None:
+        self.active_refs = max(0, self.active_refs - 1)
+
+    async def _close(self) -> None:
+        self.closed = True
+
+    async def close(self) -> None:
+        self.closed = True
+
+    async def navigate(self, url: str) -> PageSnapshot:
+        self.url = url
+        return PageSnapshot(url=url, title="Example", elements=[SnapshotElement(ref=1, tag="a", role="", type="", name="More")])
+
+    async def screenshot_bytes(self, full_page: bool = False) -> bytes:
+        return b"\x89PNG" + bytes([full_page])
+
+    async def tabs(self) -> list[BrowserTab]:
+        return [BrowserTab(index=0, url=self.url, title="Example", active=True)]
+
+    async def current_url(self) -> str:
+        return self.url
+
+    async def start_screencast(self, on_frame) -> None:
+        self.on_frame = on_frame
+        on_frame("frame-1")
+
+    async def stop_screencast(self, on_frame=None) -> None:
+        if on_frame is None or on_frame is self.on_frame:
+            self.on_frame = None
+
+
+@pytest.fixture(autouse=True)
+def _fake_sessions(monkeypatch):
+    _FakeSession.instances = []
+    monkeypatch.setattr(session_mod, "BrowserSession", _FakeSession)
+
+
+@pytest.fixture
+def host(tmp_path):
+    manager = BrowserSessionManager(max_sessions=1, enforce_single_worker=False)
+    browser_host = BrowserHost(manager, socket_path=tmp_path / "run" / "host.sock")
+    browser_host.start()
+    yield browser_host
+    browser_host.stop()
+
+
+def _client(host: BrowserHost, tmp_path) -> RemoteBrowserSessionManager:
+    return RemoteBrowserSessionManager(socket_path=host.socket_path, lock_path=tmp_path / "host.lock")
+
+
+def _guard(url: str) -> str | None:
+    return None
+
+
+def test_session_calls_round_trip_through_the_host(host, tmp_path):
+    client = _client(host, tmp_path)
+
+    async def scenario():
+        async with client.aacquire_session("thread-a", url_guard=_guard) as session:
+            snapshot = await session.navigate("https://example.com/")
+            shot = await session.screenshot_bytes(full_page=True)
+            tabs = await session.tabs()
+        return snapshot, shot, tabs
+
+    snapshot, shot, tabs = asyncio.run(scenario())
+    assert snapshot.render().startswith("URL: https://example.com/")
+    assert snapshot.elements[0].name == "More"
+    assert shot == b"\x89PNG\x01"
+    assert tabs == [BrowserTab(index=0, url="https://example.com/", title="Example", active=True)]
+    # The caller's guard cannot cross processes; the host applies the tool policy.
+    assert _FakeSession.instances[0].url_guard is not None
+    asyncio.run(client.close_all_sessions())
+
+
+def test_socket_is_created_inside_a_private_directory(tmp_path):
+    socket_dir = tmp_path / "shared"
+    socket_dir.mkdir(mode=0o755)
+    socket_dir.chmod(0o755)
+    browser_host = BrowserHost(BrowserSessionManager(enforce_single_worker=False), socket_path=socket_dir / "host.sock")
+    browser_host.start()
+    try:
+        assert stat.S_IMODE(socket_dir.stat().st_mode) == 0o700
+        assert stat.S_IMODE((socket_dir / "host.sock").stat().st_mode) == 0o600
+    finally:
+        browser_host.stop()
+
+
+def test_capacity_is_shared_and_disconnect_releases_pins(host, tmp_path):
+    worker_a = _client(host, tmp_path)
+    worker_b = _client(host, tmp_path)
+
+    worker_a.get_session("thread-a", pin=True)
+    with pytest.raises(BrowserSessionCapacityError):
+        worker_b.get_session("thread-b")
+
+    # Worker A goes away without releasing; the host must drop its pin.
+    assert asyncio.run(worker_a.close_all_sessions()) == 0
+    for _ in range(50):
+        if not _FakeSession.instances[0].active_refs:
+            break
+        threading.Event().wait(0.02)
+
+    worker_b.get_session("thread-b")
+    assert set(host.manager._sessions) == {"thread-b"}
+    asyncio.run(worker_b.close_all_sessions())
+
+
+def test_live_frames_are_pushed_to_the_viewer(host, tmp_path):
+    client = _client(host, tmp_path)
+    received = threading.Event()
+    frames: list[str] = []
+
+    def on_frame(data: str) -> None:
+        frames.append(data)
+        received.set()
+
+    async def scenario():
+        session = await client.aget_session("thread-a")
+        await session.start_screencast(on_frame)
+        assert await asyncio.to_thread(received.wait, 5)
+        await session.stop_screencast(on_frame)
+
+    asyncio.run(scenario())
+    assert frames == ["frame-1"]
+    assert _FakeSession.instances[0].on_frame is None
+    asyncio.run(client.close_all_sessions())
+
+
+def test_first_worker_without_a_host_becomes_the_host(tmp_path):
+    socket_path = tmp_path / "elected.sock"
+    first = RemoteBrowserSessionManager(socket_path=socket_path, lock_path=tmp_path / "elected.lock")
+    second = RemoteBrowserSessionManager(socket_path=socket_path, lock_path=tmp_path / "elected.lock")
+
+    first.get_session("thread-a")
+    second.get_session("thread-a")
+
+    assert first.hosting and not second.hosting
+    assert len(_FakeSession.instances) == 1
+    asyncio.run(second.close_all_sessions())
+    assert asyncio.run(first.close_all_sessions()) == 1
+    assert _FakeSession.instances[0].closed
+
+
+def test_multi_worker_gateway_gets_the_remote_manager(monkeypatch):
+    monkeypatch.setenv("GATEWAY_WORKERS", "3")
+    session_mod.reset_browser_session_manager()
+    try:
+        assert isinstance(session_mod.get_browser_session_manager(), host_mod.RemoteBrowserSessionManager)
+        assert session_mod.browser_multi_worker_error() is None
+        monkeypatch.setattr(session_mod, "_browser_host_supported", lambda: False)
+        assert "process-local" in session_mod.browser_multi_worker_error()
+    finally:
+        session_mod.reset_browser_session_manager()
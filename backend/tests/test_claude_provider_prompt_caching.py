@@ -247,3 +247,45 @@ def test_old_messages_outside_cache_window_not_cached(model):
     # Only the last message should be within the cache window
     assert "cache_control" not in payload["messages"][0]["content"][0]
     assert payload["messages"][1]["content"][0].get("cache_control") == {"type": "ephemeral"}
+
+
+# ---------------------------------------------------------------------------
+# Stable system prefix
+# ---------------------------------------------------------------------------
+
+
+def test_stable_prefix_split_keeps_text_and_pins_static_prompt(model):
+    static = "static prompt"
+    payload: dict = {
+        "system": static + "\n\n<current_date>2026-10-19</current_date>",
+        "messages": [{"role": "user", "content": f"turn {i}"} for i in range(5)],
+        "tools": [{"name": "bash"}],
+    }
+    model._apply_prompt_caching(payload, stable_prefix_chars=len(static))
+
+    assert [b["text"] for b in payload["system"]] == [static, "\n\n<current_date>2026-10-19</current_date>"]
+    assert payload["system"][0].get("cache_control") == {"type": "ephemeral"}
+    # The static prompt covers the tools, so the remaining budget goes to the newest turns.
+    assert "cache_control" not in payload["tools"][0]
+    assert [isinstance(m["content"], list) and "cache_control" in m["content"][0] for m in payload["messages"]] == [False, False, True, True, True]
+    assert _count_cache_control(payload) == 4
+
+
+def test_stable_prefix_covering_whole_system_is_not_split(model):
+    payload: dict = {"system": "static prompt", "tools": [{"name": "bash"}]}
+    model._apply_prompt_caching(payload, stable_prefix_chars=len("static prompt"))
+
+    assert len(payload["system"]) == 1
+    assert payload["tools"][0].get("cache_control") == {"type": "ephemeral"}
+
+
+def test_stable_prefix_read_from_coalesced_system_message(model):
+    from langchain_core.messages import HumanMessage, SystemMessage
+
+    from deerflow.utils.messages import STABLE_PREFIX_CHARS_KEY
+
+    system = SystemMessage(content="static\n\nreminder", additional_kwargs={STABLE_PREFIX_CHARS_KEY: len("static")})
+    payload = model._get_request_payload([system, HumanMessage(content="hi")])
+
+    assert [b["text"] for b in payload["system"]] == ["static", "\n\nreminder"]
+    assert payload["system"][0].get("cache_control") == {"type": "ephemeral"}
@@ -7,7 +7,7 @@ import tempfile
 import zipfile
 from enum import Enum
 from pathlib import Path
-from unittest.mock import ANY, MagicMock, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
 import pytest
 from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, SystemMessage, ToolMessage  # noqa: F401
@@ -1288,7 +1288,7 @@ class TestThreadQueries:
 
         result = client.list_threads()
         assert result == {"thread_list": []}
-        mock_checkpointer.list.assert_called_once_with(config=None, limit=10)
+        mock_checkpointer.list.assert_called_once_with(config=None)
 
     def test_list_threads_basic(self, client):
         mock_checkpointer = MagicMock()
@@ -1304,7 +1304,7 @@ class TestThreadQueries:
         mock_checkpointer.list.return_value = [cp2, cp1, cp_empty, cp3]
 
         result = client.list_threads(limit=5)
-        mock_checkpointer.list.assert_called_once_with(config=None, limit=5)
+        mock_checkpointer.list.assert_called_once_with(config=None)
 
         threads = result["thread_list"]
         assert len(threads) == 2
@@ -1385,6 +1385,199 @@ class TestThreadQueries:
         assert result["checkpoints"] == []
         mock_checkpointer.list.assert_called_once_with({"configurable": {"thread_id": "t99"}})
 
+    def test_list_threads_limit_counts_threads_not_checkpoints(self, client):
+        mock_checkpointer = MagicMock()
+        client._checkpointer = mock_checkpointer
+        busy = [self._make_mock_checkpoint_tuple("busy", f"c{i}", f"2023-01-02T10:0{i}:00Z", title="Busy") for i in range(5)]
+        quiet = self._make_mock_checkpoint_tuple("quiet", "q1", "2023-01-01T10:00:00Z", title="Quiet")
+        mock_checkpointer.list.return_value = [*busy, quiet]
+
+        threads = client.list_threads(limit=2)["thread_list"]
+
+        assert [t["thread_id"] for t in threads] == ["busy", "quiet"]
+
+    def test_list_threads_reads_the_thread_store(self, client):
+        from langgraph.checkpoint.base import empty_checkpoint
+        from langgraph.checkpoint.memory import InMemorySaver
+        from langgraph.store.memory import InMemoryStore
+
+        from deerflow.persistence.thread_meta.memory import MemoryThreadMetaStore
+        from deerflow.runtime.user_context import get_effective_user_id
+
+        store = MemoryThreadMetaStore(InMemoryStore())
+        client._thread_store = store
+        saver = InMemorySaver()
+        client._checkpointer = saver
+
+        def put(thread_id, title=None):
+            checkpoint = empty_checkpoint()
+            versions = {}
+            if title:
+                checkpoint["channel_values"] = {"title": title}
+                checkpoint["channel_versions"] = versions = {"title": 1}
+            return saver.put({"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}, checkpoint, {"source": "input"}, versions)
+
+        # "legacy" predates the thread store: it only has checkpoints.
+        put("legacy", "Old chat")
+        t1_config = put("t1")
+
+        async def seed():
+            for thread_id in ("t1", "t2", "t3"):
+                await store.create(thread_id, user_id=get_effective_user_id())
+            await store.update_display_name("t1", "First", user_id=get_effective_user_id())
+
+        try:
+            client._client_loop().run(seed())
+            page = client.list_threads(limit=2)["thread_list"]
+            threads = client.list_threads(limit=10)["thread_list"]
+        finally:
+            client.close()
+
+        assert len(page) == 2
+        assert {
+            "thread_id": "t1",
+            "title": "First",
+            "status": "idle",
+            "latest_checkpoint_id": t1_config["configurable"]["checkpoint_id"],
+            "created_at": ANY,
+            "updated_at": ANY,
+        } in threads
+        assert {"thread_id": "t2", "title": None, "status": "idle", "latest_checkpoint_id": None, "created_at": ANY, "updated_at": ANY} in threads
+        assert {"thread_id": "legacy", "title": "Old chat", "status": None, "latest_checkpoint_id": ANY, "created_at": ANY, "updated_at": ANY} in threads
+        assert len(threads) == 4
+        assert threads[-1]["thread_id"] == "legacy"
+        assert all(set(thread) == set(threads[0]) for thread in threads)
+
+    def test_get_thread_uses_the_async_checkpointer_with_a_sql_database(self, client):
+        from langgraph.checkpoint.base import empty_checkpoint
+        from langgraph.checkpoint.memory import InMemorySaver
+
+        saver = InMemorySaver()
+        saver.put({"configurable": {"thread_id": "t1", "checkpoint_ns": ""}}, empty_checkpoint(), {"source": "input"}, {})
+        client._app_config.database.backend = "sqlite"
+
+        try:
+            with (
+                patch.object(client, "_acheckpointer", AsyncMock(return_value=saver)),
+                patch.object(client, "_get_thread_checkpointer") as sync_checkpointer,
+            ):
+                thread = client.get_thread("t1")
+            sync_checkpointer.assert_not_called()
+        finally:
+            client.close()
+
+        assert thread["thread_id"] == "t1"
+        assert len(thread["checkpoints"]) == 1
+
+    def test_alist_threads_and_aget_thread_read_the_async_checkpointer(self, client):
+        from langgraph.checkpoint.base import empty_checkpoint
+        from langgraph.checkpoint.memory import InMemorySaver
+
+        saver = InMemorySaver()
+        client._checkpointer = saver
+        for thread_id, title in (("a", "Alpha"), ("b", None)):
+            checkpoint = empty_checkpoint()
+            versions = {}
+            if title:
+                checkpoint["channel_values"] = {"title": title}
+                checkpoint["channel_versions"] = versions = {"title": 1}
+            saver.put({"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}, checkpoint, {"source": "input"}, versions)
+
+        async def run():
+            async with client:
+                return await client.alist_threads(), await client.aget_thread("a")
+
+        listed, thread = asyncio.run(run())
+
+        assert {t["thread_id"]: t["title"] for t in listed["thread_list"]} == {"a": "Alpha", "b": None}
+        assert thread["thread_id"] == "a"
+        assert len(thread["checkpoints"]) == 1
+        assert thread["checkpoints"][0]["values"] == {"title": "Alpha"}
+
+
+# ---------------------------------------------------------------------------
+# Async API
+# ---------------------------------------------------------------------------
+
+
+class TestAsyncApi:
+    @staticmethod
+    def _async_agent(chunks, error: Exception | None = None):
+        agent = MagicMock()
+
+        async def astream(state, **kwargs):
+            agent.astream_kwargs = kwargs
+            for chunk in chunks:
+                yield chunk
+            if error is not None:
+                raise error
+
+        agent.astream = astream
+        return agent
+
+    def test_astream_yields_the_same_events_as_stream(self, client):
+        ai = AIMessage(content="Hello!", id="ai-1", usage_metadata={"input_tokens": 3, "output_tokens": 2, "total_tokens": 5})
+        agent = self._async_agent([("values", {"messages": [HumanMessage(content="hi", id="h-1"), ai], "title": "Greeting"})])
+
+        async def run():
+            with patch.object(client, "_aensure_agent", return_value=agent):
+                return [event async for event in client.astream("hi", thread_id="t1")]
+
+        try:
+            events = asyncio.run(run())
+        finally:
+            client.close()
+
+        assert [e.type for e in events] == ["messages-tuple", "values", "end"]
+        assert events[0].data["content"] == "Hello!"
+        assert events[1].data["title"] == "Greeting"
+        assert events[2].data["usage"] == {"input_tokens": 3, "output_tokens": 2, "total_tokens": 5}
+        assert agent.astream_kwargs["stream_mode"] == ["values", "messages", "custom"]
+        assert agent.astream_kwargs["context"]["thread_id"] == "t1"
+
+    def test_astream_records_the_thread_and_its_title(self, client):
+        from langgraph.checkpoint.memory import InMemorySaver
+        from langgraph.store.memory import InMemoryStore
+
+        from deerflow.persistence.thread_meta.memory import MemoryThreadMetaStore
+
+        client._thread_store = MemoryThreadMetaStore(InMemoryStore())
+        client._checkpointer = InMemorySaver()
+        agent = self._async_agent([("values", {"messages": [AIMessage(content="done", id="ai-1")], "title": "Named"})])
+
+        async def run():
+            with patch.object(client, "_aensure_agent", return_value=agent):
+                assert await client.achat("hi", thread_id="t1") == "done"
+            return await client.alist_threads()
+
+        try:
+            listed = asyncio.run(run())
+        finally:
+            client.close()
+
+        assert [(t["thread_id"], t["title"]) for t in listed["thread_list"]] == [("t1", "Named")]
+
+    def test_astream_reraises_agent_errors(self, client):
+        agent = self._async_agent([], error=RuntimeError("model exploded"))
+
+        async def run():
+            with patch.object(client, "_aensure_agent", return_value=agent):
+                async for _ in client.astream("hi", thread_id="t1"):
+                    pass
+
+        try:
+            with pytest.raises(RuntimeError, match="model exploded"):
+                asyncio.run(run())
+        finally:
+            client.close()
+
+    def test_close_stops_the_client_loop(self, client):
+        loop = client._client_loop()
+        client.close()
+
+        assert client._loop is None
+        assert loop.loop.is_closed()
+
 
 # ---------------------------------------------------------------------------
 # Goal management
@@ -81,6 +81,7 @@ def _make_client(_monkeypatch, *, enhance_enabled: bool = True) -> DeerFlowClien
     client._available_skills = None
     client._middlewares = None
     client._checkpointer = None
+    client._thread_store = None
     client._agent = None
     client._agent_config_key = None
     client._environment = None
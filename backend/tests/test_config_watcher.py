@@ -0,0 +1,271 @@
+"""Tests for the config watcher and the published ``AppConfig`` snapshot.
+
+While ``start_app_config_watcher()`` runs, ``get_app_config()`` must serve the
+published config without touching the filesystem, and an edit to
+``config.yaml`` or the extensions config must be republished (new version,
+listeners notified) — or, if the edit does not validate, leave the last good
+config in place.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+
+import pytest
+import yaml
+
+import deerflow.config.app_config as app_config_module
+import deerflow.mcp.cache as mcp_cache_module
+from deerflow.config.app_config import (
+    get_app_config,
+    get_app_config_snapshot,
+    get_app_config_watcher,
+    reset_app_config,
+    start_app_config_watcher,
+    stop_app_config_watcher,
+    subscribe_app_config,
+)
+from deerflow.config.config_watcher import ConfigWatcher
+from deerflow.config.extensions_config import reload_extensions_config, reset_extensions_config
+
+
+def _write_config(path: Path, *, model_name: str, skills_path: str | None = None) -> None:
+    config = {
+        "sandbox": {"use": "deerflow.sandbox.local:LocalSandboxProvider"},
+        "models": [{"name": model_name, "use": "langchain_openai:ChatOpenAI", "model": "gpt-test"}],
+    }
+    if skills_path is not None:
+        config["skills"] = {"path": skills_path}
+    path.write_text(yaml.safe_dump(config), encoding="utf-8")
+
+
+def _write_extensions_config(path: Path, servers: dict | None = None) -> None:
+    path.write_text(json.dumps({"mcpServers": servers or {}, "skills": {}}), encoding="utf-8")
+
+
+def _wait_for(predicate, timeout: float = 10.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+@pytest.fixture()
+def config_files(tmp_path, monkeypatch):
+    config_path = tmp_path / "config.yaml"
+    extensions_path = tmp_path / "extensions_config.json"
+    _write_config(config_path, model_name="model-a")
+    _write_extensions_config(extensions_path)
+    monkeypatch.setenv("DEER_FLOW_CONFIG_PATH", str(config_path))
+    monkeypatch.setenv("DEER_FLOW_EXTENSIONS_CONFIG_PATH", str(extensions_path))
+    reset_app_config()
+    reset_extensions_config()
+    yield config_path, extensions_path
+    reset_app_config()
+    reset_extensions_config()
+
+
+def test_watcher_reports_only_content_changes(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text("a: 1\n", encoding="utf-8")
+    seen: list[frozenset[Path]] = []
+    watcher = ConfigWatcher([path], seen.append, backend="poll")
+
+    path.touch()
+    assert watcher.check() == frozenset()
+
+    path.write_text("a: 2\n", encoding="utf-8")
+    assert watcher.check() == {path}
+    assert watcher.check() == frozenset()
+    assert seen == [{path}]
+
+
+def test_watcher_baseline_catches_edits_before_start(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text("a: 1\n", encoding="utf-8")
+    stale_baseline = {path: (0.0, 0, "not-the-current-digest")}
+
+    watcher = ConfigWatcher([path], lambda changed: None, backend="poll", baseline=stale_baseline)
+
+    assert watcher.check() == {path}
+
+
+@pytest.mark.parametrize("backend", ["poll", "native"])
+def test_running_watcher_picks_up_edits(tmp_path, backend):
+    if backend == "native":
+        pytest.importorskip("watchfiles")
+    path = tmp_path / "config.yaml"
+    path.write_text("a: 1\n", encoding="utf-8")
+    seen: list[frozenset[Path]] = []
+    watcher = ConfigWatcher([path], seen.append, backend=backend, poll_interval=0.05)
+    watcher.start()
+    try:
+        assert watcher.backend == backend
+        time.sleep(0.3)  # let the native backend register its watch
+        path.write_text("a: 2\n", encoding="utf-8")
+        assert _wait_for(lambda: seen == [{path}])
+    finally:
+        watcher.stop()
+    assert not watcher.running
+
+
+def test_native_watcher_backstop_poll_catches_unnotified_edits(tmp_path, monkeypatch):
+    """Single-file bind mounts deliver no notifications; the backstop poll still sees the edit."""
+    watchfiles = pytest.importorskip("watchfiles")
+
+    def silent_watch(*paths, stop_event, **kwargs):
+        stop_event.wait()
+        yield from ()
+
+    monkeypatch.setattr(watchfiles, "watch", silent_watch)
+    path = tmp_path / "config.yaml"
+    path.write_text("a: 1\n", encoding="utf-8")
+    seen: list[frozenset[Path]] = []
+    watcher = ConfigWatcher([path], seen.append, backend="native", backstop_interval=0.05)
+    watcher.start()
+    try:
+        path.write_text("a: 2\n", encoding="utf-8")
+        assert _wait_for(lambda: seen == [{path}])
+    finally:
+        watcher.stop()
+
+
+def test_native_watcher_sees_configmap_symlink_swaps(tmp_path):
+    pytest.importorskip("watchfiles")
+    for version, value in (("..v1", 1), ("..v2", 2)):
+        (tmp_path / version).mkdir()
+        (tmp_path / version / "config.yaml").write_text(f"a: {value}\n", encoding="utf-8")
+    (tmp_path / "..data").symlink_to("..v1")
+    path = tmp_path / "config.yaml"
+    path.symlink_to("..data/config.yaml")
+    seen: list[frozenset[Path]] = []
+    watcher = ConfigWatcher([path], seen.append, backend="native", backstop_interval=None)
+    watcher.start()
+    try:
+        time.sleep(0.3)  # let the native backend register its watch
+        (tmp_path / "..data_tmp").symlink_to("..v2")
+        (tmp_path / "..data_tmp").rename(tmp_path / "..data")
+        assert _wait_for(lambda: seen == [{path}])
+    finally:
+        watcher.stop()
+
+
+def test_get_app_config_skips_file_checks_while_watched(config_files, monkeypatch):
+    initial = get_app_config()
+    start_app_config_watcher(backend="poll", poll_interval=60)
+
+    def no_stat(_path):
+        raise AssertionError("get_app_config() touched the config file while watched")
+
+    monkeypatch.setattr(app_config_module, "_get_config_signature", no_stat)
+    monkeypatch.setattr(app_config_module.AppConfig, "resolve_config_path", classmethod(lambda cls, config_path=None: no_stat(config_path)))
+
+    assert get_app_config() is initial
+    assert get_app_config_snapshot().config is initial
+
+
+def test_watched_edit_publishes_a_new_version_and_notifies(config_files):
+    config_path, _ = config_files
+    get_app_config()
+    watcher = start_app_config_watcher(backend="poll", poll_interval=60)
+    before = get_app_config_snapshot()
+    events: list[tuple[str | None, str]] = []
+    unsubscribe = subscribe_app_config(lambda previous, current: events.append((previous.models[0].name if previous else None, current.models[0].name)))
+    try:
+        _write_config(config_path, model_name="model-b")
+        assert watcher.check() == {config_path}
+    finally:
+        unsubscribe()
+
+    after = get_app_config_snapshot()
+    assert after.config.models[0].name == "model-b"
+    assert after.version == before.version + 1
+    assert after.path == config_path
+    assert events == [("model-a", "model-b")]
+
+
+def test_invalid_watched_edit_keeps_the_last_good_config(config_files):
+    config_path, _ = config_files
+    initial = get_app_config()
+    watcher = start_app_config_watcher(backend="poll", poll_interval=60)
+
+    config_path.write_text("sandbox: [not, a, mapping\n", encoding="utf-8")
+    watcher.check()
+
+    assert get_app_config() is initial
+    _write_config(config_path, model_name="model-c")
+    watcher.check()
+    assert get_app_config().models[0].name == "model-c"
+
+
+def test_reset_app_config_stops_the_watcher(config_files):
+    watcher = start_app_config_watcher(backend="poll", poll_interval=60)
+    assert get_app_config_watcher() is watcher
+
+    reset_app_config()
+
+    assert get_app_config_watcher() is None
+    assert not watcher.running
+
+
+def test_mcp_cache_rechecks_extensions_only_after_a_watched_change(config_files, monkeypatch):
+    _, extensions_path = config_files
+    watcher = start_app_config_watcher(backend="poll", poll_interval=60)
+    assert watcher.watches(extensions_path)
+    signature_calls = []
+    real_state = mcp_cache_module._current_config_state
+
+    def counting_state():
+        signature_calls.append(1)
+        return real_state()
+
+    monkeypatch.setattr(mcp_cache_module, "_current_config_state", counting_state)
+    monkeypatch.setattr(mcp_cache_module, "_cache_initialized", True)
+    monkeypatch.setattr(mcp_cache_module, "_config_path", extensions_path)
+    monkeypatch.setattr(mcp_cache_module, "_config_signature", real_state()[1])
+    monkeypatch.setattr(mcp_cache_module, "_config_recheck_pending", False)
+
+    assert mcp_cache_module._is_cache_stale() is False
+    assert signature_calls == []
+
+    # The gateway's MCP router writes the file and then reloads the extensions
+    # config; that reload makes the watcher check immediately.
+    _write_extensions_config(extensions_path, {"new": {"enabled": True, "type": "stdio", "command": "npx"}})
+    reload_extensions_config()
+
+    assert mcp_cache_module._is_cache_stale() is True
+    assert signature_calls == [1]
+    assert get_app_config().extensions.mcp_servers.keys() == {"new"}
+
+
+def test_skills_cache_is_invalidated_only_when_the_skills_section_changes(config_files, tmp_path, monkeypatch):
+    from deerflow.agents.lead_agent import prompt as prompt_module
+
+    config_path, _ = config_files
+    invalidations = []
+    monkeypatch.setattr(prompt_module, "_invalidate_enabled_skills_cache", lambda: invalidations.append(1))
+    get_app_config()
+    watcher = start_app_config_watcher(backend="poll", poll_interval=60)
+
+    _write_config(config_path, model_name="model-b")
+    watcher.check()
+    assert invalidations == []
+
+    _write_config(config_path, model_name="model-b", skills_path=str(tmp_path / "skills"))
+    watcher.check()
+    assert invalidations == [1]
+
+
+def test_stop_app_config_watcher_restores_per_call_checks(config_files):
+    config_path, _ = config_files
+    get_app_config()
+    start_app_config_watcher(backend="poll", poll_interval=60)
+    stop_app_config_watcher()
+
+    _write_config(config_path, model_name="model-d")
+
+    assert get_app_config().models[0].name == "model-d"
@@ -21,9 +21,9 @@ class TestCrawl4AiClient:
     """Tests for the Crawl4AiClient class."""
 
     async def test_fetch_markdown_success(self):
-        with patch("deerflow.community.crawl4ai.crawl4ai_client.httpx.AsyncClient") as mock_cls:
+        with patch("deerflow.community.crawl4ai.crawl4ai_client.get_async_http_client") as mock_cls:
             mock_ctx = MagicMock()
-            mock_cls.return_value.__aenter__.return_value = mock_ctx
+            mock_cls.return_value = mock_ctx
 
             mock_resp = MagicMock()
             mock_resp.status_code = 200
@@ -44,9 +44,9 @@ class TestCrawl4AiClient:
         assert client.base_url == "http://crawl4ai:11235"
 
     async def test_fetch_markdown_http_error(self):
-        with patch("deerflow.community.crawl4ai.crawl4ai_client.httpx.AsyncClient") as mock_cls:
+        with patch("deerflow.community.crawl4ai.crawl4ai_client.get_async_http_client") as mock_cls:
             mock_ctx = MagicMock()
-            mock_cls.return_value.__aenter__.return_value = mock_ctx
+            mock_cls.return_value = mock_ctx
 
             mock_resp = MagicMock()
             mock_resp.status_code = 502
@@ -58,9 +58,9 @@ class TestCrawl4AiClient:
             assert "Error: Crawl4AI HTTP 502" in result
 
     async def test_fetch_markdown_success_false(self):
-        with patch("deerflow.community.crawl4ai.crawl4ai_client.httpx.AsyncClient") as mock_cls:
+        with patch("deerflow.community.crawl4ai.crawl4ai_client.get_async_http_client") as mock_cls:
             mock_ctx = MagicMock()
-            mock_cls.return_value.__aenter__.return_value = mock_ctx
+            mock_cls.return_value = mock_ctx
 
             mock_resp = MagicMock()
             mock_resp.status_code = 200
@@ -72,9 +72,9 @@ class TestCrawl4AiClient:
             assert result.startswith("Error:")
 
     async def test_fetch_markdown_empty(self):
-        with patch("deerflow.community.crawl4ai.crawl4ai_client.httpx.AsyncClient") as mock_cls:
+        with patch("deerflow.community.crawl4ai.crawl4ai_client.get_async_http_client") as mock_cls:
             mock_ctx = MagicMock()
-            mock_cls.return_value.__aenter__.return_value = mock_ctx
+            mock_cls.return_value = mock_ctx
 
             mock_resp = MagicMock()
             mock_resp.status_code = 200
@@ -86,9 +86,9 @@ class TestCrawl4AiClient:
             assert result == "Error: Crawl4AI returned empty markdown"
 
     async def test_fetch_markdown_timeout(self):
-        with patch("deerflow.community.crawl4ai.crawl4ai_client.httpx.AsyncClient") as mock_cls:
+        with patch("deerflow.community.crawl4ai.crawl4ai_client.get_async_http_client") as mock_cls:
             mock_ctx = MagicMock()
-            mock_cls.return_value.__aenter__.return_value = mock_ctx
+            mock_cls.return_value = mock_ctx
             import httpx
 
             mock_ctx.post = AsyncMock(side_effect=httpx.TimeoutException("Timed out"))
@@ -98,9 +98,9 @@ class TestCrawl4AiClient:
             assert "timed out" in result.lower() or "timeout" in result.lower()
 
     async def test_fetch_markdown_with_token(self):
-        with patch("deerflow.community.crawl4ai.crawl4ai_client.httpx.AsyncClient") as mock_cls:
+        with patch("deerflow.community.crawl4ai.crawl4ai_client.get_async_http_client") as mock_cls:
             mock_ctx = MagicMock()
-            mock_cls.return_value.__aenter__.return_value = mock_ctx
+            mock_cls.return_value = mock_ctx
 
             mock_resp = MagicMock()
             mock_resp.status_code = 200
@@ -114,9 +114,9 @@ class TestCrawl4AiClient:
             assert headers["Authorization"] == "Bearer secret"
 
     async def test_fetch_markdown_no_token_header_when_unset(self):
-        with patch("deerflow.community.crawl4ai.crawl4ai_client.httpx.AsyncClient") as mock_cls:
+        with patch("deerflow.community.crawl4ai.crawl4ai_client.get_async_http_client") as mock_cls:
             mock_ctx = MagicMock()
-            mock_cls.return_value.__aenter__.return_value = mock_ctx
+            mock_cls.return_value = mock_ctx
 
             mock_resp = MagicMock()
             mock_resp.status_code = 200
@@ -130,9 +130,9 @@ class TestCrawl4AiClient:
             assert "Authorization" not in headers
 
     async def test_fetch_markdown_request_error(self):
-        with patch("deerflow.community.crawl4ai.crawl4ai_client.httpx.AsyncClient") as mock_cls:
+        with patch("deerflow.community.crawl4ai.crawl4ai_client.get_async_http_client") as mock_cls:
             mock_ctx = MagicMock()
-            mock_cls.return_value.__aenter__.return_value = mock_ctx
+            mock_cls.return_value = mock_ctx
             import httpx
 
             mock_ctx.post = AsyncMock(side_effect=httpx.ConnectError("connection refused"))
@@ -142,9 +142,9 @@ class TestCrawl4AiClient:
             assert result.startswith("Error: Crawl4AI request failed")
 
     async def test_fetch_markdown_non_json_200(self):
-        with patch("deerflow.community.crawl4ai.crawl4ai_client.httpx.AsyncClient") as mock_cls:
+        with patch("deerflow.community.crawl4ai.crawl4ai_client.get_async_http_client") as mock_cls:
             mock_ctx = MagicMock()
-            mock_cls.return_value.__aenter__.return_value = mock_ctx
+            mock_cls.return_value = mock_ctx
 
             mock_resp = MagicMock()
             mock_resp.status_code = 200
@@ -232,7 +232,8 @@ class TestCrawl4AiTools:
 
         with patch("deerflow.community.crawl4ai.tools._get_tool_config", return_value=None):
             with patch(
-                "deerflow.community.url_safety.resolve_host_addresses",
+                "deerflow.community.url_safety.aresolve_host_addresses",
+                new_callable=AsyncMock,
                 return_value=[ipaddress.ip_address("10.0.0.5")],
             ):
                 result = await tools.web_fetch_tool.ainvoke("https://internal.example.com/")
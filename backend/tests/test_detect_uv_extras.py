@@ -149,6 +149,12 @@ def test_detect_from_config_redis_via_stream_bridge(tmp_path):
     assert detect.detect_from_config(cfg) == ["redis"]
 
 
+def test_detect_from_config_redis_via_auth_session_cache(tmp_path):
+    cfg = tmp_path / "config.yaml"
+    cfg.write_text("auth:\n  local:\n    allow_registration: false\n  session_cache:\n    type: redis\n")
+    assert detect.detect_from_config(cfg) == ["redis"]
+
+
 def test_detect_from_config_browser_via_browser_navigate_tool(tmp_path):
     cfg = tmp_path / "config.yaml"
     cfg.write_text(
@@ -709,7 +709,8 @@ class TestGraphIntegration:
         assert injected, "delegation ledger was not injected after summarization"
         assert "research auth" in injected[0].content
         assert "AUTH_USES_JWT_SENTINEL" in injected[0].content
-        assert "compressed summary" in injected[0].content
+        summary = [message for message in last_call_messages if isinstance(message, HumanMessage) and message.additional_kwargs.get("durable_context_data") and "compressed summary" in message.content]
+        assert summary, "summary was not injected after summarization"
 
 
 class TestSkillContextCapture:
@@ -864,8 +865,12 @@ class TestDurableContextInjection:
         data = [message for message in model.received[-1] if isinstance(message, HumanMessage) and message.additional_kwargs.get("durable_context_data")]
         assert authority, "durable context authority message not injected"
         assert data, "durable context data message not injected"
+        # The summary leads the history; the run-volatile ledger trails it so
+        # ledger updates leave the cached history prefix intact.
+        assert len(data) == 2
         assert "EARLIER_WORK_SUMMARY" in data[0].content
-        assert "research auth" in data[0].content
+        assert "research auth" in data[1].content
+        assert model.received[-1][-1] is data[1]
         assert "EARLIER_WORK_SUMMARY" not in authority[0].content
         assert "research auth" not in authority[0].content
 
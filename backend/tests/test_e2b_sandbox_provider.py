@@ -5,6 +5,7 @@ from __future__ import annotations
 import importlib
 import json
 import os
+import subprocess
 import threading
 from collections import OrderedDict
 from types import SimpleNamespace
@@ -94,6 +95,7 @@ class FakeFilesAPI:
         self.store = dict(store or {})
         self.read_calls: list[tuple[str, str | None]] = []
         self.write_calls: list[tuple[str, bytes]] = []
+        self.write_files_calls: list[list[dict[str, Any]]] = []
         self.streams: list[_FakeFileStream] = []
         self._stream_chunk_size = stream_chunk_size
 
@@ -117,6 +119,11 @@ class FakeFilesAPI:
         self.write_calls.append((path, content))
         self.store[path] = content
 
+    def write_files(self, files: list[dict[str, Any]]) -> None:
+        self.write_files_calls.append(files)
+        for entry in files:
+            self.store[entry["path"]] = entry["data"]
+
 
 class FakeClient:
     """Lightweight ``e2b.Sandbox`` substitute used by the provider tests."""
@@ -1230,3 +1237,100 @@ def test_sync_outputs_to_host_skips_oversize_files(monkeypatch, tmp_path):
     assert files.read_calls == [], "oversize files must be skipped without invoking download_file"
     host_target = Paths(base_dir=tmp_path).thread_dir("t1", user_id="u1") / "user-data" / "outputs" / "huge.bin"
     assert not host_target.exists(), "no oversize artefact must be written to host"
+
+
+def _local_shell(tmp_path, files: FakeFilesAPI):
+    """Run sandbox commands locally with ``/home/user`` mapped under *tmp_path*."""
+
+    def run(cmd: str) -> SimpleNamespace:
+        for path, data in files.store.items():
+            local = tmp_path / path.lstrip("/")
+            local.parent.mkdir(parents=True, exist_ok=True)
+            local.write_bytes(data.encode("utf-8") if isinstance(data, str) else data)
+        completed = subprocess.run(["/bin/sh", "-c", cmd.replace("/home/user", f"{tmp_path}/home/user")], capture_output=True, text=True)
+        return SimpleNamespace(stdout=completed.stdout, stderr=completed.stderr, exit_code=completed.returncode)
+
+    return run
+
+
+def test_write_file_append_runs_a_remote_append_without_downloading(tmp_path):
+    files = FakeFilesAPI(store={"/home/user/workspace/log.txt": b"seed\n"})
+    cmds = FakeCommandsAPI([_local_shell(tmp_path, files)])
+    sb = _make_sandbox(FakeClient(commands=cmds, files=files), sandbox_id="sb-append")
+
+    sb.write_file("/mnt/user-data/workspace/log.txt", "more 'quoted' text\n", append=True)
+
+    assert files.read_calls == [] and files.write_calls == []
+    assert len(cmds.calls) == 1 and ">> /home/user/workspace/log.txt" in cmds.calls[0]
+    assert (tmp_path / "home/user/workspace/log.txt").read_text() == "seed\nmore 'quoted' text\n"
+
+
+def test_write_file_large_append_stages_only_the_delta(tmp_path):
+    from deerflow.community.e2b_sandbox import e2b_sandbox as e2b_sb_mod
+
+    files = FakeFilesAPI(store={"/home/user/workspace/log.txt": b"seed\n"})
+    cmds = FakeCommandsAPI([_local_shell(tmp_path, files)])
+    sb = _make_sandbox(FakeClient(commands=cmds, files=files), sandbox_id="sb-append-large")
+    delta = "x" * (e2b_sb_mod._APPEND_INLINE_BYTES + 1)
+
+    sb.write_file("/mnt/user-data/workspace/log.txt", delta, append=True)
+
+    assert files.read_calls == []
+    [(staging, data)] = files.write_calls
+    assert staging.startswith("/home/user/workspace/log.txt.append-") and data == delta.encode("utf-8")
+    assert (tmp_path / "home/user/workspace/log.txt").read_text() == "seed\n" + delta
+    assert not (tmp_path / staging.lstrip("/")).exists()
+
+
+def test_write_file_append_raises_when_the_remote_append_fails():
+    cmds = FakeCommandsAPI([SimpleNamespace(stdout="", stderr="Permission denied", exit_code=1)])
+    sb = _make_sandbox(FakeClient(commands=cmds), sandbox_id="sb-append-fail")
+
+    with pytest.raises(OSError, match="Permission denied"):
+        sb.write_file("/mnt/user-data/workspace/log.txt", "more", append=True)
+
+
+def test_write_files_uploads_the_batch_in_one_request():
+    files = FakeFilesAPI()
+    sb = _make_sandbox(FakeClient(files=files), sandbox_id="sb-batch")
+
+    sb.write_files({"/mnt/user-data/outputs/a.txt": "A", "/mnt/user-data/outputs/sub/b.txt": "B"})
+
+    assert files.write_files_calls == [
+        [
+            {"path": "/home/user/outputs/a.txt", "data": "A"},
+            {"path": "/home/user/outputs/sub/b.txt", "data": "B"},
+        ]
+    ]
+    assert files.write_calls == []
+
+
+def test_sync_outputs_to_host_fetches_many_files_in_one_archive(monkeypatch, tmp_path):
+    from deerflow.sandbox.bulk_sync import BULK_SYNC_MIN_FILES
+
+    p = _make_provider()
+    _setup_paths(monkeypatch, tmp_path / "host")
+    remote_home = tmp_path / "remote-home"
+    (remote_home / "outputs").mkdir(parents=True)
+    names = [f"chart-{i}.png" for i in range(BULK_SYNC_MIN_FILES)]
+    listing = ""
+    for name in names:
+        (remote_home / "outputs" / name).write_bytes(name.encode())
+        listing += f"{len(name)}\t2.000000000\t/home/user/outputs/{name}\x00"
+    files = FakeFilesAPI()
+
+    def archive_in_sandbox(cmd: str) -> SimpleNamespace:
+        completed = subprocess.run(["/bin/sh", "-c", cmd.replace("/mnt/user-data", str(remote_home))], capture_output=True, text=True)
+        for staged in remote_home.glob(".deerflow-sync-*"):
+            files.store[f"/home/user/{staged.name}"] = staged.read_bytes()
+        return SimpleNamespace(stdout=completed.stdout, stderr=completed.stderr, exit_code=completed.returncode)
+
+    cmds = FakeCommandsAPI([SimpleNamespace(stdout=listing, stderr="", exit_code=0), archive_in_sandbox])
+    sb = _make_sandbox(FakeClient(commands=cmds, files=files), sandbox_id="sb-sync-archive")
+
+    p._sync_outputs_to_host(sb, thread_id="t1", user_id="u1")
+
+    outputs = Paths(base_dir=tmp_path / "host").thread_dir("t1", user_id="u1") / "user-data" / "outputs"
+    assert {path.name: path.read_bytes() for path in outputs.iterdir()} == {name: name.encode() for name in names}
+    # One archive download instead of one read per file.
+    assert [path for path, _fmt in files.read_calls if "deerflow-sync" not in path] == []
@@ -7,6 +7,7 @@ import httpx
 import pytest
 
 import deerflow.community.jina_ai.jina_client as jina_client_module
+from deerflow.community.http_pool import reset_http_clients
 from deerflow.community.jina_ai.jina_client import JinaClient
 from deerflow.community.jina_ai.tools import (
     _coerce_bool,
@@ -18,7 +19,9 @@ from deerflow.community.jina_ai.tools import (
 
 @pytest.fixture
 def jina_client():
-    return JinaClient()
+    reset_http_clients()
+    yield JinaClient()
+    reset_http_clients()
 
 
 @pytest.mark.anyio
@@ -124,7 +127,7 @@ async def test_crawl_passes_headers(jina_client, monkeypatch):
 
 @pytest.mark.anyio
 async def test_crawl_passes_proxy_to_httpx_client(jina_client, monkeypatch):
-    """Explicit proxy config should be passed to httpx.AsyncClient."""
+    """Explicit proxy config should be passed to the pooled httpx.AsyncClient."""
     captured_client_kwargs = {}
 
     class MockAsyncClient:
@@ -172,7 +175,8 @@ async def test_crawl_can_disable_trust_env(jina_client, monkeypatch):
     result = await jina_client.crawl("https://example.com", trust_env=False)
 
     assert result == "ok"
-    assert captured_client_kwargs == {"trust_env": False}
+    assert captured_client_kwargs["trust_env"] is False
+    assert "proxy" not in captured_client_kwargs
 
 
 @pytest.mark.anyio
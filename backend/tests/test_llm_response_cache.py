@@ -0,0 +1,197 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from deerflow.config.llm_response_cache_config import LlmResponseCacheConfig
+from deerflow.skills import security_scanner
+from deerflow.utils import llm_response_cache, oneshot_llm
+from deerflow.utils.llm_response_cache import (
+    LlmResponseCache,
+    MemoryLlmResponseCache,
+    SqliteLlmResponseCache,
+    build_cache_key,
+    get_llm_response_cache,
+    get_llm_response_cache_stats,
+    reset_llm_response_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_cache():
+    reset_llm_response_cache()
+    yield
+    reset_llm_response_cache()
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _config(**cache_kwargs):
+    return SimpleNamespace(
+        models=[SimpleNamespace(name="fast-model")],
+        llm_response_cache=LlmResponseCacheConfig(enabled=True, **cache_kwargs),
+        skill_evolution=SimpleNamespace(moderation_model_name=None),
+    )
+
+
+def _key(text: str, *, version: str = "1", model: str = "m") -> str:
+    return build_cache_key(call_site="site", model_name=model, prompt_version=version, parts=("system", text))
+
+
+def test_cache_key_normalizes_line_endings_and_trailing_whitespace():
+    assert _key("line one  \r\nline two\n\n") == _key("line one\nline two")
+
+
+def test_cache_key_preserves_indentation_version_and_model():
+    assert _key("def f():\n    return 1") != _key("def f():\n  return 1")
+    assert _key("prompt", version="1") != _key("prompt", version="2")
+    assert _key("prompt", model="a") != _key("prompt", model="b")
+
+
+def test_memory_cache_expires_entries_after_ttl():
+    clock = _Clock()
+    cache = MemoryLlmResponseCache(ttl_seconds=10, max_entries=8, clock=clock)
+
+    asyncio.run(cache.aset("site", "k", "value"))
+    assert asyncio.run(cache.aget("site", "k")) == "value"
+
+    clock.now += 11
+    assert asyncio.run(cache.aget("site", "k")) is None
+    assert cache.stats()["site"]["hits"] == 1
+    assert cache.stats()["site"]["misses"] == 1
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryLlmResponseCache(ttl_seconds=60, max_entries=2)
+
+    async def scenario():
+        await cache.aset("site", "a", "A")
+        await cache.aset("site", "b", "B")
+        await cache.aget("site", "a")  # refresh "a" so "b" is the LRU entry
+        await cache.aset("site", "c", "C")
+        return [await cache.aget("site", key) for key in ("a", "b", "c")]
+
+    assert asyncio.run(scenario()) == ["A", None, "C"]
+    assert len(cache) == 2
+
+
+def test_sqlite_cache_persists_across_instances_and_bounds_size(tmp_path):
+    path = tmp_path / "cache.db"
+    clock = _Clock()
+    first = SqliteLlmResponseCache(path, ttl_seconds=60, max_entries=2, clock=clock)
+
+    async def fill():
+        for index, key in enumerate(("a", "b", "c")):
+            clock.now += index + 1
+            await first.aset("site", key, key.upper())
+
+    asyncio.run(fill())
+
+    second = SqliteLlmResponseCache(path, ttl_seconds=60, max_entries=2, clock=clock)
+    assert asyncio.run(second.aget("site", "a")) is None
+    assert asyncio.run(second.aget("site", "c")) == "C"
+
+    clock.now += 120
+    assert asyncio.run(second.aget("site", "c")) is None
+
+
+def test_cache_is_disabled_by_default_and_for_test_doubles():
+    assert get_llm_response_cache(SimpleNamespace(llm_response_cache=LlmResponseCacheConfig())) is None
+    assert get_llm_response_cache(SimpleNamespace(llm_response_cache=MagicMock())) is None
+    assert get_llm_response_cache(SimpleNamespace()) is None
+
+
+def test_cache_backend_is_rebuilt_when_config_changes(tmp_path):
+    memory = get_llm_response_cache(_config())
+    assert isinstance(memory, MemoryLlmResponseCache)
+    assert get_llm_response_cache(_config()) is memory
+
+    sqlite = get_llm_response_cache(_config(backend="sqlite", sqlite_path=str(tmp_path / "c.db")))
+    assert isinstance(sqlite, SqliteLlmResponseCache)
+
+
+def test_run_oneshot_llm_serves_repeat_calls_from_cache(monkeypatch):
+    fake_model = MagicMock()
+    fake_model.ainvoke = AsyncMock(return_value=MagicMock(content="rewritten"))
+    monkeypatch.setattr(oneshot_llm, "create_chat_model", lambda **kwargs: fake_model)
+    config = _config()
+
+    async def call(user_content: str, cache_version: str | None = "1") -> str:
+        return await oneshot_llm.run_oneshot_llm(
+            system_instruction="sys",
+            user_content=user_content,
+            run_name="input_polish",
+            app_config=config,
+            cache_version=cache_version,
+        )
+
+    assert asyncio.run(call("draft")) == "rewritten"
+    assert asyncio.run(call("draft  \n")) == "rewritten"
+    assert fake_model.ainvoke.await_count == 1
+
+    # Callers that do not pass a cache version never touch the cache.
+    asyncio.run(call("draft", cache_version=None))
+    assert fake_model.ainvoke.await_count == 2
+
+    stats = get_llm_response_cache_stats()["input_polish"]
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_run_oneshot_llm_does_not_cache_rejected_responses(monkeypatch):
+    fake_model = MagicMock()
+    fake_model.ainvoke = AsyncMock(return_value=MagicMock(content="not json"))
+    monkeypatch.setattr(oneshot_llm, "create_chat_model", lambda **kwargs: fake_model)
+    config = _config()
+
+    for _ in range(2):
+        asyncio.run(
+            oneshot_llm.run_oneshot_llm(
+                system_instruction="sys",
+                user_content="conversation",
+                run_name="suggest_agent",
+                app_config=config,
+                cache_version="1",
+                cache_validator=lambda text: text.startswith("["),
+            )
+        )
+
+    assert fake_model.ainvoke.await_count == 2
+
+
+def test_security_scan_reuses_cached_verdict(monkeypatch):
+    config = _config()
+    calls = []
+
+    class FakeModel:
+        async def ainvoke(self, *args, **kwargs):
+            calls.append(args)
+            return SimpleNamespace(content='{"decision":"warn","reason":"external API"}')
+
+    monkeypatch.setattr(security_scanner, "create_chat_model", lambda **kwargs: FakeModel())
+
+    first = asyncio.run(security_scanner.scan_skill_content("same skill", app_config=config))
+    second = asyncio.run(security_scanner.scan_skill_content("same skill", app_config=config))
+    other = asyncio.run(security_scanner.scan_skill_content("other skill", app_config=config))
+
+    assert first == second == other
+    assert (second.decision, second.reason) == ("warn", "external API")
+    assert len(calls) == 2
+    assert llm_response_cache.get_llm_response_cache_stats()["security_agent"]["hits"] == 1
+
+
+def test_backend_missing_a_primitive_cannot_be_created():
+    class Incomplete(LlmResponseCache):
+        def _get(self, key, now):
+            return None
+
+    with pytest.raises(TypeError):
+        Incomplete(ttl_seconds=60, max_entries=2)
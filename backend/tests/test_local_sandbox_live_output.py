@@ -0,0 +1,205 @@
+"""Tests for live bash output streaming (``execute_command(on_output=...)``).
+
+Live chunks must arrive while the command is still running, stay within the
+throttle (one forward per interval, at most the newest chunk of a stream),
+carry offsets that expose skipped output, and be masked like the final tool
+result. The final output must be unchanged by streaming.
+"""
+
+import os
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from deerflow.sandbox.local import local_sandbox
+from deerflow.sandbox.local.local_sandbox import LocalSandbox, PathMapping
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="live output is POSIX only")
+
+
+@pytest.fixture(params=[False, True], ids=["one-shot", "persistent"])
+def sandbox(request):
+    sandbox = LocalSandbox("t", persistent_shell=request.param)
+    yield sandbox
+    sandbox.close()
+
+
+def _recorder():
+    events: list[tuple[float, str, str, int]] = []
+    start = time.monotonic()
+    return events, lambda stream, text, offset: events.append((time.monotonic() - start, stream, text, offset))
+
+
+def test_output_is_forwarded_while_command_runs(sandbox):
+    events, on_output = _recorder()
+
+    output = sandbox.execute_command("echo first; echo oops >&2; sleep 1; echo second", on_output=on_output)
+
+    assert output == "first\nsecond\n\nStd Error:\noops\n"
+    by_stream = {(stream, text, offset) for _, stream, text, offset in events}
+    assert by_stream == {("stdout", "first\n", 0), ("stderr", "oops\n", 0), ("stdout", "second\n", 6)}
+    first_at = next(at for at, _, text, _ in events if text == "first\n")
+    assert first_at < 0.8, "first line was not forwarded before the command finished"
+
+
+def test_fast_writer_is_throttled_to_newest_chunk(sandbox):
+    events, on_output = _recorder()
+
+    output = sandbox.execute_command("seq 1 200000", on_output=on_output)
+
+    assert output == "".join(f"{i}\n" for i in range(1, 200001))
+    assert 0 < len(events) <= 10
+    offsets = [offset for _, _, _, offset in events]
+    assert offsets == sorted(offsets)
+    assert all(len(text) <= local_sandbox._LIVE_OUTPUT_CHUNK_BYTES for _, _, text, _ in events)
+    # The newest output is always forwarded, aligned to a line start.
+    _, _, last_text, last_offset = events[-1]
+    assert last_text.endswith("200000\n")
+    assert last_offset + len(last_text) == len(output)
+    assert last_text.split("\n", 1)[0].isdigit()
+
+
+def test_long_line_is_forwarded_in_pieces_with_holdback(sandbox):
+    events, on_output = _recorder()
+    line = "x" * (local_sandbox._LIVE_OUTPUT_CHUNK_BYTES + 512)
+
+    sandbox.execute_command(f"printf '{line}'; sleep 0.6; echo", on_output=on_output)
+
+    early = [text for at, _, text, _ in events if at < 0.5]
+    assert early, "a long unterminated line was not forwarded"
+    assert len(early[0]) == len(line) - local_sandbox._LIVE_OUTPUT_HOLDBACK_BYTES
+    assert "".join(text for _, _, text, _ in events) == line + "\n"
+
+
+_SECRET = "SECRETTOKEN123456"
+
+
+def _leaks_partial_secret(pieces: list[str]) -> bool:
+    masked = [piece.replace(_SECRET, "[masked]") for piece in pieces]
+    return any(_SECRET[:5] in piece or _SECRET[-5:] in piece for piece in masked)
+
+
+def test_secret_across_the_holdback_cut_is_never_split(sandbox):
+    events, on_output = _recorder()
+    cut = local_sandbox._LIVE_OUTPUT_CHUNK_BYTES + 512 - local_sandbox._LIVE_OUTPUT_HOLDBACK_BYTES
+    line = "x" * (cut - 4) + _SECRET + "x" * (local_sandbox._LIVE_OUTPUT_CHUNK_BYTES + 512 - cut - len(_SECRET) + 4)
+
+    sandbox.execute_command(f"printf '{line}'; sleep 0.6; echo", env={"ERP_TOKEN": _SECRET}, on_output=on_output)
+
+    pieces = [text for _, _, text, _ in events]
+    assert len(pieces) > 1, "the long line was not forwarded in pieces"
+    assert "".join(pieces) == line + "\n"
+    assert not _leaks_partial_secret(pieces)
+
+
+@pytest.mark.parametrize("secret_at", [4090, 8190, 12280])
+def test_trimmed_and_skipped_output_never_starts_inside_a_secret(secret_at):
+    pieces: list[str] = []
+    live = local_sandbox._LiveOutput(lambda stream, text, offset: pieces.append(text), lambda text: text, secrets=[_SECRET])
+    data = ("y" * secret_at + _SECRET + "y" * 9000).encode()
+    try:
+        # One large write forces the _append skip; the flush then trims to the newest chunk.
+        live._append("stdout", data[: secret_at + 5])
+        live._append("stdout", data[secret_at + 5 :])
+        live._flush(final=False)
+    finally:
+        live.close()
+
+    assert pieces
+    assert not _leaks_partial_secret(pieces)
+
+
+def test_pending_stays_bounded_without_a_secret_safe_cut():
+    # A repetitive value inside a long run of the same bytes (a base64 blob of
+    # zeros) leaves no cut outside a secret; the buffer must still be trimmed.
+    live = local_sandbox._LiveOutput(lambda stream, text, offset: None, lambda text: text, secrets=["AAAAAAAA"])
+    chunk = b"A" * local_sandbox._LIVE_OUTPUT_CHUNK_BYTES
+    try:
+        for _ in range(20):
+            live._append("stdout", chunk)
+            assert len(live._pending["stdout"]) <= 3 * local_sandbox._LIVE_OUTPUT_CHUNK_BYTES
+    finally:
+        live.close()
+
+    assert live._offsets["stdout"] == 20 * len(chunk)
+
+
+def test_host_paths_are_reverse_resolved(tmp_path):
+    sandbox = LocalSandbox("t", path_mappings=[PathMapping(container_path="/mnt/data", local_path=str(tmp_path))])
+    events, on_output = _recorder()
+
+    sandbox.execute_command(f"echo {tmp_path}/report.txt", on_output=on_output)
+
+    assert [text for _, _, text, _ in events] == ["/mnt/data/report.txt\n"]
+
+
+def test_callback_failure_does_not_break_command(sandbox):
+    def on_output(stream, text, offset):
+        raise RuntimeError("subscriber gone")
+
+    assert sandbox.execute_command("echo ok", on_output=on_output) == "ok\n"
+
+
+def test_bash_tool_publishes_masked_tool_output_events():
+    from deerflow.sandbox import tools as tools_mod
+
+    events: list[dict] = []
+
+    class FakeSandbox:
+        def execute_command(self, command, env=None, timeout=None, on_output=None):
+            on_output("stdout", "token tok-live-secret-123 at /tmp/ws/out.txt\n", 0)
+            return "done"
+
+    runtime = SimpleNamespace(
+        context={"__active_skill_secrets": {"ERP_TOKEN": "tok-live-secret-123"}},
+        state={"sandbox": {"sandbox_id": "local:1"}},
+        stream_writer=events.append,
+        tool_call_id="call-1",
+    )
+    thread_data = {"workspace_path": "/tmp/ws", "cwd": "/mnt/user-data/workspace"}
+    with (
+        patch.object(tools_mod, "ensure_sandbox_initialized", return_value=FakeSandbox()),
+        patch.object(tools_mod, "is_local_sandbox", return_value=True),
+        patch.object(tools_mod, "is_host_bash_allowed", return_value=True),
+        patch.object(tools_mod, "ensure_thread_directories_exist", return_value=None),
+        patch.object(tools_mod, "get_thread_data", return_value=thread_data),
+        patch.object(tools_mod, "validate_local_bash_command_paths", return_value=None),
+        patch.object(tools_mod, "replace_virtual_paths_in_command", side_effect=lambda command, td: command),
+        patch.object(tools_mod, "_apply_cwd_prefix", side_effect=lambda command, td: command),
+    ):
+        assert tools_mod.bash_tool.func(runtime, "build", "make") == "done"
+
+    assert len(events) == 1
+    event = events[0]
+    assert {key: event[key] for key in ("type", "tool_call_id", "stream", "offset")} == {"type": "tool_output", "tool_call_id": "call-1", "stream": "stdout", "offset": 0}
+    assert "tok-live-secret-123" not in event["text"]
+    assert "/tmp/ws" not in event["text"]
+    assert "/mnt/user-data/workspace/out.txt" in event["text"]
+
+
+def test_bash_tool_without_stream_writer_keeps_plain_call():
+    from deerflow.sandbox import tools as tools_mod
+
+    calls = []
+
+    class FakeSandbox:
+        def execute_command(self, command, env=None, timeout=None):
+            calls.append(command)
+            return "done"
+
+    runtime = SimpleNamespace(context={}, state={"sandbox": {"sandbox_id": "local:1"}})
+    with (
+        patch.object(tools_mod, "ensure_sandbox_initialized", return_value=FakeSandbox()),
+        patch.object(tools_mod, "is_local_sandbox", return_value=True),
+        patch.object(tools_mod, "is_host_bash_allowed", return_value=True),
+        patch.object(tools_mod, "ensure_thread_directories_exist", return_value=None),
+        patch.object(tools_mod, "get_thread_data", return_value={"workspace_path": "/tmp/ws"}),
+        patch.object(tools_mod, "validate_local_bash_command_paths", return_value=None),
+        patch.object(tools_mod, "replace_virtual_paths_in_command", side_effect=lambda command, td: command),
+        patch.object(tools_mod, "_apply_cwd_prefix", side_effect=lambda command, td: command),
+    ):
+        assert tools_mod.bash_tool.func(runtime, "build", "make") == "done"
+
+    assert calls == ["make"]
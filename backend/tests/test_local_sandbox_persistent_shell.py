@@ -0,0 +1,177 @@
+"""Tests for ``sandbox.persistent_shell`` — LocalSandbox commands in one long-lived shell.
+
+The persistent shell must be a drop-in for the one-shot path: identical
+output formatting, the same timeout / process-group kill and output cap, and
+request-scoped secrets must never reach the shared shell.
+"""
+
+import functools
+import os
+import threading
+import time
+
+import pytest
+
+from deerflow.config.sandbox_config import SandboxConfig
+from deerflow.sandbox.local import persistent_shell
+from deerflow.sandbox.local.local_sandbox import LocalSandbox, _BoundedPipeCapture
+from deerflow.sandbox.local.local_sandbox_provider import LocalSandboxProvider
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="persistent shell is POSIX only")
+
+
+@pytest.fixture
+def sandbox():
+    sandbox = LocalSandbox("t", persistent_shell=True)
+    yield sandbox
+    sandbox.close()
+
+
+def _shell_pid(sandbox: LocalSandbox) -> int:
+    return sandbox._persistent_shell._process.pid
+
+
+def test_output_matches_one_shot_mode(sandbox):
+    one_shot = LocalSandbox("t")
+    commands = [
+        "echo hello",
+        "printf 'no trailing newline'",
+        "echo out; echo oops >&2",
+        "echo err only >&2",
+        "exit 3",
+        "false",
+        "true",
+        "read x; echo got",
+        "seq 1 20000",
+    ]
+    for command in commands:
+        assert sandbox.execute_command(command) == one_shot.execute_command(command), command
+
+
+def test_shell_state_and_process_persist_between_calls(sandbox, tmp_path):
+    sandbox.execute_command(f"cd {tmp_path}; export DEERFLOW_TEST_VAR=kept; greet() {{ echo hi $1; }}")
+    pid = _shell_pid(sandbox)
+
+    assert sandbox.execute_command("pwd; echo $DEERFLOW_TEST_VAR; greet there") == f"{tmp_path}\nkept\nhi there\n"
+    assert _shell_pid(sandbox) == pid
+
+
+def test_timeout_kills_shell_group_and_next_call_restarts(sandbox, tmp_path):
+    marker = tmp_path / "alive"
+    sandbox.execute_command("export DEERFLOW_TEST_VAR=lost")
+    pid = _shell_pid(sandbox)
+    start = time.monotonic()
+
+    output = sandbox.execute_command(f"echo partial; while true; do touch {marker}; sleep 0.2; done", timeout=1)
+
+    assert time.monotonic() - start < 5
+    assert output.startswith("partial\n")
+    assert "timed out" in output.lower()
+    first_mtime = marker.stat().st_mtime
+    time.sleep(1)
+    assert marker.stat().st_mtime == first_mtime, "process group survived the timeout"
+
+    assert sandbox.execute_command("echo ${DEERFLOW_TEST_VAR:-fresh}") == "fresh\n"
+    assert _shell_pid(sandbox) != pid
+
+
+def test_exit_in_command_reports_code_and_restarts(sandbox):
+    sandbox.execute_command("true")
+    pid = _shell_pid(sandbox)
+
+    assert sandbox.execute_command("echo bye; exit 7") == "bye\n\nExit Code: 7"
+    assert sandbox.execute_command("echo back") == "back\n"
+    assert _shell_pid(sandbox) != pid
+
+
+def test_backgrounded_process_returns_promptly(sandbox):
+    start = time.monotonic()
+    output = sandbox.execute_command("sleep 5 & echo serving", timeout=10)
+
+    assert time.monotonic() - start < 3
+    assert output == "serving\n"
+    assert sandbox.execute_command("echo next") == "next\n"
+
+
+def test_output_cap_applies(sandbox, monkeypatch):
+    monkeypatch.setattr(persistent_shell, "_BoundedPipeCapture", functools.partial(_BoundedPipeCapture, limit_bytes=1024))
+
+    output = sandbox.execute_command("head -c 100000 /dev/zero | tr '\\0' x; echo done >&2")
+
+    assert output.startswith("x" * 1024)
+    assert "truncated" in output
+    assert "done" in output
+    assert sandbox.execute_command("echo still usable") == "still usable\n"
+
+
+def test_request_env_runs_one_shot_and_never_enters_shell(sandbox):
+    sandbox.execute_command("true")
+    pid = _shell_pid(sandbox)
+
+    secret, one_shot_pid = sandbox.execute_command("echo $DEERFLOW_SECRET; echo $$", env={"DEERFLOW_SECRET": "s3cret"}).split()
+    assert secret == "s3cret"
+    assert int(one_shot_pid) != pid
+    assert sandbox.execute_command("echo ${DEERFLOW_SECRET:-unset}") == "unset\n"
+
+
+def test_concurrent_call_falls_back_to_one_shot(sandbox):
+    sandbox.execute_command("true")
+    results: list[str] = []
+    runner = threading.Thread(target=lambda: results.append(sandbox.execute_command("sleep 1; echo slow")))
+    runner.start()
+    time.sleep(0.3)
+
+    start = time.monotonic()
+    assert sandbox.execute_command("echo fast") == "fast\n"
+    assert time.monotonic() - start < 0.8
+    runner.join()
+    assert results == ["slow\n"]
+
+
+def test_marker_split_across_reads_is_detected():
+    cond = threading.Condition()
+    read_fd, write_fd = os.pipe()
+    reader = persistent_shell._StreamReader(read_fd, "test-drain", cond)
+    try:
+        with cond:
+            capture = reader.begin(b"__MARK__")
+            for chunk in (b"out", b"put__MA", b"RK", b"__ 0", b"\nlate background output"):
+                reader._feed(chunk)
+        assert reader.trailer == b" 0"
+        assert capture.read() == "output"
+    finally:
+        os.close(write_fd)
+
+
+def test_close_kills_shell_and_disables_it(sandbox, tmp_path):
+    marker = tmp_path / "alive"
+    sandbox.execute_command(f"(while true; do touch {marker}; sleep 0.2; done) &")
+    time.sleep(0.5)
+
+    sandbox.close()
+    first_mtime = marker.stat().st_mtime
+    time.sleep(1)
+
+    assert marker.stat().st_mtime == first_mtime
+    assert sandbox.execute_command("echo one-shot") == "one-shot\n"
+    assert sandbox._persistent_shell is None
+
+
+def test_provider_closes_evicted_and_reset_sandboxes(monkeypatch):
+    monkeypatch.setattr(LocalSandboxProvider, "_persistent_shell_enabled", staticmethod(lambda: True))
+    monkeypatch.setattr(LocalSandboxProvider, "_build_thread_path_mappings", staticmethod(lambda thread_id, user_id=None: []))
+    closed: list[str] = []
+    monkeypatch.setattr(LocalSandbox, "close", lambda self: closed.append(self.id))
+    provider = LocalSandboxProvider(max_cached_threads=1)
+
+    first = provider.get(provider.acquire("thread-1", user_id="u"))
+    assert first._persistent_shell_enabled
+    second_id = provider.acquire("thread-2", user_id="u")
+    assert closed == [first.id]
+
+    provider.reset()
+    assert closed == [first.id, second_id]
+
+
+def test_sandbox_config_persistent_shell_defaults_off():
+    assert SandboxConfig(use="deerflow.sandbox.local:LocalSandboxProvider").persistent_shell is False
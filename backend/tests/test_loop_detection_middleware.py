@@ -190,6 +190,21 @@ class TestHashToolCalls:
         }
         assert _hash_tool_calls([a]) != _hash_tool_calls([b])
 
+    def test_dict_key_order_does_not_affect_hash(self):
+        a = {"name": "write_file", "args": {"path": "/tmp/a.py", "content": "x" * 100_000}}
+        b = {"name": "write_file", "args": {"content": "x" * 100_000, "path": "/tmp/a.py"}}
+        assert _hash_tool_calls([a]) == _hash_tool_calls([b])
+
+    def test_adjacent_strings_do_not_collide(self):
+        a = {"name": "str_replace", "args": {"path": "/tmp/a.py", "old_str": "ab", "new_str": "c"}}
+        b = {"name": "str_replace", "args": {"path": "/tmp/a.py", "old_str": "a", "new_str": "bc"}}
+        assert _hash_tool_calls([a]) != _hash_tool_calls([b])
+
+    def test_hash_is_stable_across_processes(self):
+        """Hashes are checkpointed, so they must not depend on per-process salts."""
+        call = {"name": "bash", "args": {"command": "ls -la", "description": "list"}}
+        assert _hash_tool_calls([call]) == "3361658078e86b71"
+
 
 class TestLoopDetection:
     def test_no_tool_calls_returns_none(self):
@@ -652,6 +667,101 @@ class TestLoopDetection:
         assert "default" in mw._history
 
 
+class TestLoopDetectionPersistence:
+    """The sliding windows ride along with the checkpoint (``loop_detection`` key)."""
+
+    @staticmethod
+    def _checkpointed(state, update):
+        """Apply an ``after_model`` update the way the graph would."""
+        return {**state, **{k: v for k, v in (update or {}).items() if k != "messages"}}
+
+    def test_after_model_writes_snapshot(self):
+        mw = LoopDetectionMiddleware(warn_threshold=2)
+        runtime = _make_runtime()
+        call = [_bash_call("ls")]
+
+        mw.after_model(_make_state(tool_calls=call), runtime)
+        update = mw.after_model(_make_state(tool_calls=call), runtime)
+
+        snapshot = update["loop_detection"]
+        assert snapshot["hashes"] == [_hash_tool_calls(call)] * 2
+        assert snapshot["warned"] == [_hash_tool_calls(call)]
+        # A hash-layer warning returns before the frequency layer counts the call.
+        assert snapshot["tool_names"] == ["bash"]
+        assert "messages" not in update
+
+    def test_after_model_without_tool_calls_leaves_state_alone(self):
+        mw = LoopDetectionMiddleware()
+        assert mw.after_model({"messages": [AIMessage(content="done")]}, _make_runtime()) is None
+
+    def test_hard_stop_carries_snapshot_with_stripped_message(self):
+        mw = LoopDetectionMiddleware(warn_threshold=2, hard_limit=3)
+        runtime = _make_runtime()
+        call = [_bash_call("ls")]
+        for _ in range(2):
+            mw.after_model(_make_state(tool_calls=call), runtime)
+
+        update = mw.after_model(_make_state(tool_calls=call), runtime)
+
+        assert update["messages"][0].tool_calls == []
+        assert len(update["loop_detection"]["hashes"]) == 3
+
+    def test_new_worker_resumes_from_checkpointed_windows(self):
+        """A lease takeover lands on a fresh instance; counting continues."""
+        call = [_bash_call("ls")]
+        first = LoopDetectionMiddleware(warn_threshold=2, hard_limit=4)
+        state = _make_state(tool_calls=call)
+        for _ in range(3):
+            state = self._checkpointed(_make_state(tool_calls=call), first.after_model(state, _make_runtime()))
+            state = {**state, **_make_state(tool_calls=call)}
+
+        second = LoopDetectionMiddleware(warn_threshold=2, hard_limit=4)
+        update = second.after_model(state, _make_runtime())
+
+        assert update["messages"][0].tool_calls == []
+        assert second.consume_stop_reason("test-run") == "loop_capped"
+
+    def test_warned_set_survives_handoff(self):
+        """An already-delivered warning is not repeated by the next worker."""
+        call = [_bash_call("ls")]
+        first = LoopDetectionMiddleware(warn_threshold=2, hard_limit=10)
+        state = _make_state(tool_calls=call)
+        for _ in range(2):
+            state = {**self._checkpointed(state, first.after_model(state, _make_runtime())), **_make_state(tool_calls=call)}
+
+        second = LoopDetectionMiddleware(warn_threshold=2, hard_limit=10)
+        second.after_model(state, _make_runtime())
+
+        assert not second._pending_warnings.get(_pending_key())
+
+    def test_checkpoint_wins_over_evicted_in_process_copy(self):
+        mw = LoopDetectionMiddleware(warn_threshold=2, hard_limit=3, max_tracked_threads=1)
+        call = [_bash_call("ls")]
+        state = _make_state(tool_calls=call)
+        for _ in range(2):
+            state = {**self._checkpointed(state, mw.after_model(state, _make_runtime())), **_make_state(tool_calls=call)}
+        mw.after_model(_make_state(tool_calls=call), _make_runtime("other-thread"))
+        assert "test-thread" not in mw._history
+
+        update = mw.after_model(state, _make_runtime())
+
+        assert update["messages"][0].tool_calls == []
+
+    def test_tool_frequency_window_survives_handoff(self):
+        calls = [[{"name": "read_file", "id": f"c{i}", "args": {"path": f"/f_{i}.py"}}] for i in range(5)]
+        first = LoopDetectionMiddleware(tool_freq_warn=3, tool_freq_hard_limit=5)
+        state = _make_state(tool_calls=calls[0])
+        for call in calls[:4]:
+            state = {**state, **_make_state(tool_calls=call)}
+            state = self._checkpointed(state, first.after_model(state, _make_runtime()))
+        assert state["loop_detection"]["freq_warned"] == ["read_file"]
+
+        second = LoopDetectionMiddleware(tool_freq_warn=3, tool_freq_hard_limit=5)
+        update = second.after_model({**state, **_make_state(tool_calls=calls[4])}, _make_runtime())
+
+        assert update["messages"][0].tool_calls == []
+
+
 class TestLoopDetectionAgentGraphIntegration:
     def test_loop_warning_is_transient_in_real_agent_graph(self):
         """after_model queues the warning; wrap_model_call injects it request-only."""
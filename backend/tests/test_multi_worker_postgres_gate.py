@@ -54,8 +54,17 @@ def test_gate_allows_multi_worker_with_postgres_and_heartbeat(monkeypatch):
     _enforce_postgres_for_multi_worker(_config_with_backend("postgres", heartbeat_enabled=True))
 
 
+def test_gate_allows_browser_with_multi_worker_via_browser_host(monkeypatch):
+    monkeypatch.setenv("GATEWAY_WORKERS", "2")
+    monkeypatch.setattr("deerflow.community.browser_automation.session._browser_host_supported", lambda: True)
+    _enforce_postgres_for_multi_worker(
+        _config_with_backend("postgres", heartbeat_enabled=True, browser_enabled=True),
+    )
+
+
 def test_gate_rejects_process_local_browser_with_multi_worker(monkeypatch):
     monkeypatch.setenv("GATEWAY_WORKERS", "2")
+    monkeypatch.setattr("deerflow.community.browser_automation.session._browser_host_supported", lambda: False)
     with pytest.raises(SystemExit) as exc_info:
         _enforce_postgres_for_multi_worker(
             _config_with_backend("postgres", heartbeat_enabled=True, browser_enabled=True),
@@ -67,6 +76,7 @@ def test_gate_rejects_process_local_browser_with_multi_worker(monkeypatch):
 
 def test_runtime_browser_surface_stays_disabled_after_incompatible_hot_reload(monkeypatch):
     monkeypatch.setenv("GATEWAY_WORKERS", "2")
+    monkeypatch.setattr("deerflow.community.browser_automation.session._browser_host_supported", lambda: False)
     live_config = SimpleNamespace(tools=[SimpleNamespace(name="browser_navigate", model_extra={})])
 
     with patch("deerflow.config.get_app_config", return_value=live_config):
@@ -28,7 +28,7 @@ from deerflow.persistence.bootstrap import bootstrap_schema
 pytestmark = pytest.mark.asyncio
 
 
-HEAD = "0005_run_stop_reason"
+HEAD = "0006_run_usage_rollup"
 
 
 def _url(tmp_path: Path) -> str:
@@ -0,0 +1,200 @@
+"""Tests for the hourly run-usage rollup behind the console stats/usage endpoints.
+
+Covers:
+1. RunRepository keeps the rollup in step with run completion, deletion and takeover
+2. Active runs are never rolled up
+3. A pricing change (fingerprint mismatch) triggers one background rebuild
+4. Rebuilds stream runs in batches; the staleness probe uses an index
+5. Migration 0006 backfills the rollup from existing runs
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+import sqlalchemy as sa
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+import deerflow.persistence.models  # noqa: F401  -- registers ORM models
+from deerflow.persistence.base import Base
+from deerflow.persistence.engine import close_engine, get_session_factory, init_engine
+from deerflow.persistence.run import RunRepository, RunRow
+from deerflow.persistence.run_usage import RunUsageHourlyRow, RunUsageRepository
+from deerflow.persistence.run_usage import sql as usage_sql
+from deerflow.persistence.run_usage.pricing import build_pricing_map, pricing_fingerprint
+
+pytestmark = pytest.mark.asyncio
+
+_PRICED_MODELS = [SimpleNamespace(name="m1", model="M1", pricing={"input_per_million": 1_000_000, "output_per_million": 2_000_000})]
+
+
+@pytest.fixture(autouse=True)
+def _unpriced(monkeypatch):
+    # Keep the repository's refreshes independent of any local config.yaml.
+    monkeypatch.setattr(usage_sql, "build_pricing_map", lambda: {})
+
+
+@pytest_asyncio.fixture
+async def repo(tmp_path):
+    await init_engine("sqlite", url=f"sqlite+aiosqlite:///{tmp_path / 'runs.db'}", sqlite_dir=str(tmp_path))
+    yield RunRepository(get_session_factory())
+    await close_engine()
+
+
+async def _rollup(sf) -> list[RunUsageHourlyRow]:
+    async with sf() as session:
+        return list((await session.execute(select(RunUsageHourlyRow).order_by(RunUsageHourlyRow.model_name))).scalars())
+
+
+async def test_completion_rolls_up_and_delete_removes(repo):
+    sf = get_session_factory()
+    await repo.put("r1", thread_id="t1", user_id="u1", model_name="m1", status="running")
+    await repo.put("r2", thread_id="t2", user_id="u1", model_name="m1", status="running")
+    assert await _rollup(sf) == []
+
+    await repo.update_run_completion(
+        "r1",
+        status="success",
+        total_input_tokens=10,
+        total_output_tokens=5,
+        total_tokens=15,
+        token_usage_by_model={"m1": {"input_tokens": 6, "output_tokens": 3, "total_tokens": 9}, "m2": {"input_tokens": 4, "output_tokens": 2, "total_tokens": 6, "cache_read_tokens": 1}},
+    )
+    await repo.update_status("r2", "error", error="boom")
+
+    rows = {(r.model_name, r.status): r for r in await _rollup(sf)}
+    assert set(rows) == {("m1", "success"), ("m2", "success"), ("m1", "error")}
+    assert rows[("m1", "success")].run_count == 1
+    assert rows[("m1", "success")].total_tokens == 15
+    assert rows[("m1", "success")].model_tokens == 9
+    # m2 only appears in the breakdown: no run-level measures, one model-level run.
+    assert rows[("m2", "success")].run_count == 0
+    assert rows[("m2", "success")].model_run_count == 1
+    assert rows[("m2", "success")].model_cache_read_tokens == 1
+    assert rows[("m1", "error")].run_count == 1
+    assert all(r.user_id == "u1" for r in rows.values())
+
+    await repo.delete("r1", user_id=None)
+    rows = await _rollup(sf)
+    assert [(r.model_name, r.status) for r in rows] == [("m1", "error")]
+
+
+async def test_takeover_rolls_up_claimed_run(repo):
+    sf = get_session_factory()
+    await repo.put("r1", thread_id="t1", user_id="u1", model_name="m1", status="running")
+    assert await repo.claim_for_takeover("r1", grace_seconds=0, error="owner lost")
+    rows = await _rollup(sf)
+    assert [(r.status, r.run_count) for r in rows] == [("error", 1)]
+
+
+async def test_pricing_change_triggers_rebuild(repo):
+    sf = get_session_factory()
+    await repo.put("r1", thread_id="t1", user_id="u1", model_name="m1", status="running")
+    await repo.update_run_completion("r1", status="success", total_input_tokens=2, total_output_tokens=1, total_tokens=3)
+    usage = RunUsageRepository(sf)
+    [row] = await _rollup(sf)
+    assert row.cost == 0.0
+
+    pricing = build_pricing_map(_PRICED_MODELS)
+    assert await usage.ensure_current(pricing) is False
+    await usage_sql.wait_for_rollup_rebuild()
+    [row] = await _rollup(sf)
+    assert row.cost == pytest.approx(2 * 1 + 1 * 2)
+    assert row.pricing_fingerprint == pricing_fingerprint(pricing)
+    assert await usage.ensure_current(pricing) is True
+
+
+async def test_concurrent_stale_reads_start_one_rebuild(repo, monkeypatch):
+    sf = get_session_factory()
+    await repo.put("r1", thread_id="t1", user_id="u1", model_name="m1", status="running")
+    await repo.update_run_completion("r1", status="success", total_input_tokens=2, total_output_tokens=1, total_tokens=3)
+    usage = RunUsageRepository(sf)
+    real_rebuild = usage.rebuild
+    calls = []
+
+    async def counting_rebuild(**kwargs):
+        calls.append(kwargs)
+        await asyncio.sleep(0.2)  # keep the rebuild in flight while the others probe
+        return await real_rebuild(**kwargs)
+
+    monkeypatch.setattr(usage, "rebuild", counting_rebuild)
+    pricing = build_pricing_map(_PRICED_MODELS)
+
+    assert await asyncio.gather(*(usage.ensure_current(pricing) for _ in range(5))) == [False] * 5
+    await usage_sql.wait_for_rollup_rebuild()
+
+    assert len(calls) == 1
+    assert await usage.ensure_current(pricing) is True
+
+
+async def test_rebuild_streams_runs_in_batches(repo, monkeypatch):
+    sf = get_session_factory()
+    for i in range(5):
+        await repo.put(f"r{i}", thread_id=f"t{i}", user_id="u1", model_name="m1", status="running")
+        await repo.update_run_completion(f"r{i}", status="success", total_input_tokens=2, total_output_tokens=1, total_tokens=3)
+    # Five runs fetched two at a time: the fold must span every partition.
+    monkeypatch.setattr(usage_sql, "_INSERT_CHUNK", 2)
+
+    assert await RunUsageRepository(sf).rebuild(pricing={}) == 1
+
+    [row] = await _rollup(sf)
+    assert (row.run_count, row.total_tokens) == (5, 15)
+
+
+async def test_staleness_probe_uses_the_pricing_index(repo):
+    sf = get_session_factory()
+    column = RunUsageHourlyRow.pricing_fingerprint
+    probe = select(RunUsageHourlyRow.bucket_start).where(sa.or_(column < "x", column > "x")).limit(1)
+    async with sf() as session:
+        sql = str(probe.compile(session.bind, compile_kwargs={"literal_binds": True}))
+        plan = " ".join(str(row[-1]) for row in (await session.execute(sa.text(f"EXPLAIN QUERY PLAN {sql}"))).all())
+    assert "ix_run_usage_hourly_pricing" in plan
+
+
+def _seed_at_0005(db_path: Path, created: datetime) -> None:
+    engine = sa.create_engine(f"sqlite:///{db_path.as_posix()}")
+    try:
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            conn.execute(sa.text("DROP TABLE run_usage_hourly"))
+            conn.execute(sa.text("DROP INDEX ix_runs_user_created_status"))
+            conn.execute(sa.text("CREATE TABLE IF NOT EXISTS alembic_version (version_num VARCHAR(32) NOT NULL)"))
+            conn.execute(sa.text("INSERT INTO alembic_version (version_num) VALUES ('0005_run_stop_reason')"))
+        with Session(engine) as session:
+            session.add_all(
+                [
+                    RunRow(run_id="done-1", thread_id="t1", user_id="u1", model_name="m1", status="success", total_tokens=10, created_at=created, updated_at=created + timedelta(seconds=2)),
+                    RunRow(run_id="done-2", thread_id="t2", user_id="u1", model_name="m1", status="success", total_tokens=5, created_at=created + timedelta(minutes=5), updated_at=created + timedelta(minutes=5, seconds=1)),
+                    RunRow(run_id="live", thread_id="t3", user_id="u1", model_name="m1", status="running", total_tokens=7, created_at=created, updated_at=created),
+                ]
+            )
+            session.commit()
+    finally:
+        engine.dispose()
+
+
+async def test_migration_backfills_finished_runs(tmp_path):
+    db_path = tmp_path / "legacy.db"
+    created = datetime.now(UTC).replace(minute=10, second=0, microsecond=0) - timedelta(hours=3)
+    _seed_at_0005(db_path, created)
+
+    await init_engine("sqlite", url=f"sqlite+aiosqlite:///{db_path.as_posix()}", sqlite_dir=str(tmp_path))
+    try:
+        [row] = await _rollup(get_session_factory())
+    finally:
+        await close_engine()
+
+    assert (row.user_id, row.model_name, row.status) == ("u1", "m1", "success")
+    assert row.run_count == 2  # the running row is left to live queries
+    assert row.total_tokens == 15
+    assert row.latency_ms == 3000
+    with sqlite3.connect(db_path) as raw:
+        assert raw.execute("SELECT 1 FROM sqlite_master WHERE type='index' AND name='ix_runs_user_created_status'").fetchone()
+        assert raw.execute("SELECT 1 FROM sqlite_master WHERE type='index' AND name='ix_run_usage_hourly_pricing'").fetchone()
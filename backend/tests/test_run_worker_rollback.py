@@ -16,12 +16,16 @@ from deerflow.runtime.runs.schemas import RunStatus
 from deerflow.runtime.runs.worker import (
     RunContext,
     _agent_factory_supports_app_config,
+    _background_title_tasks,
     _build_runtime_context,
     _bump_channel_version,
+    _checkpoint_thread_lock,
     _collect_pre_existing_message_ids,
     _ensure_interrupted_title,
     _extract_llm_error_fallback_message,
+    _finish_background_title,
     _install_runtime_context,
+    _persist_background_title,
     _rollback_to_pre_run_checkpoint,
     _try_extract_from_message,
     run_agent,
@@ -1564,6 +1568,124 @@ async def test_ensure_interrupted_title_bumps_channel_version_and_declares_it_in
     assert write_config == {"configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}}
 
 
+@pytest.mark.anyio
+async def test_persist_background_title_replaces_only_the_fallback_title():
+    checkpointer = _TitleCheckpointer(
+        tuple_value=_FakeCheckpointTuple(
+            checkpoint={
+                "id": "ckpt-1",
+                "ts": "2026-06-29T00:00:00Z",
+                "channel_values": {"messages": [{"type": "human", "content": "hi"}], "title": "hi"},
+                "channel_versions": {"messages": 2, "title": 1},
+            },
+            metadata={"source": "loop", "step": 3},
+        ),
+    )
+
+    assert await _persist_background_title(checkpointer=checkpointer, thread_id="thread-1", title="Greeting", fallback="hi") is True
+    _, written_checkpoint, written_metadata, new_versions = checkpointer.aput.await_args.args
+    assert written_checkpoint["channel_values"]["title"] == "Greeting"
+    assert new_versions == {"title": 2}
+    assert written_metadata["writes"] == {"runtime_background_title": {"title": "Greeting"}}
+
+    checkpointer.aput.reset_mock()
+    assert await _persist_background_title(checkpointer=checkpointer, thread_id="thread-1", title="Greeting", fallback="something else") is False
+    checkpointer.aput.assert_not_awaited()
+
+
+@pytest.mark.anyio
+async def test_run_agent_ends_the_stream_before_persisting_the_background_title():
+    from deerflow.agents.middlewares.title_middleware import BACKGROUND_TITLE_CONTEXT_KEY
+
+    run_manager = RunManager()
+    record = await run_manager.create("thread-1")
+    events: list[str] = []
+    release_title = asyncio.Event()
+    bridge = SimpleNamespace(
+        publish=AsyncMock(),
+        publish_end=AsyncMock(side_effect=lambda run_id: events.append("publish_end")),
+        cleanup=AsyncMock(),
+    )
+    thread_store = SimpleNamespace(
+        update_status=AsyncMock(side_effect=lambda thread_id, status: events.append(f"status:{status}")),
+        update_display_name=AsyncMock(side_effect=lambda thread_id, title: events.append(f"display_name:{title}")),
+    )
+    checkpointer = _TitleCheckpointer(
+        tuple_value=_FakeCheckpointTuple(
+            checkpoint={
+                "id": "ckpt-1",
+                "ts": "2026-06-29T00:00:00Z",
+                "channel_values": {"messages": [{"type": "human", "content": "hi"}], "title": "hi"},
+                "channel_versions": {"messages": 2, "title": 1},
+            },
+            metadata={"source": "loop", "step": 3},
+        ),
+    )
+
+    async def record_title_write(config, checkpoint, metadata, new_versions):
+        if "runtime_background_title" in metadata.get("writes", {}):
+            events.append("title_checkpoint")
+        return {}
+
+    checkpointer.aput.side_effect = record_title_write
+
+    async def slow_title():
+        await release_title.wait()
+        return {"title": "Greeting"}
+
+    class DummyAgent:
+        async def astream(self, graph_input, config=None, stream_mode=None, subgraphs=False):
+            config["context"][BACKGROUND_TITLE_CONTEXT_KEY].start(slow_title(), fallback="hi")
+            yield {"messages": []}
+
+    await run_agent(
+        bridge,
+        run_manager,
+        record,
+        ctx=RunContext(checkpointer=checkpointer, thread_store=thread_store),
+        agent_factory=lambda *, config: DummyAgent(),
+        graph_input={},
+        config={},
+    )
+
+    assert events == ["display_name:hi", "status:idle", "publish_end"]
+    assert len(_background_title_tasks) == 1
+
+    release_title.set()
+    await asyncio.wait_for(asyncio.gather(*_background_title_tasks), 5)
+
+    assert events[3:] == ["title_checkpoint", "display_name:Greeting"]
+
+
+@pytest.mark.anyio
+async def test_background_title_waits_for_the_checkpoint_lock_and_yields_to_a_later_run():
+    run_manager = RunManager()
+    first = await run_manager.create("thread-1")
+    await run_manager.set_status(first.run_id, RunStatus.success)
+    checkpointer = _TitleCheckpointer(
+        tuple_value=_FakeCheckpointTuple(
+            checkpoint={"id": "ckpt-1", "channel_values": {"title": "hi"}, "channel_versions": {"title": 1}},
+            metadata={"source": "loop", "step": 1},
+        ),
+    )
+    background_title = SimpleNamespace(settle=AsyncMock(return_value="Greeting"), fallback="hi")
+
+    # A later run holds the lock while it streams; it registers as started
+    # only after the title task has been waiting on the lock.
+    async with _checkpoint_thread_lock("thread-1"):
+        task = asyncio.create_task(
+            _finish_background_title(background_title, checkpointer=checkpointer, thread_store=None, run_manager=run_manager, thread_id="thread-1", run_id=first.run_id),
+        )
+        for _ in range(5):
+            await asyncio.sleep(0)
+        checkpointer.aput.assert_not_awaited()
+        second = await run_manager.create("thread-1")
+        await run_manager.set_status(second.run_id, RunStatus.running)
+    await asyncio.wait_for(task, 5)
+
+    checkpointer.aput.assert_not_awaited()
+
+
 @pytest.mark.anyio
 async def test_ensure_interrupted_title_writes_graph_input_fallback_without_checkpoint(monkeypatch):
     """When no checkpoint exists, graph_input should still seed the fallback title write."""
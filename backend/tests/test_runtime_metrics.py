@@ -0,0 +1,193 @@
+"""Tests for ``metrics`` — latency histograms, instrumentation and ``/metrics``.
+
+Instrumentation must be invisible to the code it times: a real
+``create_agent`` graph runs the same with timed middleware, ``wrap_*`` hooks
+are charged only their own time, and nothing is recorded while disabled.
+"""
+
+import asyncio
+import time
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from _agent_e2e_helpers import FakeToolCallingModel, build_single_tool_call_model
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from langchain.agents import create_agent
+from langchain.agents.middleware import AgentMiddleware
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.tools import tool
+
+from app.gateway.deps import get_config
+from app.gateway.routers import metrics as metrics_router
+from deerflow.config.metrics_config import MetricsConfig
+from deerflow.runtime import metrics
+from deerflow.runtime.journal import RunJournal
+from deerflow.runtime.runs.store.memory import MemoryRunStore
+
+
+@pytest.fixture(autouse=True)
+def enabled_metrics():
+    metrics.reset_metrics()
+    metrics.configure_metrics(MetricsConfig(enabled=True, run_timing_summary=True))
+    yield
+    metrics.reset_metrics()
+
+
+class CountingMiddleware(AgentMiddleware):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    def before_model(self, state, runtime):
+        self.calls += 1
+        time.sleep(0.02)
+        return None
+
+
+class SlowWrapMiddleware(AgentMiddleware):
+    async def awrap_model_call(self, request, handler):
+        await asyncio.sleep(0.02)
+        return await handler(request)
+
+
+def _series(histogram: metrics.Histogram) -> dict[tuple[str, ...], tuple[int, float]]:
+    return {labels: (count, total) for labels, (_, count, total) in histogram.snapshot().items()}
+
+
+def test_instrumented_middlewares_run_in_a_real_agent_and_exclude_handler_time():
+    counting, wrapping = CountingMiddleware(), SlowWrapMiddleware()
+    model = FakeToolCallingModel(responses=[AIMessage(content="done")], sleep=0.2)
+    agent = create_agent(model=model, tools=[], middleware=metrics.instrument_middlewares([counting, wrapping]))
+
+    result = asyncio.run(agent.ainvoke({"messages": [HumanMessage("hi")]}))
+
+    assert result["messages"][-1].content == "done"
+    assert counting.calls == 1
+    series = _series(metrics.MIDDLEWARE_HOOK_SECONDS)
+    before_count, before_total = series[("CountingMiddleware", "before_model")]
+    assert before_count == 1 and before_total >= 0.02
+    wrap_count, wrap_total = series[("SlowWrapMiddleware", "wrap_model_call")]
+    # The 0.2 s model call runs inside the handler and is not charged to the hook.
+    assert wrap_count == 1 and 0.02 <= wrap_total < 0.15
+
+
+def test_instrumentation_is_idempotent_and_skips_disabled_metrics():
+    middleware = CountingMiddleware()
+    metrics.instrument_middlewares([middleware])
+    first = middleware.before_model
+    metrics.instrument_middlewares([middleware])
+    assert middleware.before_model is first
+
+    metrics.reset_metrics()
+    plain = CountingMiddleware()
+    metrics.instrument_middlewares([plain])
+    assert "before_model" not in vars(plain)
+
+
+def test_instrument_methods_times_async_operations():
+    class Store:
+        async def put_batch(self, events):
+            await asyncio.sleep(0.01)
+            return events
+
+    store = metrics.instrument_methods(Store(), metrics.RUN_EVENT_STORE_SECONDS, ("put_batch", "missing"))
+
+    assert asyncio.run(store.put_batch([1])) == [1]
+    count, total = _series(metrics.RUN_EVENT_STORE_SECONDS)[("put_batch",)]
+    assert count == 1 and total >= 0.01
+
+
+def test_journal_times_tool_calls_and_run_summary_collects_them():
+    journal = RunJournal("run-1", "thread-1", event_store=SimpleNamespace())
+    started = metrics.start_run_timings()
+    assert started is not None
+    timings, token = started
+    try:
+        ok, failed = uuid.uuid4(), uuid.uuid4()
+        journal.on_tool_start({"name": "web_search"}, "q", run_id=ok)
+        journal.on_tool_end(ToolMessage(content="r", tool_call_id="c1"), run_id=ok)
+        journal.on_tool_start({"name": "bash"}, "ls", run_id=failed)
+        journal.on_tool_error(RuntimeError("boom"), run_id=failed)
+    finally:
+        metrics.stop_run_timings(token)
+
+    assert set(_series(metrics.TOOL_CALL_SECONDS)) == {("web_search", "success"), ("bash", "error")}
+    summary = timings.summary()
+    assert summary["tool"]["web_search.success"]["count"] == 1
+    assert summary["tool"]["bash.error"]["count"] == 1
+
+
+def test_tool_calls_in_an_agent_run_are_timed_by_the_journal():
+    @tool
+    def lookup(query: str) -> str:
+        """Look something up."""
+        time.sleep(0.01)
+        return "found"
+
+    journal = RunJournal("run-1", "thread-1", event_store=SimpleNamespace())
+    model = build_single_tool_call_model(tool_name="lookup", tool_args={"query": "x"})
+    agent = create_agent(model=model, tools=[lookup])
+
+    agent.invoke({"messages": [HumanMessage("hi")]}, config={"callbacks": [journal]})
+
+    count, total = _series(metrics.TOOL_CALL_SECONDS)[("lookup", "success")]
+    assert count == 1 and total >= 0.01
+    assert _series(metrics.MODEL_CALL_SECONDS)[("lead_agent",)][0] == 2
+
+
+def test_render_prometheus_format():
+    metrics.CHECKPOINT_SECONDS.observe(0.003, "aput")
+    metrics.CHECKPOINT_SECONDS.observe(0.2, "aput")
+
+    text = metrics.render_prometheus()
+
+    assert "# TYPE deerflow_checkpoint_seconds histogram" in text
+    assert 'deerflow_checkpoint_seconds_bucket{operation="aput",le="0.0025"} 0' in text
+    assert 'deerflow_checkpoint_seconds_bucket{operation="aput",le="0.005"} 1' in text
+    assert 'deerflow_checkpoint_seconds_bucket{operation="aput",le="+Inf"} 2' in text
+    assert 'deerflow_checkpoint_seconds_count{operation="aput"} 2' in text
+
+
+def test_observations_are_dropped_while_disabled():
+    metrics.reset_metrics()
+    metrics.CHECKPOINT_SECONDS.observe(0.1, "aput")
+
+    assert metrics.CHECKPOINT_SECONDS.snapshot() == {}
+    assert metrics.start_run_timings() is None
+
+
+def _metrics_client(auth_token: str | None = None) -> TestClient:
+    app = FastAPI()
+    app.include_router(metrics_router.router)
+    app.dependency_overrides[get_config] = lambda: SimpleNamespace(metrics=MetricsConfig(enabled=True, auth_token=auth_token))
+    return TestClient(app)
+
+
+def test_metrics_endpoint_serves_prometheus_text_and_checks_token():
+    metrics.STREAM_BRIDGE_SECONDS.observe(0.001, "publish")
+
+    response = _metrics_client().get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'deerflow_stream_bridge_seconds_count{operation="publish"} 1' in response.text
+
+    guarded = _metrics_client(auth_token="s3cret")
+    assert guarded.get("/metrics").status_code == 401
+    assert guarded.get("/metrics", headers={"Authorization": "Bearer s3cret"}).status_code == 200
+
+    metrics.reset_metrics()
+    assert _metrics_client().get("/metrics").status_code == 404
+
+
+def test_run_completion_merges_timing_into_run_metadata():
+    store = MemoryRunStore()
+
+    async def scenario():
+        await store.put("run-1", thread_id="thread-1", metadata={"source": "ui"})
+        await store.update_run_completion("run-1", status="success", metadata_updates={"timing": {"tool": {"bash.success": {"count": 1, "total_ms": 5.0}}}})
+        return await store.get("run-1")
+
+    row = asyncio.run(scenario())
+    assert row["metadata"] == {"source": "ui", "timing": {"tool": {"bash.success": {"count": 1, "total_ms": 5.0}}}}
@@ -0,0 +1,180 @@
+"""Tests for archive-based sandbox tree sync (``deerflow.sandbox.bulk_sync``).
+
+The sandbox is stood in for by a ``Sandbox`` whose ``/mnt/user-data`` lives
+under ``tmp_path`` and whose shell runs locally, so the generated ``tar`` /
+``sha256sum`` commands are exercised for real.
+"""
+
+import hashlib
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from deerflow.sandbox import bulk_sync
+from deerflow.sandbox.bulk_sync import SyncReport, fetch_files, pull_tree, push_tree
+from deerflow.sandbox.exceptions import SandboxFileError
+from deerflow.sandbox.sandbox import Sandbox
+
+
+class _LocalShellSandbox(Sandbox):
+    def __init__(self, root: Path) -> None:
+        super().__init__("bulk-sync-test")
+        self.root = root
+        self.commands: list[str] = []
+        self.uploads: list[str] = []
+
+    def _local(self, path: str) -> Path:
+        return self.root / path.lstrip("/")
+
+    def execute_command(self, command, env=None, timeout=None) -> str:
+        self.commands.append(command)
+        completed = subprocess.run(["/bin/sh", "-c", command.replace("/mnt/user-data", f"{self.root}/mnt/user-data")], capture_output=True, text=True)
+        return completed.stdout + completed.stderr
+
+    def update_file(self, path: str, content: bytes) -> None:
+        self.uploads.append(path)
+        target = self._local(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(content)
+
+    def download_file(self, path: str) -> bytes:
+        return self._local(path).read_bytes()
+
+    def read_file(self, path):
+        raise NotImplementedError
+
+    def list_dir(self, path, max_depth=2):
+        raise NotImplementedError
+
+    def write_file(self, path, content, append=False):
+        raise NotImplementedError
+
+    def glob(self, path, pattern, *, include_dirs=False, max_results=200):
+        raise NotImplementedError
+
+    def grep(self, path, pattern, *, glob=None, literal=False, case_sensitive=False, max_results=100):
+        raise NotImplementedError
+
+
+def _sha(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+@pytest.fixture
+def sandbox(tmp_path):
+    (tmp_path / "remote" / "mnt" / "user-data").mkdir(parents=True)
+    return _LocalShellSandbox(tmp_path / "remote")
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "skill"
+    (root / "scripts" / "deep").mkdir(parents=True)
+    (root / "SKILL.md").write_text("# Skill\n", encoding="utf-8")
+    (root / "scripts" / "run.py").write_text("print('hi')\n", encoding="utf-8")
+    (root / "scripts" / "deep" / "data with spaces.bin").write_bytes(bytes(range(256)) * 10)
+    (root / "empty.txt").write_bytes(b"")
+    return root
+
+
+def test_push_tree_extracts_in_one_upload_and_reports_checksums(sandbox, tree):
+    report = push_tree(sandbox, tree, "/mnt/user-data/skills/demo")
+
+    remote = sandbox.root / "mnt/user-data/skills/demo"
+    for path in tree.rglob("*"):
+        if path.is_file():
+            assert (remote / path.relative_to(tree)).read_bytes() == path.read_bytes()
+    assert sorted(report.transferred) == ["SKILL.md", "empty.txt", "scripts/deep/data with spaces.bin", "scripts/run.py"]
+    assert report.checksums["SKILL.md"] == _sha(b"# Skill\n")
+    assert len(sandbox.uploads) == 1 and len(sandbox.commands) == 2
+    # The staging archive is cleaned up.
+    assert not list((sandbox.root / "mnt/user-data").glob(".deerflow-sync-*"))
+
+
+def test_push_tree_resync_sends_only_changed_files(sandbox, tree):
+    push_tree(sandbox, tree, "/mnt/user-data/skills/demo")
+    (tree / "scripts" / "run.py").write_text("print('changed')\n", encoding="utf-8")
+
+    report = push_tree(sandbox, tree, "/mnt/user-data/skills/demo")
+
+    assert report.transferred == ["scripts/run.py"]
+    assert len(report.skipped) == 3
+    assert (sandbox.root / "mnt/user-data/skills/demo/scripts/run.py").read_text() == "print('changed')\n"
+
+    sandbox.commands.clear()
+    unchanged = push_tree(sandbox, tree, "/mnt/user-data/skills/demo")
+    assert unchanged.transferred == [] and len(sandbox.commands) == 1
+
+
+def test_push_tree_only_limits_the_files(sandbox, tree):
+    report = push_tree(sandbox, tree, "/mnt/user-data/uploads", only=["SKILL.md", "missing.txt"], compression="none")
+
+    assert report == SyncReport(transferred=["SKILL.md"], skipped=[], checksums={"SKILL.md": _sha(b"# Skill\n")})
+    assert [p.name for p in (sandbox.root / "mnt/user-data/uploads").iterdir()] == ["SKILL.md"]
+
+
+def test_push_tree_raises_when_the_landed_checksum_differs(sandbox, tree, monkeypatch):
+    real_pack = bulk_sync._pack
+
+    def corrupt_pack(root, names, compression):
+        (root / "SKILL.md").write_text("tampered\n", encoding="utf-8")
+        return real_pack(root, names, compression)
+
+    monkeypatch.setattr(bulk_sync, "_pack", corrupt_pack)
+
+    with pytest.raises(SandboxFileError, match="checksum mismatch"):
+        push_tree(sandbox, tree, "/mnt/user-data/skills/demo")
+
+
+def test_failed_remote_command_raises(sandbox, tree, monkeypatch):
+    monkeypatch.setattr(sandbox, "execute_command", lambda command, env=None, timeout=None: "sh: tar: not found")
+
+    with pytest.raises(SandboxFileError, match="tar: not found"):
+        push_tree(sandbox, tree, "/mnt/user-data/skills/demo")
+
+
+def test_pull_tree_fetches_changed_files_in_one_download(sandbox, tree, tmp_path):
+    push_tree(sandbox, tree, "/mnt/user-data/outputs")
+    local = tmp_path / "host-outputs"
+
+    report = pull_tree(sandbox, "/mnt/user-data/outputs", local)
+
+    assert sorted(report.transferred) == sorted(report.checksums)
+    assert (local / "scripts" / "deep" / "data with spaces.bin").read_bytes() == (tree / "scripts" / "deep" / "data with spaces.bin").read_bytes()
+
+    (sandbox.root / "mnt/user-data/outputs/report.md").write_text("new\n", encoding="utf-8")
+    again = pull_tree(sandbox, "/mnt/user-data/outputs", local)
+    assert again.transferred == ["report.md"]
+    assert (local / "report.md").read_text() == "new\n"
+
+
+def test_fetch_files_uploads_long_file_lists(sandbox, monkeypatch):
+    outputs = sandbox.root / "mnt/user-data/outputs"
+    outputs.mkdir()
+    for i in range(5):
+        (outputs / f"f{i}.txt").write_text(f"body {i}", encoding="utf-8")
+    monkeypatch.setattr(bulk_sync, "_INLINE_LIST_BYTES", 0)
+
+    fetched = fetch_files(sandbox, "/mnt/user-data/outputs", ["f0.txt", "f3.txt", "gone.txt"])
+
+    assert fetched == {"f0.txt": b"body 0", "f3.txt": b"body 3"}
+    assert len(sandbox.uploads) == 1 and sandbox.uploads[0].endswith(".list")
+    assert not list((sandbox.root / "mnt/user-data").glob(".deerflow-sync-*"))
+
+
+def test_unknown_compression_is_rejected(sandbox, tree):
+    with pytest.raises(ValueError, match="compression"):
+        push_tree(sandbox, tree, "/mnt/user-data/skills/demo", compression="brotli")
+
+
+def test_zstd_round_trip(sandbox, tree, tmp_path):
+    pytest.importorskip("zstandard")
+    if shutil.which("zstd") is None:
+        pytest.skip("zstd not installed")
+
+    push_tree(sandbox, tree, "/mnt/user-data/outputs", compression="zstd")
+    report = pull_tree(sandbox, "/mnt/user-data/outputs", tmp_path / "host", compression="zstd")
+
+    assert len(report.transferred) == 4
@@ -150,3 +150,40 @@ async def test_claim_skips_task_with_active_lease(tmp_path):
     assert reclaimed == []
 
     await close_engine()
+
+
+@pytest.mark.asyncio
+async def test_list_due_times_reports_next_run_and_lease_expiry(tmp_path):
+    """The scheduler's timer plan: enabled tasks by next_run_at, leased ones at lease expiry."""
+    await init_engine_from_config(DatabaseConfig(backend="sqlite", sqlite_dir=str(tmp_path)))
+    sf = get_session_factory()
+    assert sf is not None
+    repo = ScheduledTaskRepository(sf)
+
+    now = datetime.now(UTC).replace(microsecond=0)
+    for task_id, offset in (("later", 60), ("sooner", 10), ("leased", -5), ("paused", 1)):
+        await repo.create(
+            task_id=task_id,
+            user_id="user-1",
+            thread_id=None,
+            context_mode="fresh_thread_per_run",
+            assistant_id="lead_agent",
+            title=task_id,
+            prompt="Prompt",
+            schedule_type="cron",
+            schedule_spec={"cron": "0 9 * * *"},
+            timezone="UTC",
+            next_run_at=now + timedelta(seconds=offset),
+        )
+    await repo.update("paused", user_id="user-1", updates={"status": "paused"})
+    await repo.claim_due_tasks(now=now, lease_owner="worker-1", lease_seconds=30, limit=10)
+
+    due = dict(await repo.list_due_times(limit=10))
+    assert due == {
+        "sooner": now + timedelta(seconds=10),
+        "later": now + timedelta(seconds=60),
+        "leased": now + timedelta(seconds=30),
+    }
+    assert [task_id for task_id, _ in await repo.list_due_times(limit=1)] == ["sooner", "leased"]
+
+    await close_engine()
@@ -10,7 +10,7 @@ def test_app_config_exposes_scheduler_section():
         }
     )
     assert config.scheduler.enabled is False
-    assert config.scheduler.poll_interval_seconds == 5
+    assert config.scheduler.poll_interval_seconds == 60
     assert config.scheduler.lease_seconds == 120
 
 
@@ -1,3 +1,6 @@
+import asyncio
+import time
+import uuid
 from datetime import UTC, datetime, timedelta
 
 import pytest
@@ -19,6 +22,9 @@ class DummyTaskRepo:
         self.cancelled_stuck_once = error
         return 0
 
+    async def list_due_times(self, *, limit):
+        return []
+
     async def claim_due_tasks(self, **_kwargs):
         if self.claimed:
             return []
@@ -537,3 +543,151 @@ async def test_launch_bookkeeping_passes_protect_terminal():
     await service.dispatch_task(task_repo.rows[0], now=datetime.now(UTC), trigger="scheduled")
 
     assert task_repo.updated[1]["protect_terminal"] is True
+
+
+# ── Next-due timer ────────────────────────────────────────────────────────
+
+
+class _Clock:
+    """Fake wall clock pinned to a fixed instant that advances with real time."""
+
+    def __init__(self, start: datetime) -> None:
+        self._start = start
+        self._t0 = time.monotonic()
+
+    def __call__(self) -> datetime:
+        return self._start + timedelta(seconds=time.monotonic() - self._t0)
+
+
+class TimerTaskRepo:
+    """Shared task table: claims are atomic (no await between check and flip)."""
+
+    def __init__(self, clock, tasks=()):
+        self.clock = clock
+        self.tasks = {task["id"]: dict(task) for task in tasks}
+        self.claims: list[tuple[str, datetime]] = []
+
+    async def cancel_stuck_once_tasks(self, *, error):
+        return 0
+
+    async def list_due_times(self, *, limit):
+        return [(task["id"], task["next_run_at"]) for task in self.tasks.values() if task["status"] == "enabled"][:limit]
+
+    async def claim_due_tasks(self, *, now, limit, **_kwargs):
+        claimed = []
+        for task in self.tasks.values():
+            if task["status"] == "enabled" and task["next_run_at"] <= now and len(claimed) < limit:
+                task["status"] = "running"
+                self.claims.append((task["id"], self.clock()))
+                claimed.append(dict(task))
+        return claimed
+
+    async def update_after_launch(self, task_id, *, status, next_run_at, **_kwargs):
+        self.tasks[task_id].update(status=status, next_run_at=next_run_at)
+
+
+def _cron_task(task_id: str, next_run_at: datetime, status: str = "enabled"):
+    return {
+        "id": task_id,
+        "user_id": "user-1",
+        "thread_id": None,
+        "context_mode": "fresh_thread_per_run",
+        "assistant_id": "lead_agent",
+        "prompt": "Summarize",
+        "schedule_type": "cron",
+        "schedule_spec": {"cron": "* * * * *"},
+        "timezone": "UTC",
+        "status": status,
+        "next_run_at": next_run_at,
+    }
+
+
+def _timer_service(task_repo, clock, *, poll_interval_seconds=300):
+    async def fake_launch(**kwargs):
+        return {"run_id": f"run-{uuid.uuid4().hex}", "thread_id": kwargs["thread_id"]}
+
+    return ScheduledTaskService(
+        task_repo=task_repo,
+        task_run_repo=DummyRunRepo(),
+        launch_run=fake_launch,
+        poll_interval_seconds=poll_interval_seconds,
+        lease_seconds=120,
+        max_concurrent_runs=3,
+        clock=clock,
+    )
+
+
+async def _wait_for(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_timer_fires_cron_occurrence_with_sub_second_accuracy():
+    # Half a second before a minute boundary; the reconciliation poll is 5 min
+    # away, so only the next-due timer can fire the occurrence on time.
+    clock = _Clock(datetime(2026, 7, 1, 8, 59, 59, 500000, tzinfo=UTC))
+    due = datetime(2026, 7, 1, 9, 0, tzinfo=UTC)
+    task_repo = TimerTaskRepo(clock, [_cron_task("task-cron", due)])
+    service = _timer_service(task_repo, clock)
+
+    await service.start()
+    try:
+        await _wait_for(lambda: task_repo.claims)
+    finally:
+        await service.stop()
+
+    [(task_id, fired_at)] = task_repo.claims
+    assert task_id == "task-cron"
+    assert timedelta(0) <= fired_at - due < timedelta(milliseconds=250)
+    # The next occurrence was planned from the dispatch, not a poll.
+    assert service._next_due() == datetime(2026, 7, 1, 9, 1, tzinfo=UTC)
+
+
+@pytest.mark.asyncio
+async def test_router_notifications_wake_and_cancel_the_timer():
+    start = datetime(2026, 7, 1, 8, 0, tzinfo=UTC)
+    clock = _Clock(start)
+    task_repo = TimerTaskRepo(clock)
+    service = _timer_service(task_repo, clock)
+    await service.start()
+    try:
+        await asyncio.sleep(0.05)  # idle: nothing planned, next reconcile in 5 min
+        created = _cron_task("task-new", start + timedelta(seconds=0.3))
+        task_repo.tasks["task-new"] = dict(created)
+        service.task_changed(created)
+
+        paused = _cron_task("task-paused", start + timedelta(seconds=0.2))
+        task_repo.tasks["task-paused"] = dict(paused)
+        service.task_changed(paused)
+        task_repo.tasks["task-paused"]["status"] = "paused"
+        service.task_changed(task_repo.tasks["task-paused"])
+
+        await _wait_for(lambda: task_repo.claims)
+        await asyncio.sleep(0.1)
+    finally:
+        await service.stop()
+
+    assert [task_id for task_id, _ in task_repo.claims] == ["task-new"]
+    assert task_repo.claims[0][1] - (start + timedelta(seconds=0.3)) < timedelta(milliseconds=250)
+
+
+@pytest.mark.asyncio
+async def test_workers_sharing_a_task_table_claim_each_occurrence_once():
+    clock = _Clock(datetime(2026, 7, 1, 8, 59, 59, 700000, tzinfo=UTC))
+    task_repo = TimerTaskRepo(clock, [_cron_task("task-shared", datetime(2026, 7, 1, 9, 0, tzinfo=UTC))])
+    workers = [_timer_service(task_repo, clock) for _ in range(3)]
+
+    for worker in workers:
+        await worker.start()
+    try:
+        await _wait_for(lambda: task_repo.claims)
+        await asyncio.sleep(0.1)
+    finally:
+        for worker in workers:
+            await worker.stop()
+
+    assert [task_id for task_id, _ in task_repo.claims] == ["task-shared"]
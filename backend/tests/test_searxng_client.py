@@ -7,6 +7,8 @@ import pytest
 
 from deerflow.community.searxng import tools
 from deerflow.community.searxng.searxng_client import SearxngClient
+from deerflow.community.web_cache import reset_web_tool_cache
+from deerflow.config.web_tool_cache_config import WebToolCacheConfig
 
 
 class AsyncMock(MagicMock):
@@ -29,9 +31,9 @@ class TestSearxngClient:
             ]
         }
 
-        with patch("deerflow.community.searxng.searxng_client.httpx.AsyncClient") as mock_cls:
+        with patch("deerflow.community.searxng.searxng_client.get_async_http_client") as mock_cls:
             mock_ctx = MagicMock()
-            mock_cls.return_value.__aenter__.return_value = mock_ctx
+            mock_cls.return_value = mock_ctx
 
             mock_resp = MagicMock()
             mock_resp.status_code = 200
@@ -48,9 +50,9 @@ class TestSearxngClient:
 
     async def test_search_empty_results(self):
         """Search returns empty list when no results."""
-        with patch("deerflow.community.searxng.searxng_client.httpx.AsyncClient") as mock_cls:
+        with patch("deerflow.community.searxng.searxng_client.get_async_http_client") as mock_cls:
             mock_ctx = MagicMock()
-            mock_cls.return_value.__aenter__.return_value = mock_ctx
+            mock_cls.return_value = mock_ctx
 
             mock_resp = MagicMock()
             mock_resp.status_code = 200
@@ -64,9 +66,9 @@ class TestSearxngClient:
 
     async def test_search_http_error(self):
         """Search raises on HTTP error."""
-        with patch("deerflow.community.searxng.searxng_client.httpx.AsyncClient") as mock_cls:
+        with patch("deerflow.community.searxng.searxng_client.get_async_http_client") as mock_cls:
             mock_ctx = MagicMock()
-            mock_cls.return_value.__aenter__.return_value = mock_ctx
+            mock_cls.return_value = mock_ctx
 
             import httpx
 
@@ -80,9 +82,9 @@ class TestSearxngClient:
 
     async def test_search_request_error(self):
         """Search raises on request error."""
-        with patch("deerflow.community.searxng.searxng_client.httpx.AsyncClient") as mock_cls:
+        with patch("deerflow.community.searxng.searxng_client.get_async_http_client") as mock_cls:
             mock_ctx = MagicMock()
-            mock_cls.return_value.__aenter__.return_value = mock_ctx
+            mock_cls.return_value = mock_ctx
 
             import httpx
 
@@ -94,9 +96,9 @@ class TestSearxngClient:
 
     async def test_search_with_categories(self):
         """Search passes categories parameter."""
-        with patch("deerflow.community.searxng.searxng_client.httpx.AsyncClient") as mock_cls:
+        with patch("deerflow.community.searxng.searxng_client.get_async_http_client") as mock_cls:
             mock_ctx = MagicMock()
-            mock_cls.return_value.__aenter__.return_value = mock_ctx
+            mock_cls.return_value = mock_ctx
 
             mock_resp = MagicMock()
             mock_resp.status_code = 200
@@ -115,6 +117,15 @@ class TestSearxngClient:
 class TestSearxngTools:
     """Tests for the SearXNG tool functions."""
 
+    @pytest.fixture(autouse=True)
+    def app_config(self):
+        config = MagicMock()
+        config.web_tool_cache = WebToolCacheConfig()
+        reset_web_tool_cache()
+        with patch("deerflow.community.searxng.tools.get_app_config", return_value=config):
+            yield config
+        reset_web_tool_cache()
+
     @patch("deerflow.community.searxng.tools._get_searxng_client")
     async def test_web_search_tool_success(self, mock_get_client):
         """web_search_tool returns JSON results."""
@@ -161,3 +172,21 @@ class TestSearxngTools:
         mock_client.search.assert_called_once()
         call_kwargs = mock_client.search.call_args.kwargs
         assert call_kwargs["max_results"] == 3
+
+    @patch("deerflow.community.searxng.tools._get_searxng_client")
+    async def test_web_search_tool_uses_the_resolved_app_config(self, mock_get_client, app_config):
+        """The resolved config is threaded to the client and the web cache."""
+        app_config.web_tool_cache = WebToolCacheConfig(enabled=True)
+        mock_client = MagicMock()
+        mock_client.base_url = "http://searxng:8080"
+        mock_client.search = AsyncMock(return_value=[{"title": "Result 1", "url": "https://example.com/1", "content": "Desc 1"}])
+        mock_get_client.return_value = mock_client
+
+        with patch("deerflow.community.searxng.tools._get_tool_config", return_value=None) as mock_get_tool_config:
+            first = await tools.web_search_tool.ainvoke("test query")
+            second = await tools.web_search_tool.ainvoke("test query")
+
+        assert first == second
+        mock_client.search.assert_called_once()
+        mock_get_client.assert_called_with(app_config)
+        mock_get_tool_config.assert_called_with("web_search", app_config)
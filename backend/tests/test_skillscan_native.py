@@ -1283,3 +1283,117 @@ def test_python_reverse_shell_via_create_connection_blocks(tmp_path: Path) -> No
 
     assert _finding_by_rule(result["findings"], "python-reverse-shell")["severity"] == "CRITICAL"
     assert result["blocked"] is True
+
+
+def _count_calls(monkeypatch: pytest.MonkeyPatch, name: str) -> list[str]:
+    from deerflow.skills.skillscan import orchestrator
+
+    calls: list[str] = []
+    original = getattr(orchestrator, name)
+
+    def counting(*args, **kwargs):
+        calls.append(str(args[0]))
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(orchestrator, name, counting)
+    return calls
+
+
+def _vendored_skill(skill_dir: Path) -> None:
+    _write_skill(skill_dir, "See https://example.com/docs.\n")
+    scripts_dir = skill_dir / "scripts"
+    scripts_dir.mkdir()
+    (scripts_dir / "run.py").write_text("import os\nos.system('whoami')\n", encoding="utf-8")
+    (scripts_dir / "util.py").write_text("import subprocess\nsubprocess.run(['ls'])\n", encoding="utf-8")
+
+
+def test_rescanning_unchanged_files_reuses_cached_results(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    skill_dir = tmp_path / "demo-skill"
+    _vendored_skill(skill_dir)
+    scanned = _count_calls(monkeypatch, "_scan_text_file")
+
+    first = scan_skill_dir(skill_dir)
+    assert sorted(scanned) == ["SKILL.md", "scripts/run.py", "scripts/util.py"]
+
+    scanned.clear()
+    # Identical content at another location (a re-install) is served from cache.
+    reinstalled = tmp_path / "reinstalled" / "demo-skill"
+    reinstalled.parent.mkdir()
+    _vendored_skill(reinstalled)
+    assert scan_skill_dir(reinstalled) == first
+    assert scanned == []
+
+    (reinstalled / "scripts" / "util.py").write_text("print('changed')\n", encoding="utf-8")
+    second = scan_skill_dir(reinstalled)
+    assert scanned == ["scripts/util.py"]
+    assert [f["rule_id"] for f in second["findings"] if f["file"] == "scripts/run.py"] == [f["rule_id"] for f in first["findings"] if f["file"] == "scripts/run.py"]
+    assert not any(f["rule_id"] == "python-subprocess" for f in second["findings"])
+
+
+def test_cached_results_are_keyed_by_path_and_ruleset_version(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from deerflow.skills.skillscan import cache
+
+    skill_dir = tmp_path / "demo-skill"
+    _write_skill(skill_dir)
+    (skill_dir / "notes.txt").write_text("import os\nos.system('whoami')\n", encoding="utf-8")
+    scan_skill_dir(skill_dir)
+
+    # The same bytes under a .py name hit the python analyzer: not a cache hit.
+    (skill_dir / "notes.txt").rename(skill_dir / "notes.py")
+    assert _finding_by_rule(scan_skill_dir(skill_dir)["findings"], "python-shell-exec")["file"] == "notes.py"
+
+    scanned = _count_calls(monkeypatch, "_scan_text_file")
+    monkeypatch.setattr(cache, "_ruleset_version_value", "edited-rules")
+    scan_skill_dir(skill_dir)
+    assert sorted(scanned) == ["SKILL.md", "notes.py"]
+
+
+def test_returned_results_do_not_alias_the_cache(tmp_path: Path) -> None:
+    skill_dir = tmp_path / "demo-skill"
+    _vendored_skill(skill_dir)
+
+    first = scan_skill_dir(skill_dir)
+    first["findings"][0]["message"] = "mutated"
+    first["findings"].clear()
+
+    assert scan_skill_dir(skill_dir)["findings"][0]["message"] != "mutated"
+
+
+def test_archive_preflight_is_cached_by_archive_content(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    archive = tmp_path / "demo.skill"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("demo-skill/SKILL.md", "---\nname: demo-skill\ndescription: Demo\n---\n")
+        zf.writestr("demo-skill/.env", "TOKEN=x\n")
+    scanned = _count_calls(monkeypatch, "_scan_archive_preflight_uncached")
+
+    first = scan_archive_preflight(archive)
+    copy = tmp_path / "copy.skill"
+    copy.write_bytes(archive.read_bytes())
+    assert scan_archive_preflight(copy) == first
+    assert len(scanned) == 1
+
+    with zipfile.ZipFile(archive, "a") as zf:
+        zf.writestr("demo-skill/README.md", "hello\n")
+    scan_archive_preflight(archive)
+    assert len(scanned) == 2
+
+
+def test_large_scans_run_in_the_worker_pool(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from deerflow.skills.skillscan import cache
+
+    skill_dir = tmp_path / "demo-skill"
+    _vendored_skill(skill_dir)
+    inline = scan_skill_dir(skill_dir)
+    cache.reset_scan_cache()
+
+    # Parent-process analyzers are never reached when the job runs in a worker.
+    scanned = _count_calls(monkeypatch, "_scan_text_file")
+    monkeypatch.setattr(cache, "POOL_MIN_BYTES", 0)
+    monkeypatch.setattr(cache, "_skill_scan_config", lambda: SimpleNamespace(cache_max_entries=64, max_workers=1))
+    try:
+        pooled = scan_skill_dir(skill_dir)
+    finally:
+        cache.shutdown_scan_pool()
+
+    assert pooled == inline
+    assert scanned == []
@@ -744,6 +744,125 @@ async def test_redis_transient_error_gives_up_after_max_retries():
             pass
 
 
+def _count_blocking_xreads(fake: _FakeRedis) -> dict[str, int]:
+    """Track how many blocking XREADs are issued and held at once."""
+    stats = {"calls": 0, "in_flight": 0, "max_in_flight": 0}
+    original_xread = fake.xread
+
+    async def counting_xread(streams, count=None, block=None):
+        if block is None:
+            return await original_xread(streams, count=count, block=block)
+        stats["calls"] += 1
+        stats["in_flight"] += 1
+        stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+        try:
+            return await original_xread(streams, count=count, block=block)
+        finally:
+            stats["in_flight"] -= 1
+
+    fake.xread = counting_xread
+    return stats
+
+
+async def _collect(stream, received: list, ready: asyncio.Event | None = None, delay: float = 0) -> None:
+    async for entry in stream:
+        if entry is HEARTBEAT_SENTINEL:
+            if ready is not None:
+                ready.set()
+            continue
+        received.append(entry)
+        if delay:
+            await asyncio.sleep(delay)
+        if entry is END_SENTINEL:
+            return
+
+
+@pytest.mark.anyio
+async def test_redis_subscribers_share_one_reader():
+    """Concurrent subscribers to one run share a single blocking XREAD in order."""
+    fake = _FakeRedis()
+    stats = _count_blocking_xreads(fake)
+    bridge = RedisStreamBridge(redis_url="redis://fake", queue_maxsize=64, client=fake)
+    run_id = "redis-run-fanout"
+    await bridge.publish(run_id, "metadata", {"run_id": run_id})
+
+    results = [[] for _ in range(20)]
+    readies = [asyncio.Event() for _ in results]
+    with anyio.fail_after(5):
+        async with anyio.create_task_group() as task_group:
+            for received, ready in zip(results, readies):
+                task_group.start_soon(_collect, bridge.subscribe(run_id, heartbeat_interval=0.01), received, ready)
+            for ready in readies:
+                await ready.wait()
+            for i in range(10):
+                await bridge.publish(run_id, "values", {"step": i})
+            await bridge.publish_end(run_id)
+
+    expected = ["metadata"] + ["values"] * 10
+    for received in results:
+        assert [entry.event for entry in received[:-1]] == expected
+        assert [entry.data["step"] for entry in received[1:-1]] == list(range(10))
+        assert received[-1] is END_SENTINEL
+    assert stats["max_in_flight"] == 1
+    assert stats["calls"] <= 11
+    assert bridge._readers == {}
+
+
+@pytest.mark.anyio
+async def test_redis_resume_joins_live_reader_without_gaps():
+    """A Last-Event-ID reconnect replays from Redis, then switches to the shared reader."""
+    bridge = RedisStreamBridge(redis_url="redis://fake", queue_maxsize=64, client=_FakeRedis())
+    run_id = "redis-run-resume-live"
+    live, resumed = [], []
+    live_ready = asyncio.Event()
+
+    with anyio.fail_after(5):
+        async with anyio.create_task_group() as task_group:
+            task_group.start_soon(_collect, bridge.subscribe(run_id, heartbeat_interval=0.01), live, live_ready)
+            await live_ready.wait()
+            for i in range(3):
+                await bridge.publish(run_id, "values", {"step": i})
+            while len(live) < 3:
+                await asyncio.sleep(0.01)
+
+            task_group.start_soon(_collect, bridge.subscribe(run_id, last_event_id=live[0].id, heartbeat_interval=0.01), resumed)
+            for i in range(3, 6):
+                await bridge.publish(run_id, "values", {"step": i})
+            await bridge.publish_end(run_id)
+
+    assert [entry.data["step"] for entry in live[:-1]] == list(range(6))
+    assert [entry.data["step"] for entry in resumed[:-1]] == list(range(1, 6))
+    assert [entry.id for entry in resumed[:-1]] == [entry.id for entry in live[1:-1]]
+    assert resumed[-1] is END_SENTINEL
+
+
+@pytest.mark.anyio
+async def test_redis_slow_subscriber_catches_up_from_redis():
+    """Overflowing a subscriber's bounded buffer neither drops events nor stalls others."""
+    bridge = RedisStreamBridge(redis_url="redis://fake", queue_maxsize=3, client=_FakeRedis())
+    run_id = "redis-run-slow"
+    fast, slow = [], []
+    fast_ready, slow_ready = asyncio.Event(), asyncio.Event()
+
+    with anyio.fail_after(5):
+        async with anyio.create_task_group() as task_group:
+            task_group.start_soon(_collect, bridge.subscribe(run_id, heartbeat_interval=0.01), fast, fast_ready)
+            task_group.start_soon(_collect, bridge.subscribe(run_id, heartbeat_interval=0.01), slow, slow_ready, 0.05)
+            await fast_ready.wait()
+            await slow_ready.wait()
+            for i in range(5):
+                await bridge.publish(run_id, "values", {"step": i})
+                await asyncio.sleep(0.005)  # let the reader keep within retention
+            await bridge.publish_end(run_id)
+            while len(fast) < 6:
+                await asyncio.sleep(0.005)
+            assert len(slow) < 6  # the fast subscriber was not held back
+
+    assert [entry.data["step"] for entry in fast[:-1]] == list(range(5))
+    assert [entry.data["step"] for entry in slow[:-1]] == list(range(5))
+    assert slow[-1] is END_SENTINEL
+
+
 # ---------------------------------------------------------------------------
 # Factory tests
 # ---------------------------------------------------------------------------
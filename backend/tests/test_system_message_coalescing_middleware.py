@@ -196,6 +196,7 @@ class TestCoalesceRequest:
             "source": "prompt",
             "hide_from_ui": True,
             "dynamic_context_reminder": True,
+            "stable_prefix_chars": len("prompt"),
         }
 
     def test_merged_kwargs_later_parts_override(self):
@@ -18,6 +18,7 @@ from deerflow.agents.thread_state import (
     merge_artifacts,
     merge_delegations,
     merge_goal,
+    merge_loop_detection,
     merge_sandbox,
     merge_skill_context,
     merge_todos,
@@ -105,6 +106,19 @@ class TestMergeGoal:
         assert merge_goal(existing, new) == new
 
 
+class TestMergeLoopDetection:
+    """Reducer for ThreadState.loop_detection - latest snapshot wins."""
+
+    def test_none_new_preserves_existing(self):
+        existing = {"hashes": ["a"], "warned": [], "tool_names": ["bash"], "freq_warned": []}
+        assert merge_loop_detection(existing, None) == existing
+
+    def test_new_snapshot_replaces_existing(self):
+        existing = {"hashes": ["a", "a"], "warned": ["a"], "tool_names": ["bash", "bash"], "freq_warned": []}
+        new = {"hashes": ["b"], "warned": [], "tool_names": ["read_file"], "freq_warned": []}
+        assert merge_loop_detection(existing, new) == new
+
+
 class TestMergeArtifacts:
     """Sanity check for the existing artifacts reducer."""
 
@@ -324,6 +338,11 @@ class TestThreadStateAnnotations:
         assert hasattr(goal_hint, "__metadata__"), "ThreadState.goal must be Annotated with a reducer"
         assert merge_goal in goal_hint.__metadata__, "ThreadState.goal must be wired to merge_goal reducer"
 
+    def test_loop_detection_field_is_wired_to_merge_loop_detection(self):
+        """Nodes that do not track tool calls must not drop the persisted windows."""
+        hints = get_type_hints(ThreadState, include_extras=True)
+        assert merge_loop_detection in hints["loop_detection"].__metadata__
+
     def test_artifacts_field_is_wired_to_merge_artifacts(self):
         """Sanity check that existing reducer wiring is preserved."""
         hints = get_type_hints(ThreadState, include_extras=True)
@@ -10,7 +10,7 @@ from langgraph.constants import TAG_NOSTREAM
 
 from deerflow.agents.middlewares import title_middleware as title_middleware_module
 from deerflow.agents.middlewares.dynamic_context_middleware import _DYNAMIC_CONTEXT_REMINDER_KEY
-from deerflow.agents.middlewares.title_middleware import TitleMiddleware
+from deerflow.agents.middlewares.title_middleware import BACKGROUND_TITLE_CONTEXT_KEY, BackgroundTitle, TitleMiddleware
 from deerflow.config.title_config import TitleConfig, get_title_config, set_title_config
 
 
@@ -210,6 +210,80 @@ class TestTitleMiddlewareCoreLogic:
         monkeypatch.setattr(middleware, "_agenerate_title_result", AsyncMock(return_value=None))
         assert asyncio.run(middleware.aafter_model({"messages": []}, runtime=MagicMock())) is None
 
+    def test_background_title_keeps_the_title_model_off_the_first_turn(self, monkeypatch):
+        """With a run-scoped BackgroundTitle the slow title call no longer delays the turn."""
+        _set_test_title_config(model_name="title-model")
+        middleware = TitleMiddleware()
+
+        events = []
+        release_title = None
+
+        class SlowTitleModel:
+            async def ainvoke(self, prompt, config=None):
+                events.append("title_call_started")
+                await release_title.wait()
+                events.append("title_call_finished")
+                return AIMessage(content="Weekly Sales Report")
+
+        monkeypatch.setattr(title_middleware_module, "create_chat_model", MagicMock(return_value=SlowTitleModel()))
+        state = {"messages": [HumanMessage(content="summarise this week's sales"), AIMessage(content="Sure")]}
+
+        async def run():
+            nonlocal release_title
+            release_title = asyncio.Event()
+            announced = []
+
+            async def on_ready(title):
+                announced.append(title)
+
+            background = BackgroundTitle(on_ready=on_ready)
+            runtime = SimpleNamespace(context={BACKGROUND_TITLE_CONTEXT_KEY: background})
+            # The title call can only finish once the first turn has returned,
+            # so an inline await would time out here instead of returning.
+            first = await asyncio.wait_for(middleware.aafter_model(state, runtime=runtime), 5)
+            events.append("first_turn_returned")
+
+            assert await middleware.aafter_model({**state, "title": first["title"]}, runtime=runtime) is None
+            release_title.set()
+            settled = await background.settle(5)
+            later = await middleware.aafter_model({**state, "title": first["title"]}, runtime=runtime)
+            return first, settled, later, announced
+
+        first, settled, later, announced = asyncio.run(run())
+
+        assert first == {"title": "summarise this week's sales"}
+        assert events.index("first_turn_returned") < events.index("title_call_finished")
+        assert settled == "Weekly Sales Report"
+        assert announced == ["Weekly Sales Report"]
+        assert later == {"title": "Weekly Sales Report"}
+
+    def test_background_title_does_not_override_a_later_rename(self, monkeypatch):
+        _set_test_title_config(model_name="title-model")
+        middleware = TitleMiddleware()
+        model = MagicMock()
+        model.ainvoke = AsyncMock(return_value=AIMessage(content="Generated"))
+        monkeypatch.setattr(title_middleware_module, "create_chat_model", MagicMock(return_value=model))
+        state = {"messages": [HumanMessage(content="hello"), AIMessage(content="hi")]}
+
+        async def run():
+            background = BackgroundTitle()
+            runtime = SimpleNamespace(context={BACKGROUND_TITLE_CONTEXT_KEY: background})
+            await middleware.aafter_model(state, runtime=runtime)
+            await background.settle(5)
+            return await middleware.aafter_model({**state, "title": "Renamed"}, runtime=runtime)
+
+        assert asyncio.run(run()) is None
+
+    def test_background_title_settle_cancels_a_call_past_its_budget(self):
+        async def run():
+            background = BackgroundTitle()
+            background.start(asyncio.sleep(10, result={"title": "Too Late"}), fallback="fallback")
+            title = await background.settle(0.05)
+            await asyncio.sleep(0)
+            return title, background._task.cancelled()
+
+        assert asyncio.run(run()) == (None, True)
+
     def test_aafter_model_uses_local_fallback_when_no_title_model_is_configured(self, monkeypatch):
         """Default async path must not block stream completion on a second LLM call."""
         _set_test_title_config(max_chars=20, model_name=None)
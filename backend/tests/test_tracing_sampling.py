@@ -0,0 +1,288 @@
+"""Tests for deerflow.tracing.sampling — head/tail sampling and batched export."""
+
+from __future__ import annotations
+
+import threading
+from uuid import UUID, uuid4
+
+import pytest
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.runnables import RunnableLambda
+
+from deerflow.config.tracing_config import TracingSamplingConfig, get_tracing_config, reset_tracing_config
+from deerflow.tracing import factory as tracing_factory
+from deerflow.tracing import sampling
+from deerflow.tracing.sampling import SampledTracingHandler, TraceExporter, reset_trace_exporter
+
+
+@pytest.fixture(autouse=True)
+def clear_sampling_env(monkeypatch):
+    for name in (
+        "DEER_FLOW_TRACE_SAMPLE_RATE",
+        "DEER_FLOW_TRACE_AGENT_SAMPLE_RATES",
+        "DEER_FLOW_TRACE_USER_SAMPLE_RATES",
+        "DEER_FLOW_TRACE_KEEP_ERRORS",
+        "DEER_FLOW_TRACE_BUFFER_LIMIT",
+        "DEER_FLOW_TRACE_EXPORT",
+        "DEER_FLOW_TRACE_QUEUE_SIZE",
+        "DEER_FLOW_TRACE_BATCH_SIZE",
+    ):
+        monkeypatch.delenv(name, raising=False)
+    reset_tracing_config()
+    yield
+    reset_tracing_config()
+    reset_trace_exporter()
+
+
+class RecordingHandler(BaseCallbackHandler):
+    """Stands in for a LangSmith/Langfuse handler."""
+
+    def __init__(self) -> None:
+        self.events: list[tuple[str, str]] = []
+
+    def on_chain_start(self, serialized, inputs, **kwargs):
+        self.events.append(("start", kwargs.get("name") or ""))
+
+    def on_chain_end(self, outputs, **kwargs):
+        self.events.append(("end", ""))
+
+    def on_chain_error(self, error, **kwargs):
+        self.events.append(("error", str(error)))
+
+
+class FakeSink:
+    """In-process exporter sink that records batches instead of calling providers."""
+
+    def __init__(self) -> None:
+        self.batches: list[list] = []
+
+    def __call__(self, batch) -> None:
+        self.batches.append(list(batch))
+
+    @property
+    def methods(self) -> list[str]:
+        return [event.method for batch in self.batches for event in batch]
+
+
+def _boom(_):
+    raise ValueError("boom")
+
+
+def _run(handler, *, fail: bool = False, metadata: dict | None = None) -> None:
+    chain = RunnableLambda(lambda x: x + 1, name="first") | RunnableLambda(_boom if fail else (lambda x: x * 2), name="second")
+    config = {"callbacks": [handler], "metadata": metadata or {}}
+    if fail:
+        with pytest.raises(ValueError, match="boom"):
+            chain.invoke(1, config)
+    else:
+        chain.invoke(1, config)
+
+
+def _handler(recorder, exporter=None, **overrides) -> SampledTracingHandler:
+    return SampledTracingHandler([recorder], TracingSamplingConfig(**overrides), exporter=exporter or TraceExporter())
+
+
+def test_sampled_run_is_forwarded_inline_in_order():
+    recorder = RecordingHandler()
+    handler = _handler(recorder)
+
+    _run(handler)
+
+    assert [kind for kind, _ in recorder.events] == ["start", "start", "end", "start", "end", "end"]
+    assert handler.exporter.snapshot().runs_sampled == 1
+
+
+def test_unsampled_successful_run_records_nothing():
+    recorder = RecordingHandler()
+    handler = _handler(recorder, sample_rate=0.0)
+
+    _run(handler)
+
+    assert recorder.events == []
+    stats = handler.exporter.snapshot()
+    assert (stats.runs_sampled, stats.runs_unsampled, stats.runs_promoted) == (0, 1, 0)
+    assert handler._roots == {} and handler._root_of == {}
+
+
+def test_failed_unsampled_run_is_promoted_with_its_buffered_spans():
+    recorder = RecordingHandler()
+    handler = _handler(recorder, sample_rate=0.0)
+
+    _run(handler, fail=True)
+
+    assert recorder.events[0] == ("start", "RunnableSequence")
+    assert [kind for kind, _ in recorder.events] == ["start", "start", "end", "start", "error", "error"]
+    assert handler.exporter.snapshot().runs_promoted == 1
+
+
+def test_failed_run_is_dropped_when_keep_errored_runs_is_off():
+    recorder = RecordingHandler()
+    handler = _handler(recorder, sample_rate=0.0, keep_errored_runs=False)
+
+    _run(handler, fail=True)
+
+    assert recorder.events == []
+
+
+def test_buffer_overflow_gives_up_on_the_run():
+    recorder = RecordingHandler()
+    handler = _handler(recorder, sample_rate=0.0, buffer_limit=2)
+
+    _run(handler, fail=True)
+
+    assert recorder.events == []
+    stats = handler.exporter.snapshot()
+    assert stats.buffer_overflows == 1 and stats.runs_promoted == 0
+
+
+def _start_root(handler) -> UUID:
+    run_id = uuid4()
+    handler.on_chain_start({}, {}, run_id=run_id, parent_run_id=None, metadata={})
+    return run_id
+
+
+def test_roots_that_never_end_expire_after_the_ttl(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(sampling.time, "monotonic", lambda: clock[0])
+    handler = SampledTracingHandler([RecordingHandler()], TracingSamplingConfig(sample_rate=0.0), exporter=TraceExporter(), root_ttl=60)
+
+    abandoned = _start_root(handler)
+    clock[0] += 61
+    live = _start_root(handler)
+
+    assert abandoned not in handler._roots and abandoned not in handler._root_of
+    assert list(handler._roots) == [live]
+    assert handler.exporter.snapshot().roots_evicted == 1
+
+
+def test_tracked_roots_are_capped_oldest_first():
+    handler = SampledTracingHandler([RecordingHandler()], TracingSamplingConfig(sample_rate=0.0), exporter=TraceExporter(), max_roots=3)
+
+    roots = [_start_root(handler) for _ in range(5)]
+
+    assert list(handler._roots) == roots[2:]
+    assert set(handler._root_of) == set(roots[2:])
+    assert handler.exporter.snapshot().roots_evicted == 2
+
+
+def test_per_user_rate_wins_over_per_agent_rate():
+    config = TracingSamplingConfig(sample_rate=0.5, agent_sample_rates={"lead-agent": 0.0}, user_sample_rates={"vip": 1.0})
+
+    assert config.rate_for(agent_name="lead-agent", user_id="vip") == 1.0
+    assert config.rate_for(agent_name="lead-agent", user_id="someone") == 0.0
+    assert config.rate_for(agent_name="other", user_id="someone") == 0.5
+
+
+def test_per_agent_rate_reads_run_metadata():
+    recorder = RecordingHandler()
+    handler = _handler(recorder, agent_sample_rates={"noisy": 0.0})
+
+    _run(handler, metadata={"agent_name": "noisy"})
+    assert recorder.events == []
+
+    _run(handler, metadata={"agent_name": "quiet"})
+    assert recorder.events
+
+
+def test_decision_follows_the_request_trace_id():
+    decisions = set()
+    for _ in range(5):
+        recorder = RecordingHandler()
+        _run(_handler(recorder, sample_rate=0.5), metadata={"deerflow_trace_id": "trace-42"})
+        decisions.add(bool(recorder.events))
+
+    assert len(decisions) == 1
+
+
+def test_batched_export_hands_events_to_the_sink():
+    sink = FakeSink()
+    exporter = TraceExporter(sink=sink, batch_size=4)
+    recorder = RecordingHandler()
+    handler = _handler(recorder, exporter=exporter, export_mode="batched")
+
+    _run(handler)
+    assert exporter.flush(timeout=5)
+    exporter.close()
+
+    assert recorder.events == []  # the fake sink replaces delivery
+    assert sink.methods == ["on_chain_start", "on_chain_start", "on_chain_end", "on_chain_start", "on_chain_end", "on_chain_end"]
+    assert all(len(batch) <= 4 for batch in sink.batches)
+    stats = exporter.snapshot()
+    assert stats.events_exported == 6 and stats.batches == len(sink.batches)
+    assert handler.run_inline is True
+
+
+def test_full_queue_drops_and_counts_events():
+    release = threading.Event()
+    sink = FakeSink()
+
+    def slow_sink(batch):
+        release.wait(5)
+        sink(batch)
+
+    exporter = TraceExporter(sink=slow_sink, queue_size=2, batch_size=1)
+    handler = _handler(RecordingHandler(), exporter=exporter, export_mode="batched")
+
+    _run(handler)
+    release.set()
+    assert exporter.flush(timeout=5)
+    exporter.close()
+
+    stats = exporter.snapshot()
+    assert stats.events_dropped > 0
+    assert stats.events_queued + stats.events_dropped == 6
+    assert stats.events_exported == stats.events_queued == len(sink.methods)
+
+
+def test_sampling_config_is_read_from_env(monkeypatch):
+    monkeypatch.setenv("DEER_FLOW_TRACE_SAMPLE_RATE", "0.25")
+    monkeypatch.setenv("DEER_FLOW_TRACE_AGENT_SAMPLE_RATES", "lead-agent=0.1, subagent:bash=0")
+    monkeypatch.setenv("DEER_FLOW_TRACE_KEEP_ERRORS", "false")
+    monkeypatch.setenv("DEER_FLOW_TRACE_EXPORT", "batched")
+    monkeypatch.setenv("DEER_FLOW_TRACE_QUEUE_SIZE", "50")
+    reset_tracing_config()
+
+    sampling = get_tracing_config().sampling
+
+    assert sampling.sample_rate == 0.25
+    assert sampling.agent_sample_rates == {"lead-agent": 0.1, "subagent:bash": 0.0}
+    assert sampling.keep_errored_runs is False
+    assert sampling.export_mode == "batched"
+    assert sampling.queue_size == 50
+
+
+@pytest.mark.parametrize(
+    ("name", "value", "match"),
+    [
+        ("DEER_FLOW_TRACE_SAMPLE_RATE", "often", "must be a number"),
+        ("DEER_FLOW_TRACE_USER_SAMPLE_RATES", "alice", "name=rate"),
+    ],
+)
+def test_malformed_sampling_env_is_rejected(monkeypatch, name, value, match):
+    monkeypatch.setenv(name, value)
+    reset_tracing_config()
+
+    with pytest.raises(ValueError, match=match):
+        get_tracing_config()
+
+
+def test_out_of_range_rate_fails_validation():
+    with pytest.raises(ValueError, match="between 0 and 1"):
+        TracingSamplingConfig(agent_sample_rates={"lead-agent": 1.5}).validate()
+
+
+def test_factory_wraps_providers_only_when_sampling_is_active(monkeypatch):
+    provider = RecordingHandler()
+    sampling = TracingSamplingConfig()
+    cfg = type("Cfg", (), {"langsmith": object(), "sampling": sampling})()
+    monkeypatch.setattr(tracing_factory, "validate_enabled_tracing_providers", lambda: None)
+    monkeypatch.setattr(tracing_factory, "get_enabled_tracing_providers", lambda: ["langsmith"])
+    monkeypatch.setattr(tracing_factory, "get_tracing_config", lambda: cfg)
+    monkeypatch.setattr(tracing_factory, "_create_langsmith_tracer", lambda config: provider)
+
+    assert tracing_factory.build_tracing_callbacks() == [provider]
+
+    cfg.sampling = TracingSamplingConfig(sample_rate=0.1)
+    (wrapped,) = tracing_factory.build_tracing_callbacks()
+    assert isinstance(wrapped, SampledTracingHandler)
+    assert wrapped.handlers == (provider,)
@@ -3,7 +3,8 @@ and include the expected text."""
 
 from rich.console import Console
 
-from deerflow.tui.render import render_header, render_status, render_transcript
+from deerflow.tui import render
+from deerflow.tui.render import TranscriptRenderer, render_header, render_status, render_transcript
 from deerflow.tui.view_state import (
     AssistantDelta,
     RunEnded,
@@ -96,6 +97,52 @@ def test_only_the_actively_streaming_message_is_plain():
     assert "done" in out
 
 
+def _plain_lines(lines) -> list[str]:
+    return ["".join(segment.text for segment in line).rstrip() for line in lines]
+
+
+def _layout_text(state, width: int = 60) -> list[str]:
+    console = Console(width=width, no_color=True)
+    return _plain_lines(console.render_lines(render_transcript(state), console.options.update_width(width), pad=False))
+
+
+def test_transcript_renderer_matches_render_transcript_while_streaming():
+    console = Console(width=60, no_color=True)
+    renderer = TranscriptRenderer()
+    state = initial_state()
+    assert _plain_lines(renderer.lines(state, console, 60)) == _layout_text(state)
+
+    state = reduce(state, UserSubmitted("hello"))
+    state = reduce(state, AssistantDelta(id="m1", text="# Title\n\n- one\n- **two**"))
+    state = reduce(state, RunStarted())
+    for chunk in ["Streaming ", "a long line " * 8, "\n", "\n\nnext", " paragraph\n", "中文" * 40, "\n", "tail"]:
+        state = reduce(state, AssistantDelta(id="m2", text=chunk))
+        for width in (60, 23):
+            assert _plain_lines(renderer.lines(state, console, width)) == _layout_text(state, width)
+
+
+def test_transcript_renderer_lays_out_finished_rows_once_per_width(monkeypatch):
+    console = Console(width=60, no_color=True)
+    renderer = TranscriptRenderer()
+    rendered = []
+    original = render.render_row
+    monkeypatch.setattr(render, "render_row", lambda row, **kwargs: rendered.append(row) or original(row, **kwargs))
+
+    state = reduce(initial_state(), UserSubmitted("hello"))
+    state = reduce(state, AssistantDelta(id="m1", text="**answer**"))
+    for _ in range(3):
+        renderer.lines(state, console, 60)
+    assert len(rendered) == 2
+
+    renderer.lines(state, console, 40)
+    assert len(rendered) == 4
+
+    # A changed row is a new cache key; the unchanged user row is not redone.
+    state = reduce(state, SystemMessage("note"))
+    renderer.lines(state, console, 40)
+    assert len(rendered) == 5
+
+
 def test_render_status_ready_and_working():
     ready = _render_to_text(render_status(initial_state(), model="gpt", thread_label="new"))
     assert "ready" in ready
@@ -0,0 +1,183 @@
+"""Tests for ``uploads.dedup`` — the per-user content-addressed upload store.
+
+Identical uploads must be stored once and materialized into each thread,
+thread files must stay private unless hardlinks are opted into, and every way
+a thread lets go of a file (delete, same-name re-upload, thread deletion) must
+reclaim a blob exactly when its last reference goes.
+"""
+
+import asyncio
+import hashlib
+from io import BytesIO
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from _router_auth_helpers import call_unwrapped
+from fastapi import UploadFile
+
+from app.gateway.routers import threads, uploads
+from deerflow.config.paths import Paths
+from deerflow.uploads import blob_store as blob_store_mod
+from deerflow.uploads.blob_store import UploadBlobStore
+from deerflow.utils import file_clone
+
+USER_ID = "user-1"
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return Paths(tmp_path)
+
+
+def _upload(paths: Paths, thread_id: str, files: dict[str, bytes], **uploads_config):
+    uploads_dir = paths.sandbox_uploads_dir(thread_id, user_id=USER_ID)
+    uploads_dir.mkdir(parents=True, exist_ok=True)
+    provider = MagicMock()
+    provider.uses_thread_data_mounts = True
+    config = SimpleNamespace(uploads={"dedup": True, **uploads_config})
+    with (
+        patch.object(uploads, "ensure_uploads_dir", return_value=uploads_dir),
+        patch.object(uploads, "get_sandbox_provider", return_value=provider),
+        patch.object(uploads, "get_effective_user_id", return_value=USER_ID),
+        patch.object(blob_store_mod, "get_paths", return_value=paths),
+    ):
+        upload_files = [UploadFile(filename=name, file=BytesIO(data)) for name, data in files.items()]
+        asyncio.run(call_unwrapped(uploads.upload_files, thread_id, request=MagicMock(), files=upload_files, config=config))
+    return uploads_dir
+
+
+def _blobs(paths: Paths) -> list[str]:
+    objects = paths.user_upload_blobs_dir(USER_ID) / "objects"
+    return sorted(p.name for p in objects.glob("*/*") if not p.name.endswith(".md"))
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def test_identical_uploads_are_stored_once_as_private_thread_files(paths):
+    data = b"quarterly handbook" * 1000
+
+    first = _upload(paths, "thread-a", {"handbook.txt": data})
+    second = _upload(paths, "thread-b", {"handbook.txt": data, "copy.txt": data})
+
+    assert _blobs(paths) == [_digest(data)]
+    for path in (first / "handbook.txt", second / "handbook.txt", second / "copy.txt"):
+        assert path.read_bytes() == data
+    # Without dedup_hardlinks each thread file is a reflink or copy, never the blob's inode.
+    blob = UploadBlobStore(paths.user_upload_blobs_dir(USER_ID)).blob_path(_digest(data))
+    assert (first / "handbook.txt").stat().st_ino != blob.stat().st_ino
+    assert (first / "handbook.txt").stat().st_ino != (second / "handbook.txt").stat().st_ino
+
+
+def test_dedup_hardlinks_share_the_blob_inode(paths):
+    data = b"read-only reference data"
+
+    first = _upload(paths, "thread-a", {"data.csv": data}, dedup_hardlinks=True)
+    second = _upload(paths, "thread-b", {"data.csv": data}, dedup_hardlinks=True)
+
+    blob = UploadBlobStore(paths.user_upload_blobs_dir(USER_ID)).blob_path(_digest(data))
+    if blob.stat().st_ino != (first / "data.csv").stat().st_ino:
+        pytest.skip("filesystem supports reflinks, which are preferred over hardlinks")
+    assert (second / "data.csv").stat().st_ino == blob.stat().st_ino
+    assert blob.stat().st_nlink == 3
+
+
+def test_dedup_disabled_by_default_leaves_no_store(paths):
+    uploads_dir = paths.sandbox_uploads_dir("thread-a", user_id=USER_ID)
+    uploads_dir.mkdir(parents=True)
+    provider = MagicMock()
+    provider.uses_thread_data_mounts = True
+    with (
+        patch.object(uploads, "ensure_uploads_dir", return_value=uploads_dir),
+        patch.object(uploads, "get_sandbox_provider", return_value=provider),
+    ):
+        file = UploadFile(filename="notes.txt", file=BytesIO(b"hello"))
+        asyncio.run(call_unwrapped(uploads.upload_files, "thread-a", request=MagicMock(), files=[file], config=SimpleNamespace()))
+
+    assert (uploads_dir / "notes.txt").read_bytes() == b"hello"
+    assert not paths.user_upload_blobs_dir(USER_ID).exists()
+
+
+def test_same_name_reupload_releases_previous_blob(paths):
+    _upload(paths, "thread-a", {"notes.txt": b"v1"})
+    _upload(paths, "thread-b", {"notes.txt": b"v1"})
+    uploads_dir = _upload(paths, "thread-a", {"notes.txt": b"v2"})
+
+    assert (uploads_dir / "notes.txt").read_bytes() == b"v2"
+    assert _blobs(paths) == sorted([_digest(b"v1"), _digest(b"v2")])
+
+    _upload(paths, "thread-b", {"notes.txt": b"v2"})
+    assert _blobs(paths) == [_digest(b"v2")]
+
+
+def test_deleting_uploads_and_threads_reclaims_blob_after_last_reference(paths):
+    data = b"shared dataset"
+    _upload(paths, "thread-a", {"data.bin": data})
+    _upload(paths, "thread-b", {"data.bin": data})
+
+    with (
+        patch.object(uploads, "get_uploads_dir", side_effect=lambda thread_id, user_id: paths.sandbox_uploads_dir(thread_id, user_id=user_id)),
+        patch.object(uploads, "get_upload_blob_store", side_effect=lambda user_id: UploadBlobStore(paths.user_upload_blobs_dir(user_id))),
+    ):
+        uploads._delete_uploaded_file_for_thread("thread-a", "data.bin", USER_ID)
+    assert _blobs(paths) == [_digest(data)]
+
+    threads._delete_thread_data("thread-b", paths=paths, user_id=USER_ID)
+
+    assert not paths.thread_dir("thread-b", user_id=USER_ID).exists()
+    assert _blobs(paths) == []
+    assert not any((paths.user_upload_blobs_dir(USER_ID) / "refs").iterdir())
+
+
+def test_rejected_request_releases_stored_blobs(paths, monkeypatch):
+    monkeypatch.setattr(uploads, "_get_upload_limits", lambda config: uploads.UploadLimits(max_files=10, max_file_size=100, max_total_size=150))
+
+    with pytest.raises(uploads.HTTPException):
+        _upload(paths, "thread-a", {"a.txt": b"a" * 100, "b.txt": b"b" * 100})
+
+    assert _blobs(paths) == []
+    assert not (paths.sandbox_uploads_dir("thread-a", user_id=USER_ID) / "a.txt").exists()
+
+
+def test_converted_markdown_is_reused_for_identical_upload(paths):
+    conversions: list[Path] = []
+
+    async def fake_convert(file_path, output_path=None):
+        conversions.append(file_path)
+        output_path.write_text("# converted", encoding="utf-8")
+        return output_path
+
+    with patch.object(uploads, "convert_file_to_markdown", side_effect=fake_convert):
+        _upload(paths, "thread-a", {"report.docx": b"docx bytes"}, auto_convert_documents=True)
+        second = _upload(paths, "thread-b", {"report.docx": b"docx bytes"}, auto_convert_documents=True)
+
+    assert len(conversions) == 1
+    assert (second / "report.md").read_text(encoding="utf-8") == "# converted"
+
+    threads._delete_thread_data("thread-a", paths=paths, user_id=USER_ID)
+    threads._delete_thread_data("thread-b", paths=paths, user_id=USER_ID)
+    assert not list((paths.user_upload_blobs_dir(USER_ID) / "objects").glob("*/*"))
+
+
+def test_store_falls_back_to_copy_when_reflink_is_unsupported(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_clone, "try_reflink", lambda source, target: False)
+    store = UploadBlobStore(tmp_path / "store")
+    staged = tmp_path / "staged"
+    staged.write_bytes(b"payload")
+    dest = tmp_path / "thread" / "payload.txt"
+    dest.parent.mkdir()
+
+    assert store.add("thread-a", "payload.txt", staged, _digest(b"payload"), dest) == "copy"
+    assert dest.read_bytes() == b"payload"
+    assert not staged.exists()
+    assert list(dest.parent.iterdir()) == [dest]
+
+
+def test_store_rejects_unsafe_thread_ids(tmp_path):
+    store = UploadBlobStore(tmp_path / "store")
+
+    with pytest.raises(ValueError):
+        store.release_thread("../escape")
@@ -312,6 +312,30 @@ def test_upload_files_acquires_non_local_sandbox_before_writing(tmp_path):
     sandbox.update_file.assert_called_once_with("/mnt/user-data/uploads/notes.txt", b"hello uploads")
 
 
+def test_upload_many_files_syncs_them_to_the_sandbox_as_one_archive(tmp_path):
+    thread_uploads_dir = tmp_path / "uploads"
+    thread_uploads_dir.mkdir(parents=True)
+
+    provider = MagicMock()
+    provider.uses_thread_data_mounts = False
+    sandbox = MagicMock()
+    provider.get.return_value = sandbox
+    provider.acquire_async = AsyncMock(return_value="aio-1")
+
+    with (
+        patch.object(uploads, "get_effective_user_id", return_value="owner-upload"),
+        patch.object(uploads, "ensure_uploads_dir", return_value=thread_uploads_dir),
+        patch.object(uploads, "get_sandbox_provider", return_value=provider),
+        patch.object(uploads, "push_tree") as push_tree,
+    ):
+        files = [UploadFile(filename=f"part-{i}.txt", file=BytesIO(f"part {i}".encode())) for i in range(uploads.BULK_SYNC_MIN_FILES)]
+        result = asyncio.run(call_unwrapped(uploads.upload_files, "thread-aio", request=MagicMock(), files=files, config=SimpleNamespace()))
+
+    assert result.success is True
+    sandbox.update_file.assert_not_called()
+    push_tree.assert_called_once_with(sandbox, thread_uploads_dir, "/mnt/user-data/uploads", only=[f"part-{i}.txt" for i in range(uploads.BULK_SYNC_MIN_FILES)])
+
+
 def test_upload_files_fails_before_writing_when_non_local_sandbox_unavailable(tmp_path):
     thread_uploads_dir = tmp_path / "uploads"
     thread_uploads_dir.mkdir(parents=True)
@@ -0,0 +1,111 @@
+"""Tests for the shared SSRF URL screening and its resolver cache."""
+
+import asyncio
+import ipaddress
+import socket
+
+import pytest
+
+from deerflow.community import url_safety
+
+
+class _FakeResolver:
+    """Stand-in for ``socket.getaddrinfo`` that counts resolutions."""
+
+    def __init__(self, table: dict[str, list[str]]) -> None:
+        self.table = table
+        self.calls: list[str] = []
+
+    def __call__(self, host, port, *args, **kwargs):
+        self.calls.append(host)
+        addresses = self.table.get(host)
+        if not addresses:
+            raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", (address, 0)) for address in addresses]
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(url_safety, "_dns_cache", url_safety._DnsCache(clock=clock))
+    return clock
+
+
+@pytest.fixture
+def resolver(monkeypatch, clock):
+    fake = _FakeResolver({"public.example": ["93.184.216.34"], "rebind.example": ["10.0.0.7"]})
+    monkeypatch.setattr(socket, "getaddrinfo", fake)
+    return fake
+
+
+def test_sync_resolution_is_cached_until_ttl(resolver, clock):
+    for _ in range(3):
+        assert url_safety.validate_public_http_url("https://public.example/a") is None
+    assert resolver.calls == ["public.example"]
+
+    clock.now += url_safety._DNS_POSITIVE_TTL_SECONDS + 1
+    assert url_safety.validate_public_http_url("https://PUBLIC.example./b") is None
+    assert resolver.calls == ["public.example", "public.example"]
+
+
+def test_async_path_shares_the_cache(resolver):
+    async def scenario():
+        return [await url_safety.avalidate_public_http_url("https://public.example/") for _ in range(3)]
+
+    assert asyncio.run(scenario()) == [None, None, None]
+    assert url_safety.validate_public_http_url("https://public.example/") is None
+    assert resolver.calls == ["public.example"]
+
+
+def test_cached_private_addresses_are_still_rejected(resolver):
+    for _ in range(2):
+        error = url_safety.validate_public_http_url("https://rebind.example/")
+        assert error is not None and "private, loopback, or metadata" in error
+    assert resolver.calls == ["rebind.example"]
+    # The cache stores addresses, not verdicts: an opted-in caller is unaffected.
+    assert url_safety.validate_public_http_url("https://rebind.example/", allow_private_addresses=True) is None
+
+
+def test_failed_lookups_are_cached_briefly(resolver, clock):
+    async def validate():
+        return await url_safety.avalidate_public_http_url("https://missing.example/")
+
+    assert asyncio.run(validate()) == "Error: URL host could not be resolved"
+    assert asyncio.run(validate()) == "Error: URL host could not be resolved"
+    assert resolver.calls == ["missing.example"]
+
+    clock.now += url_safety._DNS_NEGATIVE_TTL_SECONDS + 0.1
+    resolver.table["missing.example"] = ["93.184.216.35"]
+    assert asyncio.run(validate()) is None
+    assert resolver.calls == ["missing.example", "missing.example"]
+
+
+def test_async_validation_accepts_sync_and_async_resolvers(clock):
+    async def async_resolver(host):
+        return [ipaddress.ip_address("169.254.169.254")]
+
+    async def scenario():
+        return (
+            await url_safety.avalidate_public_http_url("https://a.example/", resolver=async_resolver),
+            await url_safety.avalidate_public_http_url("https://a.example/", resolver=lambda host: [ipaddress.ip_address("1.1.1.1")]),
+        )
+
+    blocked, allowed = asyncio.run(scenario())
+    assert "metadata" in blocked
+    assert allowed is None
+
+
+def test_literal_ips_and_blocked_names_skip_resolution(resolver):
+    assert url_safety.validate_public_http_url("http://127.0.0.1/") is not None
+    assert url_safety.validate_public_http_url("http://localhost/") is not None
+    assert url_safety.validate_public_http_url("http://8.8.8.8/") is None
+    assert url_safety.validate_public_http_url("ftp://public.example/") == "Error: Only http:// and https:// URLs are supported"
+    assert resolver.calls == []
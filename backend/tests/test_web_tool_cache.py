@@ -0,0 +1,208 @@
+"""Tests for the shared web-tool HTTP client pool and result cache."""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+
+from deerflow.community import http_pool
+from deerflow.community.jina_ai import tools as jina_tools
+from deerflow.community.web_cache import (
+    WebToolCache,
+    get_web_tool_cache,
+    make_web_cache_key,
+    reset_web_tool_cache,
+)
+from deerflow.config.web_tool_cache_config import WebToolCacheConfig
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    reset_web_tool_cache()
+    http_pool.reset_http_clients()
+    yield
+    reset_web_tool_cache()
+    http_pool.reset_http_clients()
+
+
+def _not_error(result: str) -> bool:
+    return not result.startswith("Error:")
+
+
+def _cache(**kwargs) -> WebToolCache:
+    options = {"ttl_seconds": 60, "max_entries": 8, "max_entry_chars": 1000}
+    options.update(kwargs)
+    return WebToolCache(**options)
+
+
+def test_cache_key_depends_on_every_param():
+    base = make_web_cache_key("search", "ddg", query="q", max_results=5)
+    assert base == make_web_cache_key("search", "ddg", max_results=5, query="q")
+    assert base != make_web_cache_key("search", "ddg", query="q", max_results=6)
+    assert base != make_web_cache_key("search", "tavily", query="q", max_results=5)
+
+
+def test_async_hit_after_miss_and_expiry():
+    now = [0.0]
+    cache = _cache(ttl_seconds=10, clock=lambda: now[0])
+    calls = []
+
+    async def fetch() -> str:
+        calls.append(1)
+        return "page"
+
+    async def scenario():
+        first = await cache.aget_or_fetch("k", fetch, cacheable=_not_error)
+        second = await cache.aget_or_fetch("k", fetch, cacheable=_not_error)
+        now[0] = 11
+        third = await cache.aget_or_fetch("k", fetch, cacheable=_not_error)
+        return first, second, third
+
+    assert asyncio.run(scenario()) == (("page", "miss"), ("page", "hit"), ("page", "miss"))
+    assert len(calls) == 2
+
+
+def test_errors_and_oversized_results_are_not_cached():
+    cache = _cache(max_entry_chars=5)
+    results = iter(["Error: boom", "way too long", "ok"])
+
+    async def fetch() -> str:
+        return next(results)
+
+    async def scenario():
+        return [(await cache.aget_or_fetch("k", fetch, cacheable=_not_error))[1] for _ in range(4)]
+
+    assert asyncio.run(scenario()) == ["miss", "miss", "miss", "hit"]
+
+
+def test_concurrent_identical_requests_share_one_upstream_call():
+    cache = _cache()
+    calls = []
+
+    async def fetch() -> str:
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def scenario():
+        return await asyncio.gather(*(cache.aget_or_fetch("k", fetch, cacheable=_not_error) for _ in range(5)))
+
+    outcomes = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert sorted(status for _, status in outcomes) == ["miss", "shared", "shared", "shared", "shared"]
+    assert {value for value, _ in outcomes} == {"result"}
+
+
+def test_waiters_refetch_when_the_leading_request_fails():
+    cache = _cache()
+    attempts = []
+
+    async def fetch() -> str:
+        attempts.append(1)
+        await asyncio.sleep(0.01)
+        if len(attempts) == 1:
+            raise httpx.ConnectError("down")
+        return "recovered"
+
+    async def scenario():
+        return await asyncio.gather(
+            cache.aget_or_fetch("k", fetch, cacheable=_not_error),
+            cache.aget_or_fetch("k", fetch, cacheable=_not_error),
+            return_exceptions=True,
+        )
+
+    leader, waiter = asyncio.run(scenario())
+    assert isinstance(leader, httpx.ConnectError)
+    assert waiter == ("recovered", "miss")
+
+
+def test_sync_requests_are_deduplicated_across_threads():
+    cache = _cache()
+    calls = []
+    outcomes = []
+    gate = threading.Barrier(4)
+
+    def fetch() -> str:
+        calls.append(1)
+        time.sleep(0.1)
+        return "result"
+
+    def worker():
+        gate.wait()
+        outcomes.append(cache.get_or_fetch("k", fetch, cacheable=_not_error))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert sorted(status for _, status in outcomes) == ["miss", "shared", "shared", "shared"]
+
+
+def test_cache_requires_enabled_config():
+    assert get_web_tool_cache(SimpleNamespace(web_tool_cache=WebToolCacheConfig())) is None
+    assert get_web_tool_cache(MagicMock()) is None
+    assert get_web_tool_cache(SimpleNamespace(web_tool_cache=WebToolCacheConfig(enabled=True))) is not None
+
+
+def test_web_fetch_reports_cache_status_in_artifact(monkeypatch):
+    app_config = MagicMock()
+    app_config.get_tool_config.return_value = None
+    app_config.web_tool_cache = WebToolCacheConfig(enabled=True)
+    monkeypatch.setattr(jina_tools, "get_app_config", lambda: app_config)
+    crawls = []
+
+    async def fake_crawl(self, url, **kwargs):
+        crawls.append(url)
+        return "<html><body><p>article</p></body></html>"
+
+    monkeypatch.setattr(jina_tools.JinaClient, "crawl", fake_crawl)
+    monkeypatch.setattr(
+        jina_tools.readability_extractor,
+        "extract_article",
+        lambda html: SimpleNamespace(to_markdown=lambda: "# article"),
+    )
+
+    def tool_call(call_id: str) -> dict:
+        return {"name": "web_fetch", "args": {"url": "https://example.com/a"}, "id": call_id, "type": "tool_call"}
+
+    async def scenario():
+        first = await jina_tools.web_fetch_tool.ainvoke(tool_call("c1"))
+        second = await jina_tools.web_fetch_tool.ainvoke(tool_call("c2"))
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first.artifact == {"web_cache": "miss"}
+    assert second.artifact == {"web_cache": "hit"}
+    assert first.content == second.content
+    assert crawls == ["https://example.com/a"]
+
+
+def test_pool_reuses_one_client_per_loop_and_closes_it():
+    async def scenario():
+        first = http_pool.get_async_http_client()
+        second = http_pool.get_async_http_client()
+        proxied = http_pool.get_async_http_client(proxy="http://127.0.0.1:7890")
+        closed = await http_pool.aclose_http_clients()
+        return first, second, proxied, closed
+
+    first, second, proxied, closed = asyncio.run(scenario())
+    assert first is second
+    assert proxied is not first
+    assert closed == 2
+    assert first.is_closed and proxied.is_closed
+
+
+def test_pool_does_not_share_clients_across_loops():
+    clients = [asyncio.run(_get_client()) for _ in range(2)]
+    assert clients[0] is not clients[1]
+
+
+async def _get_client() -> httpx.AsyncClient:
+    return http_pool.get_async_http_client()
@@ -1,8 +1,12 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, START, END
 from langgraph.checkpoint.memory import MemorySaver
+from langgraph.types import Send
+
+from src.config.configuration import Configuration
 from src.prompts.planner_model import StepType
 
 from .types import State
@@ -18,19 +22,38 @@ from .nodes import (
 )
 
 
-def continue_to_running_research_team(state: State):
+def continue_to_running_research_team(state: State, config: RunnableConfig):
     current_plan = state.get("current_plan")
     if not current_plan or not current_plan.steps:
         return "planner"
     if all(step.execution_res for step in current_plan.steps):
         return "planner"
-    for step in current_plan.steps:
-        if not step.execution_res:
-            break
-    if step.step_type and step.step_type == StepType.RESEARCH:
-        return "researcher"
-    if step.step_type and step.step_type == StepType.PROCESSING:
-        return "coder"
+
+    ready = current_plan.ready_steps()
+    if not ready:
+        # Unsatisfiable dependencies (e.g. a cycle): fall back to running the
+        # first unexecuted step, as plans without dependencies always did.
+        ready = [
+            next(i for i, s in enumerate(current_plan.steps) if not s.execution_res)
+        ]
+
+    # Independent research steps fan out to concurrent researcher runs; their
+    # results are joined in the research team node before the next round.
+    research = [
+        i for i in ready if current_plan.steps[i].step_type == StepType.RESEARCH
+    ]
+    if research:
+        configurable = Configuration.from_runnable_config(config)
+        limit = max(1, int(configurable.max_parallel_steps))
+        return [
+            Send("researcher", {**state, "current_step_index": index})
+            for index in research[:limit]
+        ]
+
+    # Processing steps share one code interpreter and run one at a time.
+    index = ready[0]
+    if current_plan.steps[index].step_type == StepType.PROCESSING:
+        return Send("coder", {**state, "current_step_index": index})
     return "planner"
 
 
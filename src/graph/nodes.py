@@ -200,6 +200,7 @@ def human_feedback_node(
             "current_plan": Plan.model_validate(new_plan),
             "plan_iterations": plan_iterations,
             "locale": new_plan["locale"],
+            "step_results": None,
         },
         goto=goto,
     )
@@ -288,9 +289,31 @@ def reporter_node(state: State, config: RunnableConfig):
 
 
 def research_team_node(state: State):
-    """Research team node that collaborates on tasks."""
+    """Research team node that collaborates on tasks.
+
+    Steps may run concurrently, so they report their results through
+    ``step_results`` instead of editing the plan; this node is the join point
+    that folds them into ``current_plan`` and ``observations`` in plan order.
+    """
     logger.info("Research team is collaborating on tasks.")
-    pass
+    current_plan = state.get("current_plan")
+    step_results = state.get("step_results") or {}
+    if not isinstance(current_plan, Plan) or not step_results:
+        return None
+
+    steps = []
+    new_observations = []
+    for index, step in enumerate(current_plan.steps):
+        if not step.execution_res and index in step_results:
+            step = step.model_copy(update={"execution_res": step_results[index]})
+            new_observations.append(step_results[index])
+        steps.append(step)
+
+    return {
+        "current_plan": current_plan.model_copy(update={"steps": steps}),
+        "observations": state.get("observations", []) + new_observations,
+        "step_results": None,
+    }
 
 
 async def _execute_agent_step(
@@ -298,22 +321,27 @@ async def _execute_agent_step(
 ) -> Command[Literal["research_team"]]:
     """Helper function to execute a step using the specified agent."""
     current_plan = state.get("current_plan")
-    observations = state.get("observations", [])
 
-    # Find the first unexecuted step
-    current_step = None
-    completed_steps = []
-    for step in current_plan.steps:
-        if not step.execution_res:
-            current_step = step
-            break
-        else:
-            completed_steps.append(step)
+    # Steps fanned out by the research team carry their index; otherwise run
+    # the first unexecuted step.
+    step_index = state.get("current_step_index")
+    if step_index is None:
+        step_index = next(
+            (i for i, s in enumerate(current_plan.steps) if not s.execution_res),
+            None,
+        )
 
-    if not current_step:
+    if step_index is None:
         logger.warning("No unexecuted step found")
         return Command(goto="research_team")
 
+    current_step = current_plan.steps[step_index]
+    completed_steps = [
+        current_plan.steps[i]
+        for i in current_plan.step_dependencies(step_index)
+        if current_plan.steps[i].execution_res
+    ]
+
     logger.info(f"Executing step: {current_step.title}, agent: {agent_name}")
 
     # Format completed steps information
@@ -387,8 +415,7 @@ async def _execute_agent_step(
     response_content = result["messages"][-1].content
     logger.debug(f"{agent_name.capitalize()} full response: {response_content}")
 
-    # Update the step with the execution result
-    current_step.execution_res = response_content
+    # Report the result; the research team node folds it into the plan
     logger.info(f"Step '{current_step.title}' execution completed by {agent_name}")
 
     return Command(
@@ -399,7 +426,7 @@ async def _execute_agent_step(
                     name=agent_name,
                 )
             ],
-            "observations": observations + [response_content],
+            "step_results": {step_index: response_content},
         },
         goto="research_team",
     )
@@ -1,12 +1,27 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+from typing import Annotated, Optional
+
 from langgraph.graph import MessagesState
 
 from src.prompts.planner_model import Plan
 from src.rag import Resource
 
 
+def merge_step_results(
+    left: Optional[dict[int, str]], right: Optional[dict[int, str]]
+) -> dict[int, str]:
+    """Merge step results written by concurrently running research steps.
+
+    Writing ``None`` clears the results, which is done whenever a new plan is
+    installed so results of a previous plan are never folded into it.
+    """
+    if right is None:
+        return {}
+    return {**(left or {}), **right}
+
+
 class State(MessagesState):
     """State for the agent system, extends MessagesState with next field."""
 
@@ -20,3 +35,9 @@ class State(MessagesState):
     auto_accepted_plan: bool = False
     enable_background_investigation: bool = True
     background_investigation_results: str = None
+    # Index of the plan step a researcher/coder run executes, set per run by
+    # the ``Send`` that fans the research team out.
+    current_step_index: int = None
+    # Results of finished plan steps keyed by step index, not yet folded into
+    # ``current_plan`` by the research team node.
+    step_results: Annotated[dict[int, str], merge_step_results] = {}
@@ -20,6 +20,13 @@ class Step(BaseModel):
     execution_res: Optional[str] = Field(
         default=None, description="The Step execution result"
     )
+    depends_on: Optional[List[int]] = Field(
+        default=None,
+        description=(
+            "0-based indices of the steps whose results this step needs. "
+            "Omit to depend on every earlier step; use [] for an independent step."
+        ),
+    )
 
 
 class Plan(BaseModel):
@@ -34,6 +41,35 @@ class Plan(BaseModel):
         description="Research & Processing steps to get more context",
     )
 
+    def step_dependencies(self, index: int) -> List[int]:
+        """Return the valid dependency indices of the step at ``index``.
+
+        Steps that do not declare ``depends_on`` keep the original sequential
+        semantics and depend on every earlier step. Out-of-range and
+        self-references are ignored.
+        """
+        step = self.steps[index]
+        if step.depends_on is None:
+            return list(range(index))
+        return sorted(
+            {
+                dep
+                for dep in step.depends_on
+                if 0 <= dep < len(self.steps) and dep != index
+            }
+        )
+
+    def ready_steps(self) -> List[int]:
+        """Return the indices of unexecuted steps whose dependencies are all done."""
+        return [
+            index
+            for index, step in enumerate(self.steps)
+            if not step.execution_res
+            and all(
+                self.steps[dep].execution_res for dep in self.step_dependencies(index)
+            )
+        ]
+
     class Config:
         json_schema_extra = {
             "examples": [
@@ -51,6 +87,7 @@ class Plan(BaseModel):
                                 "Collect data on market size, growth rates, major players, and investment trends in AI sector."
                             ),
                             "step_type": "research",
+                            "depends_on": [],
                         }
                     ],
                 }
@@ -0,0 +1,58 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""Stub the graph's unavailable imports so the real nodes can be tested.
+
+``src.graph.nodes`` imports agent, tool, LLM and prompt modules that are not
+all present (or importable without credentials) in this tree. The graph tests
+replace the agent with a fake, so each missing module only needs the names
+``nodes`` imports from it. A module that imports cleanly is left untouched.
+"""
+
+import importlib
+import sys
+import types
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import src.config
+from src.config.tools import SELECTED_SEARCH_ENGINE, SearchEngine
+
+_SRC_DIR = Path(__file__).resolve().parents[3] / "src"
+
+
+def _stub_module(name, package_dir=None, **attrs):
+    try:
+        importlib.import_module(name)
+        return
+    except ImportError:
+        sys.modules.pop(name, None)
+    module = types.ModuleType(name)
+    if package_dir is not None:
+        # Keep real submodules (e.g. src.tools.retriever) importable.
+        module.__path__ = [str(package_dir)]
+    module.__dict__.update(attrs)
+    sys.modules[name] = module
+    parent, _, child = name.rpartition(".")
+    if parent in sys.modules:
+        setattr(sys.modules[parent], child, module)
+
+
+# ``src/config`` has no ``__init__``; nodes imports the search engine from it.
+src.config.SELECTED_SEARCH_ENGINE = SELECTED_SEARCH_ENGINE
+src.config.SearchEngine = SearchEngine
+
+_stub_module("src.agents", _SRC_DIR / "agents", create_agent=MagicMock())
+_stub_module("src.utils", _SRC_DIR / "utils")
+_stub_module("src.utils.json_utils", repair_json_output=lambda content: content)
+_stub_module(
+    "src.tools",
+    _SRC_DIR / "tools",
+    crawl_tool=MagicMock(),
+    get_web_search_tool=MagicMock(),
+    get_retriever_tool=MagicMock(return_value=None),
+    python_repl_tool=MagicMock(),
+)
+_stub_module("src.tools.search", LoggedTavilySearch=MagicMock())
+_stub_module("src.llms.llm", get_llm_by_type=MagicMock())
+_stub_module("src.prompts.template", apply_prompt_template=MagicMock())
@@ -0,0 +1,218 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import time
+from typing import get_type_hints
+from unittest.mock import patch
+
+import pytest
+from langchain_core.messages import AIMessage
+from langgraph.graph import END, START, StateGraph
+from langgraph.types import Send
+
+from src.graph.builder import continue_to_running_research_team
+from src.graph.nodes import coder_node, research_team_node, researcher_node
+from src.graph.types import State, merge_step_results
+from src.prompts.planner_model import Plan, Step, StepType
+
+
+def _step(title, step_type=StepType.RESEARCH, depends_on=None, execution_res=None):
+    return Step(
+        need_search=step_type == StepType.RESEARCH,
+        title=title,
+        description=f"Collect {title}",
+        step_type=step_type,
+        depends_on=depends_on,
+        execution_res=execution_res,
+    )
+
+
+def _plan(*steps):
+    return Plan(
+        locale="en-US",
+        has_enough_context=False,
+        thought="thought",
+        title="title",
+        steps=list(steps),
+    )
+
+
+def _config(max_parallel_steps=3):
+    return {"configurable": {"max_parallel_steps": max_parallel_steps}}
+
+
+class FakeAgent:
+    """Fake researcher/coder agent whose LLM call sleeps; records overlapping runs."""
+
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.running = 0
+        self.max_running = 0
+        self.tasks = []
+
+    async def ainvoke(self, input, config=None):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        task = input["messages"][0].content
+        self.tasks.append(task)
+        await asyncio.sleep(self.delay)
+        self.running -= 1
+        title = task.split("## Title\n\n")[1].split("\n")[0]
+        return {"messages": [AIMessage(content=f"result of {title}")]}
+
+
+@pytest.fixture
+def fake_agent():
+    agent = FakeAgent()
+    with patch("src.graph.nodes.create_agent", return_value=agent):
+        yield agent
+
+
+def _research_graph():
+    builder = StateGraph(State)
+    builder.add_node("research_team", research_team_node)
+    builder.add_node("researcher", researcher_node)
+    builder.add_node("coder", coder_node)
+    builder.add_node("planner", lambda state: None)
+    builder.add_edge(START, "research_team")
+    builder.add_conditional_edges(
+        "research_team",
+        continue_to_running_research_team,
+        ["planner", "researcher", "coder"],
+    )
+    builder.add_edge("planner", END)
+    return builder.compile()
+
+
+def test_steps_without_dependencies_stay_sequential():
+    plan = _plan(_step("a"), _step("b"), _step("c"))
+    assert plan.ready_steps() == [0]
+    assert plan.step_dependencies(2) == [0, 1]
+
+
+def test_independent_steps_are_ready_together():
+    plan = _plan(
+        _step("a", depends_on=[]),
+        _step("b", depends_on=[]),
+        _step("c", StepType.PROCESSING, depends_on=[0, 1, 7]),
+    )
+    assert plan.ready_steps() == [0, 1]
+    assert plan.step_dependencies(2) == [0, 1]
+
+
+def test_dependent_step_is_ready_once_its_inputs_exist():
+    plan = _plan(
+        _step("a", depends_on=[], execution_res="done"),
+        _step("b", depends_on=[]),
+        _step("calc", StepType.PROCESSING, depends_on=[0]),
+    )
+    assert plan.ready_steps() == [1, 2]
+
+
+def test_merge_step_results_merges_and_clears():
+    assert merge_step_results({0: "a"}, {1: "b"}) == {0: "a", 1: "b"}
+    assert merge_step_results(None, {2: "c"}) == {2: "c"}
+    assert merge_step_results({0: "a"}, None) == {}
+
+
+def test_state_declares_current_step_index():
+    assert get_type_hints(State)["current_step_index"] is int
+
+
+def test_send_delivers_the_step_index_to_concurrent_runs():
+    seen = []
+
+    def fan_out(state):
+        return [Send("step", {**state, "current_step_index": i}) for i in range(3)]
+
+    def step(state):
+        seen.append(state["current_step_index"])
+        return {"step_results": {state["current_step_index"]: f"result {state['current_step_index']}"}}
+
+    builder = StateGraph(State)
+    builder.add_node("team", lambda state: {})
+    builder.add_node("step", step)
+    builder.add_edge(START, "team")
+    builder.add_conditional_edges("team", fan_out, ["step"])
+    builder.add_edge("step", END)
+
+    result = builder.compile().invoke({"messages": []})
+
+    assert sorted(seen) == [0, 1, 2]
+    assert result["step_results"] == {0: "result 0", 1: "result 1", 2: "result 2"}
+
+
+def test_routing_fans_out_ready_research_steps_up_to_the_limit():
+    plan = _plan(*[_step(f"s{i}", depends_on=[]) for i in range(5)])
+    sends = continue_to_running_research_team(
+        {"current_plan": plan}, _config(max_parallel_steps=2)
+    )
+    assert sends == [
+        Send("researcher", {"current_plan": plan, "current_step_index": 0}),
+        Send("researcher", {"current_plan": plan, "current_step_index": 1}),
+    ]
+
+
+def test_routing_runs_processing_steps_once_their_inputs_exist():
+    plan = _plan(
+        _step("a", depends_on=[], execution_res="done"),
+        _step("calc", StepType.PROCESSING, depends_on=[0]),
+    )
+    send = continue_to_running_research_team({"current_plan": plan}, _config())
+    assert send == Send("coder", {"current_plan": plan, "current_step_index": 1})
+
+    finished = _plan(_step("a", execution_res="done"))
+    assert (
+        continue_to_running_research_team({"current_plan": finished}, _config())
+        == "planner"
+    )
+
+
+def test_independent_research_steps_run_concurrently(fake_agent):
+    plan = _plan(*[_step(f"topic {i}", depends_on=[]) for i in range(6)])
+
+    started = time.monotonic()
+    result = asyncio.run(
+        _research_graph().ainvoke(
+            {"messages": [], "current_plan": plan, "observations": []},
+            _config(max_parallel_steps=6),
+        )
+    )
+    elapsed = time.monotonic() - started
+
+    assert fake_agent.max_running == 6
+    # Six sequential runs would take 6 * delay; concurrent ones take about one.
+    assert elapsed < 3 * fake_agent.delay
+    steps = result["current_plan"].steps
+    assert [step.execution_res for step in steps] == [
+        f"result of topic {i}" for i in range(6)
+    ]
+    assert result["observations"] == [f"result of topic {i}" for i in range(6)]
+
+
+def test_dependent_steps_run_in_order_and_see_their_inputs(fake_agent):
+    plan = _plan(
+        _step("market size", depends_on=[]),
+        _step("competitors", depends_on=[]),
+        _step("summary table", depends_on=[0, 1]),
+        _step("growth model", StepType.PROCESSING, depends_on=[2]),
+    )
+
+    result = asyncio.run(
+        _research_graph().ainvoke(
+            {"messages": [], "current_plan": plan, "observations": []}, _config()
+        )
+    )
+
+    assert fake_agent.max_running == 2
+    titles = [task.split("## Title\n\n")[1].split("\n")[0] for task in fake_agent.tasks]
+    assert sorted(titles[:2]) == ["competitors", "market size"]
+    assert titles[2:] == ["summary table", "growth model"]
+    assert "result of market size" in fake_agent.tasks[2]
+    assert "result of competitors" in fake_agent.tasks[2]
+    assert "result of summary table" in fake_agent.tasks[3]
+    assert result["observations"][2:] == [
+        "result of summary table",
+        "result of growth model",
+    ]